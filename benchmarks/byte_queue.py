@@ -0,0 +1,130 @@
+#####################################################################
+# byte_queue.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Micro benchmark for the ByteQueue frame consumption.
+
+Compares :class:`secsgem.common.ByteQueue` with the previous bytearray based implementation, by pushing a burst of
+small hsms frames queued behind a large partially received frame through the queue.
+
+Run with `python benchmarks/byte_queue.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import struct
+import threading
+import timeit
+
+from secsgem.common import ByteQueue
+
+
+class LegacyByteQueue:
+    """Previous bytearray based ByteQueue implementation, for comparison."""
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        self._buffer = bytearray()
+        self._buffer_lock = threading.Condition()
+
+    def append(self, data: bytes):
+        """Add bytes to the end of the queue."""
+        with self._buffer_lock:
+            self._buffer.extend(data)
+            self._buffer_lock.notify_all()
+
+    def pop(self, size: int = 1) -> bytes:
+        """Remove and return bytes from the beginning of queue."""
+        with self._buffer_lock:
+            data = self._buffer[:size]
+            del self._buffer[:size]
+            return data
+
+    def peek(self, size: int = 1) -> bytes:
+        """Get bytes from beginning of the queue without removing them."""
+        return self._buffer[:size]
+
+    def __len__(self) -> int:
+        """Get the length of the queue."""
+        return len(self._buffer)
+
+    def wait_for(self, size: int = 1, peek: bool = False) -> bytes:
+        """Wait until the requested number of bytes is available in the receive queue."""
+        if len(self._buffer) < size:
+            with self._buffer_lock:
+                self._buffer_lock.wait_for(lambda: len(self._buffer) >= size)
+
+        if peek:
+            return self.peek(size)
+
+        return self.pop(size)
+
+
+def _frame(payload_size: int) -> bytes:
+    return struct.pack(">L", 10 + payload_size) + b"\x00" * (10 + payload_size)
+
+
+def _split(data: bytes, read_size: int = 65536) -> list[bytes]:
+    return [data[index : index + read_size] for index in range(0, len(data), read_size)]
+
+
+def _receive(queue_type: type, chunks: list[bytes]) -> int:
+    """Feed the chunks like the connection does and consume all complete frames after each read.
+
+    Same access pattern as `HsmsProtocol._process_received_data`.
+    """
+    queue = queue_type()
+    frames = 0
+
+    for chunk in chunks:
+        queue.append(chunk)
+
+        while len(queue) > 3:
+            length = struct.unpack(">L", queue.wait_for(4, peek=True))[0] + 4
+            if len(queue) < length:
+                break
+
+            queue.wait_for(length)
+            frames += 1
+
+    return frames
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000, help="number of small frames in the burst")
+    parser.add_argument("--large", type=int, default=8 * 1024 * 1024, help="size of the large frames")
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs, the fastest is reported")
+    args = parser.parse_args()
+
+    scenarios = {
+        # burst of small frames queued in front of the first part of a large frame
+        "burst": _split(b"".join(_frame(20) for _ in range(args.frames)) + _frame(args.large)[: args.large // 2]),
+        # large frames, received in socket sized reads
+        "large": _split(_frame(args.large) * 4),
+    }
+
+    for scenario, chunks in scenarios.items():
+        for name, queue_type in (("legacy", LegacyByteQueue), ("ring", ByteQueue)):
+            timer = timeit.Timer(functools.partial(_receive, queue_type, chunks))
+            duration = min(timer.repeat(number=1, repeat=args.repeat))
+            frames = _receive(queue_type, chunks)
+            print(f"{scenario:>6} {name:>7}: {duration * 1000:9.2f} ms, {frames / duration:12.0f} frames/s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
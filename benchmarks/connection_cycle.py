@@ -0,0 +1,104 @@
+#####################################################################
+# connection_cycle.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Benchmark for the enable, connected, disable cycle of tcp connections.
+
+Measures the wall clock time of a full cycle of a server and a client connection on localhost, and the cpu time used
+by the process during the cycles.
+
+Run with `python benchmarks/connection_cycle.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import socket
+import statistics
+import threading
+import time
+
+import secsgem.common
+import secsgem.hsms
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _cycle(port: int, reactor: secsgem.common.Reactor | None) -> float:
+    server = secsgem.common.TcpServerConnection(
+        secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=port, reactor=reactor)
+    )
+    client = secsgem.common.TcpClientConnection(
+        secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE, port=port, reactor=reactor)
+    )
+
+    server_connected = threading.Event()
+    client_connected = threading.Event()
+    server_disconnected = threading.Event()
+
+    server.on_connected.register(lambda _: server_connected.set())
+    client.on_connected.register(lambda _: client_connected.set())
+    server.on_disconnected.register(lambda _: server_disconnected.set())
+
+    start = time.perf_counter()
+
+    server.enable()
+    client.enable()
+
+    if not server_connected.wait(10) or not client_connected.wait(10):
+        raise RuntimeError("connection not established")
+
+    client.disable()
+
+    if not server_disconnected.wait(10):
+        raise RuntimeError("disconnect not detected")
+
+    server.disable()
+
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=50, help="number of cycles")
+    parser.add_argument("--reactor", action="store_true", help="serve the connections with a shared reactor")
+    args = parser.parse_args()
+
+    reactor = secsgem.common.Reactor() if args.reactor else None
+
+    cpu_start = time.process_time()
+
+    durations = [_cycle(_free_port(), reactor) for _ in range(args.cycles)]
+
+    cpu_time = time.process_time() - cpu_start
+
+    if reactor is not None:
+        reactor.stop()
+
+    print(  # noqa: T201
+        f"{args.cycles} cycles: "
+        f"mean {statistics.mean(durations) * 1000:.2f} ms, "
+        f"median {statistics.median(durations) * 1000:.2f} ms, "
+        f"max {max(durations) * 1000:.2f} ms, "
+        f"cpu {cpu_time / args.cycles * 1000:.2f} ms/cycle"
+    )
+
+
+if __name__ == "__main__":
+    main()
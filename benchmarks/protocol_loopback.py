@@ -0,0 +1,142 @@
+#####################################################################
+# protocol_loopback.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Benchmark for request/response round trips of the protocols over tcp, unix sockets and in-memory loopback links.
+
+Transports:
+    tcp: host and equipment connected over localhost.
+    unix: host and equipment connected over a unix domain socket (hsms only).
+    loopback: host and equipment connected by a secsgem.common.LoopbackLink, without sockets.
+
+Run with `python benchmarks/protocol_loopback.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+import secsgem.common
+import secsgem.hsms
+import secsgem.secs
+import secsgem.secsitcp
+from secsgem.secs.functions import StreamsFunctions
+
+TRANSPORTS = ["tcp", "unix", "loopback"]
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _transport_settings(transport: str) -> dict:
+    if transport == "loopback":
+        return {"loopback": secsgem.common.LoopbackLink()}
+
+    if transport == "unix":
+        return {"socket_path": tempfile.mktemp(suffix=".sock"), "timeouts": secsgem.common.Timeouts(t5=0.5)}  # noqa: S306
+
+    return {"port": _free_port(), "timeouts": secsgem.common.Timeouts(t5=0.5)}
+
+
+def _hsms_protocols(transport: str):
+    settings = _transport_settings(transport)
+
+    host = secsgem.hsms.HsmsSettings(**settings).create_protocol(StreamsFunctions())
+    equipment = secsgem.hsms.HsmsSettings(
+        connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+        device_type=secsgem.common.DeviceType.EQUIPMENT,
+        **settings,
+    ).create_protocol(StreamsFunctions())
+
+    return host, equipment
+
+
+def _secsi_protocols(transport: str):
+    settings = _transport_settings(transport)
+
+    host = secsgem.secsitcp.SecsITcpSettings(**settings).create_protocol(StreamsFunctions())
+    equipment = secsgem.secsitcp.SecsITcpSettings(
+        connect_mode=secsgem.secsitcp.SecsITcpConnectMode.SERVER,
+        device_type=secsgem.common.DeviceType.EQUIPMENT,
+        **settings,
+    ).create_protocol(StreamsFunctions())
+
+    return host, equipment
+
+
+def _round_trips(protocols: tuple, count: int) -> list[float]:
+    host, equipment = protocols
+
+    equipment.events.message_received += lambda data: equipment.send_response(
+        secsgem.secs.functions.SecsS01F04([42]), data["message"].header.system
+    )
+
+    communicating = threading.Event()
+    host.events.communicating += lambda _: communicating.set()
+
+    equipment.enable()
+    host.enable()
+
+    try:
+        if not communicating.wait(10):
+            raise RuntimeError("not communicating")
+
+        durations = []
+        for _ in range(count):
+            start = time.perf_counter()
+            if host.send_and_waitfor_response(secsgem.secs.functions.SecsS01F03([1])) is None:
+                raise RuntimeError("no response received")
+            durations.append(time.perf_counter() - start)
+
+        return durations
+    finally:
+        host.disable()
+        equipment.disable()
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500, help="number of round trips per configuration")
+    parser.add_argument("--protocol", choices=["hsms", "secsi"], nargs="*", default=["hsms", "secsi"])
+    parser.add_argument("--transport", choices=TRANSPORTS, nargs="*", default=TRANSPORTS)
+    args = parser.parse_args()
+
+    factories = {"hsms": _hsms_protocols, "secsi": _secsi_protocols}
+
+    for protocol in args.protocol:
+        for transport in args.transport:
+            if protocol == "secsi" and transport == "unix":
+                continue
+
+            durations = _round_trips(factories[protocol](transport), args.count)
+
+            print(  # noqa: T201
+                f"{protocol:6} {transport:9} {args.count} round trips: "
+                f"mean {statistics.mean(durations) * 1000:.3f} ms, "
+                f"median {statistics.median(durations) * 1000:.3f} ms, "
+                f"p99 {sorted(durations)[int(len(durations) * 0.99) - 1] * 1000:.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#####################################################################
+# secsi_codec.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Benchmark for encoding and decoding SECS-I messages into blocks.
+
+Operations:
+    encode: split the message into blocks and encode each block, like sending.
+    decode: decode each encoded block and join the data, like receiving.
+
+Run with `python benchmarks/secsi_codec.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import secsgem.secsi
+from secsgem.secsi.message import SecsIBlock, SecsIMessage
+
+SIZES = {"1KB": 1024, "100KB": 100 * 1024, "1MB": 1024 * 1024}
+
+
+def _measure(function, repeat: int) -> float:
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="number of runs per size, the best run is reported")
+    parser.add_argument("--size", choices=list(SIZES), nargs="*", default=list(SIZES))
+    args = parser.parse_args()
+
+    header = secsgem.secsi.SecsIHeader(1, 0, 6, 11, require_response=True)
+
+    for name in args.size:
+        data = bytes(range(256)) * (SIZES[name] // 256)
+        encoded = [block.encode() for block in SecsIMessage(header, data).blocks]
+
+        def encode(data=data):
+            for block in SecsIMessage(header, data).blocks:
+                block.encode_parts()
+
+        def decode(encoded=encoded):
+            blocks = [SecsIBlock.decode(block) for block in encoded]
+            return b"".join(block.data for block in blocks)  # type: ignore[union-attr]
+
+        for operation, function in (("encode", encode), ("decode", decode)):
+            duration = _measure(function, args.repeat)
+
+            print(  # noqa: T201
+                f"{operation} {name:5} in {len(encoded):4} blocks: "
+                f"{duration * 1000:8.3f} ms, {len(data) / duration / 1024 / 1024:7.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#####################################################################
+# secsi_pty.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Benchmark for SECS-I over a serial line, emulated by two linux pty pairs.
+
+The master ends of the pty pairs are connected by a relay thread, like a null modem cable.
+Host and equipment open the slave ends with the regular serial connection.
+
+Scenarios:
+    latency: round trip of a single block request and response.
+    throughput: multi block requests, reported as payload bytes per second.
+
+Run with `python benchmarks/secsi_pty.py` (linux only).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import select
+import statistics
+import threading
+import time
+import tty
+
+import secsgem.common
+import secsgem.secs
+import secsgem.secsi
+from secsgem.secs.functions import StreamsFunctions
+
+
+class NullModem:
+    """Two pty pairs with the master ends connected to each other."""
+
+    def __init__(self) -> None:
+        """Create the pty pairs."""
+        self._masters = []
+        self._slaves = []
+        self.ports = []
+
+        for _ in range(2):
+            master, slave = os.openpty()
+            tty.setraw(slave)
+            self._masters.append(master)
+            self._slaves.append(slave)
+            self.ports.append(os.ttyname(slave))
+
+        self._stop_read, self._stop_write = os.pipe()
+        self._thread = threading.Thread(target=self._relay, daemon=True)
+
+    def __enter__(self) -> NullModem:
+        """Start relaying."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Stop relaying and close the pty pairs."""
+        os.write(self._stop_write, b"\x00")
+        self._thread.join()
+
+        for fd in [*self._masters, *self._slaves, self._stop_read, self._stop_write]:
+            os.close(fd)
+
+    def _relay(self):
+        peers = {self._masters[0]: self._masters[1], self._masters[1]: self._masters[0]}
+
+        while True:
+            readable, _, _ = select.select([*peers, self._stop_read], [], [])
+
+            if self._stop_read in readable:
+                return
+
+            for fd in readable:
+                os.write(peers[fd], os.read(fd, 4096))
+
+
+def _protocols(ports: list[str], speed: int, timeouts: secsgem.common.Timeouts):
+    host = secsgem.secsi.SecsISettings(port=ports[0], speed=speed, timeouts=timeouts).create_protocol(
+        StreamsFunctions()
+    )
+    equipment = secsgem.secsi.SecsISettings(
+        port=ports[1],
+        speed=speed,
+        timeouts=timeouts,
+        device_type=secsgem.common.DeviceType.EQUIPMENT,
+    ).create_protocol(StreamsFunctions())
+
+    equipment.events.message_received += lambda data: equipment.send_response(
+        secsgem.secs.functions.SecsS01F04([42]), data["message"].header.system
+    )
+
+    return host, equipment
+
+
+def _run(host, count: int, values: list[int]) -> list[float]:
+    durations = []
+
+    for _ in range(count):
+        start = time.perf_counter()
+        if host.send_and_waitfor_response(secsgem.secs.functions.SecsS01F03(values)) is None:
+            raise RuntimeError("no response received")
+        durations.append(time.perf_counter() - start)
+
+    return durations
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200, help="number of requests per scenario")
+    parser.add_argument("--speed", type=int, default=115200, help="baud rate set on the pty")
+    parser.add_argument("--values", type=int, default=2000, help="number of values in throughput requests")
+    args = parser.parse_args()
+
+    timeouts = secsgem.common.Timeouts(t1=0.5, t2=2.0)
+
+    with NullModem() as null_modem:
+        host, equipment = _protocols(null_modem.ports, args.speed, timeouts)
+
+        equipment.enable()
+        host.enable()
+
+        try:
+            durations = _run(host, args.count, [1])
+            print(  # noqa: T201
+                f"latency    {args.count} round trips: "
+                f"mean {statistics.mean(durations) * 1000:.3f} ms, "
+                f"median {statistics.median(durations) * 1000:.3f} ms, "
+                f"p99 {sorted(durations)[int(len(durations) * 0.99) - 1] * 1000:.3f} ms"
+            )
+
+            values = list(range(args.values))
+            size = len(secsgem.secs.functions.SecsS01F03(values).encode())
+            blocks = -(-size // secsgem.secsi.SecsIProtocol.block_size)
+
+            durations = _run(host, args.count, values)
+            print(  # noqa: T201
+                f"throughput {args.count} requests of {size} bytes in {blocks} blocks: "
+                f"{size * args.count / sum(durations) / 1024:.1f} KiB/s, "
+                f"{blocks * args.count / sum(durations):.0f} blocks/s"
+            )
+        finally:
+            host.disable()
+            equipment.disable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#####################################################################
+# tcp_latency.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Benchmark for request/response round trips with different tcp options.
+
+Scenarios:
+    protocol: S1F1/S1F2 round trips between two hsms protocols on localhost.
+    split: round trips with a remote writing the length and header of the reply separately from the data, as some
+        equipment does. The reply is held back by Nagle's algorithm until the request was acknowledged, which the
+        receiver delays.
+
+Run with `python benchmarks/tcp_latency.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import socket
+import statistics
+import struct
+import threading
+import time
+
+import secsgem.common
+import secsgem.hsms
+import secsgem.secs
+from secsgem.secs.functions import StreamsFunctions
+
+CONFIGURATIONS = {
+    "nagle": {"tcp_nodelay": False},
+    "nodelay": {"tcp_nodelay": True},
+    "nodelay+quickack": {"tcp_nodelay": True, "tcp_quickack": True},
+}
+
+REPLY_DATA = b"\x01\x02\x41\x04MDLN\x41\x07SOFTREV"
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _protocol_round_trips(count: int, options: dict) -> list[float]:
+    port = _free_port()
+    options = {**options, "timeouts": secsgem.common.Timeouts(t5=0.5)}
+    passive = secsgem.hsms.HsmsProtocol(
+        secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=port, **options),
+        StreamsFunctions(),
+    )
+    active = secsgem.hsms.HsmsProtocol(
+        secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE, port=port, **options),
+        StreamsFunctions(),
+    )
+
+    passive.events.message_received += lambda data: passive.send_response(
+        secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]), data["message"].header.system
+    )
+
+    selected = threading.Event()
+    active.events.communicating += lambda _: selected.set()
+
+    passive.enable()
+    active.enable()
+
+    try:
+        if not selected.wait(10):
+            raise RuntimeError("connection not selected")
+
+        durations = []
+        for _ in range(count):
+            start = time.perf_counter()
+            if active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01()) is None:
+                raise RuntimeError("no response received")
+            durations.append(time.perf_counter() - start)
+
+        return durations
+    finally:
+        active.disable()
+        passive.disable()
+
+
+def _split_remote(server_sock: socket.socket, count: int, options: dict):
+    """Reply to each request, writing length and header before the data."""
+    sock, _ = server_sock.accept()
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(options.get("tcp_nodelay", False)))
+
+    with sock:
+        for _ in range(count):
+            request = sock.recv(14)
+            if len(request) < 14:
+                return
+
+            header = request[4:]
+
+            sock.sendall(struct.pack(">L", 10 + len(REPLY_DATA)) + header[:2] + bytes([1, 2]) + header[4:])
+            sock.sendall(REPLY_DATA)
+
+
+def _split_round_trips(count: int, options: dict) -> list[float]:
+    server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_sock.bind(("127.0.0.1", 0))
+    server_sock.listen(1)
+
+    remote = threading.Thread(target=_split_remote, args=(server_sock, count, options), daemon=True)
+    remote.start()
+
+    tcp_options = secsgem.hsms.HsmsSettings(**options).tcp_options
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        tcp_options.apply(sock)
+        sock.connect(server_sock.getsockname())
+
+        durations = []
+        for system in range(count):
+            start = time.perf_counter()
+
+            header = secsgem.hsms.HsmsStreamFunctionHeader(system, 1, 1, True, 0)
+            sock.sendall(secsgem.hsms.HsmsBlock(header, b"").encode())
+
+            expected = 4 + 10 + len(REPLY_DATA)
+            received = 0
+            while received < expected:
+                received += len(sock.recv(expected - received))
+
+                if tcp_options.quickack:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+            durations.append(time.perf_counter() - start)
+
+    remote.join()
+    server_sock.close()
+
+    return durations
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200, help="number of round trips per configuration")
+    parser.add_argument("--scenario", choices=["protocol", "split"], nargs="*", default=["protocol", "split"])
+    args = parser.parse_args()
+
+    scenarios = {"protocol": _protocol_round_trips, "split": _split_round_trips}
+
+    for scenario in args.scenario:
+        for name, options in CONFIGURATIONS.items():
+            durations = scenarios[scenario](args.count, options)
+
+            print(  # noqa: T201
+                f"{scenario:8} {name:16} {args.count} round trips: "
+                f"mean {statistics.mean(durations) * 1000:.3f} ms, "
+                f"median {statistics.median(durations) * 1000:.3f} ms, "
+                f"p99 {sorted(durations)[int(len(durations) * 0.99) - 1] * 1000:.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -20,17 +20,30 @@ from .byte_queue import ByteQueue
 from .callbacks import CallbackHandler
 from .connection import Connection
 from .events import EventProducer
+from .file_payload import FilePayload
 from .header import Header
 from .helpers import format_hex, function_name, indent_block, is_errorcode_ewouldblock, is_windows
+from .loopback_connection import LoopbackConnection, LoopbackLink
 from .message import Block, Message
+from .message_assembler import AssemblerStatistics, MessageAssembler
 from .protocol import Protocol
-from .protocol_dispatcher import ProtocolDispatcher
+from .protocol_dispatcher import DispatchWorkerStatistics, ProtocolDispatcher, default_dispatch_key
+from .rate_limiter import RateLimiter
+from .reactor import Reactor
+from .reconnect import ReconnectStatistics, reconnect_delay
+from .send_queue import SendPriority, SendQueue, SendQueueStatistics
 from .serial_connection import SerialConnection
 from .settings import DeviceType, Setting, Settings
 from .state_machine import State, StateMachine, Transition, UnknownTransitionError, WrongSourceStateError
+from .tcp_accepted_connection import TcpAcceptedConnection
 from .tcp_client_connection import TcpClientConnection
+from .tcp_options import TcpOptions
 from .tcp_server_connection import TcpServerConnection
 from .timeouts import Timeouts
+from .timer_wheel import TimerWheel, WheelTimer
+from .transactions import TransactionTable
+from .unix_client_connection import UnixClientConnection
+from .unix_server_connection import UnixServerConnection
 
 __all__ = [
     "BlockSendInfo",
@@ -39,15 +52,29 @@ __all__ = [
     "Connection",
     "EventProducer",
     "Header",
+    "FilePayload",
     "format_hex",
     "function_name",
     "indent_block",
     "is_windows",
     "is_errorcode_ewouldblock",
+    "LoopbackConnection",
+    "LoopbackLink",
     "Message",
+    "MessageAssembler",
+    "AssemblerStatistics",
     "Block",
     "Protocol",
     "ProtocolDispatcher",
+    "DispatchWorkerStatistics",
+    "default_dispatch_key",
+    "RateLimiter",
+    "Reactor",
+    "ReconnectStatistics",
+    "reconnect_delay",
+    "SendPriority",
+    "SendQueue",
+    "SendQueueStatistics",
     "SerialConnection",
     "Settings",
     "Setting",
@@ -57,7 +84,14 @@ __all__ = [
     "Transition",
     "UnknownTransitionError",
     "WrongSourceStateError",
+    "TcpAcceptedConnection",
     "TcpClientConnection",
+    "TcpOptions",
     "TcpServerConnection",
     "Timeouts",
+    "TimerWheel",
+    "WheelTimer",
+    "TransactionTable",
+    "UnixClientConnection",
+    "UnixServerConnection",
 ]
@@ -19,6 +19,9 @@ from __future__ import annotations
 
 import enum
 import threading
+import typing
+
+from .send_queue import SendPriority
 
 
 class BlockSendResult(enum.Enum):
@@ -32,22 +35,67 @@ class BlockSendResult(enum.Enum):
 class BlockSendInfo:
     """Container for sending block and waiting for result."""
 
-    def __init__(self, data: bytes):
+    def __init__(
+        self,
+        data: bytes | typing.Sequence[bytes | memoryview],
+        on_resolved: typing.Callable[[bool], None] | None = None,
+        priority: SendPriority = SendPriority.REQUEST,
+        starts_message: bool = True,
+    ):
         """Initialize block send info object.
 
         Args:
-            data: data to send.
+            data: data to send, either as bytes or as list of buffers (see :meth:`secsgem.common.Block.encode_parts`).
+            on_resolved: called with the result by the thread resolving the block
+            priority: lane of the send queue
+            starts_message: True for the first block of a message, counted by the message rate limit
 
         """
-        self._data = data
+        self._parts = [data] if isinstance(data, (bytes, bytearray, memoryview)) else list(data)
 
         self._result = BlockSendResult.NOT_SENT
         self._result_trigger = threading.Event()
+        self._on_resolved = on_resolved
+        self._aborted = False
+        self._priority = priority
+        self._starts_message = starts_message
 
     @property
     def data(self) -> bytes:
         """Get the data for sending."""
-        return self._data
+        if len(self._parts) == 1:
+            return bytes(self._parts[0])
+
+        return b"".join(self._parts)
+
+    @property
+    def parts(self) -> list[bytes | memoryview]:
+        """Get the data for sending as list of buffers."""
+        return self._parts
+
+    @property
+    def priority(self) -> SendPriority:
+        """Get the lane of the send queue."""
+        return self._priority
+
+    @property
+    def size(self) -> int:
+        """Get the number of bytes to send."""
+        return sum(len(part) for part in self._parts)
+
+    @property
+    def starts_message(self) -> bool:
+        """Check if this is the first block of a message."""
+        return self._starts_message
+
+    @property
+    def aborted(self) -> bool:
+        """Check if the block is resolved with False instead of being sent."""
+        return self._aborted
+
+    def abort(self):
+        """Skip sending the block, e.g. after a previous block of the same message failed."""
+        self._aborted = True
 
     def resolve(self, result: bool):
         """Resolve the send data with a result.
@@ -59,6 +107,9 @@ class BlockSendInfo:
         self._result = BlockSendResult.SENT_OK if result else BlockSendResult.SENT_ERROR
         self._result_trigger.set()
 
+        if self._on_resolved is not None:
+            self._on_resolved(result)
+
     def wait(self) -> bool:
         """Wait for the message is sent and a result is available."""
         self._result_trigger.wait()
@@ -17,16 +17,37 @@
 
 from __future__ import annotations
 
+import collections
 import threading
 
 
 class ByteQueue:
-    """FIFO class for queuing and retrieving bytes."""
+    """FIFO class for queuing and retrieving bytes.
+
+    The received data is kept as a list of chunks, consumed bytes are skipped by moving a read offset into the
+    first chunk. Removing data from the beginning of the queue therefore doesn't move the remaining bytes, and
+    peeking returns a :class:`memoryview` on the queued data without copying it.
+
+    Example:
+        >>> queue = ByteQueue()
+        >>> queue.append(b"te")
+        >>> queue.append(b"st")
+        >>> bytes(queue.peek(3))
+        b'tes'
+        >>> queue.pop(3)
+        b'tes'
+        >>> len(queue)
+        1
+
+    """
 
     def __init__(self) -> None:
         """Initialize the queue."""
-        self._buffer = bytearray()
-        self._buffer_lock = threading.Condition()
+        self._chunks: collections.deque[bytes] = collections.deque()
+        self._offset = 0
+        self._length = 0
+        self._lock = threading.Lock()
+        self._buffer_lock = threading.Condition(self._lock)
 
     def append(self, data: bytes):
         """Add bytes to the end of the queue.
@@ -35,10 +56,40 @@ class ByteQueue:
             data: bytes to add
 
         """
+        if not data:
+            return
+
+        # the data is kept as is, so mutable buffers have to be copied
+        if not isinstance(data, bytes):
+            data = bytes(data)
+
         with self._buffer_lock:
-            self._buffer.extend(data)
+            self._chunks.append(data)
+            self._length += len(data)
             self._buffer_lock.notify_all()
 
+    def _coalesce(self, size: int):
+        """Merge the first chunks until the first chunk holds at least `size` bytes.
+
+        The lock must be held by the caller.
+
+        Args:
+            size: number of bytes required in the first chunk
+
+        """
+        size = min(size, self._length)
+
+        parts = [self._chunks.popleft()[self._offset :]]
+        collected = len(parts[0])
+
+        while collected < size:
+            chunk = self._chunks.popleft()
+            parts.append(chunk)
+            collected += len(chunk)
+
+        self._chunks.appendleft(b"".join(parts))
+        self._offset = 0
+
     def pop(self, size: int = 1) -> bytes:
         """Remove and return bytes from the beginning of queue.
 
@@ -49,10 +100,32 @@ class ByteQueue:
             removed bytes
 
         """
-        with self._buffer_lock:
-            data = self._buffer[:size]
-            del self._buffer[:size]
-            return data
+        with self._lock:
+            # plain comparison instead of min(), this is called for every received block
+            if size > self._length:  # pylint: disable=consider-using-min-builtin
+                size = self._length
+
+            if size <= 0:
+                return b""
+
+            chunk = self._chunks[0]
+            start = self._offset
+            end = start + size
+
+            if end > len(chunk):
+                self._coalesce(size)
+                chunk = self._chunks[0]
+                start = 0
+                end = size
+
+            self._length -= size
+            if end == len(chunk):
+                self._chunks.popleft()
+                self._offset = 0
+            else:
+                self._offset = end
+
+            return chunk[start:end]
 
     def pop_byte(self) -> int:
         """Remove and return single byte from the beginning of queue.
@@ -61,14 +134,26 @@ class ByteQueue:
             removed byte
 
         """
-        with self._buffer_lock:
-            data = self._buffer[0]
-            del self._buffer[0]
+        with self._lock:
+            if self._length == 0:
+                raise IndexError("pop from empty queue")
+
+            chunk = self._chunks[0]
+            data = chunk[self._offset]
+
+            self._length -= 1
+            self._offset += 1
+            if self._offset == len(chunk):
+                self._chunks.popleft()
+                self._offset = 0
+
             return data
 
-    def peek(self, size: int = 1) -> bytes:
+    def peek(self, size: int = 1) -> memoryview:
         """Get bytes from beginning of the queue without removing them.
 
+        The returned view stays valid after the bytes are removed from the queue.
+
         Args:
             size: number of bytes to peek
 
@@ -76,7 +161,19 @@ class ByteQueue:
             peek bytes
 
         """
-        return self._buffer[:size]
+        # fast path, data is only removed by the reading thread, so the first chunk can't change while peeking
+        offset = self._offset
+        if self._chunks and offset + size <= len(self._chunks[0]):
+            return memoryview(self._chunks[0])[offset : offset + size]
+
+        with self._lock:
+            size = min(size, self._length)
+            if size <= 0:
+                return memoryview(b"")
+
+            self._coalesce(size)
+
+            return memoryview(self._chunks[0])[:size]
 
     def peek_byte(self, position: int = 0) -> int:
         """Get single byte in the buffer without removing.
@@ -88,12 +185,25 @@ class ByteQueue:
             peek bytes
 
         """
-        return self._buffer[position]
+        with self._buffer_lock:
+            if not 0 <= position < self._length:
+                raise IndexError("queue index out of range")
+
+            position += self._offset
+            for chunk in self._chunks:
+                if position < len(chunk):
+                    return chunk[position]
+
+                position -= len(chunk)
+
+        raise IndexError("queue index out of range")
 
     def clear(self):
         """Clear the bytes in the queue."""
         with self._buffer_lock:
-            self._buffer.clear()
+            self._chunks.clear()
+            self._offset = 0
+            self._length = 0
 
     def __len__(self) -> int:
         """Get the length of the queue.
@@ -102,26 +212,22 @@ class ByteQueue:
             queue length
 
         """
-        return len(self._buffer)
+        return self._length
 
-    def wait_for(self, size: int = 1, peek: bool = False) -> bytes:
+    def wait_for(self, size: int = 1, peek: bool = False) -> bytes | memoryview:
         """Wait until the requested number of bytes is available in the receive queue.
 
         Args:
             size: number of bytes
-            peek: only look, don't remove the item from the queue.
+            peek: only look, don't remove the item from the queue, a memoryview is returned in this case.
 
         Returns:
             Found bytes
 
         """
-
-        def min_size() -> bool:
-            return len(self._buffer) >= size
-
-        if len(self._buffer) < size:
+        if self._length < size:
             with self._buffer_lock:
-                self._buffer_lock.wait_for(min_size)
+                self._buffer_lock.wait_for(lambda: self._length >= size)
 
         if peek:
             return self.peek(size)
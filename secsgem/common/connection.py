@@ -15,10 +15,15 @@
 #####################################################################
 """Connection base function."""
 
+from __future__ import annotations
+
 import abc
+import typing
 
 from .events import Event
-from .settings import Settings
+
+if typing.TYPE_CHECKING:
+    from .settings import Settings
 
 
 class Connection(abc.ABC):
@@ -120,3 +125,17 @@ class Connection(abc.ABC):
 
         """
         raise NotImplementedError("Connection.send_data missing implementation")
+
+    def send_buffers(self, buffers: typing.Sequence[bytes | memoryview]) -> bool:
+        """Send a list of buffers to the remote host, as if they were concatenated.
+
+        Connections supporting gather writes override this to avoid joining the buffers.
+
+        Args:
+            buffers: encoded data.
+
+        Returns:
+            True if succeeded, False if failed
+
+        """
+        return self.send_data(b"".join(buffers))
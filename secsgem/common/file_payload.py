@@ -0,0 +1,118 @@
+#####################################################################
+# file_payload.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Message payload stored in a memory-mapped file."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+
+
+class FilePayload:
+    """Payload of a large message, backed by a memory-mapped file instead of memory.
+
+    Received payloads are written to an anonymous temporary file, which is removed by the operating system when the
+    last view on the payload is released. Payloads to send can be mapped from an existing file, the blocks reference
+    the mapped file and the pages are read while sending.
+
+    Example:
+        >>> payload = FilePayload(4)
+        >>> payload.write(b"da")
+        2
+        >>> payload.write(b"tax")
+        2
+        >>> payload.remaining
+        0
+        >>> bytes(payload.view)
+        b'data'
+
+    """
+
+    def __init__(self, size: int, directory: str | None = None, *, mapping: mmap.mmap | None = None) -> None:
+        """Create a payload in a temporary file.
+
+        Args:
+            size: size of the payload in bytes
+            directory: directory for the temporary file, the default temporary directory if not set
+            mapping: mapped file holding the complete payload, used instead of a temporary file
+
+        """
+        self._mmap = mapping if mapping is not None else self._map_temporary_file(size, directory)
+        self._size = size
+        self._offset = size if mapping is not None else 0
+
+    @staticmethod
+    def _map_temporary_file(size: int, directory: str | None) -> mmap.mmap:
+        # empty files can't be mapped
+        if size == 0:
+            return mmap.mmap(-1, 1)
+
+        # the mapping keeps its own handle, the file is removed when the mapping is released
+        with tempfile.TemporaryFile(dir=directory) as file:
+            file.truncate(size)
+            return mmap.mmap(file.fileno(), size)
+
+    @classmethod
+    def from_file(cls, path: str) -> FilePayload:
+        """Map an existing file as payload, to send its content without reading it into memory.
+
+        Args:
+            path: path of the file containing the encoded message data
+
+        Returns:
+            read-only payload of the file content
+
+        """
+        with open(path, "rb") as file:  # noqa: PTH123
+            # empty files can't be mapped
+            if os.fstat(file.fileno()).st_size == 0:
+                return cls(0)
+
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(len(mapping), mapping=mapping)
+
+    @property
+    def size(self) -> int:
+        """Get the size of the payload in bytes."""
+        return self._size
+
+    @property
+    def remaining(self) -> int:
+        """Get the number of bytes still to write."""
+        return self._size - self._offset
+
+    @property
+    def view(self) -> memoryview:
+        """Get the payload data."""
+        return memoryview(self._mmap)[: self._offset]
+
+    def write(self, data: bytes | memoryview) -> int:
+        """Append data to the payload.
+
+        Args:
+            data: data to append, data exceeding the payload size is not written
+
+        Returns:
+            number of written bytes
+
+        """
+        size = min(len(data), self._size - self._offset)
+        self._mmap[self._offset : self._offset + size] = data[:size]
+        self._offset += size
+
+        return size
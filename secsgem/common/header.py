@@ -72,6 +72,16 @@ class Header(abc.ABC):
         """Get require response flag."""
         return self._require_response
 
+    @property
+    def last_block(self) -> bool:
+        """Get last block flag, always set for protocols not splitting messages into blocks."""
+        return True
+
+    @property
+    def is_control(self) -> bool:
+        """Check if the header belongs to a control message of the protocol, never for protocols without them."""
+        return False
+
     @abc.abstractmethod
     def encode(self) -> bytes:
         """Encode header to message.
@@ -16,6 +16,8 @@
 """Contains helper functions."""
 
 import errno
+import select
+import socket
 import sys
 import types
 
@@ -111,3 +113,24 @@ def is_errorcode_ewouldblock(errorcode: int) -> bool:
         return True
 
     return False
+
+
+def wait_for_writable(sock: socket.socket, timeout: float) -> bool:
+    """Wait until a socket is writable.
+
+    Uses poll where available, so the file descriptor number is not limited to FD_SETSIZE like with select.
+
+    Args:
+        sock: socket to wait for
+        timeout: maximum number of seconds to wait
+
+    Returns:
+        True if the socket is writable
+
+    """
+    if hasattr(select, "poll"):
+        poller = select.poll()
+        poller.register(sock, select.POLLOUT)
+        return len(poller.poll(timeout * 1000)) > 0
+
+    return len(select.select([], [sock], [], timeout)[1]) > 0
@@ -0,0 +1,219 @@
+#####################################################################
+# loopback_connection.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""In-memory connection pair for host and equipment in the same process."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import typing
+
+from .connection import Connection
+
+if typing.TYPE_CHECKING:
+    from .settings import Settings
+
+
+class LoopbackLink:
+    """In-memory link between two loopback connections.
+
+    The link is shared by the settings of both ends.
+    It is established when both connections are enabled, and separated when one of them is disabled.
+
+    Example:
+        >>> import secsgem.common
+        >>> import secsgem.hsms
+        >>>
+        >>> link = secsgem.common.LoopbackLink()
+        >>> host_settings = secsgem.hsms.HsmsSettings(loopback=link)
+        >>> equipment_settings = secsgem.hsms.HsmsSettings(
+        ...     connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+        ...     device_type=secsgem.common.DeviceType.EQUIPMENT,
+        ...     loopback=link,
+        ... )
+        >>> host_settings.create_connection()
+        LoopbackConnection (not connected)
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize a loopback link."""
+        self._lock = threading.Lock()
+        self._enabled: list[LoopbackConnection] = []
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} ({len(self._enabled)} of 2 ends enabled)"
+
+    def _enable(self, connection: LoopbackConnection):
+        with self._lock:
+            if connection in self._enabled:
+                return
+
+            if len(self._enabled) >= 2:
+                raise ValueError(f"{self} is already used by two connections")
+
+            self._enabled.append(connection)
+
+            if len(self._enabled) < 2:
+                return
+
+            first, second = self._enabled
+            first._peer = second  # noqa: SLF001
+            second._peer = first  # noqa: SLF001
+
+        first._link_established()  # noqa: SLF001
+        second._link_established()  # noqa: SLF001
+
+    def _disable(self, connection: LoopbackConnection):
+        with self._lock:
+            if connection not in self._enabled:
+                return
+
+            self._enabled.remove(connection)
+
+            peer = connection._peer  # noqa: SLF001
+            if peer is None:
+                return
+
+        # still linked, so messages sent before separating (like separate requests) reach the other end
+        connection._link_disconnecting()  # noqa: SLF001
+
+        with self._lock:
+            connection._peer = None  # noqa: SLF001
+            peer._peer = None  # noqa: SLF001
+
+        connection._link_separated()  # noqa: SLF001
+        peer._link_separated()  # noqa: SLF001
+
+
+class LoopbackConnection(Connection):
+    """Connection passing the encoded data straight to the other end of a :class:`LoopbackLink`.
+
+    Data is handed over in the thread of the sender, without socket and byte stream logging.
+    Data sent before the other end handled its connected event is held back until it did.
+    """
+
+    def __init__(self, settings: Settings, link: LoopbackLink) -> None:
+        """Initialize a loopback connection.
+
+        Args:
+            settings: protocol and communication settings
+            link: link to the other end
+
+        """
+        super().__init__(settings)
+
+        self._link = link
+        self._peer: LoopbackConnection | None = None
+
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        # received data is passed on in order, and only after the connected event was handled
+        self._receive_lock = threading.RLock()
+        self._ready = False
+        self._pending: list[bytes] = []
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} ({'connected' if self._connected else 'not connected'})"
+
+    @property
+    def link(self) -> LoopbackLink:
+        """Get the link this connection is using."""
+        return self._link
+
+    def enable(self):
+        """Enable the connection.
+
+        The link is established when the other end is enabled as well.
+        """
+        self._link._enable(self)  # noqa: SLF001
+
+    def disable(self):
+        """Disable the connection.
+
+        Separates the link, the other end stays enabled and waits for this end to be enabled again.
+        """
+        self._link._disable(self)  # noqa: SLF001
+
+    def send_data(self, data: bytes) -> bool:
+        """Send data to the remote host.
+
+        Args:
+            data: encoded data.
+
+        Returns:
+            True if succeeded, False if failed
+
+        """
+        peer = self._peer
+        if peer is None or not self._connected:
+            return False
+
+        peer._deliver(data)  # noqa: SLF001
+
+        return True
+
+    def _deliver(self, data: bytes):
+        with self._receive_lock:
+            if not self._ready:
+                self._pending.append(data)
+                return
+
+            self._fire_data(data)
+
+    def _fire_data(self, data: bytes):
+        try:
+            self.on_data({"source": self, "data": data})
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("ignoring exception for on_data handler")
+
+    def _link_established(self):
+        self._connected = True
+
+        try:
+            self.on_connected({"source": self})
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("ignoring exception for on_connected handler")
+
+        with self._receive_lock:
+            for data in self._pending:
+                self._fire_data(data)
+
+            self._pending.clear()
+            self._ready = True
+
+    def _link_disconnecting(self):
+        self._disconnecting = True
+
+        try:
+            self.on_disconnecting({"source": self})
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("ignoring exception for on_disconnecting handler")
+
+    def _link_separated(self):
+        with self._receive_lock:
+            self._ready = False
+            self._pending.clear()
+
+        self._connected = False
+        self._disconnecting = False
+
+        try:
+            self.on_disconnected({"source": self})
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("ignoring exception for on_disconnected handler")
@@ -37,12 +37,25 @@ class Block(abc.ABC, typing.Generic[BlockHeaderT]):
     length_format: str
     checksum_format: str
 
-    def __init__(self, header: BlockHeaderT, data: bytes):
+    _length_struct: struct.Struct
+    _checksum_struct: struct.Struct | None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Compile the length and checksum formats of a block type once."""
+        super().__init_subclass__(**kwargs)
+
+        if "length_format" in cls.__dict__:
+            cls._length_struct = struct.Struct(f">{cls.length_format}")
+
+        if "checksum_format" in cls.__dict__:
+            cls._checksum_struct = struct.Struct(f">{cls.checksum_format}") if cls.checksum_format != "" else None
+
+    def __init__(self, header: BlockHeaderT, data: bytes | memoryview):
         """Initialize a block header.
 
         Args:
             header: block header
-            data: block data
+            data: block data, a memoryview is used without copying
 
         """
         self._header = header
@@ -54,22 +67,18 @@ class Block(abc.ABC, typing.Generic[BlockHeaderT]):
         return self._header
 
     @property
-    def data(self) -> bytes:
+    def data(self) -> bytes | memoryview:
         """Get the data."""
         return self._data
 
     @property
     def checksum(self) -> int:
         """Get the checksum."""
-        if self.checksum_format == "":
+        if self._checksum_struct is None:
             return 0
 
-        calculated_checksum = 0
-
-        for data_byte in self.header.encode() + self.data:
-            calculated_checksum += data_byte
-
-        return calculated_checksum
+        # iterating bytes is faster than iterating a memoryview, blocks with checksum are small
+        return sum(self.header.encode()) + sum(bytes(self.data))
 
     def encode(self) -> bytes:
         """Encode block data.
@@ -78,24 +87,31 @@ class Block(abc.ABC, typing.Generic[BlockHeaderT]):
             byte-encoded block
 
         """
-        data_length = len(self.data)
+        return b"".join(self.encode_parts())
 
-        struct_args: tuple = (
-            self.header.length + data_length,
-            self.header.encode(),
-            self.data,
-        )
+    def encode_parts(self) -> list[bytes | memoryview]:
+        """Encode block data as separate buffers, without copying the data.
 
-        if self.checksum_format != "":
-            struct_args += (self.checksum,)
+        The buffers can be passed to a gather write (like `socket.sendmsg`) as is.
 
-        return struct.pack(
-            f">{self.length_format}{self.header.length}s{data_length}s{self.checksum_format}",
-            *struct_args,
-        )
+        Returns:
+            length and header, data and optional checksum buffers
+
+        """
+        header = self.header.encode()
+
+        parts: list[bytes | memoryview] = [
+            self._length_struct.pack(len(header) + len(self.data)) + header,
+            memoryview(self.data),
+        ]
+
+        if self._checksum_struct is not None:
+            parts.append(self._checksum_struct.pack(self.checksum))
+
+        return parts
 
     @classmethod
-    def decode(cls: type[BlockT], data: bytes) -> BlockT | None:
+    def decode(cls: type[BlockT], data: bytes | memoryview) -> BlockT | None:
         """Decode byte array hsms packet to HsmsPacket object.
 
         Args:
@@ -105,19 +121,24 @@ class Block(abc.ABC, typing.Generic[BlockHeaderT]):
             received packet object
 
         """
-        data_length = struct.unpack_from(f">{cls.length_format}", data)[0] - cls.header_type.length
+        start = cls._length_struct.size
+        end = start + cls._length_struct.unpack_from(data)[0]
+        data_start = start + cls.header_type.length
+        checksum_size = cls._checksum_struct.size if cls._checksum_struct is not None else 0
 
-        data_fields = struct.unpack(
-            f">{cls.length_format}{cls.header_type.length}s{data_length}s{cls.checksum_format}",
-            data,
-        )
+        if len(data) != end + checksum_size:
+            raise struct.error(f"invalid block size {len(data)}, expected {end + checksum_size}")
 
-        header = cls.header_type.decode(data_fields[1])
+        header = cls.header_type.decode(data[start:data_start])
 
-        obj = cls(header, data_fields[2])
+        obj = cls(header, bytes(data[data_start:end]))
 
-        if cls.checksum_format != "" and obj.checksum != data_fields[3]:
-            return None
+        # header and data are summed from the received bytes, without encoding the header again
+        if cls._checksum_struct is not None:
+            (checksum,) = cls._checksum_struct.unpack_from(data, end)
+
+            if sum(bytes(data[start:end])) != checksum:
+                return None
 
         return obj
 
@@ -128,22 +149,25 @@ class Message(abc.ABC, typing.Generic[BlockT]):
     block_size = -1
     block_type: type[BlockT]
 
-    def __init__(self, header: BlockHeaderT, data: bytes):
+    def __init__(self, header: BlockHeaderT, data: bytes | memoryview, *, blocks: list[BlockT] | None = None):
         """Initialize a Message object.
 
         Args:
             header: header used for this message
             data: data part used for streams and functions (SType 0)
+            blocks: received blocks of the message, kept instead of splitting the data into new blocks
 
         """
-        self._blocks: list[BlockT] = self._split_blocks(data, header)
+        self._blocks: list[BlockT] = list(blocks) if blocks is not None else self._split_blocks(data, header)
 
     @classmethod
-    def _split_blocks(cls, data: bytes, header: BlockHeaderT) -> list[BlockT]:
+    def _split_blocks(cls, data: bytes | memoryview, header: BlockHeaderT) -> list[BlockT]:
         if cls.block_size == -1:
             return [cls.block_type(header, data)]
 
-        data_blocks = [data[i : i + cls.block_size] for i in range(0, len(data), cls.block_size)]
+        # the blocks reference the message data, a message without data is sent as a single empty block
+        view = memoryview(data)
+        data_blocks = [view[i : i + cls.block_size] for i in range(0, len(data), cls.block_size)] or [view]
 
         blocks = []
         for index, block_data in enumerate(data_blocks):
@@ -157,7 +181,7 @@ class Message(abc.ABC, typing.Generic[BlockT]):
         return blocks
 
     @classmethod
-    def from_block(cls: type[MessageT], block: Block) -> MessageT:
+    def from_block(cls: type[MessageT], block: BlockT) -> MessageT:
         """Initialize Message object from Block object.
 
         Args:
@@ -167,7 +191,36 @@ class Message(abc.ABC, typing.Generic[BlockT]):
             Message object
 
         """
-        return cls(block.header, block.data)
+        return cls.from_blocks([block], block.data)
+
+    @classmethod
+    def from_blocks(cls: type[MessageT], blocks: list[BlockT], data: bytes | memoryview) -> MessageT:
+        """Initialize Message object from the received blocks of a message.
+
+        The received blocks are kept, splitting the data again would reset block number and last block flag.
+
+        Args:
+            blocks: blocks of the message, in order
+            data: joined data of the blocks
+
+        Returns:
+            Message object
+
+        """
+        return cls(blocks[-1].header, data, blocks=blocks)
+
+    @classmethod
+    def is_last_block(cls, block: BlockT) -> bool:
+        """Check if a block is the last block of its message.
+
+        Args:
+            block: received block
+
+        Returns:
+            True if the last block flag of the block header is set
+
+        """
+        return block.header.last_block
 
     @property
     @abc.abstractmethod
@@ -200,5 +253,5 @@ class Message(abc.ABC, typing.Generic[BlockT]):
         """Generate textual representation for an object of this class."""
         return (
             f"{self.__class__.__name__}"
-            f"({{'header': {self.header.__repr__()}, 'data': '{self.data.decode('utf-8')}'}})"
+            f"({{'header': {self.header.__repr__()}, 'data': '{bytes(self.data).decode('utf-8')}'}})"
         )
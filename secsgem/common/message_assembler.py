@@ -0,0 +1,238 @@
+#####################################################################
+# message_assembler.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Reassembly of messages received in multiple blocks."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from .message import Block, Message
+
+MessageT = typing.TypeVar("MessageT", bound="Message")
+
+
+class AssemblerStatistics:
+    """Statistics of a message assembler."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.blocks = 0
+        """Number of received blocks."""
+
+        self.messages = 0
+        """Number of completed messages."""
+
+        self.expired = 0
+        """Number of partial messages dropped after the inter-block timeout."""
+
+        self.dropped = 0
+        """Number of partial messages dropped for exceeding the memory limit."""
+
+        self.partial_messages = 0
+        """Number of currently buffered partial messages."""
+
+        self.buffered_bytes = 0
+        """Number of currently buffered data bytes of partial messages."""
+
+        self.peak_buffered_bytes = 0
+        """Highest number of buffered data bytes of partial messages."""
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return (
+            f"{self.__class__.__name__}(blocks={self.blocks}, messages={self.messages}, expired={self.expired}, "
+            f"dropped={self.dropped}, partial_messages={self.partial_messages}, buffered_bytes={self.buffered_bytes})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Get the statistics as dictionary."""
+        return {
+            "blocks": self.blocks,
+            "messages": self.messages,
+            "expired": self.expired,
+            "dropped": self.dropped,
+            "partial_messages": self.partial_messages,
+            "buffered_bytes": self.buffered_bytes,
+            "peak_buffered_bytes": self.peak_buffered_bytes,
+        }
+
+
+class _PartialMessage:
+    def __init__(self, block: Block, deadline: float) -> None:
+        self.blocks = [block]
+        self.data = bytearray(block.data)
+        self.deadline = deadline
+
+    def add(self, block: Block, deadline: float):
+        self.blocks.append(block)
+        self.data += block.data
+        self.deadline = deadline
+
+
+class MessageAssembler(typing.Generic[MessageT]):
+    """Collects the blocks of messages by system id and returns the completed messages.
+
+    The data of a message is appended to one buffer as the blocks arrive, so it is joined only once. Partial messages
+    are dropped if the next block doesn't arrive within the inter-block timeout (T4), or if the data of all partial
+    messages exceeds the memory limit, in which case the oldest partial messages are dropped first.
+
+    Example:
+        >>> import secsgem.secsi.message
+        >>> from secsgem.common.message_assembler import MessageAssembler
+        >>>
+        >>> assembler = MessageAssembler(secsgem.secsi.message.SecsIMessage, 10.0, 1024 * 1024)
+        >>> message = secsgem.secsi.message.SecsIMessage(secsgem.secsi.SecsIHeader(1, 0, 6, 11), b"a" * 300)
+        >>> assembler.add(message.blocks[0]) is None
+        True
+        >>> len(assembler.add(message.blocks[1]).data)
+        300
+        >>> assembler.statistics
+        AssemblerStatistics(blocks=2, messages=1, expired=0, dropped=0, partial_messages=0, buffered_bytes=0)
+
+    """
+
+    def __init__(
+        self,
+        message_type: type[MessageT],
+        timeout: float,
+        memory_limit: int,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an assembler.
+
+        Args:
+            message_type: message class created from the blocks
+            timeout: seconds between two blocks of a message, before the partial message is dropped (T4)
+            memory_limit: maximum number of data bytes buffered for all partial messages
+            clock: monotonic time source
+
+        """
+        self._message_type = message_type
+        self._timeout = timeout
+        self._memory_limit = memory_limit
+        self._clock = clock
+
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        # partial messages by system id, in order of their last received block
+        self._partial_messages: dict[int, _PartialMessage] = {}
+        self._lock = threading.Lock()
+
+        self._statistics = AssemblerStatistics()
+
+    @property
+    def statistics(self) -> AssemblerStatistics:
+        """Get the assembler statistics."""
+        return self._statistics
+
+    def add(self, block: Block) -> MessageT | None:
+        """Add a block, and get completed message if available.
+
+        Args:
+            block: block to add
+
+        Returns:
+            completed message or None if the message is not complete or was dropped
+
+        """
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._statistics.blocks += 1
+
+            system = block.header.system
+            partial = self._partial_messages.pop(system, None)
+
+            if partial is None:
+                if self._message_type.is_last_block(block):
+                    self._statistics.messages += 1
+                    return self._message_type.from_block(block)
+
+                partial = _PartialMessage(block, now + self._timeout)
+                self._statistics.buffered_bytes += len(block.data)
+            else:
+                partial.add(block, now + self._timeout)
+                self._statistics.buffered_bytes += len(block.data)
+
+                if self._message_type.is_last_block(block):
+                    self._statistics.buffered_bytes -= len(partial.data)
+                    self._update_partial_count()
+                    self._statistics.messages += 1
+                    return self._message_type.from_blocks(partial.blocks, bytes(partial.data))
+
+            # reinsert to keep the partial messages ordered by their last block
+            self._partial_messages[system] = partial
+            self._update_partial_count()
+            self._enforce_memory_limit()
+
+            return None
+
+    def expire(self) -> float | None:
+        """Drop the partial messages whose inter-block timeout expired.
+
+        Returns:
+            seconds until the next partial message expires, None if there are no partial messages
+
+        """
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+
+            if not self._partial_messages:
+                return None
+
+            return max(0.0, next(iter(self._partial_messages.values())).deadline - now)
+
+    def clear(self):
+        """Drop all partial messages."""
+        with self._lock:
+            self._partial_messages.clear()
+            self._statistics.buffered_bytes = 0
+            self._update_partial_count()
+
+    def _expire(self, now: float):
+        while self._partial_messages:
+            system, partial = next(iter(self._partial_messages.items()))
+            if partial.deadline > now:
+                break
+
+            self._logger.warning("dropping partial message for system %d after inter-block timeout", system)
+            self._drop(system)
+            self._statistics.expired += 1
+
+    def _enforce_memory_limit(self):
+        self._statistics.peak_buffered_bytes = max(
+            self._statistics.peak_buffered_bytes, self._statistics.buffered_bytes
+        )
+
+        while self._statistics.buffered_bytes > self._memory_limit:
+            system = next(iter(self._partial_messages))
+
+            self._logger.warning("dropping partial message for system %d exceeding memory limit", system)
+            self._drop(system)
+            self._statistics.dropped += 1
+
+    def _drop(self, system: int):
+        partial = self._partial_messages.pop(system)
+        self._statistics.buffered_bytes -= len(partial.data)
+        self._update_partial_count()
+
+    def _update_partial_count(self):
+        self._statistics.partial_messages = len(self._partial_messages)
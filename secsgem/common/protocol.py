@@ -18,15 +18,19 @@
 from __future__ import annotations
 
 import abc
+import concurrent.futures
 import logging
-import queue
 import random
+import threading
 import typing
 
 from .block_send_info import BlockSendInfo
 from .byte_queue import ByteQueue
 from .events import EventProducer
-from .protocol_dispatcher import ProtocolDispatcher
+from .message_assembler import AssemblerStatistics, MessageAssembler
+from .protocol_dispatcher import DispatchWorkerStatistics, ProtocolDispatcher
+from .send_queue import SendPriority, SendQueueStatistics
+from .transactions import TransactionTable
 
 if typing.TYPE_CHECKING:
     from ..secs.functions import StreamsFunctions
@@ -44,6 +48,9 @@ class Protocol(abc.ABC, typing.Generic[MessageT, BlockT]):  # pylint: disable=to
 
     message_type: type[MessageT]
 
+    # send on a separate thread, so sending doesn't wait for the received data to be parsed and vice versa
+    _concurrent_send = False
+
     def __init__(self, settings: Settings, streams_functions: StreamsFunctions) -> None:
         """Initialize protocol base object."""
         super().__init__()
@@ -55,22 +62,26 @@ class Protocol(abc.ABC, typing.Generic[MessageT, BlockT]):  # pylint: disable=to
         self._event_producer.targets += self
 
         self._system_counter = random.randint(0, (2**32) - 1)  # noqa: S311
+        self._system_counter_lock = threading.Lock()
 
         self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
         self._communication_logger = logging.getLogger("communication")
 
         self.__connection: Connection | None = None
 
-        self._response_queues: dict[int, queue.Queue[MessageT]] = {}
+        self._transactions: TransactionTable[MessageT] = TransactionTable()
 
         self._receive_buffer = ByteQueue()
-        self._send_queue: queue.Queue[BlockSendInfo] = queue.Queue()
-        self._incomplete_messages: dict[int, MessageT] = {}
+        self._send_queue = settings.create_send_queue()
+        # the blocks of a message are queued without blocks of other messages of the same priority in between
+        self._send_queue_lock = threading.Lock()
+        self.__message_assembler: MessageAssembler[MessageT] | None = None
 
         self._thread = ProtocolDispatcher(
             self._process_data,
             self._dispatch_block,
             self._settings,
+            self._process_send_queue if self._concurrent_send else None,
         )
 
     @property
@@ -84,6 +95,17 @@ class Protocol(abc.ABC, typing.Generic[MessageT, BlockT]):  # pylint: disable=to
 
         return self.__connection
 
+    @property
+    def _message_assembler(self) -> MessageAssembler[MessageT]:
+        if self.__message_assembler is None:
+            self.__message_assembler = MessageAssembler(
+                self.message_type,
+                self._settings.timeouts.t4,
+                self._settings.reassembly_memory_limit,
+            )
+
+        return self.__message_assembler
+
     @abc.abstractmethod
     def _on_connected(self, _: dict[str, typing.Any]):
         raise NotImplementedError("Protocol._on_connected missing implementation")
@@ -106,18 +128,30 @@ class Protocol(abc.ABC, typing.Generic[MessageT, BlockT]):  # pylint: disable=to
         self._receive_buffer.append(data["data"])
         self._thread.trigger_receiver()
 
-    def _process_data(self):
-        """Parse the receive buffer and dispatch callbacks."""
-        self._process_send_queue()
-        self._process_received_data()
+    def _process_data(self) -> float | None:
+        """Parse the receive buffer and dispatch callbacks.
+
+        Returns:
+            seconds after which this is called again without new data, None to wait for new data
+
+        """
+        send_timeout = None if self._concurrent_send else self._process_send_queue()
+        receive_timeout = self._process_received_data()
+
+        return min((timeout for timeout in (send_timeout, receive_timeout) if timeout is not None), default=None)
 
     @abc.abstractmethod
-    def _process_send_queue(self):
-        """Process the send to communication queue."""
+    def _process_send_queue(self) -> float | None:
+        """Process the send to communication queue.
+
+        Returns:
+            seconds until the next block throttled by the rate limit may be sent, None to wait for new blocks
+
+        """
         raise NotImplementedError("Protocol._process_send_queue missing implementation")
 
     @abc.abstractmethod
-    def _process_received_data(self):
+    def _process_received_data(self) -> float | None:
         """Process the receive from communication queue."""
         raise NotImplementedError("Protocol._process_received_data missing implementation")
 
@@ -143,12 +177,13 @@ class Protocol(abc.ABC, typing.Generic[MessageT, BlockT]):  # pylint: disable=to
             System for the next command
 
         """
-        self._system_counter += 1
+        with self._system_counter_lock:
+            self._system_counter += 1
 
-        if self._system_counter > ((2**32) - 1):
-            self._system_counter = 0
+            if self._system_counter > ((2**32) - 1):
+                self._system_counter = 0
 
-        return self._system_counter
+            return self._system_counter
 
     def enable(self):
         """Enable the connection."""
@@ -174,27 +209,17 @@ class Protocol(abc.ABC, typing.Generic[MessageT, BlockT]):  # pylint: disable=to
         """
         raise NotImplementedError("Protocol._on_connection_message_received missing implementation")
 
-    def _get_queue_for_system(self, system_id: int) -> queue.Queue:
-        """Create a new queue to receive responses for a certain system.
+    def _resolve_transaction(self, message: MessageT) -> bool:
+        """Pass a received message to the transaction waiting for it.
 
         Args:
-            system_id: system id to watch
+            message: received message
 
         Returns:
-            queue to receive responses with
+            True if a transaction was waiting for the message
 
         """
-        self._response_queues[system_id] = queue.Queue()
-        return self._response_queues[system_id]
-
-    def _remove_queue(self, system_id: int):
-        """Remove queue for system id from list.
-
-        Args:
-            system_id: system id to remove
-
-        """
-        del self._response_queues[system_id]
+        return self._transactions.resolve(message.header.system, message)
 
     def _add_message_block(self, block: BlockT) -> MessageT | None:
         """Add a block, and get completed message if available.
@@ -206,18 +231,22 @@ class Protocol(abc.ABC, typing.Generic[MessageT, BlockT]):  # pylint: disable=to
             completed message or None if paket not complete
 
         """
-        if block.header.system not in self._incomplete_messages:
-            self._incomplete_messages[block.header.system] = self.message_type.from_block(block)
-        else:
-            self._incomplete_messages[block.header.system].blocks.append(block)
+        return self._message_assembler.add(block)
 
-        message = self._incomplete_messages[block.header.system]
+    @property
+    def reassembly_statistics(self) -> AssemblerStatistics:
+        """Get the statistics of the reassembly of messages received in multiple blocks."""
+        return self._message_assembler.statistics
 
-        if not message.complete:
-            return None
+    @property
+    def send_statistics(self) -> SendQueueStatistics:
+        """Get the statistics of the send queue, with the blocks throttled and dropped by the send limits."""
+        return self._send_queue.statistics
 
-        del self._incomplete_messages[block.header.system]
-        return message
+    @property
+    def dispatch_statistics(self) -> list[DispatchWorkerStatistics]:
+        """Get the statistics of the threads dispatching received messages."""
+        return self._thread.statistics
 
     @abc.abstractmethod
     def _create_message_for_function(
@@ -247,47 +276,180 @@ class Protocol(abc.ABC, typing.Generic[MessageT, BlockT]):  # pylint: disable=to
             True if sending was successful
 
         """
-        for block in message.blocks:
-            block_send_info = BlockSendInfo(block.encode())
-            self._send_queue.put(block_send_info)
-            self._thread.trigger_receiver()
+        return self.send_message_async(message).result()
+
+    def send_message_async(self, message: Message) -> concurrent.futures.Future[bool]:
+        """Queue a message for the remote host without waiting for it to be sent.
 
-            if not block_send_info.wait():
-                return False
+        The returned future can't be cancelled, its callbacks are called by the sending thread and must not block.
 
-        return True
+        Args:
+            message: message to be transmitted
 
-    def send_and_waitfor_response(self, function: SecsStreamFunction) -> Message | None:
+        Returns:
+            future resolved with True when the message was sent, False if sending failed
+
+        """
+        future: concurrent.futures.Future[bool] = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+
+        self._queue_message(message, future.set_result)
+
+        return future
+
+    def _queue_block(self, block_send_info: BlockSendInfo):
+        """Queue a block for the protocol thread to send.
+
+        Args:
+            block_send_info: encoded block, resolved when it was sent
+
+        """
+        self._send_queue.put(block_send_info)
+        self._thread.trigger_sender()
+
+    def send_and_waitfor_response(
+        self,
+        function: SecsStreamFunction,
+        timeout: float | None = None,
+    ) -> MessageT | None:
         """Send the message and wait for the response.
 
         Args:
             function: message to be sent
+            timeout: seconds to wait for the response, T3 if None
 
         Returns:
-            Message that was received
+            Message that was received, None if the response timed out or sending failed
 
         """
         system_id = self.get_next_system_counter()
 
-        response_queue = self._get_queue_for_system(system_id)
-
         out_message = self._create_message_for_function(function, system_id)
 
+        future = self._transactions.open(system_id)
+
         self._communication_logger.info("> %s\n%s", out_message, function, extra=self._get_log_extra())
 
         if not self.send_message(out_message):
             self._logger.error("Sending message failed")
-            self._remove_queue(system_id)
+            future.cancel()
             return None
 
-        try:
-            response = response_queue.get(True, self._settings.timeouts.t3)
-        except queue.Empty:
-            response = None
+        # the deadline is enforced by the timer wheel
+        return self._transactions.wait(system_id, future, self._settings.timeouts.t3 if timeout is None else timeout)
+
+    def send_async(
+        self,
+        function: SecsStreamFunction,
+        timeout: float | None = None,
+    ) -> concurrent.futures.Future[MessageT | None]:
+        """Send the message without waiting for the response.
+
+        The returned future is resolved with the response, or with None if the response timed out or sending failed.
+        Cancelling the future abandons the transaction, a late response is handled like an unsolicited message.
+
+        Args:
+            function: message to be sent
+            timeout: seconds to wait for the response, T3 if None
+
+        Returns:
+            future resolved with the response
+
+        """
+        out_message = self._create_message_for_function(function, self.get_next_system_counter())
+
+        self._communication_logger.info("> %s\n%s", out_message, function, extra=self._get_log_extra())
+
+        return self._send_request_async(out_message, self._settings.timeouts.t3 if timeout is None else timeout)
+
+    def _send_request_async(self, message: Message, timeout: float) -> concurrent.futures.Future[MessageT | None]:
+        """Queue a request, the deadline for the response starts when the request was sent.
+
+        Args:
+            message: request to send
+            timeout: seconds to wait for the response
+
+        Returns:
+            future resolved with the response
+
+        """
+        system_id = message.header.system
+        future = self._transactions.open(system_id)
+
+        def _on_sent(result: bool):
+            if result:
+                self._transactions.arm(system_id, timeout)
+            else:
+                self._logger.error("Sending message failed")
+                self._transactions.resolve(system_id, None)
+
+        self._queue_message(message, _on_sent)
+
+        return future
+
+    def _queue_message(self, message: Message, on_sent: typing.Callable[[bool], None]):
+        """Queue all blocks of a message at once, without waiting for them to be sent.
+
+        When sending a block fails, the following blocks of the message are aborted instead of being sent.
+
+        Args:
+            message: message to send
+            on_sent: called with True after the last block was sent, or with False if sending a block failed
+
+        """
+        blocks = message.blocks
+        if not blocks:
+            on_sent(True)
+            return
+
+        block_send_infos: list[BlockSendInfo] = []
+        pending = len(blocks)
+        lock = threading.Lock()
+
+        def _on_block_resolved(result: bool):
+            nonlocal pending
+
+            with lock:
+                # already reported, an aborted block after a failed one
+                if pending == 0:
+                    return
+
+                pending = pending - 1 if result else 0
+                completed = pending == 0
 
-        self._remove_queue(system_id)
+            if not result:
+                for block_send_info in block_send_infos:
+                    block_send_info.abort()
 
-        return response
+            if completed:
+                on_sent(result)
+
+        priority = self._send_priority(message)
+        block_send_infos.extend(
+            BlockSendInfo(block.encode_parts(), _on_block_resolved, priority, index == 0)
+            for index, block in enumerate(blocks)
+        )
+
+        with self._send_queue_lock:
+            for block_send_info in block_send_infos:
+                self._queue_block(block_send_info)
+
+    def _send_priority(self, message: Message) -> SendPriority:
+        """Get the lane of the send queue for a message.
+
+        Replies and error messages overtake the queued primary messages.
+
+        Args:
+            message: message to send
+
+        Returns:
+            priority of the blocks of the message
+
+        """
+        if message.header.stream == 9 or message.header.function % 2 == 0:
+            return SendPriority.REPLY
+
+        return SendPriority.REQUEST
 
     def send_response(self, function: SecsStreamFunction, system: int) -> bool:
         """Send response function for system.
@@ -306,6 +468,23 @@ class Protocol(abc.ABC, typing.Generic[MessageT, BlockT]):  # pylint: disable=to
 
         return self.send_message(out_message)
 
+    def send_response_async(self, function: SecsStreamFunction, system: int) -> concurrent.futures.Future[bool]:
+        """Queue a response function for system without waiting for it to be sent.
+
+        Args:
+            function: function to be sent
+            system: system to reply to
+
+        Returns:
+            future resolved with True when the response was sent, False if sending failed
+
+        """
+        out_message = self._create_message_for_function(function, system)
+
+        self._communication_logger.info("> %s\n%s", out_message, function, extra=self._get_log_extra())
+
+        return self.send_message_async(out_message)
+
     def send_stream_function(self, function: SecsStreamFunction) -> bool:
         """Send the message and wait for the response.
 
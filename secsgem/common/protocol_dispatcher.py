@@ -17,9 +17,11 @@
 
 from __future__ import annotations
 
+import collections
 import logging
 import queue
 import threading
+import time
 import typing
 
 if typing.TYPE_CHECKING:
@@ -27,114 +29,349 @@ if typing.TYPE_CHECKING:
     from .settings import Settings
 
 
+def default_dispatch_key(block: Block) -> typing.Hashable:
+    """Get the dispatch key of a received block, its session id and stream.
+
+    Example:
+        >>> import secsgem.hsms
+        >>> default_dispatch_key(secsgem.hsms.HsmsBlock(secsgem.hsms.HsmsStreamFunctionHeader(1, 6, 12, False, 0), b""))
+        (0, 6)
+
+    Args:
+        block: received block
+
+    Returns:
+        key of the blocks dispatched in order
+
+    """
+    return block.header.session_id, block.header.stream
+
+
+class DispatchWorkerStatistics:
+    """Statistics of a thread dispatching received blocks."""
+
+    def __init__(self, name: str, clock: typing.Callable[[], float] = time.monotonic) -> None:
+        """Initialize the statistics.
+
+        Args:
+            name: name of the worker
+            clock: time source for the utilization
+
+        """
+        self._clock = clock
+        self._started = clock()
+
+        self.name = name
+        """Name of the worker."""
+
+        self.dispatched = 0
+        """Number of dispatched blocks."""
+
+        self.busy_time = 0.0
+        """Seconds spent in the dispatch callback."""
+
+        self.max_dispatch_time = 0.0
+        """Longest time in seconds spent in the dispatch callback for a block."""
+
+    @property
+    def utilization(self) -> float:
+        """Get the fraction of the time since the worker was created spent in the dispatch callback."""
+        elapsed = self._clock() - self._started
+        return min(self.busy_time / elapsed, 1.0) if elapsed > 0 else 0.0
+
+    def add(self, dispatch_time: float):
+        """Count a dispatched block.
+
+        Args:
+            dispatch_time: seconds spent in the dispatch callback
+
+        """
+        self.dispatched += 1
+        self.busy_time += dispatch_time
+        self.max_dispatch_time = max(self.max_dispatch_time, dispatch_time)
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return (
+            f"{self.__class__.__name__}(name={self.name}, dispatched={self.dispatched}, "
+            f"busy_time={self.busy_time:.3f}, max_dispatch_time={self.max_dispatch_time:.3f}, "
+            f"utilization={self.utilization:.3f})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Get the statistics as dictionary."""
+        return {
+            "name": self.name,
+            "dispatched": self.dispatched,
+            "busy_time": self.busy_time,
+            "max_dispatch_time": self.max_dispatch_time,
+            "utilization": self.utilization,
+        }
+
+
 class ProtocolDispatcher:  # pylint: disable=too-many-instance-attributes
-    """Thread that calls a target function when a trigger was raised."""
+    """Thread that calls a target function when a trigger was raised.
+
+    With a sender target, sending runs on its own thread, so blocks are sent while the receiver is parsing a
+    large frame, and received data is parsed while a large block is sent.
+
+    With more than one dispatch worker (see the `dispatch_workers` setting), received blocks are dispatched by a pool
+    of threads. Blocks with the same dispatch key, by default the same session and stream, are dispatched one after
+    the other in the order they were received, blocks with different keys concurrently. A slow callback for a stream
+    then doesn't delay the replies to open transactions received on other streams.
+    """
 
     def __init__(
         self,
         receiver_target: typing.Callable,
         dispatcher_target: typing.Callable,
         settings: Settings,
+        sender_target: typing.Callable | None = None,
     ) -> None:
         """Initialize thread object.
 
         Args:
-            receiver_target: function to call when receiver triggered
+            receiver_target: function to call when receiver triggered, can return the seconds after which
+                it is called again without trigger
             dispatcher_target: function to call when message available for dispatch
             settings: communication/protocol settings
+            sender_target: function to call when sender triggered, the receiver target sends if not set, can
+                return the seconds after which it is called again without trigger
 
         """
         self._receiver_target = receiver_target
         self._dispatcher_target = dispatcher_target
+        self._sender_target = sender_target
         self._settings = settings
 
         self._receiver_thread: threading.Thread | None = None
         self._dispatcher_thread: threading.Thread | None = None
+        self._sender_thread: threading.Thread | None = None
 
         self._receiver_thread_trigger = threading.Event()
         self._dispatcher_thread_trigger = threading.Event()
+        self._sender_thread_trigger = threading.Event()
 
         self._dispatch_queue: queue.Queue[tuple[object, Block]] = queue.Queue()
 
-        self._stop_receiver_thread = False
-        self._stop_dispatcher_thread = False
+        # worker pool, blocks waiting by dispatch key and keys of the blocks ready for a worker
+        self._workers = max(settings.dispatch_workers, 1)
+        self._dispatch_key: typing.Callable[[Block], typing.Hashable] = settings.dispatch_key or default_dispatch_key
+        self._dispatch_condition = threading.Condition()
+        self._pending_blocks: dict[typing.Hashable, collections.deque[tuple[object, Block]]] = {}
+        self._ready_keys: collections.deque[typing.Hashable] = collections.deque()
+        # blocks received during a control block or while it waits for the pending keys, in order, None for control
+        self._held_blocks: collections.deque[tuple[typing.Hashable, tuple[object, Block]]] = collections.deque()
+        self._worker_threads: list[threading.Thread] = []
+
+        self._statistics = [
+            DispatchWorkerStatistics(f"protocol_dispatcher_{index}" if self._workers > 1 else "protocol_dispatcher")
+            for index in range(self._workers)
+        ]
+
+        # stop signal of the running threads, a new one is created on every start
+        self._stop_event = threading.Event()
+
+    @property
+    def statistics(self) -> list[DispatchWorkerStatistics]:
+        """Get the statistics of the dispatch workers."""
+        return self._statistics
 
     def start(self):
         """Start the thread."""
-        self._stop_receiver_thread = False
-        self._stop_dispatcher_thread = False
+        self._stop_event = threading.Event()
 
         self._receiver_thread = threading.Thread(
             target=self._receiver_thread_function,
-            args=(),
+            args=(self._stop_event,),
             name=self._settings.generate_thread_name("protocol_receiver"),
             daemon=True,
         )
-
-        self._dispatcher_thread = threading.Thread(
-            target=self._dispatcher_thread_function,
-            args=(),
-            name=self._settings.generate_thread_name("protocol_dispatcher"),
-            daemon=True,
-        )
-
         self._receiver_thread.start()
-        self._dispatcher_thread.start()
+
+        if self._workers == 1:
+            self._dispatcher_thread = threading.Thread(
+                target=self._dispatcher_thread_function,
+                args=(self._stop_event,),
+                name=self._settings.generate_thread_name("protocol_dispatcher"),
+                daemon=True,
+            )
+            self._dispatcher_thread.start()
+        else:
+            self._worker_threads = [
+                threading.Thread(
+                    target=self._dispatch_worker_function,
+                    args=(self._stop_event, statistics),
+                    name=self._settings.generate_thread_name(statistics.name),
+                    daemon=True,
+                )
+                for statistics in self._statistics
+            ]
+
+            for thread in self._worker_threads:
+                thread.start()
+
+        if self._sender_target is not None:
+            self._sender_thread = threading.Thread(
+                target=self._sender_thread_function,
+                args=(self._stop_event,),
+                name=self._settings.generate_thread_name("protocol_sender"),
+                daemon=True,
+            )
+            self._sender_thread.start()
 
     def stop(self):
-        """Stop the thread."""
-        if not self._receiver_thread.is_alive():
+        """Stop the thread.
+
+        Waits for the receiver and sender threads to finish. The dispatcher thread finishes dispatching the queued
+        blocks in the background, as a callback might be waiting for the connection that is stopped.
+        """
+        if self._receiver_thread is None or self._stop_event.is_set():
             return
 
-        self._stop_receiver_thread = True
+        self._stop_event.set()
         self._receiver_thread_trigger.set()
+        self._dispatcher_thread_trigger.set()
+        self._sender_thread_trigger.set()
+
+        with self._dispatch_condition:
+            self._dispatch_condition.notify_all()
 
-        self._receiver_thread.join()
+        for thread in (self._receiver_thread, self._sender_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join()
 
     def trigger_receiver(self):
         """Trigger the thread to call target function."""
         self._receiver_thread_trigger.set()
 
+    def trigger_sender(self):
+        """Trigger the thread to call the sender target, the receiver thread if there is no sender target."""
+        if self._sender_target is None:
+            self._receiver_thread_trigger.set()
+        else:
+            self._sender_thread_trigger.set()
+
     def queue_block(self, source: object, block: Block):
         """Add a block to the dispatch queue and trigger dispatch thread.
 
+        With a pool of workers, a control block (e.g. HSMS select or separate) is a barrier. It is dispatched alone,
+        after all blocks received before it and before all blocks received after it.
+
         Args:
             source: source of the block
             block: new block
 
         """
-        self._dispatch_queue.put((source, block))
-        self._dispatcher_thread_trigger.set()
+        if self._workers == 1:
+            self._dispatch_queue.put((source, block))
+            self._dispatcher_thread_trigger.set()
+            return
+
+        key = None if block.header.is_control else self._dispatch_key(block)
+
+        with self._dispatch_condition:
+            if self._held_blocks or not self._admissible(key):
+                self._held_blocks.append((key, (source, block)))
+                return
+
+            self._admit(key, (source, block))
+
+    def _admissible(self, key: typing.Hashable) -> bool:
+        # a control block waits for all pending keys, and nothing is admitted while it is pending
+        if None in self._pending_blocks:
+            return False
+
+        return key is not None or not self._pending_blocks
+
+    def _admit(self, key: typing.Hashable, data: tuple[object, Block]):
+        pending = self._pending_blocks.get(key)
+
+        # a key with pending blocks is ready or being dispatched, its worker continues with the new block
+        if pending is not None:
+            pending.append(data)
+            return
 
-    def _receiver_thread_function(self):
-        while not self._stop_receiver_thread:
-            self._receiver_thread_trigger.wait()
+        self._pending_blocks[key] = collections.deque([data])
+        self._ready_keys.append(key)
+        self._dispatch_condition.notify()
+
+    def _admit_held(self):
+        while self._held_blocks and self._admissible(self._held_blocks[0][0]):
+            self._admit(*self._held_blocks.popleft())
+
+    def _receiver_thread_function(self, stop_event: threading.Event):
+        timeout: float | None = None
+
+        while not stop_event.is_set():
+            self._receiver_thread_trigger.wait(timeout)
             self._receiver_thread_trigger.clear()
 
-            if self._stop_receiver_thread:
-                continue
+            if stop_event.is_set():
+                break
 
             try:
-                self._receiver_target()
+                timeout = self._receiver_target()
             except Exception as exc:  # pylint: disable=broad-exception-caught
                 logging.warning("Exception in receiver callback, ignoring", exc_info=exc)
+                timeout = None
+
+    def _sender_thread_function(self, stop_event: threading.Event):
+        sender_target = typing.cast("typing.Callable", self._sender_target)
+        timeout: float | None = None
 
-        self._stop_receiver_thread = False
+        while not stop_event.is_set():
+            self._sender_thread_trigger.wait(timeout)
+            self._sender_thread_trigger.clear()
+
+            if stop_event.is_set():
+                break
+
+            try:
+                timeout = sender_target()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logging.warning("Exception in sender callback, ignoring", exc_info=exc)
+                timeout = None
 
-    def _dispatcher_thread_function(self):
-        while not self._stop_dispatcher_thread:
+    def _dispatcher_thread_function(self, stop_event: threading.Event):
+        while not stop_event.is_set():
             self._dispatcher_thread_trigger.wait()
             self._dispatcher_thread_trigger.clear()
 
-            if self._stop_dispatcher_thread:
-                continue
-
+            # blocks received before stopping are still dispatched
             while self._dispatch_queue.qsize() > 0:
-                data = self._dispatch_queue.get()
+                self._dispatch(self._dispatch_queue.get(), self._statistics[0])
+
+    def _dispatch_worker_function(self, stop_event: threading.Event, statistics: DispatchWorkerStatistics):
+        while True:
+            with self._dispatch_condition:
+                # blocks received before stopping are still dispatched
+                while not self._ready_keys and not stop_event.is_set():
+                    self._dispatch_condition.wait()
+
+                if not self._ready_keys:
+                    return
+
+                key = self._ready_keys.popleft()
+                data = self._pending_blocks[key].popleft()
+
+            self._dispatch(data, statistics)
+
+            with self._dispatch_condition:
+                # the next block of the key goes to the back, so a busy key doesn't keep the others waiting
+                if self._pending_blocks[key]:
+                    self._ready_keys.append(key)
+                    self._dispatch_condition.notify()
+                else:
+                    del self._pending_blocks[key]
+                    self._admit_held()
+
+    def _dispatch(self, data: tuple[object, Block], statistics: DispatchWorkerStatistics):
+        start = time.monotonic()
 
-                try:
-                    self._dispatcher_target(*data)
-                except Exception as exc:  # pylint: disable=broad-exception-caught
-                    logging.warning("Exception in dispatcher callback, ignoring", exc_info=exc)
+        try:
+            self._dispatcher_target(*data)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logging.warning("Exception in dispatcher callback, ignoring", exc_info=exc)
 
-        self._stop_dispatcher_thread = False
+        statistics.add(time.monotonic() - start)
@@ -0,0 +1,119 @@
+#####################################################################
+# rate_limiter.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Token bucket rate limiter for sent messages."""
+
+from __future__ import annotations
+
+import time
+import typing
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = now
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, cost: float) -> float:
+        # a cost above the capacity is taken from a full bucket, leaving a debt
+        missing = min(cost, self.capacity) - self.tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+
+class RateLimiter:
+    """Limit for the messages and bytes sent per second, with a token bucket for each.
+
+    A bucket holds the tokens for `burst` seconds, so a burst of that size is sent without delay after being idle.
+    A block larger than the bucket is sent when the bucket is full, the following blocks wait for the debt.
+
+    Example:
+        >>> now = 0.0
+        >>> limiter = RateLimiter(messages_per_second=2, clock=lambda: now)
+        >>> limiter.acquire(1, 100), limiter.acquire(1, 100), limiter.acquire(1, 100)
+        (0.0, 0.0, 0.5)
+        >>> now = 0.5
+        >>> limiter.acquire(1, 100)
+        0.0
+
+    """
+
+    def __init__(
+        self,
+        messages_per_second: float | None = None,
+        bytes_per_second: float | None = None,
+        burst: float = 1.0,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a rate limiter.
+
+        Args:
+            messages_per_second: maximum number of messages per second, unlimited if None
+            bytes_per_second: maximum number of bytes per second, unlimited if None
+            burst: seconds of the rate held by the buckets
+            clock: time source
+
+        Raises:
+            ValueError: if a rate is not positive
+
+        """
+        for name, rate in (("messages_per_second", messages_per_second), ("bytes_per_second", bytes_per_second)):
+            if rate is not None and rate <= 0:
+                raise ValueError(f"{name} must be positive or None for unlimited, got {rate}")
+
+        self._clock = clock
+
+        now = clock()
+        self._messages = (
+            _TokenBucket(messages_per_second, max(messages_per_second * burst, 1.0), now)
+            if messages_per_second is not None
+            else None
+        )
+        self._bytes = (
+            _TokenBucket(bytes_per_second, max(bytes_per_second * burst, 1.0), now)
+            if bytes_per_second is not None
+            else None
+        )
+
+    def acquire(self, messages: int, size: int) -> float:
+        """Take the tokens for a block if they are available.
+
+        Args:
+            messages: number of messages started by the block
+            size: size of the block in bytes
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the seconds until they are available
+
+        """
+        now = self._clock()
+        costs = [(bucket, cost) for bucket, cost in ((self._messages, messages), (self._bytes, size)) if bucket]
+
+        for bucket, _ in costs:
+            bucket.refill(now)
+
+        delay = max((bucket.delay(cost) for bucket, cost in costs), default=0.0)
+        if delay > 0:
+            return delay
+
+        for bucket, cost in costs:
+            bucket.tokens -= cost
+
+        return 0.0
@@ -0,0 +1,267 @@
+#####################################################################
+# reactor.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Selector based reactor serving the sockets of many connections."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import selectors
+import socket
+import threading
+import typing
+
+
+class _ReactorLoop:
+    """Single selector and the thread polling it."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._selector = selectors.DefaultSelector()
+        self._thread: threading.Thread | None = None
+        self._stop = False
+
+        self._pending: list[tuple[typing.Callable[[], None], threading.Event | None]] = []
+        self._pending_lock = threading.Lock()
+
+        self._wakeup_receiver, self._wakeup_sender = socket.socketpair()
+        self._wakeup_receiver.setblocking(False)
+        self._wakeup_sender.setblocking(False)
+        self._selector.register(self._wakeup_receiver, selectors.EVENT_READ, None)
+
+        self._socket_count = 0
+
+    @property
+    def socket_count(self) -> int:
+        """Get the number of sockets served by this loop."""
+        return self._socket_count
+
+    @property
+    def in_loop_thread(self) -> bool:
+        """Check if the caller is running in the thread of this loop."""
+        return threading.current_thread() is self._thread
+
+    def register(self, sock: socket.socket, callback: typing.Callable[[], None]):
+        """Start watching a socket for readability.
+
+        Args:
+            sock: socket to watch
+            callback: function called when the socket is readable
+
+        """
+        self._socket_count += 1
+
+        def _register():
+            self._selector.register(sock, selectors.EVENT_READ, callback)
+
+        self._run_in_loop(_register, wait=False)
+
+    def unregister(self, sock: socket.socket):
+        """Stop watching a socket.
+
+        When called from outside the loop thread, this returns after the loop stopped watching the socket,
+        so the callback will not be called afterwards.
+
+        Args:
+            sock: socket to stop watching
+
+        """
+        self._run_in_loop(lambda: self._unregister(sock), wait=True)
+
+    def release(self):
+        """Remove an unregistered socket from the number of sockets served by this loop."""
+        self._socket_count -= 1
+
+    def stop(self):
+        """Stop the loop thread."""
+        if self._thread is None:
+            return
+
+        self._stop = True
+        self._wakeup()
+
+        if not self.in_loop_thread:
+            self._thread.join()
+
+        self._thread = None
+
+    def _unregister(self, sock: socket.socket):
+        with contextlib.suppress(KeyError, ValueError):
+            self._selector.unregister(sock)
+
+    def _run_in_loop(self, function: typing.Callable[[], None], wait: bool):
+        if self.in_loop_thread:
+            function()
+            return
+
+        done = threading.Event() if wait else None
+
+        with self._pending_lock:
+            self._pending.append((function, done))
+
+            if self._thread is None:
+                self._stop = False
+                self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+                self._thread.start()
+
+        self._wakeup()
+
+        if done is not None:
+            done.wait()
+
+    def _wakeup(self):
+        # a full buffer means a wakeup is already pending
+        with contextlib.suppress(BlockingIOError):
+            self._wakeup_sender.send(b"\x00")
+
+    def _drain_wakeup(self):
+        with contextlib.suppress(BlockingIOError):
+            while self._wakeup_receiver.recv(1024):
+                pass
+
+    def _process_pending(self):
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = []
+
+        for function, done in pending:
+            try:
+                function()
+            except Exception:  # pylint: disable=broad-except
+                self._logger.exception("exception while updating selector")
+
+            if done is not None:
+                done.set()
+
+    def _loop(self):
+        while not self._stop:
+            self._process_pending()
+
+            for key, _ in self._selector.select():
+                if key.fileobj is self._wakeup_receiver:
+                    self._drain_wakeup()
+                    continue
+
+                try:
+                    key.data()
+                except Exception:  # pylint: disable=broad-except
+                    self._logger.exception("ignoring exception in reactor callback")
+
+        # release threads waiting for an unregister
+        self._process_pending()
+
+
+class Reactor:
+    """Event loop serving the sockets of many TCP connections from a small number of threads.
+
+    Connections that get a reactor passed in their settings register their sockets here,
+    instead of starting a receiver (and server) thread each.
+    Sockets are distributed over the loop threads, always using the least busy loop.
+
+    The threads are started on demand, when the first socket is registered.
+
+    Example:
+        >>> import socket
+        >>> import threading
+        >>> import secsgem.common
+        >>>
+        >>> reactor = secsgem.common.Reactor()
+        >>> first, second = socket.socketpair()
+        >>> received = threading.Event()
+        >>> reactor.register(first, received.set)
+        >>> _ = second.send(b"data")
+        >>> received.wait(5)
+        True
+        >>> reactor.unregister(first)
+        >>> reactor.stop()
+        >>> first.close()
+        >>> second.close()
+
+    """
+
+    def __init__(self, threads: int = 1, name: str = "secsgem_reactor") -> None:
+        """Initialize a reactor.
+
+        Args:
+            threads: number of selector threads
+            name: name prefix for the selector threads
+
+        """
+        if threads < 1:
+            raise ValueError(f"Reactor requires at least one thread, got {threads}")
+
+        self._loops = [_ReactorLoop(f"{name}_{index}") for index in range(threads)]
+        self._assignments: dict[socket.socket, _ReactorLoop] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def socket_count(self) -> int:
+        """Get the number of sockets served by this reactor."""
+        return len(self._assignments)
+
+    @property
+    def in_reactor_thread(self) -> bool:
+        """Check if the caller is running in one of the threads of this reactor."""
+        return any(loop.in_loop_thread for loop in self._loops)
+
+    def register(self, sock: socket.socket, callback: typing.Callable[[], None]):
+        """Start watching a socket for readability.
+
+        The callback is called from a reactor thread each time the socket is readable,
+        so it must not block.
+
+        Args:
+            sock: socket to watch
+            callback: function called when the socket is readable
+
+        """
+        with self._lock:
+            if sock in self._assignments:
+                raise ValueError(f"Socket {sock} is already registered")
+
+            loop = min(self._loops, key=lambda item: item.socket_count)
+            self._assignments[sock] = loop
+            loop.register(sock, callback)
+
+    def unregister(self, sock: socket.socket):
+        """Stop watching a socket.
+
+        Must be called before the socket is closed.
+        After this returns the callback of the socket is not called any more.
+
+        Args:
+            sock: socket to stop watching
+
+        """
+        with self._lock:
+            loop = self._assignments.pop(sock, None)
+            if loop is None:
+                return
+
+            # the count is kept with the assignments, the loop is waited for without holding the lock
+            loop.release()
+
+        loop.unregister(sock)
+
+    def stop(self):
+        """Stop all reactor threads.
+
+        Threads are restarted when a new socket is registered.
+        """
+        for loop in self._loops:
+            loop.stop()
@@ -0,0 +1,95 @@
+#####################################################################
+# reconnect.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Delay and statistics of the reconnect attempts of client connections."""
+
+from __future__ import annotations
+
+import random
+import typing
+
+
+class ReconnectStatistics:
+    """Reconnect statistics of a client connection."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.attempts = 0
+        """Number of connect attempts."""
+
+        self.failures = 0
+        """Number of failed connect attempts."""
+
+        self.connects = 0
+        """Number of established connections."""
+
+        self.consecutive_failures = 0
+        """Number of failed connect attempts since the last established connection."""
+
+        self.last_delay: float | None = None
+        """Delay in seconds before the last scheduled attempt."""
+
+        self.last_error: str | None = None
+        """Error of the last failed attempt."""
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return (
+            f"{self.__class__.__name__}(attempts={self.attempts}, failures={self.failures}, connects={self.connects}, "
+            f"consecutive_failures={self.consecutive_failures}, last_delay={self.last_delay})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Get the statistics as dictionary."""
+        return {
+            "attempts": self.attempts,
+            "failures": self.failures,
+            "connects": self.connects,
+            "consecutive_failures": self.consecutive_failures,
+            "last_delay": self.last_delay,
+            "last_error": self.last_error,
+        }
+
+
+def reconnect_delay(t5: float, failures: int, backoff: float, max_delay: float, jitter: float) -> float:
+    """Calculate the delay before the next connect attempt.
+
+    The delay starts with T5 and is multiplied by the backoff factor for every failed attempt, up to the maximum
+    delay. A random part of up to `jitter` times the delay is added, so connections dropped together don't
+    reconnect in lockstep. The delay is never shorter than T5.
+
+    Example:
+        >>> import secsgem.common.reconnect
+        >>> secsgem.common.reconnect.reconnect_delay(0.5, 0, 2.0, 60.0, 0.0)
+        0.5
+        >>> secsgem.common.reconnect.reconnect_delay(0.5, 3, 2.0, 60.0, 0.0)
+        4.0
+        >>> secsgem.common.reconnect.reconnect_delay(10.0, 10, 2.0, 60.0, 0.0)
+        60.0
+
+    Args:
+        t5: connect separation time in seconds
+        failures: number of consecutive failed attempts
+        backoff: factor the delay is multiplied with for each failed attempt
+        max_delay: maximum delay in seconds before jitter, T5 if shorter than T5
+        jitter: maximum random part of the delay, as fraction of the delay
+
+    Returns:
+        delay in seconds
+
+    """
+    delay = min(t5 * backoff ** min(failures, 64), max(max_delay, t5))
+
+    return delay + delay * jitter * random.random()  # noqa: S311
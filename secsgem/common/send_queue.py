@@ -0,0 +1,248 @@
+#####################################################################
+# send_queue.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Queue for the blocks to send, with a lane per priority."""
+
+from __future__ import annotations
+
+import collections
+import enum
+import queue
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from .block_send_info import BlockSendInfo
+    from .rate_limiter import RateLimiter
+
+
+class SendPriority(enum.IntEnum):
+    """Priority of a block to send, lower values are sent first."""
+
+    CONTROL = 0
+    """HSMS control messages, like linktest and select."""
+
+    REPLY = 1
+    """Replies and error messages (S9Fx)."""
+
+    REQUEST = 2
+    """Primary messages."""
+
+
+class SendQueueStatistics:  # pylint: disable=too-many-instance-attributes
+    """Statistics of the send queue of a connection."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.queued = 0
+        """Number of blocks added to the queue."""
+
+        self.sent = 0
+        """Number of blocks taken from the queue for sending."""
+
+        self.dropped = 0
+        """Number of blocks resolved with False without being sent, for a full queue or a closed connection."""
+
+        self.throttled = 0
+        """Number of primary message blocks delayed by the rate limit."""
+
+        self.depth = 0
+        """Number of blocks currently queued."""
+
+        self.max_depth = 0
+        """Highest number of queued blocks."""
+
+        self.wait_time_total = 0.0
+        """Sum of the seconds the sent blocks were queued."""
+
+        self.wait_time_max = 0.0
+        """Longest time in seconds a sent block was queued."""
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return (
+            f"{self.__class__.__name__}(queued={self.queued}, sent={self.sent}, dropped={self.dropped}, "
+            f"throttled={self.throttled}, depth={self.depth}, max_depth={self.max_depth}, "
+            f"wait_time_total={self.wait_time_total:.3f}, wait_time_max={self.wait_time_max:.3f})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Get the statistics as dictionary."""
+        return {
+            "queued": self.queued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "throttled": self.throttled,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "wait_time_total": self.wait_time_total,
+            "wait_time_max": self.wait_time_max,
+        }
+
+
+class SendQueue:
+    """Blocks waiting to be sent, taken from the lane with the highest priority first.
+
+    The blocks of a lane are sent in the order they were queued. Control messages and replies overtake queued
+    primary messages, blocks of a multi-block SECS-I message are interleaved with them at block boundaries.
+
+    Only primary messages are subject to the rate limit and the queue limit, control messages and replies are
+    never delayed or dropped by them. While the next primary block is throttled, :attr:`delay` tells the sender
+    when to try again.
+
+    Example:
+        >>> import secsgem.common
+        >>>
+        >>> send_queue = SendQueue()
+        >>> send_queue.put(secsgem.common.BlockSendInfo(b"S6F11"))
+        >>> send_queue.put(secsgem.common.BlockSendInfo(b"linktest", priority=SendPriority.CONTROL))
+        >>> send_queue.get_nowait().data
+        b'linktest'
+        >>> len(send_queue)
+        1
+
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter | None = None,
+        limit: int | None = None,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the queue.
+
+        Args:
+            rate_limiter: limit for the primary message blocks taken from the queue
+            limit: maximum number of queued primary message blocks, further blocks are dropped
+            clock: time source for the wait times
+
+        """
+        self._lanes: tuple[collections.deque[tuple[float, BlockSendInfo]], ...] = tuple(
+            collections.deque() for _ in SendPriority
+        )
+        self._lock = threading.Lock()
+        self._rate_limiter = rate_limiter
+        self._limit = limit
+        self._clock = clock
+
+        self._throttled: BlockSendInfo | None = None
+        self._delay: float | None = None
+        self._statistics = SendQueueStatistics()
+
+    def __len__(self) -> int:
+        """Get the number of queued blocks."""
+        return sum(len(lane) for lane in self._lanes)
+
+    def empty(self) -> bool:
+        """Check if no block is queued."""
+        return not any(self._lanes)
+
+    @property
+    def statistics(self) -> SendQueueStatistics:
+        """Get the statistics of the queue."""
+        return self._statistics
+
+    @property
+    def delay(self) -> float | None:
+        """Get the seconds until the throttled next block may be sent, None if the next block is not throttled."""
+        return self._delay
+
+    def put(self, block_send_info: BlockSendInfo):
+        """Add a block to the lane of its priority.
+
+        A primary message block exceeding the queue limit is resolved with False instead.
+
+        Args:
+            block_send_info: block to send
+
+        """
+        with self._lock:
+            lane = self._lanes[block_send_info.priority]
+            dropped = (
+                block_send_info.priority == SendPriority.REQUEST
+                and self._limit is not None
+                and len(lane) >= self._limit
+            )
+
+            if dropped:
+                self._statistics.dropped += 1
+            else:
+                lane.append((self._clock(), block_send_info))
+                self._statistics.queued += 1
+                self._statistics.depth += 1
+                self._statistics.max_depth = max(self._statistics.max_depth, self._statistics.depth)
+
+        if dropped:
+            block_send_info.resolve(False)
+
+    def get_nowait(self) -> BlockSendInfo:
+        """Remove the next block to send.
+
+        Returns:
+            first block of the lane with the highest priority
+
+        Raises:
+            queue.Empty: no block is queued, or the next block is throttled by the rate limit
+
+        """
+        with self._lock:
+            self._delay = None
+
+            for priority, lane in enumerate(self._lanes):
+                if not lane:
+                    continue
+
+                queued, block_send_info = lane[0]
+
+                # aborted blocks are resolved without being sent, they don't take tokens
+                if priority == SendPriority.REQUEST and self._rate_limiter is not None and not block_send_info.aborted:
+                    delay = self._rate_limiter.acquire(int(block_send_info.starts_message), block_send_info.size)
+                    if delay > 0:
+                        if self._throttled is not block_send_info:
+                            self._throttled = block_send_info
+                            self._statistics.throttled += 1
+
+                        self._delay = delay
+                        break
+
+                lane.popleft()
+                self._throttled = None
+
+                wait_time = self._clock() - queued
+                self._statistics.sent += 1
+                self._statistics.depth -= 1
+                self._statistics.wait_time_total += wait_time
+                self._statistics.wait_time_max = max(self._statistics.wait_time_max, wait_time)
+
+                return block_send_info
+
+        raise queue.Empty
+
+    def clear(self):
+        """Remove all blocks and resolve them with False, e.g. after the connection was closed."""
+        with self._lock:
+            block_send_infos = [block_send_info for lane in self._lanes for _, block_send_info in lane]
+
+            for lane in self._lanes:
+                lane.clear()
+
+            self._throttled = None
+            self._delay = None
+            self._statistics.dropped += len(block_send_infos)
+            self._statistics.depth = 0
+
+        for block_send_info in block_send_infos:
+            block_send_info.resolve(False)
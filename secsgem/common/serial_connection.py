@@ -19,7 +19,6 @@ from __future__ import annotations
 
 import logging
 import threading
-import time
 import typing
 
 import serial
@@ -83,6 +82,7 @@ class SerialConnection(Connection):  # pylint: disable=too-many-instance-attribu
         self._enabled = True
 
         self.__port = serial.Serial(self._settings.port, self._settings.speed, timeout=self._receiver_timeout)
+        self._receiver_thread_running = True
 
         # start data receiving thread
         self._receiver_thread = threading.Thread(
@@ -98,10 +98,6 @@ class SerialConnection(Connection):  # pylint: disable=too-many-instance-attribu
         except Exception:  # pylint: disable=broad-except
             self._logger.exception("ignoring exception for on_connected handler")
 
-        # wait until thread is running
-        while not self._receiver_thread_running:
-            pass
-
     def disable(self):
         """Disable the connection.
 
@@ -116,14 +112,15 @@ class SerialConnection(Connection):  # pylint: disable=too-many-instance-attribu
 
         self._stop_receiver_thread = True
 
+        # interrupt a pending read
+        self._port.cancel_read()
+
         # wait for connection thread to stop
-        while self._stop_receiver_thread:
-            time.sleep(0.2)
+        if self._receiver_thread is not None and self._receiver_thread is not threading.current_thread():
+            self._receiver_thread.join()
 
     def _receiver_thread_function(self):
         """Thread for receiving incoming data and sending it to the protocol handler."""
-        self._receiver_thread_running = True
-
         try:
             self._receiver_loop()
         except Exception:  # pylint: disable=broad-except
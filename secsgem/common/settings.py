@@ -22,6 +22,8 @@ import enum
 import typing
 from typing import Any
 
+from .rate_limiter import RateLimiter
+from .send_queue import SendQueue
 from .timeouts import Timeouts
 
 if typing.TYPE_CHECKING:
@@ -114,6 +116,28 @@ class Settings(abc.ABC):
             Setting("device_type", DeviceType.HOST, "Device type"),
             Setting("session_id", 0, "session / device ID to use for connection"),
             Setting("establish_communication_timeout", 10, "Time to wait between CA requests", writeable=True),
+            Setting(
+                "reassembly_memory_limit", 16 * 1024 * 1024, "Maximum bytes buffered for partially received messages"
+            ),
+            Setting("send_messages_per_second", None, "Maximum rate of sent primary messages, None for unlimited"),
+            Setting("send_bytes_per_second", None, "Maximum rate of sent primary message bytes, None for unlimited"),
+            Setting(
+                "send_queue_limit",
+                None,
+                "Maximum number of queued primary message blocks, sending further messages fails, None for unlimited",
+            ),
+            Setting(
+                "dispatch_workers",
+                1,
+                "Number of threads dispatching received messages, messages with the same dispatch key are dispatched "
+                "in order, control messages are dispatched alone in the order received",
+            ),
+            Setting(
+                "dispatch_key",
+                None,
+                "Function getting the dispatch key of a received block, session id and stream if not set "
+                "(see :func:`secsgem.common.default_dispatch_key`)",
+            ),
         ]
 
     @classmethod
@@ -143,7 +167,7 @@ class Settings(abc.ABC):
         super().__setattr__("_data", {})
 
         for attribute in self._attributes():
-            if attribute.default_class is not None:
+            if attribute.default_class is not None and attribute.name not in kwargs:
                 klass = attribute.default_class
                 value = klass(**kwargs)
             else:
@@ -156,11 +180,25 @@ class Settings(abc.ABC):
         """Protocol class for this configuration."""
         raise NotImplementedError(f"function 'create_protocol' is not implemented for '{self.__class__.__name__}'")
 
+    def create_async_protocol(self, streams_functions: StreamsFunctions) -> typing.Any:
+        """Asyncio protocol class for this configuration."""
+        raise NotImplementedError(
+            f"function 'create_async_protocol' is not implemented for '{self.__class__.__name__}'"
+        )
+
     @abc.abstractmethod
     def create_connection(self) -> Connection:
         """Connection class for this configuration."""
         raise NotImplementedError(f"function 'create_connection' is not implemented for '{self.__class__.__name__}'")
 
+    def create_send_queue(self) -> SendQueue:
+        """Send queue with the rate and queue limits of this configuration."""
+        rate_limiter = None
+        if self.send_messages_per_second is not None or self.send_bytes_per_second is not None:
+            rate_limiter = RateLimiter(self.send_messages_per_second, self.send_bytes_per_second)
+
+        return SendQueue(rate_limiter, self.send_queue_limit)
+
     @property
     @abc.abstractmethod
     def name(self) -> str:
@@ -180,6 +218,17 @@ class Settings(abc.ABC):
         """
         raise NotImplementedError(f"function 'generate_thread_name' is not implemented for '{self.__class__.__name__}'")
 
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Get the values of all settings.
+
+        The result can be passed as keyword arguments to create a copy of the settings.
+
+        Returns:
+            setting values by name
+
+        """
+        return dict(self._data)
+
     def __getattr__(self, name: str) -> typing.Any:
         """Get an attribute.
 
@@ -0,0 +1,103 @@
+#####################################################################
+# tcp_accepted_connection.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""TCP connection for a socket accepted by a server."""
+
+from __future__ import annotations
+
+import typing
+
+from .tcp_connection import TcpConnection
+
+if typing.TYPE_CHECKING:
+    import socket
+
+    from .settings import Settings
+
+
+class TcpAcceptedConnection(TcpConnection):
+    """Connection class for a socket accepted by a server handling multiple connections.
+
+    The connection is established with the accepted socket on enable.
+    Once the connection is closed it is not reestablished, the remote has to connect to the server again.
+    """
+
+    def __init__(self, settings: Settings, sock: socket.socket):
+        """Initialize an accepted TCP connection.
+
+        Args:
+            settings: protocol and communication settings
+            sock: accepted socket
+
+        """
+        super().__init__(settings)
+
+        self._accepted_sock: socket.socket | None = sock
+        self._remote_address: tuple[str, int] = sock.getpeername()[:2]
+        self._enabled = False
+
+    @property
+    def remote_address(self) -> tuple[str, int]:
+        """Get the address and port of the remote."""
+        return self._remote_address
+
+    def _serialize_data(self):
+        """Return data for serialization.
+
+        Returns:
+            data to serialize for this object
+
+        """
+        return {
+            "connect_mode": self._settings.connect_mode,
+            "remoteAddress": self._remote_address[0],
+            "remotePort": self._remote_address[1],
+            "session_id": self._settings.session_id,
+            "connected": self._connected,
+        }
+
+    def __str__(self):
+        """Get the contents of this object as a string."""
+        return (
+            f"accepted connection from {self._remote_address[0]}:{self._remote_address[1]}"
+            f" session_id={self._settings.session_id}"
+        )
+
+    def enable(self):
+        """Enable the connection.
+
+        Starts receiving on the accepted socket.
+        """
+        if self._enabled or self._accepted_sock is None:
+            return
+
+        self._enabled = True
+
+        sock = self._accepted_sock
+        self._accepted_sock = None
+
+        self._attach_socket(sock)
+
+    def disable(self):
+        """Disable the connection.
+
+        Closes the connection.
+        """
+        if not self._enabled:
+            return
+
+        self._enabled = False
+
+        self.disconnect()
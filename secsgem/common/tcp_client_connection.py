@@ -19,17 +19,24 @@ from __future__ import annotations
 
 import socket
 import threading
-import time
 import typing
 
+from .reconnect import ReconnectStatistics, reconnect_delay
 from .tcp_connection import TcpConnection
+from .timer_wheel import TimerWheel, WheelTimer
 
 if typing.TYPE_CHECKING:
     import secsgem.common
 
 
 class TcpClientConnection(TcpConnection):
-    """Client class for single tcp client connection."""
+    """Client class for single tcp client connection.
+
+    Connect attempts are scheduled on the shared :class:`secsgem.common.TimerWheel`, or the timer wheel set as
+    reconnect scheduler in the settings, so no thread is running while waiting for the next attempt. After a failed
+    attempt the delay grows from T5 with the reconnect backoff, a random jitter is added to spread the attempts of
+    connections dropped together.
+    """
 
     def __init__(self, settings: secsgem.common.Settings):
         """Initialize a TCP client connection.
@@ -44,101 +51,120 @@ class TcpClientConnection(TcpConnection):
         # initially not enabled
         self.enabled = False
 
-        # reconnect thread required for client connection
-        self.connection_thread = None
-        self.stop_connection_thread = False
+        # connect attempts are running in a short lived thread, scheduled by the timer wheel
+        self.connection_thread: threading.Thread | None = None
+        self._connect_timer: WheelTimer | None = None
+        self._connect_lock = threading.Lock()
 
-        # flag if this is the first connection since enable
-        self.first_connection = True
+        self._reconnect_scheduler: TimerWheel = getattr(settings, "reconnect_scheduler", None) or TimerWheel.default()
+        self._reconnect_statistics = ReconnectStatistics()
 
         self.on_disconnected.register(self._disconnected)
 
+    @property
+    def reconnect_statistics(self) -> ReconnectStatistics:
+        """Get the reconnect statistics of this connection."""
+        return self._reconnect_statistics
+
     def _disconnected(self, _: dict[str, typing.Any]):
         """Signal from super that the connection was closed.
 
         This is required to initiate the reconnect if the connection is still enabled
         """
-        if self.enabled:
-            self.__start_connect_thread()
+        self.__schedule_connect(self.__reconnect_delay())
 
     def enable(self):
         """Enable the connection.
 
         Starts the client connection process to the remote.
         """
-        # only start if not already enabled
-        if not self.enabled:
-            # reset first connection to eliminate reconnection timeout
-            self.first_connection = True
+        with self._connect_lock:
+            # only start if not already enabled
+            if self.enabled:
+                return
+
+            self._reconnect_statistics.consecutive_failures = 0
 
             # mark connection as enabled
             self.enabled = True
 
-            # start the connection thread
-            self.__start_connect_thread()
+        # the first attempt is started right away
+        self.__schedule_connect(0.0)
 
     def disable(self):
         """Disable the connection.
 
         Stops all connection attempts, and closes the connection
         """
-        # only stop if enabled
-        if self.enabled:
-            # mark connection as disabled
-            self.enabled = False
+        with self._connect_lock:
+            # only stop if enabled
+            if not self.enabled:
+                return
 
-            # stop connection thread if it is running
-            if self.connection_thread and self.connection_thread.is_alive():
-                self.stop_connection_thread = True
+            # mark connection as disabled, no more attempts are scheduled or started
+            self.enabled = False
 
-            # wait for connection thread to stop
-            while self.stop_connection_thread:
-                time.sleep(0.2)
+            if self._connect_timer is not None:
+                self._connect_timer.cancel()
+                self._connect_timer = None
 
-            # disconnect super class
-            self.disconnect()
+            connection_thread = self.connection_thread
 
-    def __idle(self, timeout: float):
-        """Wait until timeout elapsed or connection thread is stopped.
+        # wait for a running attempt to finish
+        if connection_thread is not None and connection_thread is not threading.current_thread():
+            connection_thread.join()
 
-        Args:
-            timeout: number of seconds to wait
+        # disconnect super class
+        self.disconnect()
 
-        Returns:
-                False if thread was stopped
+    def __reconnect_delay(self) -> float:
+        return reconnect_delay(
+            self._settings.timeouts.t5,
+            self._reconnect_statistics.consecutive_failures,
+            getattr(self._settings, "reconnect_backoff", 1.0),
+            getattr(self._settings, "reconnect_max_delay", 0.0),
+            getattr(self._settings, "reconnect_jitter", 0.0),
+        )
 
-        """
-        for _ in range(int(timeout) * 5):
-            time.sleep(0.2)
+    def __schedule_connect(self, delay: float):
+        with self._connect_lock:
+            if not self.enabled:
+                return
 
-            # check if connection was disabled
-            if self.stop_connection_thread:
-                self.stop_connection_thread = False
-                return False
+            if delay > 0:
+                self._reconnect_statistics.last_delay = delay
+                self._logger.debug("next connect attempt in %.3f s", delay)
 
-        return True
+            self._connect_timer = self._reconnect_scheduler.schedule(delay, self.__start_connect_thread)
 
     def __start_connect_thread(self):
-        self.connection_thread = threading.Thread(
-            target=self.__connect_thread, name=f"secsgem_tcpClientConnection_connectThread_{self._settings.address}"
-        )
-        self.connection_thread.start()
+        """Scheduler callback, the attempt is run in a separate thread, so the scheduler is not blocked."""
+        with self._connect_lock:
+            if not self.enabled:
+                return
+
+            self._connect_timer = None
+
+            self.connection_thread = threading.Thread(
+                target=self.__connect_thread,
+                name=f"secsgem_tcpClientConnection_connectThread_{self._endpoint_name}",
+            )
+            self.connection_thread.start()
 
     def __connect_thread(self):
-        """Thread function to (re)connect client connection to remote host.
+        """Thread function for a connect attempt to the remote host.
 
         .. warning:: Do not call this directly, for internal use only.
         """
-        # wait for timeout if this is not the first connection
-        if not self.first_connection and not self.__idle(self._settings.timeouts.t5):
+        self._reconnect_statistics.attempts += 1
+
+        if self.__connect():
             return
 
-        self.first_connection = False
+        self._reconnect_statistics.failures += 1
+        self._reconnect_statistics.consecutive_failures += 1
 
-        # try to connect to remote
-        while not self.__connect():
-            if not self.__idle(self._settings.timeouts.t5):
-                return
+        self.__schedule_connect(self.__reconnect_delay())
 
     def __connect(self):
         """Open connection to remote host.
@@ -148,33 +174,26 @@ class TcpClientConnection(TcpConnection):
 
         """
         # create socket
-        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock = socket.socket(self.address_family, socket.SOCK_STREAM)
 
-        # setup socket
-        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # setup socket, before connecting so the buffer sizes are used for the window negotiation
+        self._tcp_options.apply(self._socket)
 
-        self._logger.debug("connecting to %s:%d", self._settings.address, self._settings.port)
+        self._logger.debug("connecting to %s", self._endpoint_name)
 
         # try to connect socket
         try:
-            self._socket.connect((self._settings.address, self._settings.port))
-        except OSError:
-            self._logger.debug("connecting to %s:%d failed", self._settings.address, self._settings.port)
+            self._socket.connect(self._endpoint)
+        except OSError as exc:
+            self._logger.debug("connecting to %s failed", self._endpoint_name)
+            self._socket.close()
+            self._reconnect_statistics.last_error = str(exc)
             return False
 
-        # make socket nonblocking
-        self._socket.setblocking(0)
-
-        # mark connection as connected
-        self._connected = True
+        self._reconnect_statistics.connects += 1
+        self._reconnect_statistics.consecutive_failures = 0
 
-        # start the receiver thread
-        self._start_receiver()
-
-        # send event
-        try:
-            self.on_connected({"source": self})
-        except Exception:  # pylint: disable=broad-except
-            self._logger.exception("ignoring exception for on_connected handler")
+        # start receiving and send event
+        self._attach_socket(self._socket)
 
         return True
@@ -17,18 +17,20 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
 import select
+import socket
+import struct
 import threading
-import time
 import typing
 
 from .connection import Connection
-from .helpers import format_hex, is_errorcode_ewouldblock
+from .helpers import format_hex, is_errorcode_ewouldblock, wait_for_writable
+from .tcp_options import TcpOptions
 
 if typing.TYPE_CHECKING:
-    import socket
-
+    from .reactor import Reactor
     from .settings import Settings
 
 
@@ -38,6 +40,18 @@ class TcpConnection(Connection):
     select_timeout = 0.5
     """Timeout for select calls ."""
 
+    receive_buffer_size = 65536
+    """Default number of bytes read from the socket at once, if not configured in the settings."""
+
+    max_receive_size = 16 * 1024 * 1024
+    """Upper limit for the number of bytes read from the socket at once."""
+
+    max_send_buffers = 64
+    """Maximum number of buffers passed to a single gather write."""
+
+    address_family = socket.AF_INET
+    """Address family of the sockets."""
+
     def __init__(self, settings: Settings):
         """Initialize a TCP connection.
 
@@ -56,6 +70,27 @@ class TcpConnection(Connection):
         # receiving thread flags
         self._thread_running = False
         self._stop_thread = False
+        self._receiver_thread: threading.Thread | None = None
+        self._receiver_wakeup: tuple[socket.socket, socket.socket] | None = None
+
+        # shared reactor, receiver threads are used if not set
+        self._reactor: Reactor | None = getattr(settings, "reactor", None)
+        self._reactor_lock = threading.Lock()
+        self._reactor_registered = False
+        self._teardown_thread: threading.Thread | None = None
+
+        # read size, grows while a large block is pending
+        self._receive_size: int = getattr(settings, "receive_buffer_size", self.receive_buffer_size)
+
+        # length header of the blocks, used to size the reads according to the pending block
+        length_header_format: str | None = getattr(settings, "length_header_format", None)
+        self._length_header = struct.Struct(length_header_format) if length_header_format is not None else None
+        self._block_header = bytearray()
+        self._block_remaining = 0
+
+        # socket options, quick acknowledgement has to be renewed after each read
+        self._tcp_options: TcpOptions = getattr(settings, "tcp_options", None) or TcpOptions()
+        self._quickack = self._tcp_options.quickack and self.address_family != getattr(socket, "AF_UNIX", None)
 
     @property
     def _socket(self) -> socket.socket:
@@ -64,6 +99,16 @@ class TcpConnection(Connection):
 
         return self._sock
 
+    @property
+    def _endpoint(self) -> typing.Any:
+        """Address to connect or bind the socket to."""
+        return (self._settings.address, self._settings.port)
+
+    @property
+    def _endpoint_name(self) -> str:
+        """Address for log messages and thread names."""
+        return f"{self._settings.address}:{self._settings.port}"
+
     def _serialize_data(self):
         """Return data for serialization.
 
@@ -82,26 +127,61 @@ class TcpConnection(Connection):
     def __str__(self):
         """Get the contents of this object as a string."""
         return (
-            f"{self._settings.connect_mode} connection to "
-            f"{self._settings.address}:{self._settings.port}"
-            f" session_id={self._settings.session_id}"
+            f"{self._settings.connect_mode} connection to {self._endpoint_name} session_id={self._settings.session_id}"
         )
 
+    def _attach_socket(self, sock: socket.socket):
+        """Use a connected socket for this connection, start receiving and notify the listeners.
+
+        Args:
+            sock: connected socket
+
+        """
+        self._sock = sock
+
+        # setup socket
+        self._tcp_options.apply(self._socket)
+
+        # make socket nonblocking
+        self._socket.setblocking(False)
+
+        # mark connection as connected
+        self._connected = True
+
+        # start the receiver thread
+        self._start_receiver()
+
+        # send event
+        try:
+            self.on_connected({"source": self})
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("ignoring exception for on_connected handler")
+
     def _start_receiver(self):
-        """Start the thread for receiving and handling incoming messages.
+        """Start receiving and handling incoming messages.
 
-        Will also do the initial Select and Linktest requests.
+        If a reactor is configured, the socket is registered there, otherwise a receiver thread is started.
         """
+        self._block_header.clear()
+        self._block_remaining = 0
+
+        if self._reactor is not None:
+            self._thread_running = True
+            self._reactor_registered = True
+            self._reactor.register(self._socket, self._on_socket_readable)
+            return
+
+        # socket pair to wake up the receiver thread from its select on disconnect
+        self._receiver_wakeup = socket.socketpair()
+        self._thread_running = True
+
         # start data receiving thread
-        threading.Thread(
+        self._receiver_thread = threading.Thread(
             target=self.__receiver_thread,
-            args=(),
-            name=f"secsgem_tcpConnection_receiver_{self._settings.address}:{self._settings.port}",
-        ).start()
-
-        # wait until thread is running
-        while not self._thread_running:
-            pass
+            args=(self._receiver_wakeup,),
+            name=f"secsgem_tcpConnection_receiver_{self._endpoint_name}",
+        )
+        self._receiver_thread.start()
 
     def disconnect(self):
         """Close connection."""
@@ -112,12 +192,19 @@ class TcpConnection(Connection):
         # set disconnecting flag to avoid another select
         self._disconnecting = True
 
-        # set flag to stop the thread
-        self._stop_thread = True
+        if self._reactor is not None:
+            if self._detach_from_reactor():
+                self._close_connection()
+            elif self._teardown_thread is not None and self._teardown_thread is not threading.current_thread():
+                self._teardown_thread.join()
+        else:
+            # set flag to stop the thread and wake it up
+            self._stop_thread = True
+            self.__wake_receiver()
 
-        # wait until thread stopped
-        while self._thread_running:
-            pass
+            # wait until thread stopped
+            if self._receiver_thread is not None and self._receiver_thread is not threading.current_thread():
+                self._receiver_thread.join()
 
         # clear disconnecting flag, no selects coming any more
         self._disconnecting = False
@@ -132,69 +219,221 @@ class TcpConnection(Connection):
             True if succeeded, False if failed
 
         """
-        retry = True
+        return self.send_buffers([data])
 
-        # not sent yet, retry
-        while retry:
-            # wait until socket is writable
-            while not select.select([], [self._socket], [], self.select_timeout)[1]:
-                pass
+    def send_buffers(self, buffers: typing.Sequence[bytes | memoryview]) -> bool:
+        """Send a list of buffers to the remote host, as if they were concatenated.
 
-            try:
-                # send message
-                self._socket.send(data)
+        The buffers are passed to the socket without joining them (gather write), partial writes are continued until
+        all data is sent.
+
+        Args:
+            buffers: encoded data.
 
-                # retry will be cleared if send succeeded
-                retry = False
+        Returns:
+            True if succeeded, False if failed
+
+        """
+        if self._bytestream_logger.isEnabledFor(logging.DEBUG):
+            self._bytestream_logger.debug("> %s", format_hex(b"".join(buffers)))
+
+        pending = [memoryview(buffer).cast("B") for buffer in buffers if len(buffer) > 0]
+
+        while pending:
+            try:
+                sent = self.__send_pending(pending)
             except OSError as exc:
                 if not is_errorcode_ewouldblock(exc.errno):
                     # raise if not EWOULDBLOCK
                     return False
-                # it is EWOULDBLOCK, so retry sending
 
-            self._bytestream_logger.debug("> %s", format_hex(data))
+                # it is EWOULDBLOCK, so wait until socket is writable and retry sending
+                while not wait_for_writable(self._socket, self.select_timeout):
+                    pass
+
+                continue
+
+            # drop the buffers that were sent completely and continue with the remainder of a partially sent one
+            while sent > 0:
+                if sent < len(pending[0]):
+                    pending[0] = pending[0][sent:]
+                    break
+
+                sent -= len(pending.pop(0))
+
+        return True
+
+    def __send_pending(self, pending: list[memoryview]) -> int:
+        """Send as much of the pending buffers as the socket takes.
+
+        Args:
+            pending: buffers to send
+
+        Returns:
+            number of bytes sent
+
+        """
+        if hasattr(self._socket, "sendmsg"):
+            return self._socket.sendmsg(pending[: self.max_send_buffers])
+
+        # no gather write available (windows), send the buffers one by one
+        return self._socket.send(pending[0])
+
+    def _next_receive_size(self) -> int:
+        """Get the number of bytes to read from the socket next.
+
+        While the remainder of a block is pending, the read size grows to the bytes missing, so a large block arrives
+        in a few reads.
+
+        Returns:
+            number of bytes to read
+
+        """
+        if self._block_remaining <= self._receive_size:
+            return self._receive_size
+
+        return min(self._block_remaining, self.max_receive_size)
+
+    def _track_blocks(self, data: memoryview):
+        """Follow the block boundaries in the received data to find the size of the pending block.
+
+        Args:
+            data: received data
+
+        """
+        if self._length_header is None:
+            return
+
+        position = 0
+        length = len(data)
+
+        while position < length:
+            if self._block_remaining > 0:
+                step = min(self._block_remaining, length - position)
+                self._block_remaining -= step
+                position += step
+                continue
+
+            missing = self._length_header.size - len(self._block_header)
+            self._block_header += data[position : position + missing]
+            position += missing
+
+            if len(self._block_header) == self._length_header.size:
+                self._block_remaining = self._length_header.unpack(self._block_header)[0]
+                self._block_header.clear()
+
+    def _receive(self) -> bool:
+        """Read the available data from the socket and pass it to the listeners.
+
+        Returns:
+            False if the socket was closed by the remote
+
+        """
+        size = self._next_receive_size()
+
+        try:
+            # get data from socket, recv trims the bytes object to the received size without copying again
+            recv_data = self._socket.recv(size)
+        except OSError as exc:
+            if not is_errorcode_ewouldblock(exc.errno):
+                raise exc
+
+            return True
+
+        # check if socket was closed
+        if not recv_data:
+            return False
+
+        if self._quickack:
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+        self._track_blocks(memoryview(recv_data))
+
+        if self._bytestream_logger.isEnabledFor(logging.DEBUG):
+            self._bytestream_logger.debug("< %s", format_hex(recv_data))
+
+        # add received data to input buffer
+        self.on_data({"source": self, "data": recv_data})
 
         return True
 
-    def __receiver_thread_read_data(self):
+    def __wake_receiver(self):
+        """Wake up the receiver thread waiting for data."""
+        if self._receiver_wakeup is None:
+            return
+
+        with contextlib.suppress(OSError):
+            self._receiver_wakeup[1].send(b"\x00")
+
+    def __receiver_thread_read_data(self, wakeup: socket.socket):
         # check if shutdown requested
         while not self._stop_thread:
             # check if data available
-            select_result = select.select([self._socket], [], [self._socket], self.select_timeout)
+            select_result = select.select([self._socket, wakeup], [], [self._socket], self.select_timeout)
 
             # check if disconnection was started
-            if self._disconnecting:
-                time.sleep(0.2)
-                continue
+            if self._stop_thread or self._disconnecting:
+                return
 
-            if select_result[0]:
-                try:
-                    # get data from socket
-                    recv_data = self._socket.recv(1024)
+            if self._socket in select_result[0] and not self._receive():
+                self._connected = False
+                return
 
-                    # check if socket was closed
-                    if len(recv_data) == 0:
-                        self._connected = False
-                        self._stop_thread = True
-                        continue
+    def __receiver_thread(self, wakeup: tuple[socket.socket, socket.socket]):
+        """Thread for receiving incoming data and adding it to the receive buffer.
 
-                    self._bytestream_logger.debug("< %s", format_hex(recv_data))
+        Args:
+            wakeup: socket pair used to interrupt waiting for data
 
-                    # add received data to input buffer
-                    self.on_data({"source": self, "data": recv_data})
-                except OSError as exc:
-                    if not is_errorcode_ewouldblock(exc.errno):
-                        raise exc
+        """
+        try:
+            self.__receiver_thread_read_data(wakeup[0])
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("exception")
 
-    def __receiver_thread(self):
-        """Thread for receiving incoming data and adding it to the receive buffer."""
-        self._thread_running = True
+        self._receiver_wakeup = None
+        wakeup[0].close()
+        wakeup[1].close()
 
+        self._close_connection()
+
+    def _on_socket_readable(self):
+        """Reactor callback for incoming data."""
         try:
-            self.__receiver_thread_read_data()
+            alive = self._receive()
         except Exception:  # pylint: disable=broad-except
             self._logger.exception("exception")
+            alive = False
+
+        if alive or not self._detach_from_reactor():
+            return
+
+        # closing notifies the listeners, which might block, so don't do that in the reactor thread
+        self._teardown_thread = threading.Thread(
+            target=self._close_connection,
+            name=f"secsgem_tcpConnection_teardown_{self._endpoint_name}",
+            daemon=True,
+        )
+        self._teardown_thread.start()
+
+    def _detach_from_reactor(self) -> bool:
+        """Unregister the socket from the reactor.
+
+        Returns:
+            True if the caller is responsible for closing the connection
+
+        """
+        with self._reactor_lock:
+            if self._reactor is None or not self._reactor_registered:
+                return False
+
+            self._reactor_registered = False
+
+        self._reactor.unregister(self._socket)
+        return True
 
+    def _close_connection(self):
+        """Notify listeners, close the socket and reset the connection state."""
         # notify listeners of disconnection
         try:
             self.on_disconnecting({"source": self})
@@ -0,0 +1,184 @@
+#####################################################################
+# tcp_options.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""TCP socket options class."""
+
+from __future__ import annotations
+
+import logging
+import socket
+
+
+class _TcpOption:
+    def __init__(self, name: str, default: bool | int | None, help_text: str, level: str, option: str) -> None:
+        self._name = name
+        self._default = default
+        self._help = help_text
+        self._level = level
+        self._option = option
+
+    @property
+    def name(self) -> str:
+        """Get the option name."""
+        return self._name
+
+    @property
+    def default(self) -> bool | int | None:
+        """Get the default option value."""
+        return self._default
+
+    @property
+    def help(self) -> str:
+        """Get the help text for the option."""
+        return self._help
+
+    @property
+    def level(self) -> int:
+        """Get the protocol level of the socket option."""
+        return getattr(socket, self._level)
+
+    @property
+    def option(self) -> int | None:
+        """Get the socket option, None if not supported on this platform."""
+        return getattr(socket, self._option, None)
+
+    @property
+    def option_name(self) -> str:
+        """Get the name of the socket option."""
+        return self._option
+
+
+class TcpOptions:
+    r"""TCP socket options.
+
+    Options set to None are not touched, so the system default is used.
+
+    Example:
+        >>> import secsgem.common
+        >>> options = secsgem.common.TcpOptions(tcp_nodelay=False, so_rcvbuf=262144)
+        >>> options.tcp_nodelay
+        False
+        >>> options.so_rcvbuf
+        262144
+        >>> options.tcp_keepidle is None
+        True
+
+    .. exec::
+        import secsgem.common.tcp_options
+
+        for option in secsgem.common.tcp_options.TcpOptions.options():
+            print(f".. attribute:: {option.name}\n\n"
+                    f"   :type: {option.default.__class__.__name__}\n"
+                    f"   :value: {option.default}\n"
+                    f"   {option.help}")
+
+    """
+
+    @classmethod
+    def options(cls) -> list[_TcpOption]:
+        """Get a list of available options."""
+        return [
+            _TcpOption(
+                "tcp_nodelay", True, "Send small blocks without waiting (no Nagle)", "IPPROTO_TCP", "TCP_NODELAY"
+            ),
+            _TcpOption("so_keepalive", True, "Send keepalive probes on idle connections", "SOL_SOCKET", "SO_KEEPALIVE"),
+            _TcpOption(
+                "tcp_keepidle", None, "Seconds of idle time before keepalive probes", "IPPROTO_TCP", "TCP_KEEPIDLE"
+            ),
+            _TcpOption("tcp_keepintvl", None, "Seconds between keepalive probes", "IPPROTO_TCP", "TCP_KEEPINTVL"),
+            _TcpOption(
+                "tcp_keepcnt", None, "Unanswered keepalive probes before disconnect", "IPPROTO_TCP", "TCP_KEEPCNT"
+            ),
+            _TcpOption("so_sndbuf", None, "Size of the socket send buffer in bytes", "SOL_SOCKET", "SO_SNDBUF"),
+            _TcpOption("so_rcvbuf", None, "Size of the socket receive buffer in bytes", "SOL_SOCKET", "SO_RCVBUF"),
+            _TcpOption(
+                "tcp_quickack", False, "Acknowledge data immediately (Linux only)", "IPPROTO_TCP", "TCP_QUICKACK"
+            ),
+        ]
+
+    def __init__(self, **kwargs) -> None:
+        """TCP options initializer.
+
+        All arguments are optional.
+        The default value will be used, when an argument is omitted.
+
+        Args:
+            **kwargs: keyword arguments, see below
+
+        Keyword Args:
+            tcp_nodelay: Send small blocks without waiting, disables Nagle's algorithm (TCP_NODELAY)
+            so_keepalive: Send keepalive probes on idle connections (SO_KEEPALIVE)
+            tcp_keepidle: Seconds of idle time before keepalive probes (TCP_KEEPIDLE)
+            tcp_keepintvl: Seconds between keepalive probes (TCP_KEEPINTVL)
+            tcp_keepcnt: Unanswered keepalive probes before disconnect (TCP_KEEPCNT)
+            so_sndbuf: Size of the socket send buffer in bytes (SO_SNDBUF)
+            so_rcvbuf: Size of the socket receive buffer in bytes (SO_RCVBUF)
+            tcp_quickack: Acknowledge received data immediately (TCP_QUICKACK, Linux only)
+
+        """
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._data = {}
+
+        for option in self.options():
+            self._data[option.name] = kwargs.get(option.name, option.default)
+
+    def __getattr__(self, name: str):
+        """Get an attribute.
+
+        Args:
+            name: attribute name
+
+        Returns:
+            attribute value
+
+        """
+        if name not in self._data:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+        return self._data[name]
+
+    @property
+    def quickack(self) -> bool:
+        """Check if quick acknowledgement is enabled and supported.
+
+        The kernel falls back to delayed acknowledgement after a while, so it has to be set again after each read.
+        """
+        return bool(self._data["tcp_quickack"]) and hasattr(socket, "TCP_QUICKACK")
+
+    def apply(self, sock: socket.socket):
+        """Set the options on a socket.
+
+        Options not supported on this platform are skipped with a warning.
+        On unix domain sockets only the socket level options are set.
+
+        Args:
+            sock: socket to set the options on
+
+        """
+        tcp_socket = sock.family != getattr(socket, "AF_UNIX", None)
+
+        for option in self.options():
+            value = self._data[option.name]
+
+            if value is None or (not tcp_socket and option.level == socket.IPPROTO_TCP):
+                continue
+
+            if option.option is None:
+                if value:
+                    self._logger.warning("%s is not supported on this platform, ignoring", option.option_name)
+                continue
+
+            sock.setsockopt(option.level, option.option, int(value))
@@ -17,10 +17,10 @@
 
 from __future__ import annotations
 
+import contextlib
 import select
 import socket
 import threading
-import time
 import typing
 
 from .helpers import is_windows
@@ -35,6 +35,8 @@ class TcpServerConnection(TcpConnection):
 
     Creates a listening socket and waits for one incoming connection on this socket.
     After the connection is established the listening socket is closed.
+
+    If a reactor is configured, the listening socket is served by the reactor instead of a server thread.
     """
 
     def __init__(self, settings: Settings):
@@ -51,9 +53,10 @@ class TcpServerConnection(TcpConnection):
         self._enabled = False
 
         # reconnect thread required for server
-        self._server_thread = None
-        self._stop_server_thread = False
-        self._server_sock = None
+        self._server_thread: threading.Thread | None = None
+        self._stop_server_thread = threading.Event()
+        self._server_wakeup: tuple[socket.socket, socket.socket] | None = None
+        self._server_sock: socket.socket | None = None
 
         self.on_disconnected.register(self._disconnected)
 
@@ -89,76 +92,128 @@ class TcpServerConnection(TcpConnection):
             # mark connection as disabled
             self._enabled = False
 
+            # stop listening in reactor if still waiting for a connection
+            if self._reactor is not None:
+                self.__close_reactor_server_socket()
+
             # stop connection thread if it is running
-            if self._server_thread and self._server_thread.is_alive():
-                self._stop_server_thread = True
+            elif self._server_thread is not None:
+                self._stop_server_thread.set()
 
-                if self._server_sock:
-                    self._server_sock.close()
+                if self._server_wakeup is not None:
+                    with contextlib.suppress(OSError):
+                        self._server_wakeup[1].send(b"\x00")
 
                 # wait for connection thread to stop
-                while self._stop_server_thread:
-                    time.sleep(0.2)
+                if self._server_thread is not threading.current_thread():
+                    self._server_thread.join()
 
             # disconnect super class
             self.disconnect()
 
     def __start_server_thread(self):
+        if self._reactor is not None:
+            self._server_sock = self._create_server_socket()
+            self._server_sock.setblocking(False)
+            self._reactor.register(self._server_sock, self.__on_server_socket_readable)
+            return
+
+        # listen before returning, so a client connecting right after enable finds the socket
+        try:
+            server_sock = self._create_server_socket()
+        except OSError:
+            self._logger.exception("failed to listen on %s", self._endpoint_name)
+            return
+
+        # socket pair to wake up the server thread from its select on disable
+        self._stop_server_thread.clear()
+        self._server_wakeup = socket.socketpair()
+
         self._server_thread = threading.Thread(
-            target=self.__server_thread, name=f"secsgem_tcpServerConnection_serverThread_{self._settings.address}"
+            target=self.__server_thread,
+            args=(server_sock, self._server_wakeup),
+            name=f"secsgem_tcpServerConnection_serverThread_{self._endpoint_name}",
         )
         self._server_thread.start()
 
-    def __server_thread(self):
+    def __server_thread(self, server_sock: socket.socket, wakeup: tuple[socket.socket, socket.socket]):
         """Thread function to wait for incoming tcp connections.
 
         .. warning:: Do not call this directly, for internal use only.
-        """
-        self._server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
-        if not is_windows():
-            self._server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        Args:
+            server_sock: listening socket
+            wakeup: socket pair used to interrupt waiting for connections
 
-        self._server_sock.bind((self._settings.address, self._settings.port))
-        self._server_sock.listen(1)
+        """
+        self._server_sock = server_sock
 
-        while not self._stop_server_thread:
-            try:
-                select_result = select.select([self._server_sock], [], [], self.select_timeout)
-            except Exception as exc:  # pylint: disable=broad-except
-                self._logger.debug("select exception", exc_info=exc)
+        while not self._stop_server_thread.is_set():
+            select_result = select.select([server_sock, wakeup[0]], [], [], self.select_timeout)
 
-            if not select_result[0]:
-                # select timed out
+            if self._stop_server_thread.is_set() or server_sock not in select_result[0]:
                 continue
 
-            accept_result = self._server_sock.accept()
-            if accept_result is None:
-                continue
+            accept_result = server_sock.accept()
+
+            self._server_sock = None
+            server_sock.close()
+            self.__close_wakeup(wakeup)
+
+            self._attach_socket(accept_result[0])
 
-            (self._sock, (_, _)) = accept_result
+            return
+
+        self._server_sock = None
+        server_sock.close()
+        self.__close_wakeup(wakeup)
+
+    def __close_wakeup(self, wakeup: tuple[socket.socket, socket.socket]):
+        if self._server_wakeup is wakeup:
+            self._server_wakeup = None
+
+        wakeup[0].close()
+        wakeup[1].close()
+
+    def _create_server_socket(self) -> socket.socket:
+        """Create the listening socket.
+
+        Returns:
+            bound and listening socket
+
+        """
+        server_sock = socket.socket(self.address_family, socket.SOCK_STREAM)
+
+        if not is_windows():
+            server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        # accepted sockets inherit the buffer sizes, they are used for the window negotiation
+        self._tcp_options.apply(server_sock)
 
-            # setup socket
-            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        server_sock.bind(self._endpoint)
+        server_sock.listen(1)
 
-            # make socket nonblocking
-            self._socket.setblocking(0)
+        return server_sock
 
-            # mark connection as connected
-            self._connected = True
+    def __on_server_socket_readable(self):
+        """Reactor callback for incoming connections on the listening socket."""
+        if self._server_sock is None:
+            return
 
-            # start the receiver thread
-            self._start_receiver()
+        try:
+            accept_result = self._server_sock.accept()
+        except BlockingIOError:
+            return
 
-            # send event
-            try:
-                self.on_connected({"source": self})
-            except Exception:  # pylint: disable=broad-except
-                self._logger.exception("ignoring exception for on_connection_established handler")
+        self.__close_reactor_server_socket()
 
-            self._server_sock.shutdown(socket.SHUT_RDWR)
-            self._server_sock.close()
+        self._attach_socket(accept_result[0])
 
+    def __close_reactor_server_socket(self):
+        server_sock = self._server_sock
+        if server_sock is None or self._reactor is None:
             return
 
-        self._stop_server_thread = False
+        self._server_sock = None
+        self._reactor.unregister(server_sock)
+        server_sock.close()
@@ -0,0 +1,301 @@
+#####################################################################
+# timer_wheel.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Hierarchical timer wheel for the protocol timers of all connections."""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+import typing
+
+_LEVEL_BITS = 6
+_SLOTS = 1 << _LEVEL_BITS
+_SLOT_MASK = _SLOTS - 1
+_LEVELS = 4
+
+
+class WheelTimer:
+    """Handle for a scheduled callback, returned by :meth:`TimerWheel.schedule`."""
+
+    def __init__(self, wheel: TimerWheel, deadline: float, tick: int, callback: typing.Callable[[], None]) -> None:
+        """Initialize a timer.
+
+        Args:
+            wheel: wheel the timer is scheduled on
+            deadline: time the callback is due
+            tick: wheel tick the callback is due
+            callback: function to call
+
+        """
+        self._wheel = wheel
+        self._deadline = deadline
+        self._tick = tick
+        self._callback = callback
+        self._cancelled = False
+        self._slot: set[WheelTimer] | None = None
+
+    @property
+    def deadline(self) -> float:
+        """Get the time the callback is due."""
+        return self._deadline
+
+    @property
+    def cancelled(self) -> bool:
+        """Check if the timer was cancelled."""
+        return self._cancelled
+
+    def cancel(self):
+        """Cancel the timer, the callback will not be called if it is not running already."""
+        self._cancelled = True
+        self._wheel._remove(self)  # noqa: SLF001
+
+    def _fire(self):
+        if not self._cancelled:
+            self._callback()
+
+
+class TimerWheel:
+    """Timers of many connections, called from a single thread.
+
+    Timers are kept in slots of four wheels with 64 slots each, the first wheel has one slot per tick, each further
+    wheel one slot per turn of the previous wheel. Scheduling and cancelling a timer adds it to or removes it
+    from a slot. When a wheel completes a turn, the next slot of the following wheel is spread over the
+    previous wheels. No thread is running per timer, and the wheel thread only wakes up for the next slot holding
+    timers. Callbacks are never called before their deadline, but up to one resolution late.
+
+    Callbacks are called from the wheel thread, they must not block.
+
+    All protocols and client connections use :meth:`default`.
+
+    Example:
+        >>> import secsgem.common
+        >>>
+        >>> now = 0.0
+        >>> wheel = secsgem.common.TimerWheel(clock=lambda: now)
+        >>> timer = wheel.schedule(0.5, lambda: print("T6 expired"))
+        >>> now = 0.4
+        >>> wheel.advance()
+        0.1
+        >>> now = 0.5
+        >>> wheel.advance()
+        T6 expired
+
+    """
+
+    _default: TimerWheel | None = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        resolution: float = 0.01,
+        name: str = "secsgem_timerWheel",
+        clock: typing.Callable[[], float] | None = None,
+    ) -> None:
+        """Initialize a timer wheel.
+
+        Args:
+            resolution: duration of a tick in seconds
+            name: name of the wheel thread
+            clock: time source, the wheel has no thread and is driven by :meth:`advance` if set
+
+        """
+        self._resolution = resolution
+        self._name = name
+        self._clock = clock or time.monotonic
+        self._threaded = clock is None
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._origin = self._clock()
+        self._tick = 0
+        self._wheels: list[list[set[WheelTimer]]] = [[set() for _ in range(_SLOTS)] for _ in range(_LEVELS)]
+        self._overflow: set[WheelTimer] = set()
+        self._count = 0
+
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._wake_tick: int | None = None
+        self._woken = False
+
+    @classmethod
+    def default(cls) -> TimerWheel:
+        """Get the timer wheel shared by the process."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+
+            return cls._default
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {self._name} ({self._count} timers)"
+
+    @property
+    def pending(self) -> int:
+        """Get the number of scheduled timers."""
+        return self._count
+
+    def schedule(self, delay: float, callback: typing.Callable[[], None]) -> WheelTimer:
+        """Call a function after a delay.
+
+        Args:
+            delay: delay in seconds
+            callback: function to call
+
+        Returns:
+            timer handle to cancel the call
+
+        """
+        deadline = self._clock() + max(delay, 0.0)
+        timer = WheelTimer(self, deadline, math.ceil((deadline - self._origin) / self._resolution), callback)
+
+        with self._condition:
+            # nothing to expire while the wheel is empty, skip the ticks passed since
+            if self._count == 0:
+                self._tick = max(self._tick, self._current_tick())
+
+            self._place(timer, self._tick + 1)
+            self._count += 1
+
+            if self._threaded and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+
+            # wake the thread up if it sleeps past the new timer
+            if self._wake_tick is None or timer._tick < self._wake_tick:  # noqa: SLF001
+                self._wake_tick = timer._tick  # noqa: SLF001
+                self._woken = True
+                self._condition.notify()
+
+        return timer
+
+    def advance(self) -> float | None:
+        """Call the due timers.
+
+        Called by the wheel thread, or by the owner of a wheel with its own clock.
+
+        Returns:
+            seconds until the wheel has to be advanced again, None if no timer is scheduled
+
+        """
+        with self._condition:
+            due: list[WheelTimer] = []
+            target = self._current_tick()
+
+            # jump from slot to slot holding timers, the ticks in between have nothing to do
+            next_tick = self._next_tick()
+            while next_tick is not None and next_tick <= target:
+                self._tick = next_tick
+                self._cascade(next_tick)
+
+                slot = self._wheels[0][next_tick & _SLOT_MASK]
+                for timer in slot:
+                    timer._slot = None  # noqa: SLF001
+
+                due.extend(slot)
+                self._count -= len(slot)
+                slot.clear()
+
+                next_tick = self._next_tick()
+
+            self._tick = max(self._tick, target)
+
+            self._wake_tick = self._next_tick()
+            if self._wake_tick is not None:
+                delay: float | None = self._origin + self._wake_tick * self._resolution - self._clock()
+            else:
+                delay = None
+
+        for timer in sorted(due, key=lambda item: item.deadline):
+            self._fire(timer)
+
+        return None if delay is None else max(round(delay, 9), 0.0)
+
+    def _fire(self, timer: WheelTimer):
+        try:
+            timer._fire()  # noqa: SLF001
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("ignoring exception in timer callback")
+
+    def _current_tick(self) -> int:
+        return math.floor((self._clock() - self._origin) / self._resolution)
+
+    def _place(self, timer: WheelTimer, earliest: int):
+        due = max(timer._tick, earliest)  # noqa: SLF001
+
+        # lowest wheel where the due tick is in the current turn, relative to the current tick and not the earliest,
+        # a timer due on the first tick of the next turn is in a slot the search for the next tick reaches
+        for level in range(_LEVELS):
+            shift = _LEVEL_BITS * (level + 1)
+            if due >> shift == self._tick >> shift:
+                slot = self._wheels[level][(due >> (_LEVEL_BITS * level)) & _SLOT_MASK]
+                break
+        else:
+            slot = self._overflow
+
+        slot.add(timer)
+        timer._slot = slot  # noqa: SLF001
+
+    def _cascade(self, tick: int):
+        # spread the slots starting with this tick over the lower wheels, from the highest wheel down
+        if tick & ((1 << (_LEVEL_BITS * _LEVELS)) - 1) == 0:
+            self._respread(self._overflow, tick)
+
+        for level in range(_LEVELS - 1, 0, -1):
+            if tick & ((1 << (_LEVEL_BITS * level)) - 1) == 0:
+                self._respread(self._wheels[level][(tick >> (_LEVEL_BITS * level)) & _SLOT_MASK], tick)
+
+    def _respread(self, slot: set[WheelTimer], tick: int):
+        timers = list(slot)
+        slot.clear()
+
+        for timer in timers:
+            self._place(timer, tick)
+
+    def _next_tick(self) -> int | None:
+        if self._count == 0:
+            return None
+
+        # first slot holding timers after the current one, on the lowest wheel having one in its current turn
+        for level in range(_LEVELS):
+            shift = _LEVEL_BITS * level
+            turn_start = (self._tick >> (shift + _LEVEL_BITS)) << (shift + _LEVEL_BITS)
+
+            slots = self._wheels[level]
+            for index in range(((self._tick >> shift) & _SLOT_MASK) + 1, _SLOTS):
+                if slots[index]:
+                    return turn_start + (index << shift)
+
+        # only the overflow left, spread at the end of the turn of the highest wheel
+        return ((self._tick >> (_LEVEL_BITS * _LEVELS)) + 1) << (_LEVEL_BITS * _LEVELS)
+
+    def _remove(self, timer: WheelTimer):
+        with self._condition:
+            if timer._slot is not None:  # noqa: SLF001
+                timer._slot.discard(timer)  # noqa: SLF001
+                timer._slot = None  # noqa: SLF001
+                self._count -= 1
+
+    def _run(self):
+        while True:
+            delay = self.advance()
+
+            with self._condition:
+                if not self._woken:
+                    self._condition.wait(delay)
+
+                self._woken = False
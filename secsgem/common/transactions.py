@@ -0,0 +1,165 @@
+#####################################################################
+# transactions.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Open transactions waiting for their response."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import typing
+
+from .message import MessageT
+from .timer_wheel import TimerWheel
+
+
+class TransactionTable(typing.Generic[MessageT]):
+    """Futures of the open transactions by system id.
+
+    A transaction is a future in a dict, resolved with the response message or None if the deadline passed before
+    the response arrived. Cancelling the future closes the transaction, a late response is handled like an
+    unsolicited message.
+
+    A thread waiting with :meth:`wait` gives up :attr:`wait_margin` seconds after the deadline, even if the timer
+    wheel didn't expire the transaction.
+
+    Example:
+        >>> table = TransactionTable()
+        >>> future = table.open(101)
+        >>> 101 in table
+        True
+        >>> table.resolve(101, None)
+        True
+        >>> future.done(), 101 in table
+        (True, False)
+
+    """
+
+    wait_margin = 1.0
+    """Seconds a waiting thread waits beyond the deadline before it closes the transaction itself."""
+
+    def __init__(self, timers: TimerWheel | None = None) -> None:
+        """Initialize a transaction table.
+
+        Args:
+            timers: timer wheel for the deadlines, the shared wheel is used if None
+
+        """
+        self._transactions: dict[int, concurrent.futures.Future[MessageT | None]] = {}
+        self._timers = timers or TimerWheel.default()
+
+    def __contains__(self, system: int) -> bool:
+        """Check if a transaction is open for a system id."""
+        return system in self._transactions
+
+    def __len__(self) -> int:
+        """Get the number of open transactions."""
+        return len(self._transactions)
+
+    def open(self, system: int, timeout: float | None = None) -> concurrent.futures.Future[MessageT | None]:
+        """Open a transaction for a system id.
+
+        Args:
+            system: system id of the request
+            timeout: seconds after which the future is resolved with None, no deadline until :meth:`arm` if None
+
+        Returns:
+            future resolved with the response
+
+        """
+        future: concurrent.futures.Future[MessageT | None] = concurrent.futures.Future()
+        self._transactions[system] = future
+
+        future.add_done_callback(lambda _: self._close(system, future))
+
+        if timeout is not None:
+            self.arm(system, timeout)
+
+        return future
+
+    def arm(self, system: int, timeout: float):
+        """Start the deadline of an open transaction, e.g. T3 after the request was sent.
+
+        Args:
+            system: system id of the request
+            timeout: seconds after which the future is resolved with None
+
+        """
+        future = self._transactions.get(system)
+        if future is None:
+            return
+
+        timer = self._timers.schedule(timeout, lambda: self._expire(system, future))
+        future.add_done_callback(lambda _: timer.cancel())
+
+    def wait(self, system: int, future: concurrent.futures.Future[MessageT | None], timeout: float) -> MessageT | None:
+        """Start the deadline of an open transaction and wait for the response.
+
+        Args:
+            system: system id of the request
+            future: future returned by :meth:`open` for the system id
+            timeout: seconds after which the future is resolved with None
+
+        Returns:
+            response message, None if the transaction failed or timed out
+
+        """
+        self.arm(system, timeout)
+
+        try:
+            return future.result(timeout + self.wait_margin)
+        except concurrent.futures.TimeoutError:
+            # the deadline wasn't enforced, e.g. the timer wheel is stalled
+            if future.cancel():
+                return None
+
+        # resolved concurrently
+        return future.result()
+
+    def resolve(self, system: int, message: MessageT | None) -> bool:
+        """Resolve the transaction of a system id.
+
+        Args:
+            system: system id of the response
+            message: response message, None if the transaction failed
+
+        Returns:
+            True if a transaction was waiting for the response
+
+        """
+        future = self._transactions.pop(system, None)
+        if future is None:
+            return False
+
+        try:
+            future.set_result(message)
+        except concurrent.futures.InvalidStateError:
+            # cancelled or timed out concurrently
+            return False
+
+        return True
+
+    def resolve_all(self):
+        """Resolve all open transactions with None, e.g. when the connection is lost."""
+        for system in list(self._transactions):
+            self.resolve(system, None)
+
+    def _expire(self, system: int, future: concurrent.futures.Future[MessageT | None]):
+        if self._transactions.get(system) is future:
+            self.resolve(system, None)
+
+    def _close(self, system: int, future: concurrent.futures.Future[MessageT | None]):
+        # the system id might be reused by a newer transaction already
+        if self._transactions.get(system) is future:
+            self._transactions.pop(system, None)
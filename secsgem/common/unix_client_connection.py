@@ -0,0 +1,56 @@
+#####################################################################
+# unix_client_connection.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Unix domain socket client connection."""
+
+from __future__ import annotations
+
+import socket
+
+from .tcp_client_connection import TcpClientConnection
+
+
+class UnixClientConnection(TcpClientConnection):
+    """Client connection to a unix domain socket of a process on the same host.
+
+    Works like :class:`secsgem.common.TcpClientConnection`, with the socket path from the settings
+    instead of address and port.
+    """
+
+    address_family = getattr(socket, "AF_UNIX", socket.AF_INET)
+
+    @property
+    def _endpoint(self) -> str:
+        """Path of the socket to connect to."""
+        return self._settings.socket_path
+
+    @property
+    def _endpoint_name(self) -> str:
+        """Path of the socket for log messages and thread names."""
+        return self._settings.socket_path
+
+    def _serialize_data(self):
+        """Return data for serialization.
+
+        Returns:
+            data to serialize for this object
+
+        """
+        return {
+            "connect_mode": self._settings.connect_mode,
+            "socketPath": self._settings.socket_path,
+            "session_id": self._settings.session_id,
+            "connected": self._connected,
+        }
@@ -0,0 +1,98 @@
+#####################################################################
+# unix_server_connection.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Unix domain socket server connection."""
+
+from __future__ import annotations
+
+import contextlib
+import pathlib
+import socket
+import stat
+
+from .tcp_server_connection import TcpServerConnection
+
+
+class UnixServerConnection(TcpServerConnection):
+    """Server connection listening on a unix domain socket for a process on the same host.
+
+    Works like :class:`secsgem.common.TcpServerConnection`, with the socket path from the settings
+    instead of address and port.
+    A socket file left over at the path is replaced, the file is removed when the connection is disabled.
+    """
+
+    address_family = getattr(socket, "AF_UNIX", socket.AF_INET)
+
+    @property
+    def _endpoint(self) -> str:
+        """Path of the socket to listen on."""
+        return self._settings.socket_path
+
+    @property
+    def _endpoint_name(self) -> str:
+        """Path of the socket for log messages and thread names."""
+        return self._settings.socket_path
+
+    def _serialize_data(self):
+        """Return data for serialization.
+
+        Returns:
+            data to serialize for this object
+
+        """
+        return {
+            "connect_mode": self._settings.connect_mode,
+            "socketPath": self._settings.socket_path,
+            "session_id": self._settings.session_id,
+            "connected": self._connected,
+        }
+
+    def _create_server_socket(self) -> socket.socket:
+        """Create the listening socket, replacing a stale socket file.
+
+        Returns:
+            bound and listening socket
+
+        """
+        self.__remove_socket_file()
+
+        server_sock = socket.socket(self.address_family, socket.SOCK_STREAM)
+
+        self._tcp_options.apply(server_sock)
+
+        server_sock.bind(self._endpoint)
+        server_sock.listen(1)
+
+        return server_sock
+
+    def disable(self):
+        """Disable the connection.
+
+        Stops listening, closes the connection and removes the socket file.
+        """
+        enabled = self._enabled
+
+        super().disable()
+
+        if enabled:
+            self.__remove_socket_file()
+
+    def __remove_socket_file(self):
+        # only socket files are removed, other files make the bind fail
+        path = pathlib.Path(self._endpoint)
+
+        with contextlib.suppress(FileNotFoundError):
+            if stat.S_ISSOCK(path.stat().st_mode):
+                path.unlink()
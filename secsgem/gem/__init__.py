@@ -16,6 +16,8 @@
 """module imports."""
 
 from .alarm import Alarm
+from .async_handler import AsyncGemHandler
+from .async_hosthandler import AsyncGemHostHandler
 from .collection_event import CollectionEvent, CollectionEventId
 from .collection_event_link import CollectionEventLink
 from .collection_event_report import CollectionEventReport
@@ -28,6 +30,8 @@ from .remote_command import RemoteCommand, RemoteCommandId
 from .status_variable import StatusVariable, StatusVariableId
 
 __all__ = [
+    "AsyncGemHandler",
+    "AsyncGemHostHandler",
     "GemHandler",
     "GemEquipmentHandler",
     "GemHostHandler",
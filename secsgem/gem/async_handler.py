@@ -0,0 +1,200 @@
+#####################################################################
+# async_handler.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Asyncio handler for GEM commands."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing
+
+import secsgem.common
+import secsgem.secs
+
+from ..secs.functions import SecsS07F04, SecsS07F06
+from .communication_state_machine import CommunicationState, CommunicationStateMachine
+from .handler_mixin import GemHandlerMixin
+
+
+class AsyncGemHandler(secsgem.secs.AsyncSecsHandler, GemHandlerMixin):  # pylint: disable=too-many-instance-attributes
+    """Baseclass for creating Host/Equipment models on asyncio. This layer contains GEM functionality."""
+
+    def __init__(self, settings: secsgem.common.Settings):
+        """Initialize a gem handler.
+
+        Inherit from this class and override required functions.
+
+        Args:
+            settings: communication settings
+
+        """
+        super().__init__(settings)
+        self._protocol.events.communicating += self._on_communicating
+        self._protocol.events.disconnected += self.on_connection_closed
+
+        self._mdln = "secsgem"  #: model number returned by S01E13/14
+        self._softrev = "0.1.0"  #: software version returned by S01E13/14
+
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._is_host = True
+
+        self._communication_state = CommunicationStateMachine(self.settings)
+        self._communication_state.wait_cra.events.enter.register(self._on_state_wait_cra)
+        self._communication_state.communicating.events.enter.register(self._on_state_communicating)
+
+        self._report_id_counter = 1000
+
+        self._wait_future_list: list[asyncio.Future[bool]] = []
+
+    @property
+    def communication_state(self) -> CommunicationStateMachine:
+        """Get the communication state model."""
+        return self._communication_state
+
+    async def enable(self) -> None:
+        """Enable the connection."""
+        self._loop = asyncio.get_running_loop()
+        self._communication_state.enable()
+        await self.protocol.enable()
+
+        self._logger.info("Connection enabled")
+
+    async def disable(self) -> None:
+        """Disable the connection."""
+        await self.protocol.disable()
+        self._communication_state.disable()
+
+        self._logger.info("Connection disabled")
+
+    def _on_message_received(self, data: dict[str, typing.Any]):
+        """Message received from protocol layer.
+
+        Args:
+            data: received event data
+
+        """
+        message = data["message"]
+        if self._communication_state.current == CommunicationState.WAIT_CRA:
+            if message.header.stream == 1 and message.header.function == 13:
+                if self._is_host:
+                    function = self.stream_function(1, 14)({"COMMACK": self.on_commack_requested(), "MDLN": []})
+                else:
+                    function = self.stream_function(1, 14)(
+                        {"COMMACK": self.on_commack_requested(), "MDLN": [self._mdln, self._softrev]}
+                    )
+
+                self._run_coroutine(self.send_response(function, message.header.system))
+
+                self._communication_state.s1f13received()
+            elif message.header.stream == 1 and message.header.function == 14:
+                self._communication_state.s1f14received()
+        elif self._communication_state.current == CommunicationState.WAIT_DELAY:
+            pass
+        elif self._communication_state.current == CommunicationState.COMMUNICATING:
+            self._run_coroutine(self._handle_stream_function(message))
+
+    def _on_communicating(self, _):
+        """Selected received from hsms layer."""
+        self._communication_state.select()
+
+    def _on_state_wait_cra(self, _):
+        """Connection state model changed to state WAIT_CRA.
+
+        Args:
+            data: event attributes
+
+        """
+        if self._is_host:
+            self._run_coroutine(self.send_stream_function(self.stream_function(1, 13)()))
+        else:
+            self._run_coroutine(self.send_stream_function(self.stream_function(1, 13)([self._mdln, self._softrev])))
+
+    def _on_state_communicating(self, _):
+        """Connection state model changed to state COMMUNICATING.
+
+        Args:
+            data: event attributes
+
+        """
+        self.events.fire("handler_communicating", {"handler": self})
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._release_wait_futures)
+
+    def _release_wait_futures(self):
+        for future in self._wait_future_list:
+            if not future.done():
+                future.set_result(True)
+
+    async def send_process_program(self, ppid: int | str, ppbody: str):
+        """Send a process program.
+
+        Args:
+            ppid: Transferred process programs ID
+            ppbody: Content of process program
+
+        """
+        # send remote command
+        self._logger.info("Send process program %s", ppid)
+
+        s7f4 = typing.cast(
+            SecsS07F04,
+            self.streams_functions.decode(
+                await self.send_and_waitfor_response(self.stream_function(7, 3)({"PPID": ppid, "PPBODY": ppbody}))
+            ),
+        )
+
+        return s7f4.get()
+
+    async def request_process_program(self, ppid: int | str) -> tuple[int | str, str]:
+        """Request a process program.
+
+        Args:
+            ppid: Transferred process programs ID
+
+        """
+        self._logger.info("Request process program %s", ppid)
+
+        # send remote command
+        s7f6 = typing.cast(
+            SecsS07F06,
+            self.streams_functions.decode(await self.send_and_waitfor_response(self.stream_function(7, 5)(ppid))),
+        )
+        return s7f6.PPID.get(), s7f6.PPBODY.get()
+
+    async def waitfor_communicating(self, timeout: float | None = None) -> bool:
+        """Wait until connection gets into communicating state. Returns immediately if state is communicating.
+
+        Args:
+            timeout: seconds to wait before aborting
+
+        Returns:
+            True if state is communicating, False if timed out
+
+        """
+        if self._communication_state.current == CommunicationState.COMMUNICATING:
+            return True
+
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._wait_future_list.append(future)
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._wait_future_list.remove(future)
@@ -0,0 +1,233 @@
+#####################################################################
+# async_hosthandler.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Asyncio handler for GEM host."""
+
+from __future__ import annotations
+
+import collections
+import typing
+
+import secsgem.common
+import secsgem.secs
+from secsgem.secs.functions import (
+    SecsS01F16,
+    SecsS01F18,
+    SecsS02F42,
+    SecsS05F04,
+    SecsS05F06,
+    SecsS05F08,
+    SecsS07F18,
+    SecsS07F20,
+)
+
+from .async_handler import AsyncGemHandler
+from .hosthandler_mixin import GemHostHandlerMixin
+
+
+class AsyncGemHostHandler(AsyncGemHandler, GemHostHandlerMixin):
+    """Baseclass for creating host models on asyncio. Inherit from this class and override required functions."""
+
+    def __init__(self, settings: secsgem.common.Settings):
+        """Initialize a gem host handler.
+
+        Args:
+            settings: communication settings
+
+        """
+        super().__init__(settings)
+
+        self.is_host = True
+
+        self.report_subscriptions: dict[int | str, list[int | str]] = {}
+
+    async def clear_collection_events(self) -> None:
+        """Clear all collection events."""
+        self._logger.info("Clearing collection events")
+
+        # clear subscribed reports
+        self.report_subscriptions = {}
+
+        # disable all ceids
+        await self.disable_ceids()
+
+        # delete all reports
+        await self.disable_ceid_reports()
+
+    async def subscribe_collection_event(
+        self, ceid: int | str, dvs: list[int | str], report_id: int | str | None = None
+    ):
+        """Subscribe to a collection event.
+
+        Args:
+            ceid: ID of the collection event
+            dvs: DV IDs to add for collection event
+            report_id: optional - ID for report, autonumbering if None
+
+        """
+        self._logger.info("Subscribing to collection event %s", ceid)
+
+        if report_id is None:
+            report_id = self._report_id_counter
+            self._report_id_counter += 1
+
+        # note subscribed reports
+        self.report_subscriptions[report_id] = dvs
+
+        # create report
+        await self.send_and_waitfor_response(
+            self.stream_function(2, 33)({"DATAID": 0, "DATA": [{"RPTID": report_id, "VID": dvs}]})
+        )
+
+        # link event report to collection event
+        await self.send_and_waitfor_response(
+            self.stream_function(2, 35)({"DATAID": 0, "DATA": [{"CEID": ceid, "RPTID": [report_id]}]})
+        )
+
+        # enable collection event
+        await self.send_and_waitfor_response(self.stream_function(2, 37)({"CEED": True, "CEID": [ceid]}))
+
+    async def send_remote_command(self, rcmd: int | str, params: list[str]):
+        """Send a remote command.
+
+        Args:
+            rcmd: Name of command
+            params: DV IDs to add for collection event
+
+        """
+        self._logger.info("Send RCMD %s", rcmd)
+
+        s2f41 = self.stream_function(2, 41)()
+        s2f41.RCMD = rcmd
+        if isinstance(params, list):
+            for param in params:
+                s2f41.PARAMS.append({"CPNAME": param[0], "CPVAL": param[1]})
+        elif isinstance(params, collections.OrderedDict):
+            for param in params:
+                s2f41.PARAMS.append({"CPNAME": param, "CPVAL": params[param]})
+
+        # send remote command
+        return typing.cast(SecsS02F42, self.streams_functions.decode(await self.send_and_waitfor_response(s2f41)))
+
+    async def delete_process_programs(self, ppids: list[int | str]):
+        """Delete a list of process program.
+
+        Args:
+            ppids: Process programs to delete
+
+        """
+        self._logger.info("Delete process programs %s", ppids)
+
+        # send remote command
+        return typing.cast(
+            SecsS07F18,
+            self.streams_functions.decode(await self.send_and_waitfor_response(self.stream_function(7, 17)(ppids))),
+        ).get()
+
+    async def get_process_program_list(self) -> secsgem.secs.SecsStreamFunction:
+        """Get process program list."""
+        self._logger.info("Get process program list")
+
+        # send remote command
+        return typing.cast(
+            SecsS07F20,
+            self.streams_functions.decode(await self.send_and_waitfor_response(self.stream_function(7, 19)())),
+        ).get()
+
+    async def go_online(self) -> str | None:
+        """Set control state to online."""
+        self._logger.info("Go online")
+
+        # send remote command
+        resp = self.streams_functions.decode(await self.send_and_waitfor_response(self.stream_function(1, 17)()))
+        if resp is None:
+            return None
+
+        resp = typing.cast(SecsS01F18, resp)
+
+        return resp.get()
+
+    async def go_offline(self) -> str | None:
+        """Set control state to offline."""
+        self._logger.info("Go offline")
+
+        # send remote command
+        return typing.cast(
+            SecsS01F16,
+            self.streams_functions.decode(await self.send_and_waitfor_response(self.stream_function(1, 15)())),
+        ).get()
+
+    async def enable_alarm(self, alid: int | str):
+        """Enable alarm.
+
+        Args:
+            alid: alarm id to enable
+
+        """
+        self._logger.info("Enable alarm %d", alid)
+
+        return typing.cast(
+            SecsS05F04,
+            self.streams_functions.decode(
+                await self.send_and_waitfor_response(
+                    self.stream_function(5, 3)({"ALED": secsgem.secs.data_items.ALED.ENABLE, "ALID": alid})
+                )
+            ),
+        ).get()
+
+    async def disable_alarm(self, alid: int | str):
+        """Disable alarm.
+
+        Args:
+            alid: alarm id to disable
+
+        """
+        self._logger.info("Disable alarm %d", alid)
+
+        return typing.cast(
+            SecsS05F04,
+            self.streams_functions.decode(
+                await self.send_and_waitfor_response(
+                    self.stream_function(5, 3)({"ALED": secsgem.secs.data_items.ALED.DISABLE, "ALID": alid})
+                )
+            ),
+        ).get()
+
+    async def list_alarms(self, alids: list[int | str] | None = None):
+        """List alarms.
+
+        Args:
+            alids: alarms to list details for
+
+        """
+        if alids is None:
+            alids = []
+            self._logger.info("List all alarms")
+        else:
+            self._logger.info("List alarms %s", alids)
+
+        return typing.cast(
+            SecsS05F06,
+            self.streams_functions.decode(await self.send_and_waitfor_response(self.stream_function(5, 5)(alids))),
+        ).get()
+
+    async def list_enabled_alarms(self):
+        """List enabled alarms."""
+        self._logger.info("List all enabled alarms")
+
+        return typing.cast(
+            SecsS05F08,
+            self.streams_functions.decode(await self.send_and_waitfor_response(self.stream_function(5, 7)())),
+        ).get()
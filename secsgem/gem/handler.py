@@ -26,9 +26,10 @@ import secsgem.secs
 
 from ..secs.functions import SecsS07F04, SecsS07F06
 from .communication_state_machine import CommunicationState, CommunicationStateMachine
+from .handler_mixin import GemHandlerMixin
 
 
-class GemHandler(secsgem.secs.SecsHandler):  # pylint: disable=too-many-instance-attributes
+class GemHandler(secsgem.secs.SecsHandler, GemHandlerMixin):  # pylint: disable=too-many-instance-attributes
     """Baseclass for creating Host/Equipment models. This layer contains GEM functionality."""
 
     def __init__(self, settings: secsgem.common.Settings):
@@ -58,32 +59,11 @@ class GemHandler(secsgem.secs.SecsHandler):  # pylint: disable=too-many-instance
 
         self._wait_event_list: list[threading.Event] = []
 
-    def __repr__(self) -> str:
-        """Generate textual representation for an object of this class."""
-        return f"{self.__class__.__name__} {self.serialize_data()}"
-
     @property
     def communication_state(self) -> CommunicationStateMachine:
         """Get the communication state model."""
         return self._communication_state
 
-    def serialize_data(self) -> dict[str, typing.Any]:
-        """Get serialized data.
-
-        Returns:
-            data to serialize for this object
-
-        """
-        data = self.protocol.serialize_data()
-        data.update(
-            {
-                "communicationState": self._communication_state.current,
-                "commDelayTimeout": self.settings.establish_communication_timeout,
-                "reportIDCounter": self._report_id_counter,
-            }
-        )
-        return data
-
     def enable(self) -> None:
         """Enable the connection."""
         self._communication_state.enable()
@@ -157,25 +137,6 @@ class GemHandler(secsgem.secs.SecsHandler):  # pylint: disable=too-many-instance
         for event in self._wait_event_list:
             event.set()
 
-    def on_connection_closed(self, _):
-        """Handle connection was closed event."""
-        self._logger.info("Connection was closed")
-
-        if self._communication_state.current == CommunicationState.COMMUNICATING:
-            # update communication state
-            self._communication_state.communicationfail()
-
-    def on_commack_requested(self) -> int:
-        """Get the acknowledgement code for the connection request.
-
-        override to accept or deny connection request
-
-        Returns:
-            0 when connection is accepted, 1 when connection is denied
-
-        """
-        return 0
-
     def send_process_program(self, ppid: int | str, ppbody: str):
         """Send a process program.
 
@@ -233,39 +194,3 @@ class GemHandler(secsgem.secs.SecsHandler):  # pylint: disable=too-many-instance
         self._wait_event_list.remove(event)
 
         return result
-
-    def _on_s01f01(
-        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
-    ) -> secsgem.secs.SecsStreamFunction | None:
-        """Handle Stream 1, Function 1, Are You There.
-
-        Args:
-            handler: handler the message was received on
-            message: complete message received
-
-        """
-        del handler, message  # unused parameters
-
-        if self._is_host:
-            return self.stream_function(1, 2)()
-
-        return self.stream_function(1, 2)([self._mdln, self._softrev])
-
-    def _on_s01f13(
-        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
-    ) -> secsgem.secs.SecsStreamFunction | None:
-        """Handle Stream 1, Function 13, Establish Communication Request.
-
-        Args:
-            handler: handler the message was received on
-            message: complete message received
-
-        """
-        del handler, message  # unused parameters
-
-        if self._is_host:
-            return self.stream_function(1, 14)({"COMMACK": self.on_commack_requested(), "MDLN": []})
-
-        return self.stream_function(1, 14)(
-            {"COMMACK": self.on_commack_requested(), "MDLN": [self._mdln, self._softrev]}
-        )
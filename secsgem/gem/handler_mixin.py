@@ -0,0 +1,135 @@
+#####################################################################
+# handler_mixin.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Stream/function handlers and helpers shared by the threaded and the asyncio GEM handler."""
+
+from __future__ import annotations
+
+import abc
+import typing
+
+from .communication_state_machine import CommunicationState
+
+if typing.TYPE_CHECKING:
+    import logging
+
+    import secsgem.common
+    import secsgem.secs
+
+    from .communication_state_machine import CommunicationStateMachine
+
+
+class GemHandlerMixin(abc.ABC):
+    """GEM functionality not communicating, shared by :class:`GemHandler` and :class:`AsyncGemHandler`."""
+
+    _logger: logging.Logger
+    _communication_state: CommunicationStateMachine
+    _report_id_counter: int
+    _is_host: bool
+    _mdln: str
+    _softrev: str
+
+    @property
+    @abc.abstractmethod
+    def settings(self) -> secsgem.common.Settings:
+        """Get the setting object."""
+        raise NotImplementedError
+
+    @property
+    @abc.abstractmethod
+    def protocol(self) -> typing.Any:
+        """Get the protocol for the handler."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def stream_function(self, stream: int, function: int) -> type[secsgem.secs.SecsStreamFunction]:
+        """Get class for stream and function."""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {self.serialize_data()}"
+
+    def serialize_data(self) -> dict[str, typing.Any]:
+        """Get serialized data.
+
+        Returns:
+            data to serialize for this object
+
+        """
+        data = self.protocol.serialize_data()
+        data.update(
+            {
+                "communicationState": self._communication_state.current,
+                "commDelayTimeout": self.settings.establish_communication_timeout,
+                "reportIDCounter": self._report_id_counter,
+            }
+        )
+        return data
+
+    def on_connection_closed(self, _):
+        """Handle connection was closed event."""
+        self._logger.info("Connection was closed")
+
+        if self._communication_state.current == CommunicationState.COMMUNICATING:
+            # update communication state
+            self._communication_state.communicationfail()
+
+    def on_commack_requested(self) -> int:
+        """Get the acknowledgement code for the connection request.
+
+        override to accept or deny connection request
+
+        Returns:
+            0 when connection is accepted, 1 when connection is denied
+
+        """
+        return 0
+
+    def _on_s01f01(
+        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
+    ) -> secsgem.secs.SecsStreamFunction | None:
+        """Handle Stream 1, Function 1, Are You There.
+
+        Args:
+            handler: handler the message was received on
+            message: complete message received
+
+        """
+        del handler, message  # unused parameters
+
+        if self._is_host:
+            return self.stream_function(1, 2)()
+
+        return self.stream_function(1, 2)([self._mdln, self._softrev])
+
+    def _on_s01f13(
+        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
+    ) -> secsgem.secs.SecsStreamFunction | None:
+        """Handle Stream 1, Function 13, Establish Communication Request.
+
+        Args:
+            handler: handler the message was received on
+            message: complete message received
+
+        """
+        del handler, message  # unused parameters
+
+        if self._is_host:
+            return self.stream_function(1, 14)({"COMMACK": self.on_commack_requested(), "MDLN": []})
+
+        return self.stream_function(1, 14)(
+            {"COMMACK": self.on_commack_requested(), "MDLN": [self._mdln, self._softrev]}
+        )
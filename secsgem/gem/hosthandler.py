@@ -26,20 +26,18 @@ from secsgem.secs.functions import (
     SecsS01F16,
     SecsS01F18,
     SecsS02F42,
-    SecsS05F01,
     SecsS05F04,
     SecsS05F06,
     SecsS05F08,
-    SecsS06F11,
     SecsS07F18,
     SecsS07F20,
-    SecsS10F01,
 )
 
 from .handler import GemHandler
+from .hosthandler_mixin import GemHostHandlerMixin
 
 
-class GemHostHandler(GemHandler):
+class GemHostHandler(GemHandler, GemHostHandlerMixin):
     """Baseclass for creating host models. Inherit from this class and override required functions."""
 
     def __init__(self, settings: secsgem.common.Settings):
@@ -224,93 +222,3 @@ class GemHostHandler(GemHandler):
         return typing.cast(
             SecsS05F08, self.streams_functions.decode(self.send_and_waitfor_response(self.stream_function(5, 7)()))
         ).get()
-
-    def _on_alarm_received(self, handler, alarm_id, alarm_code, alarm_text):
-        del handler, alarm_id, alarm_code, alarm_text  # unused variables
-        return secsgem.secs.data_items.ACKC5.ACCEPTED
-
-    def _on_s05f01(
-        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
-    ) -> secsgem.secs.SecsStreamFunction | None:
-        """Handle Stream 5, Function 1, Alarm request.
-
-        Args:
-            handler: handler the message was received on
-            message: complete message received
-
-        """
-        s5f1 = typing.cast(SecsS05F01, self.streams_functions.decode(message))
-
-        result = self._callback_handler.alarm_received(handler, s5f1.ALID, s5f1.ALCD, s5f1.ALTX)
-
-        self.events.fire(
-            "alarm_received",
-            {"code": s5f1.ALCD, "alid": s5f1.ALID, "text": s5f1.ALTX, "handler": self.protocol, "peer": self},
-        )
-
-        return self.stream_function(5, 2)(result)
-
-    def _on_s06f11(
-        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
-    ) -> secsgem.secs.SecsStreamFunction | None:
-        """Handle Stream 6, Function 11, Event Report Send.
-
-        Args:
-            handler: handler the message was received on
-            message: complete message received
-
-        """
-        del handler  # unused parameters
-
-        function = typing.cast(SecsS06F11, self.streams_functions.decode(message))
-
-        for report in function.RPT:
-            # It might happen that a report is emitted by the equipment before it is
-            # registered by the host via `subscribe_collection_event`.
-            try:
-                report_dvs = self.report_subscriptions[report.RPTID.get()]
-            except KeyError:
-                rptid = report.RPTID.get()
-                self._logger.error(
-                    "Discarded report from equipment, because report with %s is not registered on host.", rptid
-                )
-                continue
-            report_values = report.V.get()
-
-            values = [
-                {"dvid": data_value_id, "value": report_values[index]} for index, data_value_id in enumerate(report_dvs)
-            ]
-
-            data = {
-                "ceid": function.CEID,
-                "rptid": report.RPTID,
-                "values": values,
-                "handler": self.protocol,
-                "peer": self,
-            }
-            self.events.fire("collection_event_received", data)
-
-        return self.stream_function(6, 12)(0)
-
-    def _on_terminal_received(self, handler, terminal_id, text):
-        del handler, terminal_id, text  # unused variables
-        return secsgem.secs.data_items.ACKC10.ACCEPTED
-
-    def _on_s10f01(
-        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
-    ) -> secsgem.secs.SecsStreamFunction | None:
-        """Handle Stream 10, Function 1, Terminal Request.
-
-        Args:
-            handler: handler the message was received on
-            message: complete message received
-
-        """
-        s10f1 = typing.cast(SecsS10F01, self.streams_functions.decode(message))
-
-        result = self._callback_handler.terminal_received(handler, s10f1.TID, s10f1.TEXT)
-        self.events.fire(
-            "terminal_received", {"text": s10f1.TEXT, "terminal": s10f1.TID, "handler": self.protocol, "peer": self}
-        )
-
-        return self.stream_function(10, 2)(result)
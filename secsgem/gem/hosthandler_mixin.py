@@ -0,0 +1,131 @@
+#####################################################################
+# hosthandler_mixin.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Stream/function handlers shared by the threaded and the asyncio GEM host handler."""
+
+from __future__ import annotations
+
+import abc
+import typing
+
+import secsgem.common
+import secsgem.secs
+from secsgem.secs.functions import SecsS05F01, SecsS06F11, SecsS10F01
+
+from .handler_mixin import GemHandlerMixin
+
+
+class GemHostHandlerMixin(GemHandlerMixin):
+    """GEM host functionality not communicating, shared by :class:`GemHostHandler` and :class:`AsyncGemHostHandler`."""
+
+    streams_functions: secsgem.secs.functions.StreamsFunctions
+    report_subscriptions: dict[int | str, list[int | str]]
+    _callback_handler: secsgem.common.CallbackHandler
+
+    @property
+    @abc.abstractmethod
+    def events(self) -> typing.Any:
+        """Wrapper for protocols events."""
+        raise NotImplementedError
+
+    def _on_alarm_received(self, handler, alarm_id, alarm_code, alarm_text):
+        del handler, alarm_id, alarm_code, alarm_text  # unused variables
+        return secsgem.secs.data_items.ACKC5.ACCEPTED
+
+    def _on_s05f01(
+        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
+    ) -> secsgem.secs.SecsStreamFunction | None:
+        """Handle Stream 5, Function 1, Alarm request.
+
+        Args:
+            handler: handler the message was received on
+            message: complete message received
+
+        """
+        s5f1 = typing.cast(SecsS05F01, self.streams_functions.decode(message))
+
+        result = self._callback_handler.alarm_received(handler, s5f1.ALID, s5f1.ALCD, s5f1.ALTX)
+
+        self.events.fire(
+            "alarm_received",
+            {"code": s5f1.ALCD, "alid": s5f1.ALID, "text": s5f1.ALTX, "handler": self.protocol, "peer": self},
+        )
+
+        return self.stream_function(5, 2)(result)
+
+    def _on_s06f11(
+        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
+    ) -> secsgem.secs.SecsStreamFunction | None:
+        """Handle Stream 6, Function 11, Event Report Send.
+
+        Args:
+            handler: handler the message was received on
+            message: complete message received
+
+        """
+        del handler  # unused parameters
+
+        function = typing.cast(SecsS06F11, self.streams_functions.decode(message))
+
+        for report in function.RPT:
+            # It might happen that a report is emitted by the equipment before it is
+            # registered by the host via `subscribe_collection_event`.
+            try:
+                report_dvs = self.report_subscriptions[report.RPTID.get()]
+            except KeyError:
+                rptid = report.RPTID.get()
+                self._logger.error(
+                    "Discarded report from equipment, because report with %s is not registered on host.", rptid
+                )
+                continue
+            report_values = report.V.get()
+
+            values = [
+                {"dvid": data_value_id, "value": report_values[index]} for index, data_value_id in enumerate(report_dvs)
+            ]
+
+            data = {
+                "ceid": function.CEID,
+                "rptid": report.RPTID,
+                "values": values,
+                "handler": self.protocol,
+                "peer": self,
+            }
+            self.events.fire("collection_event_received", data)
+
+        return self.stream_function(6, 12)(0)
+
+    def _on_terminal_received(self, handler, terminal_id, text):
+        del handler, terminal_id, text  # unused variables
+        return secsgem.secs.data_items.ACKC10.ACCEPTED
+
+    def _on_s10f01(
+        self, handler: secsgem.secs.SecsHandler, message: secsgem.common.Message
+    ) -> secsgem.secs.SecsStreamFunction | None:
+        """Handle Stream 10, Function 1, Terminal Request.
+
+        Args:
+            handler: handler the message was received on
+            message: complete message received
+
+        """
+        s10f1 = typing.cast(SecsS10F01, self.streams_functions.decode(message))
+
+        result = self._callback_handler.terminal_received(handler, s10f1.TID, s10f1.TEXT)
+        self.events.fire(
+            "terminal_received", {"text": s10f1.TEXT, "terminal": s10f1.TID, "handler": self.protocol, "peer": self}
+        )
+
+        return self.stream_function(10, 2)(result)
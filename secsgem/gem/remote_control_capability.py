@@ -90,7 +90,8 @@ class RemoteControlCapability(GemHandler, Capability):
                     {"HCACK": secsgem.secs.data_items.HCACK.PARAMETER_INVALID, "PARAMS": []}
                 )
 
-        self.send_response(
+        # acknowledged without waiting for the reply to be sent, the command runs in the meantime
+        self.send_response_async(
             self.stream_function(2, 42)({"HCACK": secsgem.secs.data_items.HCACK.ACK_FINISH_LATER, "PARAMS": []}),
             message.header.system,
         )
@@ -17,21 +17,31 @@
 
 from secsgem.common.settings import DeviceType
 
+from .admission import HsmsAdmission, HsmsAdmissionStatistics, HsmsFrameRejectedError
+from .async_protocol import AsyncHsmsProtocol
 from .deselect_req_header import HsmsDeselectReqHeader
 from .deselect_rsp_header import HsmsDeselectRspHeader
+from .frame_reader import HsmsFrameReader
 from .header import HsmsHeader, HsmsSType
 from .linktest_req_header import HsmsLinktestReqHeader
 from .linktest_rsp_header import HsmsLinktestRspHeader
 from .message import HsmsBlock, HsmsMessage
+from .multiplexer import HsmsMultiplexer, HsmsSessionConnection, HsmsSessionProtocol, HsmsSessionSettings
 from .protocol import HsmsProtocol
 from .reject_req_header import HsmsRejectReqHeader
 from .select_req_header import HsmsSelectReqHeader
 from .select_rsp_header import HsmsSelectRspHeader
 from .separate_req_header import HsmsSeparateReqHeader
+from .server import HsmsMultiPassiveServer, HsmsPeerSettings
 from .settings import HsmsConnectMode, HsmsSettings
 from .stream_function_header import HsmsStreamFunctionHeader
 
 __all__ = [
+    "AsyncHsmsProtocol",
+    "HsmsAdmission",
+    "HsmsAdmissionStatistics",
+    "HsmsFrameRejectedError",
+    "HsmsFrameReader",
     "HsmsProtocol",
     "HsmsMessage",
     "HsmsBlock",
@@ -48,5 +58,11 @@ __all__ = [
     "HsmsSType",
     "HsmsSettings",
     "HsmsConnectMode",
+    "HsmsMultiPassiveServer",
+    "HsmsPeerSettings",
+    "HsmsMultiplexer",
+    "HsmsSessionConnection",
+    "HsmsSessionProtocol",
+    "HsmsSessionSettings",
     "DeviceType",
 ]
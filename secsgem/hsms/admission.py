@@ -0,0 +1,197 @@
+#####################################################################
+# admission.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Admission control for received HSMS frames."""
+
+from __future__ import annotations
+
+import typing
+
+from .header import HsmsHeader, HsmsSType
+
+
+class HsmsFrameRejectedError(Exception):
+    """Received frame was not admitted.
+
+    The payload of a rejected data message was discarded, the receive buffer continues with the next frame.
+    A malformed frame has no header, the receive buffer can't be resynchronized and the connection is separated.
+    """
+
+    def __init__(self, message: str, header: HsmsHeader | None = None) -> None:
+        """Initialize the exception.
+
+        Args:
+            message: description of the rejection
+            header: header of a rejected data message, None for a malformed frame
+
+        """
+        super().__init__(message)
+
+        self.header = header
+
+
+class HsmsAdmissionStatistics:
+    """Statistics of the admission control of a connection."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.rejected = 0
+        """Number of data messages rejected for exceeding a size limit."""
+
+        self.malformed = 0
+        """Number of malformed frames, each separating the connection."""
+
+        self.discarded_bytes = 0
+        """Number of payload bytes discarded for rejected data messages."""
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return (
+            f"{self.__class__.__name__}(rejected={self.rejected}, malformed={self.malformed}, "
+            f"discarded_bytes={self.discarded_bytes})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Get the statistics as dictionary."""
+        return {
+            "rejected": self.rejected,
+            "malformed": self.malformed,
+            "discarded_bytes": self.discarded_bytes,
+        }
+
+
+class HsmsAdmission:
+    """Size limits for the frames received on a connection.
+
+    The length in front of a frame is checked before its payload is received. Data messages exceeding the maximum
+    message size or the limit for their stream and function are rejected, and their payload is discarded as it
+    arrives. Frames too short for a header, with an undecodable header or control messages with payload are
+    malformed.
+
+    Example:
+        >>> import secsgem.hsms
+        >>>
+        >>> admission = secsgem.hsms.HsmsAdmission(1024 * 1024, {(7, 3): 64 * 1024})
+        >>> header = secsgem.hsms.HsmsStreamFunctionHeader(1, 7, 3, True, 0)
+        >>> admission.admit(header, 1000)
+        True
+        >>> admission.admit(header, 100 * 1024)
+        False
+        >>> admission.statistics
+        HsmsAdmissionStatistics(rejected=1, malformed=0, discarded_bytes=102400)
+
+    """
+
+    reject_reason = 0x80
+    """Reason code of the reject request sent for a data message exceeding a size limit."""
+
+    def __init__(
+        self,
+        max_message_size: int | None = None,
+        message_size_limits: dict[tuple[int, int], int] | None = None,
+    ) -> None:
+        """Initialize the admission control.
+
+        Args:
+            max_message_size: maximum payload size of a message in bytes, unlimited if None
+            message_size_limits: maximum payload sizes by stream and function
+
+        """
+        self._max_message_size = max_message_size
+        self._message_size_limits = dict(message_size_limits or {})
+
+        limits = [*self._message_size_limits.values()]
+        if max_message_size is not None:
+            limits.append(max_message_size)
+
+        # payloads up to the smallest limit are admitted without looking at the header
+        self._unchecked_size = min(limits, default=None)
+
+        self._statistics = HsmsAdmissionStatistics()
+
+    @property
+    def statistics(self) -> HsmsAdmissionStatistics:
+        """Get the admission statistics."""
+        return self._statistics
+
+    def check_length(self, length: int) -> bool:
+        """Check the length in front of a frame.
+
+        Args:
+            length: length of header and payload
+
+        Returns:
+            True if the header has to be checked with :meth:`admit` before receiving the payload
+
+        Raises:
+            HsmsFrameRejectedError: frame is too short for a header
+
+        """
+        if length < HsmsHeader.length:
+            self._statistics.malformed += 1
+            raise HsmsFrameRejectedError(f"frame length {length} shorter than header")
+
+        return self._unchecked_size is not None and length - HsmsHeader.length > self._unchecked_size
+
+    def admit(self, header: HsmsHeader, data_length: int) -> bool:
+        """Check if the payload of a message is received.
+
+        Args:
+            header: header of the frame
+            data_length: payload size in bytes
+
+        Returns:
+            False if the message is rejected and its payload has to be discarded
+
+        Raises:
+            HsmsFrameRejectedError: control message with payload
+
+        """
+        if header.s_type != HsmsSType.DATA_MESSAGE:
+            if data_length == 0:
+                return True
+
+            self._statistics.malformed += 1
+            raise HsmsFrameRejectedError(f"{header.s_type.text} with {data_length} bytes payload")
+
+        limit = self._message_size_limits.get((header.stream, header.function), self._max_message_size)
+        if self._max_message_size is not None and limit is not None:
+            limit = min(limit, self._max_message_size)
+
+        if limit is None or data_length <= limit:
+            return True
+
+        self._statistics.rejected += 1
+        self._statistics.discarded_bytes += data_length
+        return False
+
+    def decode_header(self, data: bytes) -> HsmsHeader:
+        """Decode the header of a frame to check.
+
+        Args:
+            data: encoded header
+
+        Returns:
+            decoded header
+
+        Raises:
+            HsmsFrameRejectedError: header can't be decoded
+
+        """
+        try:
+            return HsmsHeader.decode(data)
+        except ValueError as exc:
+            self._statistics.malformed += 1
+            raise HsmsFrameRejectedError(f"invalid header: {exc}") from exc
@@ -0,0 +1,667 @@
+#####################################################################
+# async_protocol.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""HSMS protocol implementation based on asyncio streams."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import random
+import struct
+import typing
+
+import secsgem.common
+
+from .admission import HsmsAdmission, HsmsAdmissionStatistics, HsmsFrameRejectedError
+from .connection_state_machine import ConnectionState, ConnectionStateMachine
+from .deselect_req_header import HsmsDeselectReqHeader
+from .deselect_rsp_header import HsmsDeselectRspHeader
+from .header import HsmsHeader, HsmsSType
+from .linktest_req_header import HsmsLinktestReqHeader
+from .linktest_rsp_header import HsmsLinktestRspHeader
+from .message import HsmsBlock, HsmsMessage
+from .reject_req_header import HsmsRejectReqHeader
+from .select_req_header import HsmsSelectReqHeader
+from .select_rsp_header import HsmsSelectRspHeader
+from .separate_req_header import HsmsSeparateReqHeader
+from .stream_function_header import HsmsStreamFunctionHeader
+
+if typing.TYPE_CHECKING:
+    from ..secs.functions import StreamsFunctions
+    from ..secs.functions.base import SecsStreamFunction
+    from .settings import HsmsSettings
+
+
+class AsyncHsmsProtocol:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    """HSMS protocol running in an asyncio event loop.
+
+    All sending functions are coroutines, waiting for a reply only holds a future in the transaction table,
+    so a single event loop can handle many connections and outstanding transactions without a thread per wait.
+
+    The events (connected, communicating, disconnected, message_received) are fired from the event loop.
+
+    Example:
+        import secsgem.hsms
+
+        settings = secsgem.hsms.HsmsSettings(
+            address="10.211.55.33",
+            port=5000,
+            connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE,
+        )
+
+        async def main():
+            protocol = settings.create_async_protocol(streams_functions)
+            await protocol.enable()
+
+            response = await protocol.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01())
+
+            await protocol.disable()
+
+    """
+
+    message_type = HsmsMessage
+
+    def __init__(self, settings: HsmsSettings, streams_functions: StreamsFunctions) -> None:
+        """Initialize asyncio hsms protocol.
+
+        Args:
+            settings: protocol and communication settings
+            streams_functions: container of all known stream functions
+
+        """
+        self._settings = settings
+        self._streams_functions = streams_functions
+
+        self._event_producer = secsgem.common.EventProducer()
+        self._event_producer.targets += self
+
+        self._system_counter = random.randint(0, (2**32) - 1)  # noqa: S311
+
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+        self._communication_logger = logging.getLogger("communication")
+
+        self._connection_state = ConnectionStateMachine()
+        self._connection_state.connected_selected.events.enter.register(self._on_state_select)
+
+        self._enabled = False
+        self._connected = False
+
+        self._linktest_timeout = settings.linktest_timeout
+
+        self._server: asyncio.AbstractServer | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._drain_lock: asyncio.Lock | None = None
+
+        self._connect_task: asyncio.Future | None = None
+        self._reconnect_statistics = secsgem.common.ReconnectStatistics()
+        self._connection_task: asyncio.Future | None = None
+        self._tasks: set[asyncio.Future] = set()
+
+        self._response_futures: dict[int, asyncio.Future[HsmsMessage | None]] = {}
+
+        self._admission = HsmsAdmission(self._settings.max_message_size, self._settings.message_size_limits)
+
+    @property
+    def events(self) -> secsgem.common.EventProducer:
+        """Property for event handling."""
+        return self._event_producer
+
+    @property
+    def connection_state(self) -> ConnectionStateMachine:
+        """Property for connection state."""
+        return self._connection_state
+
+    @property
+    def connected(self) -> bool:
+        """Check if a connection to the remote is established."""
+        return self._connected
+
+    @property
+    def reconnect_statistics(self) -> secsgem.common.ReconnectStatistics:
+        """Get the reconnect statistics of the active connection."""
+        return self._reconnect_statistics
+
+    @property
+    def admission_statistics(self) -> HsmsAdmissionStatistics:
+        """Get the statistics of the frames rejected by the admission control."""
+        return self._admission.statistics
+
+    def get_next_system_counter(self) -> int:
+        """Return the next System.
+
+        Returns:
+            System for the next command
+
+        """
+        self._system_counter += 1
+
+        if self._system_counter > ((2**32) - 1):
+            self._system_counter = 0
+
+        return self._system_counter
+
+    async def enable(self):
+        """Enable the connection.
+
+        Active connections start connecting to the remote, passive connections start listening.
+        """
+        if self._enabled:
+            return
+
+        self._enabled = True
+        self._drain_lock = asyncio.Lock()
+
+        if self._settings.is_active:
+            self._connect_task = asyncio.ensure_future(self._connect_loop())
+        elif self._settings.socket_path is not None:
+            self._server = await asyncio.start_unix_server(self._on_client_connected, self._settings.socket_path)
+        else:
+            self._server = await asyncio.start_server(
+                self._on_client_connected, self._settings.address, self._settings.port
+            )
+
+    async def disable(self):
+        """Disable the connection.
+
+        Stops connecting or listening and separates an established connection.
+        """
+        if not self._enabled:
+            return
+
+        self._enabled = False
+
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._connect_task
+            self._connect_task = None
+
+        # the connection task clears the writer if the remote closes the connection while the separate is sent
+        writer = self._writer
+        if writer is not None:
+            await self.send_separate_req()
+            writer.close()
+
+        if self._connection_task is not None:
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._connection_task
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _on_state_select(self, _: dict[str, typing.Any]):
+        """Handle connection state model got event select."""
+        self.events.fire("communicating", {"connection": self})
+
+    async def _connect_loop(self):
+        statistics = self._reconnect_statistics
+        statistics.consecutive_failures = 0
+        first_connection = True
+
+        while self._enabled:
+            # wait for connect separation time if this is not the first connection, growing with failed attempts
+            if not first_connection:
+                statistics.last_delay = secsgem.common.reconnect_delay(
+                    self._settings.timeouts.t5,
+                    statistics.consecutive_failures,
+                    self._settings.reconnect_backoff,
+                    self._settings.reconnect_max_delay,
+                    self._settings.reconnect_jitter,
+                )
+                await asyncio.sleep(statistics.last_delay)
+
+            first_connection = False
+
+            self._logger.debug("connecting to %s", self._settings.endpoint)
+            statistics.attempts += 1
+
+            try:
+                if self._settings.socket_path is not None:
+                    reader, writer = await asyncio.open_unix_connection(self._settings.socket_path)
+                else:
+                    reader, writer = await asyncio.open_connection(self._settings.address, self._settings.port)
+            except OSError as exc:
+                self._logger.debug("connecting to %s failed", self._settings.endpoint)
+                statistics.failures += 1
+                statistics.consecutive_failures += 1
+                statistics.last_error = str(exc)
+                continue
+
+            statistics.connects += 1
+            statistics.consecutive_failures = 0
+
+            self._connection_task = asyncio.ensure_future(self._serve_connection(reader, writer))
+            await asyncio.shield(self._connection_task)
+
+    async def _on_client_connected(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # only one connection at a time, claimed before the connection task is scheduled
+        if self._writer is not None or not self._enabled:
+            writer.close()
+            return
+
+        self._writer = writer
+        self._connection_task = asyncio.ensure_future(self._serve_connection(reader, writer))
+        await asyncio.shield(self._connection_task)
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            self._settings.tcp_options.apply(sock)
+
+        self._writer = writer
+        self._connected = True
+
+        self._connection_state.connect()
+        self.events.fire("connected", {"connection": self})
+
+        connection_tasks = [asyncio.ensure_future(self._linktest_loop())]
+
+        if self._settings.is_active:
+            connection_tasks.append(asyncio.ensure_future(self._select_on_connect()))
+
+        try:
+            await self._receive_loop(reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("exception in receive loop")
+        finally:
+            for task in connection_tasks:
+                task.cancel()
+
+            self._writer = None
+            self._connected = False
+
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+            # release everyone waiting for a response
+            for future in self._response_futures.values():
+                if not future.done():
+                    future.set_result(None)
+
+            self._connection_state.disconnect()
+            self.events.fire("disconnected", {"connection": self})
+
+    async def _receive_loop(self, reader: asyncio.StreamReader):
+        while True:
+            length = struct.unpack(">L", await reader.readexactly(4))[0]
+            data_length = length - HsmsHeader.length
+
+            try:
+                header = await self._receive_header(reader, length)
+            except HsmsFrameRejectedError as exc:
+                if exc.header is None:
+                    # the rest of the stream can't be parsed
+                    self._logger.warning("separating after malformed frame: %s", exc)
+                    await self.send_separate_req()
+                    return
+
+                self._logger.warning("rejecting received message: %s", exc)
+                await self._send_control_message(
+                    HsmsRejectReqHeader(exc.header.system, exc.header.s_type, HsmsAdmission.reject_reason)
+                )
+                continue
+
+            block: HsmsBlock
+            spool_threshold = self._settings.spool_threshold
+            if spool_threshold is not None and data_length > spool_threshold:
+                block = await self._receive_spooled_block(reader, header, data_length)
+            else:
+                block = HsmsBlock(header, await reader.readexactly(data_length))
+
+            try:
+                self._on_message_received(HsmsMessage.from_block(block))
+            except Exception:  # pylint: disable=broad-except
+                self._logger.exception("ignoring exception for on_message_received handler")
+
+    async def _receive_header(self, reader: asyncio.StreamReader, length: int) -> HsmsHeader:
+        """Receive the header of a frame and check it with the admission control.
+
+        Args:
+            reader: stream of the connection, positioned after the length
+            length: length of the block
+
+        Returns:
+            received header
+
+        Raises:
+            HsmsFrameRejectedError: frame was not admitted, the payload of a rejected message was discarded
+
+        """
+        if not self._admission.check_length(length):
+            return HsmsHeader.decode(await reader.readexactly(HsmsHeader.length))
+
+        header = self._admission.decode_header(await reader.readexactly(HsmsHeader.length))
+        data_length = length - HsmsHeader.length
+
+        if self._admission.admit(header, data_length):
+            return header
+
+        # the payload is dropped as it arrives instead of collecting it
+        remaining = data_length
+        while remaining > 0:
+            data = await reader.read(remaining)
+            if not data:
+                raise asyncio.IncompleteReadError(b"", remaining)
+
+            remaining -= len(data)
+
+        raise HsmsFrameRejectedError(
+            f"S{header.stream}F{header.function} with {data_length} bytes exceeds size limit", header
+        )
+
+    async def _receive_spooled_block(
+        self, reader: asyncio.StreamReader, header: HsmsHeader, data_length: int
+    ) -> HsmsBlock:
+        """Receive the payload of a block, written to a memory-mapped file as it arrives.
+
+        Args:
+            reader: stream of the connection, positioned after the header
+            header: received header of the block
+            data_length: payload size in bytes
+
+        Returns:
+            received block
+
+        """
+        payload = secsgem.common.FilePayload(data_length, self._settings.spool_directory)
+        while payload.remaining > 0:
+            data = await reader.read(payload.remaining)
+            if not data:
+                raise asyncio.IncompleteReadError(b"", payload.remaining)
+
+            payload.write(data)
+
+        return HsmsBlock(header, payload.view)
+
+    async def _select_on_connect(self):
+        response = await self.send_select_req()
+        if response is None:
+            self._logger.warning("select request failed")
+
+    async def _linktest_loop(self):
+        while True:
+            await asyncio.sleep(self._linktest_timeout)
+            await self.send_linktest_req()
+
+    def _create_task(self, coroutine: typing.Coroutine):
+        """Run a coroutine in the background, keeping a reference until it is done."""
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _resolve_response(self, message: HsmsMessage) -> bool:
+        future = self._response_futures.get(message.header.system)
+        if future is None or future.done():
+            return False
+
+        future.set_result(message)
+        return True
+
+    def _on_message_received(self, message: HsmsMessage):
+        if message.header.s_type.value > 0:
+            self._handle_hsms_request(message)
+            return
+
+        decoded_message = self._streams_functions.decode(message)
+        self._communication_logger.info("< %s\n%s", message, decoded_message, extra=self._get_log_extra())
+
+        if self._connection_state.current != ConnectionState.CONNECTED_SELECTED:
+            self._logger.warning("received message when not selected")
+            self._create_task(self.send_reject_rsp(message.header.system, message.header.s_type, 4))
+            return
+
+        # nobody is waiting for this message, so forward it
+        if not self._resolve_response(message):
+            self.events.fire("message_received", {"connection": self, "message": message})
+
+    def _handle_hsms_request(self, message: HsmsMessage):
+        self._communication_logger.info("< %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
+
+        s_type = message.header.s_type
+        system_id = message.header.system
+
+        if s_type == HsmsSType.SELECT_REQ:
+            self._create_task(self.send_select_rsp(system_id))
+            self._connection_state.select()
+        elif s_type == HsmsSType.SELECT_RSP:
+            self._connection_state.select()
+            self._resolve_response(message)
+        elif s_type == HsmsSType.DESELECT_REQ:
+            self._create_task(self.send_deselect_rsp(system_id))
+            self._connection_state.deselect()
+        elif s_type == HsmsSType.DESELECT_RSP:
+            self._connection_state.deselect()
+            self._resolve_response(message)
+        elif s_type == HsmsSType.LINKTEST_REQ:
+            self._create_task(self.send_linktest_rsp(system_id))
+        elif s_type == HsmsSType.SEPARATE_REQ:
+            if self._writer is not None:
+                self._writer.close()
+        else:
+            self._resolve_response(message)
+
+    def _create_message_for_function(self, function: SecsStreamFunction, system_id: int) -> HsmsMessage:
+        return HsmsMessage(
+            HsmsStreamFunctionHeader(
+                system_id,
+                function.stream,
+                function.function,
+                function.is_reply_required,
+                self._settings.session_id,
+            ),
+            function.encode(),
+        )
+
+    async def send_message(self, message: HsmsMessage) -> bool:
+        """Send a message to the remote host.
+
+        Args:
+            message: message to be transmitted
+
+        Returns:
+            True if sending was successful
+
+        """
+        writer = self._writer
+        if writer is None or self._drain_lock is None:
+            return False
+
+        try:
+            for block in message.blocks:
+                writer.writelines(block.encode_parts())
+
+            async with self._drain_lock:
+                await writer.drain()
+        except ConnectionError:
+            return False
+
+        return True
+
+    async def _send_and_wait(self, message: HsmsMessage, timeout: float) -> HsmsMessage | None:
+        system_id = message.header.system
+
+        future: asyncio.Future[HsmsMessage | None] = asyncio.get_running_loop().create_future()
+        self._response_futures[system_id] = future
+
+        try:
+            if not await self.send_message(message):
+                self._logger.error("Sending message failed")
+                return None
+
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                return None
+        finally:
+            self._response_futures.pop(system_id, None)
+
+    async def send_and_waitfor_response(
+        self,
+        function: SecsStreamFunction,
+        timeout: float | None = None,
+    ) -> HsmsMessage | None:
+        """Send the message and wait for the response.
+
+        Args:
+            function: message to be sent
+            timeout: seconds to wait for the reply, T3 is used if None
+
+        Returns:
+            Message that was received, None on failure or timeout
+
+        """
+        out_message = self._create_message_for_function(function, self.get_next_system_counter())
+
+        self._communication_logger.info("> %s\n%s", out_message, function, extra=self._get_log_extra())
+
+        return await self._send_and_wait(out_message, self._settings.timeouts.t3 if timeout is None else timeout)
+
+    async def send_response(self, function: SecsStreamFunction, system: int) -> bool:
+        """Send response function for system.
+
+        Args:
+            function: function to be sent
+            system: system to reply to
+
+        Returns:
+            True if sending was successful
+
+        """
+        out_message = self._create_message_for_function(function, system)
+
+        self._communication_logger.info("> %s\n%s", out_message, function, extra=self._get_log_extra())
+
+        return await self.send_message(out_message)
+
+    async def send_stream_function(self, function: SecsStreamFunction) -> bool:
+        """Send the message without waiting for the response.
+
+        Args:
+            function: message to be sent
+
+        Returns:
+            True if successful
+
+        """
+        out_message = self._create_message_for_function(function, self.get_next_system_counter())
+
+        self._communication_logger.info("> %s\n%s", out_message, function, extra=self._get_log_extra())
+
+        return await self.send_message(out_message)
+
+    async def _send_control_message(self, header: HsmsHeader) -> bool:
+        message = HsmsMessage(header, b"")
+        self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
+        return await self.send_message(message)
+
+    async def _send_control_request(self, header: HsmsHeader) -> HsmsMessage | None:
+        message = HsmsMessage(header, b"")
+        self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
+        return await self._send_and_wait(message, self._settings.timeouts.t6)
+
+    async def send_select_req(self) -> HsmsMessage | None:
+        """Send a Select Request to the remote host and wait for the response."""
+        return await self._send_control_request(HsmsSelectReqHeader(self.get_next_system_counter()))
+
+    async def send_select_rsp(self, system_id: int) -> bool:
+        """Send a Select Response to the remote host.
+
+        Args:
+            system_id: System of the request to reply for
+
+        """
+        return await self._send_control_message(HsmsSelectRspHeader(system_id))
+
+    async def send_linktest_req(self) -> HsmsMessage | None:
+        """Send a Linktest Request to the remote host and wait for the response."""
+        return await self._send_control_request(HsmsLinktestReqHeader(self.get_next_system_counter()))
+
+    async def send_linktest_rsp(self, system_id: int) -> bool:
+        """Send a Linktest Response to the remote host.
+
+        Args:
+            system_id: System of the request to reply for
+
+        """
+        return await self._send_control_message(HsmsLinktestRspHeader(system_id))
+
+    async def send_deselect_req(self) -> HsmsMessage | None:
+        """Send a Deselect Request to the remote host and wait for the response."""
+        return await self._send_control_request(HsmsDeselectReqHeader(self.get_next_system_counter()))
+
+    async def send_deselect_rsp(self, system_id: int) -> bool:
+        """Send a Deselect Response to the remote host.
+
+        Args:
+            system_id: System of the request to reply for
+
+        """
+        return await self._send_control_message(HsmsDeselectRspHeader(system_id))
+
+    async def send_reject_rsp(self, system_id: int, s_type: HsmsSType, reason: int) -> bool:
+        """Send a Reject Response to the remote host.
+
+        Args:
+            system_id: System of the request to reply for
+            s_type: s_type of rejected message
+            reason: reason for rejection
+
+        """
+        return await self._send_control_message(HsmsRejectReqHeader(system_id, s_type, reason))
+
+    async def send_separate_req(self) -> int | None:
+        """Send a Separate Request to the remote host.
+
+        Returns:
+            System of the sent request, None if sending failed
+
+        """
+        system_id = self.get_next_system_counter()
+
+        if not await self._send_control_message(HsmsSeparateReqHeader(system_id)):
+            return None
+
+        return system_id
+
+    def serialize_data(self) -> dict[str, typing.Any]:
+        """Get protocol serialized data for debugging."""
+        return {
+            "address": self._settings.address,
+            "port": self._settings.port,
+            "connect_mode": self._settings.connect_mode,
+            "session_id": self._settings.session_id,
+            "name": self._settings.name,
+            "connected": self._connected,
+        }
+
+    def __repr__(self):
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {self.serialize_data()}"
+
+    def _get_log_extra(self) -> dict[str, typing.Any]:
+        """Get extra fields for logging."""
+        return {
+            "address": self._settings.address,
+            "port": self._settings.port,
+            "session_id": self._settings.session_id,
+            "remoteName": self._settings.name,
+        }
@@ -24,11 +24,12 @@ class HsmsDeselectRspHeader(HsmsHeader):
     Header for message with SType 4.
     """
 
-    def __init__(self, system: int):
+    def __init__(self, system: int, session_id: int = 0xFFFF):
         """Initialize a hsms deslelct response.
 
         Args:
             system: message ID
+            session_id: session of the message, 0xFFFF unless multiple sessions share the connection (HSMS-GS)
 
         Example:
             >>> import secsgem.hsms
@@ -38,4 +39,4 @@ class HsmsDeselectRspHeader(HsmsHeader):
 system:0x00000001, require_response:False})
 
         """
-        super().__init__(system, 0xFFFF, 0, 0, False, 0x00, HsmsSType.DESELECT_RSP)
+        super().__init__(system, session_id, 0, 0, False, 0x00, HsmsSType.DESELECT_RSP)
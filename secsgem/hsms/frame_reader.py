@@ -0,0 +1,220 @@
+#####################################################################
+# frame_reader.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Incremental reader for HSMS frames."""
+
+from __future__ import annotations
+
+import struct
+import time
+import typing
+
+import secsgem.common
+
+from .admission import HsmsFrameRejectedError
+from .header import HsmsHeader
+from .message import HsmsBlock
+
+if typing.TYPE_CHECKING:
+    from .admission import HsmsAdmission
+
+
+class HsmsFrameReader:  # pylint: disable=too-many-instance-attributes
+    r"""Reader for the frames in a receive buffer, consuming the data as it arrives without waiting.
+
+    The state of a partly received frame is kept between the calls. Small frames are decoded once they are complete
+    in the buffer, spooled payloads are written to the file and discarded payloads of rejected messages are dropped
+    with every call, so the buffer doesn't grow with a large frame.
+
+    Example:
+        >>> import secsgem.common
+        >>>
+        >>> buffer = secsgem.common.ByteQueue()
+        >>> reader = HsmsFrameReader(buffer)
+        >>> buffer.append(b"\x00\x00\x00\x0a\xff\xff\x00\x00\x00\x05")
+        >>> reader.read() is None
+        True
+        >>> reader.needed
+        14
+        >>> buffer.append(b"\x00\x00\x00\x01")
+        >>> reader.read().header.s_type
+        <HsmsSType.LINKTEST_REQ: 5>
+
+    """
+
+    def __init__(
+        self,
+        buffer: secsgem.common.ByteQueue,
+        spool_threshold: int | None = None,
+        spool_directory: str | None = None,
+        admission: HsmsAdmission | None = None,
+    ) -> None:
+        """Initialize the reader.
+
+        Args:
+            buffer: receive buffer
+            spool_threshold: payload size above which the payload is stored in a file, never if None
+            spool_directory: directory for the payload files
+            admission: size limits checked before the payload is received
+
+        """
+        self._buffer = buffer
+        self._spool_threshold = spool_threshold
+        self._spool_directory = spool_directory
+        self._admission = admission
+
+        self._header: HsmsHeader | None = None
+        self._data_length = 0
+        self._remaining = 0
+        self._payload: secsgem.common.FilePayload | None = None
+        self._rejected = False
+
+        self._needed = 4
+        self._available = 0
+        self._last_progress = time.monotonic()
+
+    @property
+    def partial(self) -> bool:
+        """Check if a frame was started but is not complete."""
+        return self._header is not None or len(self._buffer) > 0
+
+    @property
+    def needed(self) -> int:
+        """Get the number of bytes in the buffer the next read needs to make progress."""
+        return self._needed
+
+    @property
+    def last_progress(self) -> float:
+        """Get the monotonic time new data was last seen by :meth:`read`."""
+        return self._last_progress
+
+    def reset(self):
+        """Drop the state of a partly received frame, after the buffer was cleared."""
+        self._header = None
+        self._payload = None
+        self._rejected = False
+        self._needed = 4
+        self._available = len(self._buffer)
+        self._last_progress = time.monotonic()
+
+    def read(self) -> HsmsBlock | None:
+        """Consume the available data of the next frame.
+
+        Returns:
+            received block, None if the frame is not complete yet
+
+        Raises:
+            HsmsFrameRejectedError: frame was not admitted
+
+        """
+        # data arrived since the last call, for the T8 timeout between the bytes of a frame
+        if len(self._buffer) != self._available:
+            self._last_progress = time.monotonic()
+
+        try:
+            return self._read()
+        finally:
+            self._available = len(self._buffer)
+
+    def _read(self) -> HsmsBlock | None:
+        if self._header is None:
+            block = self._read_header()
+            if block is not None or self._header is None:
+                return block
+
+        if self._rejected:
+            self._discard()
+            return None
+
+        if self._payload is not None:
+            if len(self._buffer) > 0:
+                self._payload.write(self._buffer.pop(min(len(self._buffer), self._payload.remaining)))
+
+            if self._payload.remaining > 0:
+                self._needed = 1
+                return None
+
+            return self._complete(self._payload.view)
+
+        if len(self._buffer) < self._data_length:
+            self._needed = self._data_length
+            return None
+
+        return self._complete(self._buffer.pop(self._data_length))
+
+    def _read_header(self) -> HsmsBlock | None:
+        if len(self._buffer) < 4:
+            self._needed = 4
+            return None
+
+        length = struct.unpack(">L", self._buffer.peek(4))[0]
+        data_length = length - HsmsHeader.length
+
+        checked = self._admission is not None and self._admission.check_length(length)
+        spooled = self._spool_threshold is not None and data_length > self._spool_threshold
+
+        # frames without checks are decoded at once
+        if not checked and not spooled:
+            if len(self._buffer) < length + 4:
+                self._needed = length + 4
+                return None
+
+            self._needed = 4
+            return HsmsBlock.decode(self._buffer.pop(length + 4))
+
+        if len(self._buffer) < HsmsHeader.length + 4:
+            self._needed = HsmsHeader.length + 4
+            return None
+
+        header_data = bytes(self._buffer.pop(HsmsHeader.length + 4))[4:]
+
+        if self._admission is not None and checked:
+            header = self._admission.decode_header(header_data)
+            self._rejected = not self._admission.admit(header, data_length)
+        else:
+            header = HsmsHeader.decode(header_data)
+
+        self._header = header
+        self._data_length = data_length
+        self._remaining = data_length
+
+        if spooled and not self._rejected:
+            self._payload = secsgem.common.FilePayload(data_length, self._spool_directory)
+
+        return None
+
+    def _discard(self) -> None:
+        header = typing.cast("HsmsHeader", self._header)
+
+        # the payload is dropped as it arrives instead of collecting it
+        if len(self._buffer) > 0:
+            self._remaining -= len(self._buffer.pop(min(len(self._buffer), self._remaining)))
+
+        if self._remaining > 0:
+            self._needed = 1
+            return
+
+        data_length = self._data_length
+        self.reset()
+
+        raise HsmsFrameRejectedError(
+            f"S{header.stream}F{header.function} with {data_length} bytes exceeds size limit", header
+        )
+
+    def _complete(self, data: bytes | memoryview) -> HsmsBlock:
+        block = HsmsBlock(typing.cast("HsmsHeader", self._header), data)
+        self.reset()
+
+        return block
@@ -130,6 +130,11 @@ require_response:False})
         """Get S-type."""
         return self._s_type
 
+    @property
+    def is_control(self) -> bool:
+        """Check if the header belongs to a control message, any message but a data message."""
+        return self._s_type != HsmsSType.DATA_MESSAGE
+
     @property
     def _as_dictionary(self) -> dict[str, typing.Any]:
         """Get the data as dictionary.
@@ -0,0 +1,754 @@
+#####################################################################
+# multiplexer.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Multiple HSMS sessions sharing one TCP connection (HSMS-GS)."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import random
+import threading
+import time
+import typing
+
+import secsgem.common
+from secsgem.common.events import Event
+
+from .admission import HsmsAdmission, HsmsAdmissionStatistics, HsmsFrameRejectedError
+from .connection_state_machine import ConnectionState
+from .frame_reader import HsmsFrameReader
+from .header import HsmsHeader, HsmsSType
+from .linktest_req_header import HsmsLinktestReqHeader
+from .linktest_rsp_header import HsmsLinktestRspHeader
+from .message import HsmsBlock, HsmsMessage
+from .protocol import HsmsProtocol
+from .reject_req_header import HsmsRejectReqHeader
+from .settings import HsmsSettings
+
+if typing.TYPE_CHECKING:
+    import concurrent.futures
+
+    from ..secs.functions import StreamsFunctions
+
+
+class HsmsSessionSettings(HsmsSettings):
+    """Settings for a session sharing the connection of a :class:`HsmsMultiplexer`.
+
+    Created with :meth:`HsmsMultiplexer.session_settings`, the session is selected by its `session_id`.
+
+    .. exec::
+        import secsgem.hsms.multiplexer
+
+        secsgem.hsms.multiplexer.HsmsSessionSettings._attributes_help()
+
+    """
+
+    @classmethod
+    def _attributes(cls) -> list[secsgem.common.Setting]:
+        """Get the available settings for the class."""
+        return [
+            *super()._attributes(),
+            secsgem.common.Setting("multiplexer", None, "Multiplexer providing the shared connection"),
+        ]
+
+    def create_protocol(self, streams_functions: StreamsFunctions) -> secsgem.common.Protocol:
+        """Protocol class for this configuration."""
+        return HsmsSessionProtocol(self, streams_functions)
+
+    def create_connection(self) -> secsgem.common.Connection:
+        """Connection class for this configuration."""
+        return HsmsSessionConnection(self)
+
+    @property
+    def name(self) -> str:
+        """Name of this configuration."""
+        return f"HSMS-{self.connect_mode}_{self.address}:{self.port}_session{self.session_id}"
+
+
+class HsmsSessionConnection(secsgem.common.Connection):
+    """Connection of a single session, sharing the TCP connection of a :class:`HsmsMultiplexer`.
+
+    The connection is established while the session is enabled and the shared connection is established.
+    Received blocks for the session are passed with the `on_block` event.
+    """
+
+    def __init__(self, settings: HsmsSessionSettings):
+        """Initialize a session connection.
+
+        Args:
+            settings: settings of the session
+
+        """
+        super().__init__(settings)
+
+        self._multiplexer: HsmsMultiplexer = settings.multiplexer
+        self._on_block = Event()
+
+    @property
+    def on_block(self) -> Event:
+        """Get the block received event.
+
+        Callbacks to this event are called, when a block for the session was received.
+
+        """
+        return self._on_block
+
+    @property
+    def session_id(self) -> int:
+        """Get the session id."""
+        return self._settings.session_id
+
+    @property
+    def connected(self) -> bool:
+        """Get the connected flag.
+
+        This flag is True, when the session is enabled and the shared connection is established.
+
+        """
+        return self._multiplexer.connected and self._multiplexer.is_attached(self)
+
+    @property
+    def disconnecting(self) -> bool:
+        """Get the disconnecting flag.
+
+        This flag is True, when the shared connection is about to be separated.
+
+        """
+        return self._multiplexer.disconnecting
+
+    def enable(self):
+        """Enable the connection.
+
+        Attaches the session to the multiplexer.
+        """
+        self._multiplexer.attach(self)
+
+    def disable(self):
+        """Disable the connection.
+
+        Detaches the session from the multiplexer.
+        """
+        self._multiplexer.detach(self)
+
+    def send_data(self, data: bytes) -> bool:
+        """Send data to the remote host.
+
+        Args:
+            data: encoded data.
+
+        Returns:
+            True if succeeded, False if failed
+
+        """
+        return self._multiplexer.send_buffers([data])
+
+    def send_buffers(self, buffers: typing.Sequence[bytes | memoryview]) -> bool:
+        """Send a list of buffers to the remote host, as if they were concatenated.
+
+        Args:
+            buffers: encoded data.
+
+        Returns:
+            True if succeeded, False if failed
+
+        """
+        return self._multiplexer.send_buffers(buffers)
+
+    def queue_block(self, block_send_info: secsgem.common.BlockSendInfo):
+        """Queue a block for the shared connection without waiting for it to be sent.
+
+        Args:
+            block_send_info: encoded block, resolved when it was sent
+
+        """
+        self._multiplexer.queue_block(block_send_info)
+
+    @property
+    def send_statistics(self) -> secsgem.common.SendQueueStatistics:
+        """Get the statistics of the send queue of the shared connection."""
+        return self._multiplexer.send_statistics
+
+    @property
+    def dispatch_statistics(self) -> list[secsgem.common.DispatchWorkerStatistics]:
+        """Get the statistics of the threads dispatching the messages received on the shared connection."""
+        return self._multiplexer.dispatch_statistics
+
+
+class HsmsSessionProtocol(HsmsProtocol):
+    """HSMS protocol for one session of a connection shared by multiple sessions.
+
+    Select, deselect and separate are done per session, with the session id in the header.
+    Receiving, sending and linktest are done once for the shared connection by the :class:`HsmsMultiplexer`,
+    so a session does not start any threads on its own.
+    """
+
+    def __init__(self, settings: HsmsSessionSettings, streams_functions: StreamsFunctions) -> None:
+        """Initialize hsms session protocol.
+
+        Args:
+            settings: protocol and communication settings of the session
+            streams_functions: container of all known stream functions
+
+        """
+        super().__init__(settings, streams_functions)
+
+        typing.cast("HsmsSessionConnection", self._connection).on_block.register(self._on_connection_block_received)
+
+    @property
+    def _control_session_id(self) -> int:
+        """Session id for select, deselect, reject and separate messages."""
+        return self._settings.session_id
+
+    def _start_linktest_timer(self):
+        """Linktest is done for the shared connection by the multiplexer."""
+
+    def _on_connected(self, _: dict[str, typing.Any]):
+        """Handle connection was established event."""
+        self._connected = True
+
+        # update connection state
+        self._connection_state.connect()
+
+        self.events.fire("connected", {"connection": self})
+
+    def _on_disconnected(self, _: dict[str, typing.Any]):
+        """Handle connection was closed event."""
+        # update connection state
+        self._connected = False
+        self._connection_state.disconnect()
+
+        # responses to the open transactions won't arrive
+        self._transactions.resolve_all()
+
+        self.events.fire("disconnected", {"connection": self})
+
+    def _on_connection_block_received(self, data: dict[str, typing.Any]):
+        """Block for this session received by the multiplexer.
+
+        Args:
+            data: event data with source and block
+
+        """
+        self._dispatch_block(data["source"], data["block"])
+
+    def _on_connection_message_received(self, source: object, message: HsmsMessage):
+        """Message received by connection.
+
+        Args:
+            source: source of event
+            message: received data message
+
+        """
+        if message.header.s_type != HsmsSType.SEPARATE_REQ:
+            super()._on_connection_message_received(source, message)
+            return
+
+        # the remote ended this session, the shared connection stays open
+        self._communication_logger.info("< %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
+
+        if self._connection_state.current == ConnectionState.CONNECTED_SELECTED:
+            self._connection_state.deselect()
+
+    def _queue_block(self, block_send_info: secsgem.common.BlockSendInfo):
+        """Queue a block on the shared connection."""
+        typing.cast("HsmsSessionConnection", self._connection).queue_block(block_send_info)
+
+    @property
+    def send_statistics(self) -> secsgem.common.SendQueueStatistics:
+        """Get the statistics of the send queue of the shared connection."""
+        return typing.cast("HsmsSessionConnection", self._connection).send_statistics
+
+    @property
+    def dispatch_statistics(self) -> list[secsgem.common.DispatchWorkerStatistics]:
+        """Get the statistics of the threads dispatching the messages received on the shared connection."""
+        return typing.cast("HsmsSessionConnection", self._connection).dispatch_statistics
+
+
+class HsmsMultiplexer:  # pylint: disable=too-many-instance-attributes
+    """Single HSMS connection shared by multiple sessions (HSMS-GS).
+
+    Each session is a separate protocol or handler, created with the settings from :meth:`session_settings`.
+    Received blocks are routed to the session by the session id in the header.
+    All sessions share the socket and the receiver and dispatcher threads of the multiplexer.
+
+    The connection is enabled with the first enabled session, and disabled with the last disabled one.
+
+    Example:
+        import secsgem.gem
+        import secsgem.hsms
+
+        multiplexer = secsgem.hsms.HsmsMultiplexer(
+            secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE,
+                address="10.211.55.33",
+                port=5000,
+            )
+        )
+
+        modules = [secsgem.gem.GemHostHandler(multiplexer.session_settings(session_id)) for session_id in (1, 2, 3)]
+
+        for module in modules:
+            module.enable()
+
+    """
+
+    def __init__(self, settings: HsmsSettings) -> None:
+        """Initialize a multiplexer.
+
+        Args:
+            settings: settings of the shared connection, passed on to the sessions
+
+        """
+        self._settings = settings
+
+        self.linktest_timeout = settings.linktest_timeout
+        """Seconds between linktest requests on the shared connection."""
+
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+        self._communication_logger = logging.getLogger("communication")
+
+        self._sessions: dict[int, HsmsSessionConnection] = {}
+        # sessions are notified of connection changes with this lock held, so routing waits for them
+        self._sessions_lock = threading.RLock()
+        self._link_up = False
+
+        self._system_counter = random.randint(0, (2**32) - 1)  # noqa: S311
+        self._system_counter_lock = threading.Lock()
+        self._transactions: secsgem.common.TransactionTable[HsmsMessage] = secsgem.common.TransactionTable()
+        self._linktest_timer: secsgem.common.WheelTimer | None = None
+
+        self._receive_buffer = secsgem.common.ByteQueue()
+        self._send_queue = settings.create_send_queue()
+        self._admission = HsmsAdmission(settings.max_message_size, settings.message_size_limits)
+
+        self._frame_reader = HsmsFrameReader(
+            self._receive_buffer, settings.spool_threshold, settings.spool_directory, self._admission
+        )
+
+        # blocks are sent on their own thread, replies don't wait for a large frame to be received
+        self._thread = secsgem.common.ProtocolDispatcher(
+            self._process_received_data,
+            self._dispatch_block,
+            self._settings,
+            self._process_send_queue,
+        )
+
+        self._connection = settings.create_connection()
+        self._connection.on_connected.register(self._on_connected)
+        self._connection.on_data.register(self._on_connection_data_received)
+        self._connection.on_disconnecting.register(self._on_disconnecting)
+        self._connection.on_disconnected.register(self._on_disconnected)
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {self._settings.name} (sessions {sorted(self._sessions)})"
+
+    @property
+    def settings(self) -> HsmsSettings:
+        """Get the settings of the shared connection."""
+        return self._settings
+
+    @property
+    def connected(self) -> bool:
+        """Check if the shared connection is established."""
+        return self._link_up
+
+    @property
+    def disconnecting(self) -> bool:
+        """Check if the shared connection is about to be separated."""
+        return self._connection.disconnecting
+
+    @property
+    def admission_statistics(self) -> HsmsAdmissionStatistics:
+        """Get the statistics of the frames rejected by the admission control of the shared connection."""
+        return self._admission.statistics
+
+    @property
+    def send_statistics(self) -> secsgem.common.SendQueueStatistics:
+        """Get the statistics of the send queue of the shared connection."""
+        return self._send_queue.statistics
+
+    @property
+    def dispatch_statistics(self) -> list[secsgem.common.DispatchWorkerStatistics]:
+        """Get the statistics of the threads dispatching the messages received on the shared connection."""
+        return self._thread.statistics
+
+    @property
+    def sessions(self) -> dict[int, HsmsSessionConnection]:
+        """Get the connections of the enabled sessions by session id."""
+        with self._sessions_lock:
+            return dict(self._sessions)
+
+    def session_settings(self, session_id: int, **kwargs) -> HsmsSessionSettings:
+        """Create settings for a session on this connection.
+
+        Args:
+            session_id: session id / device id of the session
+            kwargs: settings overriding the ones of the shared connection
+
+        Returns:
+            settings for creating the protocol or handler of the session
+
+        """
+        return HsmsSessionSettings(
+            **{
+                **self._settings.to_dict(),
+                **kwargs,
+                "session_id": session_id,
+                "multiplexer": self,
+            }
+        )
+
+    def is_attached(self, connection: HsmsSessionConnection) -> bool:
+        """Check if a session connection is attached.
+
+        Args:
+            connection: session connection to check
+
+        """
+        return self._sessions.get(connection.session_id) is connection
+
+    def attach(self, connection: HsmsSessionConnection):
+        """Attach a session, enabling the shared connection for the first session.
+
+        Args:
+            connection: connection of the session
+
+        """
+        with self._sessions_lock:
+            if connection.session_id in self._sessions:
+                if self._sessions[connection.session_id] is connection:
+                    return
+
+                raise ValueError(f"Session {connection.session_id} is already attached to {self}")
+
+            self._sessions[connection.session_id] = connection
+            first = len(self._sessions) == 1
+
+            if self._link_up:
+                connection.on_connected({"source": connection})
+
+        if first:
+            self._connection.enable()
+
+    def detach(self, connection: HsmsSessionConnection):
+        """Detach a session, disabling the shared connection with the last session.
+
+        Args:
+            connection: connection of the session
+
+        """
+        with self._sessions_lock:
+            if not self.is_attached(connection):
+                return
+
+            if self._link_up:
+                self.__notify(connection.on_disconnecting, connection)
+
+            del self._sessions[connection.session_id]
+
+            if self._link_up:
+                self.__notify(connection.on_disconnected, connection)
+
+            last = not self._sessions
+
+        if last:
+            self._connection.disable()
+
+    def send_buffers(
+        self,
+        buffers: typing.Sequence[bytes | memoryview],
+        priority: secsgem.common.SendPriority = secsgem.common.SendPriority.REQUEST,
+    ) -> bool:
+        """Send a block on the shared connection.
+
+        Args:
+            buffers: encoded block (see :meth:`secsgem.common.Block.encode_parts`)
+            priority: lane of the send queue
+
+        Returns:
+            True if sending was successful
+
+        """
+        block_send_info = secsgem.common.BlockSendInfo(buffers, priority=priority)
+        self.queue_block(block_send_info)
+
+        return block_send_info.wait()
+
+    def queue_block(self, block_send_info: secsgem.common.BlockSendInfo):
+        """Queue a block for the shared connection without waiting for it to be sent.
+
+        Args:
+            block_send_info: encoded block, resolved when it was sent or with False if the connection is closed
+
+        """
+        with self._sessions_lock:
+            link_up = self._link_up
+
+            if link_up:
+                self._send_queue.put(block_send_info)
+
+        if not link_up:
+            block_send_info.resolve(False)
+            return
+
+        self._thread.trigger_sender()
+
+    def send_linktest_req(self) -> HsmsMessage | None:
+        """Send a Linktest Request on the shared connection.
+
+        Returns:
+            response message, None if it timed out or sending failed
+
+        """
+        system_id = self.__next_system()
+        future = self._transactions.open(system_id)
+
+        if not self.__send_control(HsmsLinktestReqHeader(system_id)):
+            future.cancel()
+            return None
+
+        return self._transactions.wait(system_id, future, self._settings.timeouts.t6)
+
+    def __next_system(self) -> int:
+        with self._system_counter_lock:
+            self._system_counter = (self._system_counter + 1) & 0xFFFFFFFF
+            return self._system_counter
+
+    def __send_control(self, header: HsmsHeader) -> bool:
+        message = HsmsMessage(header, b"")
+        self._communication_logger.info("> %s\n  %s", message, header.s_type.text, extra=self.__log_extra)
+
+        return self.send_buffers(message.blocks[0].encode_parts(), secsgem.common.SendPriority.CONTROL)
+
+    @property
+    def __log_extra(self) -> dict[str, typing.Any]:
+        return {
+            "address": self._settings.address,
+            "port": self._settings.port,
+            "session_id": 0xFFFF,
+            "remoteName": self._settings.name,
+        }
+
+    def __notify(self, event: Event, connection: HsmsSessionConnection):
+        try:
+            event({"source": connection})
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("ignoring exception in handler of session %d", connection.session_id)
+
+    def __start_linktest_timer(self):
+        self._linktest_timer = secsgem.common.TimerWheel.default().schedule(
+            self.linktest_timeout, self.__on_linktest_timer
+        )
+
+    def __on_linktest_timer(self):
+        system_id = self.__next_system()
+        message = HsmsMessage(HsmsLinktestReqHeader(system_id), b"")
+        self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self.__log_extra)
+
+        # the timer is restarted when the response arrived or T6 expired, without blocking the timer wheel
+        self._transactions.open(system_id).add_done_callback(self.__on_linktest_completed)
+
+        def _on_sent(result: bool):
+            if result:
+                self._transactions.arm(system_id, self._settings.timeouts.t6)
+            else:
+                self._transactions.resolve(system_id, None)
+
+        parts = message.blocks[0].encode_parts()
+        self.queue_block(secsgem.common.BlockSendInfo(parts, _on_sent, secsgem.common.SendPriority.CONTROL))
+
+    def __on_linktest_completed(self, future: concurrent.futures.Future[HsmsMessage | None]):
+        if not future.cancelled() and future.result() is None:
+            self._logger.warning("linktest request failed")
+
+        if self._link_up:
+            self.__start_linktest_timer()
+
+    def _on_connected(self, _: dict[str, typing.Any]):
+        """Handle shared connection was established event."""
+        # sessions are connected before the first block is parsed, so a quick select request finds them ready
+        with self._sessions_lock:
+            self._link_up = True
+
+            for connection in self._sessions.values():
+                self.__notify(connection.on_connected, connection)
+
+        self._thread.start()
+
+        self.__start_linktest_timer()
+
+    def _on_connection_data_received(self, data: dict[str, typing.Any]):
+        """Data received by shared connection.
+
+        Args:
+            data: received data
+
+        """
+        self._receive_buffer.append(data["data"])
+        self._thread.trigger_receiver()
+
+    def _on_disconnecting(self, _: dict[str, typing.Any]):
+        """Handle shared connection is about to be closed event, sessions send their separate request."""
+        with self._sessions_lock:
+            for connection in self._sessions.values():
+                self.__notify(connection.on_disconnecting, connection)
+
+    def _on_disconnected(self, _: dict[str, typing.Any]):
+        """Handle shared connection was closed event."""
+        if self._linktest_timer is not None:
+            self._linktest_timer.cancel()
+            self._linktest_timer = None
+
+        with self._sessions_lock:
+            self._link_up = False
+
+            for connection in self._sessions.values():
+                self.__notify(connection.on_disconnected, connection)
+
+        self._thread.stop()
+        self._receive_buffer.clear()
+        self._frame_reader.reset()
+
+        # blocks not sent any more
+        self._send_queue.clear()
+
+        # responses to the open linktest requests won't arrive
+        self._transactions.resolve_all()
+
+    def _process_send_queue(self) -> float | None:
+        """Send the queued blocks.
+
+        Returns:
+            seconds until the next block throttled by the rate limit may be sent
+
+        """
+        while True:
+            try:
+                block_info = self._send_queue.get_nowait()
+            except queue.Empty:
+                return self._send_queue.delay
+
+            block_info.resolve(not block_info.aborted and self._connection.send_buffers(block_info.parts))
+
+    def _process_received_data(self) -> float | None:
+        """Parse the receive buffer without waiting for the rest of a partly received frame.
+
+        Returns:
+            seconds until T8 expires for a partly received frame
+
+        """
+        while True:
+            try:
+                block = self._frame_reader.read()
+            except HsmsFrameRejectedError as exc:
+                if exc.header is None:
+                    self._logger.warning("disconnecting after malformed frame: %s", exc)
+                    self.__disconnect_stream()
+                    return None
+
+                self._logger.warning("rejecting received message: %s", exc)
+                self.__queue_control(
+                    HsmsRejectReqHeader(
+                        exc.header.system, exc.header.s_type, HsmsAdmission.reject_reason, exc.header.session_id
+                    )
+                )
+                continue
+
+            if block is None:
+                break
+
+            self._thread.queue_block(self, block)
+
+        if not self._frame_reader.partial:
+            return None
+
+        remaining = self._frame_reader.last_progress + self._settings.timeouts.t8 - time.monotonic()
+        if remaining > 0:
+            return remaining
+
+        self._logger.warning("disconnecting after T8 timeout, no data for a partly received frame")
+        self.__disconnect_stream()
+
+        return None
+
+    def __disconnect_stream(self):
+        # the rest of the stream can't be parsed, disconnecting stops and waits for the receiver thread
+        self._receive_buffer.clear()
+        self._frame_reader.reset()
+
+        threading.Thread(
+            target=self._connection.disconnect, name="secsgem_hsmsMultiplexer_separate", daemon=True
+        ).start()
+
+    def __queue_control(self, header: HsmsHeader):
+        # queued from the receiver thread, which can't wait for the sender
+        self._communication_logger.info("> %s\n  %s", header, header.s_type.text, extra=self.__log_extra)
+        self.queue_block(
+            secsgem.common.BlockSendInfo(
+                HsmsMessage(header, b"").blocks[0].encode_parts(), priority=secsgem.common.SendPriority.CONTROL
+            )
+        )
+
+    def _dispatch_block(self, _: object, block: HsmsBlock):
+        """Route a received block to its session.
+
+        Args:
+            block: received block
+
+        """
+        header = typing.cast("HsmsHeader", block.header)
+
+        if header.s_type == HsmsSType.LINKTEST_REQ:
+            self._communication_logger.info("< %s\n  %s", header, header.s_type.text, extra=self.__log_extra)
+            self.__send_control(HsmsLinktestRspHeader(header.system))
+            return
+
+        if header.session_id == 0xFFFF and header.system in self._transactions:
+            self._communication_logger.info("< %s\n  %s", header, header.s_type.text, extra=self.__log_extra)
+            self._transactions.resolve(header.system, HsmsMessage.from_block(block))
+            return
+
+        with self._sessions_lock:
+            if header.session_id == 0xFFFF:
+                # reject or separate without session, every session checks if it is concerned
+                targets = list(self._sessions.values())
+            else:
+                session = self._sessions.get(header.session_id)
+                targets = [session] if session is not None else []
+
+        if not targets:
+            self.__reject_unknown_session(header)
+            return
+
+        for connection in targets:
+            self.__deliver(connection, block)
+
+    def __deliver(self, connection: HsmsSessionConnection, block: HsmsBlock):
+        # an exception in one session must not keep the block from the others
+        try:
+            connection.on_block({"source": connection, "block": block})
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("ignoring exception in handler of session %d", connection.session_id)
+
+    def __reject_unknown_session(self, header: HsmsHeader):
+        # only requests are rejected, other messages for unknown sessions are dropped
+        if header.s_type not in (HsmsSType.DATA_MESSAGE, HsmsSType.SELECT_REQ, HsmsSType.DESELECT_REQ):
+            self._logger.debug("dropping %s for unknown session %d", header.s_type.text, header.session_id)
+            return
+
+        self._logger.warning("rejecting %s for unknown session %d", header.s_type.text, header.session_id)
+        self.__send_control(HsmsRejectReqHeader(header.system, header.s_type, 4, header.session_id))
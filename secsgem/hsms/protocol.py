@@ -18,16 +18,18 @@
 from __future__ import annotations
 
 import queue
-import struct
 import threading
+import time
 import typing
 
 import secsgem.common
 
+from .admission import HsmsAdmission, HsmsAdmissionStatistics, HsmsFrameRejectedError
 from .connection_state_machine import ConnectionState, ConnectionStateMachine
 from .deselect_req_header import HsmsDeselectReqHeader
 from .deselect_rsp_header import HsmsDeselectRspHeader
-from .header import HsmsSType
+from .frame_reader import HsmsFrameReader
+from .header import HsmsHeader, HsmsSType
 from .linktest_req_header import HsmsLinktestReqHeader
 from .linktest_rsp_header import HsmsLinktestRspHeader
 from .message import HsmsBlock, HsmsMessage
@@ -38,6 +40,8 @@ from .separate_req_header import HsmsSeparateReqHeader
 from .stream_function_header import HsmsStreamFunctionHeader
 
 if typing.TYPE_CHECKING:
+    import concurrent.futures
+
     from ..secs.functions import StreamsFunctions
     from ..secs.functions.base import SecsStreamFunction
     from .settings import HsmsSettings
@@ -51,10 +55,13 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
     """
 
     send_packet_size = 1024 * 1024
-    """ Block size for outbound data ."""
+    """Deprecated, not used anymore. Blocks are sent with gather writes without being split."""
 
     message_type = HsmsMessage
 
+    # the connection is full duplex, replies are sent while a large frame is received
+    _concurrent_send = True
+
     def __init__(self, settings: HsmsSettings, streams_functions: StreamsFunctions) -> None:
         """Initialize hsms handler.
 
@@ -88,9 +95,10 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
 
         self._connected = False
 
-        # repeating linktest variables
-        self._linktest_timer = None
-        self._linktest_timeout = 30
+        # repeating linktest and not selected timeout, on the shared timer wheel
+        self._linktest_timer: secsgem.common.WheelTimer | None = None
+        self._linktest_timeout = settings.linktest_timeout
+        self._t7_timer: secsgem.common.WheelTimer | None = None
 
         # select request thread for active connections, to avoid blocking state changes
         self._select_req_thread: threading.Thread | None = None
@@ -101,12 +109,37 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         self._connection_state.connected.events.enter.register(self._on_state_connect)
         self._connection_state.connected.events.leave.register(self._on_state_disconnect)
         self._connection_state.connected_selected.events.enter.register(self._on_state_select)
+        self._connection_state.connected_not_selected.events.enter.register(self._on_state_not_selected)
+        self._connection_state.connected_not_selected.events.leave.register(self._on_state_leave_not_selected)
+
+        self._admission = HsmsAdmission(self._settings.max_message_size, self._settings.message_size_limits)
+        self._frame_reader = HsmsFrameReader(
+            self._receive_buffer,
+            self._settings.spool_threshold,
+            self._settings.spool_directory,
+            self._admission,
+        )
 
     @property
     def connection_state(self) -> ConnectionStateMachine:
         """Property for connection state."""
         return self._connection_state
 
+    @property
+    def reconnect_statistics(self) -> secsgem.common.ReconnectStatistics | None:
+        """Get the reconnect statistics of the active connection, None for passive connections."""
+        return getattr(self._connection, "reconnect_statistics", None)
+
+    @property
+    def admission_statistics(self) -> HsmsAdmissionStatistics:
+        """Get the statistics of the frames rejected by the admission control."""
+        return self._admission.statistics
+
+    @property
+    def _control_session_id(self) -> int:
+        """Session id for select, deselect, reject and separate messages."""
+        return 0xFFFF
+
     def _send_select_req_thread(self):
         try:
             response = self.send_select_req()
@@ -116,10 +149,9 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
             self._logger.warning("exception in _send_select_req_thread", exc_info=exc)
 
     def _start_linktest_timer(self):
-        self._linktest_timer = threading.Timer(self._linktest_timeout, self._on_linktest_timer)
-        self._linktest_timer.daemon = True  # kill thread automatically on main program termination
-        self._linktest_timer.name = "secsgem_hsmsProtocol_linktestTimer"
-        self._linktest_timer.start()
+        self._linktest_timer = secsgem.common.TimerWheel.default().schedule(
+            self._linktest_timeout, self._on_linktest_timer
+        )
 
     def _on_state_connect(self, _: dict[str, typing.Any]):
         """Handle connection state model got event connect.
@@ -145,10 +177,9 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         :type data: object
         """
         # stop linktest timer
-        if self._linktest_timer:
-            self._linktest_timer.cancel()
-
-        self._linktest_timer = None
+        linktest_timer, self._linktest_timer = self._linktest_timer, None
+        if linktest_timer is not None:
+            linktest_timer.cancel()
 
     def _on_state_select(self, _: dict[str, typing.Any]):
         """Handle connection state model got event select.
@@ -159,13 +190,55 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         # send event
         self.events.fire("communicating", {"connection": self})
 
+    def _on_state_not_selected(self, _: dict[str, typing.Any]):
+        """Handle connection state model entered not selected, after connect or deselect.
+
+        :param data: event attributes
+        :type data: object
+        """
+        # the connection is closed if it is not selected within T7
+        self._t7_timer = secsgem.common.TimerWheel.default().schedule(self._settings.timeouts.t7, self._on_t7_timeout)
+
+    def _on_state_leave_not_selected(self, _: dict[str, typing.Any]):
+        """Handle connection state model left not selected.
+
+        :param data: event attributes
+        :type data: object
+        """
+        t7_timer, self._t7_timer = self._t7_timer, None
+        if t7_timer is not None:
+            t7_timer.cancel()
+
+    def _on_t7_timeout(self):
+        """Connection was not selected within T7, so it is closed."""
+        if self._connection_state.current != ConnectionState.CONNECTED_NOT_SELECTED:
+            return
+
+        disconnect = getattr(self._connection, "disconnect", None)
+        if disconnect is None:
+            return
+
+        self._logger.warning("connection not selected within T7, disconnecting")
+
+        # disconnecting sends the separate request and waits for the protocol thread, not on the wheel thread
+        threading.Thread(target=disconnect, name="secsgem_hsmsProtocol_t7Timeout", daemon=True).start()
+
     def _on_linktest_timer(self):
         """Linktest time timed out, so send linktest request."""
-        # send linktest request and wait for response
-        self.send_linktest_req()
+        system_id = self.get_next_system_counter()
+        message = HsmsMessage(HsmsLinktestReqHeader(system_id), b"")
+        self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
 
-        # restart the timer
-        self._start_linktest_timer()
+        # the timer is restarted when the response arrived or T6 expired, without blocking the timer wheel
+        self._send_request_async(message, self._settings.timeouts.t6).add_done_callback(self._on_linktest_completed)
+
+    def _on_linktest_completed(self, future: concurrent.futures.Future[HsmsMessage | None]):
+        if not future.cancelled() and future.result() is None:
+            self._logger.warning("linktest request failed")
+
+        # not restarted after the connection was closed
+        if self._linktest_timer is not None:
+            self._start_linktest_timer()
 
     def _on_connected(self, _: dict[str, typing.Any]):
         """Handle connection was established event."""
@@ -191,6 +264,10 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
 
         self._thread.stop()
         self._receive_buffer.clear()
+        self._frame_reader.reset()
+
+        # responses to the open transactions won't arrive
+        self._transactions.resolve_all()
 
         self.events.fire("disconnected", {"connection": self})
 
@@ -205,8 +282,7 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
     def __handle_hsms_requests_select_rsp(self, message: HsmsMessage):
         self._connection_state.select()
 
-        if message.header.system in self._response_queues:
-            self._response_queues[message.header.system].put_nowait(message)
+        self._resolve_transaction(message)
 
     def __handle_hsms_requests_deselect_req(self, message: HsmsMessage):
         if self._connection.disconnecting:
@@ -219,8 +295,7 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
     def __handle_hsms_requests_deselect_rsp(self, message: HsmsMessage):
         self._connection_state.deselect()
 
-        if message.header.system in self._response_queues:
-            self._response_queues[message.header.system].put_nowait(message)
+        self._resolve_transaction(message)
 
     def __handle_hsms_requests_linktest_req(self, message: HsmsMessage):
         if self._connection.disconnecting:
@@ -242,23 +317,106 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         elif message.header.s_type == HsmsSType.LINKTEST_REQ:
             self.__handle_hsms_requests_linktest_req(message)
         else:
-            if message.header.system in self._response_queues:
-                self._response_queues[message.header.system].put_nowait(message)
+            self._resolve_transaction(message)
+
+    def _process_received_data(self) -> float | None:
+        """Parse the received data without waiting for the rest of a partly received frame.
+
+        Returns:
+            seconds until T8 expires for a partly received frame
+
+        """
+        while True:
+            # decode received message, large payloads are spooled to a file
+            try:
+                block = self._frame_reader.read()
+            except HsmsFrameRejectedError as exc:
+                self._on_frame_rejected(exc)
+
+                if exc.header is None:
+                    return None
+
+                continue
+
+            if block is None:
+                break
+
+            self._thread.queue_block(self, block)
+
+        if not self._frame_reader.partial:
+            return None
+
+        remaining = self._frame_reader.last_progress + self._settings.timeouts.t8 - time.monotonic()
+        if remaining > 0:
+            return remaining
+
+        self._logger.warning("separating after T8 timeout, no data for a partly received frame")
+        self._separate_stream()
+
+        return None
+
+    def _on_frame_rejected(self, exc: HsmsFrameRejectedError):
+        """Reject a data message exceeding a size limit, or separate after a malformed frame.
+
+        Args:
+            exc: rejection of the received frame
+
+        """
+        if exc.header is None:
+            self._logger.warning("separating after malformed frame: %s", exc)
+            self._separate_stream()
+            return
+
+        self._logger.warning("rejecting received message: %s", exc)
+        self._queue_control(
+            HsmsRejectReqHeader(
+                exc.header.system, exc.header.s_type, HsmsAdmission.reject_reason, self._control_session_id
+            )
+        )
 
-    def _process_received_data(self):
-        if len(self._receive_buffer) < 4:
+    def _separate_stream(self):
+        """Separate when the rest of the received stream can't be parsed.
+
+        The stream connections send the separate request when disconnecting, and reconnect.
+        """
+        disconnect = getattr(self._connection, "disconnect", None)
+        if disconnect is None:
+            self._queue_control(HsmsSeparateReqHeader(self.get_next_system_counter(), self._control_session_id))
             return
 
-        while len(self._receive_buffer) > 3:
-            length_data = self._receive_buffer.wait_for(4, peek=True)
-            length = struct.unpack(">L", length_data)[0] + 4
+        self._receive_buffer.clear()
+        self._frame_reader.reset()
+
+        # disconnecting stops and waits for the protocol threads
+        threading.Thread(target=disconnect, name="secsgem_hsmsProtocol_separate", daemon=True).start()
 
-            data = self._receive_buffer.wait_for(length)
+    def _queue_control(self, header: HsmsHeader):
+        """Queue a control message from the receiver thread, which can't wait for it to be sent.
 
-            # decode received message
-            response = HsmsBlock.decode(data)
+        Args:
+            header: header of the control message
+
+        """
+        message = HsmsMessage(header, b"")
+        self._communication_logger.info("> %s\n  %s", message, header.s_type.text, extra=self._get_log_extra())
+        self._queue_block(
+            secsgem.common.BlockSendInfo(message.blocks[0].encode_parts(), priority=secsgem.common.SendPriority.CONTROL)
+        )
+
+    def _send_priority(self, message: secsgem.common.Message) -> secsgem.common.SendPriority:
+        """Get the lane of the send queue for a message, control messages are sent first.
+
+        Args:
+            message: message to send
+
+        Returns:
+            priority of the blocks of the message
+
+        """
+        if typing.cast("HsmsHeader", message.header).s_type != HsmsSType.DATA_MESSAGE:
+            return secsgem.common.SendPriority.CONTROL
 
-            self._thread.queue_block(self, response)
+        return super()._send_priority(message)
 
     def _on_connection_message_received(self, _: object, message: HsmsMessage):
         """Message received by connection.
@@ -277,7 +435,9 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
             if self._connection_state.current != ConnectionState.CONNECTED_SELECTED:
                 self._logger.warning("received message when not selected")
 
-                out_message = HsmsMessage(HsmsRejectReqHeader(message.header.system, message.header.s_type, 4), b"")
+                out_message = HsmsMessage(
+                    HsmsRejectReqHeader(message.header.system, message.header.s_type, 4, self._control_session_id), b""
+                )
                 self._communication_logger.info(
                     "> %s\n  %s", out_message, out_message.header.s_type.text, extra=self._get_log_extra()
                 )
@@ -285,12 +445,8 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
 
                 return
 
-            # someone is waiting for this message
-            if message.header.system in self._response_queues:
-                # send message to request sender
-                self._response_queues[message.header.system].put_nowait(message)
-            # just log if nobody is interested
-            else:
+            # someone is waiting for this message, just log if nobody is interested
+            if not self._resolve_transaction(message):
                 self.events.fire("message_received", {"connection": self, "message": message})
 
     def serialize_data(self) -> dict[str, typing.Any]:
@@ -308,24 +464,15 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
             "connected": self._connected,
         }
 
-    def _process_send_queue(self):
-        if self._send_queue.empty():
-            return
-
-        while not self._send_queue.empty():
-            block_info = self._send_queue.get()
-
-            packets = [
-                block_info.data[i : i + self.send_packet_size]
-                for i in range(0, len(block_info.data), self.send_packet_size)
-            ]
+    def _process_send_queue(self) -> float | None:
+        # every block is resolved, the sender is not triggered again for the blocks left in the queue
+        while True:
+            try:
+                block_info = self._send_queue.get_nowait()
+            except queue.Empty:
+                return self._send_queue.delay
 
-            for packet in packets:
-                if not self._connection.send_data(packet):
-                    block_info.resolve(False)
-                    return
-
-            block_info.resolve(True)
+            block_info.resolve(not block_info.aborted and self._connection.send_buffers(block_info.parts))
 
     def _create_message_for_function(
         self,
@@ -353,31 +500,35 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
             function.encode(),
         )
 
-    def send_select_req(self):
-        """Send a Select Request to the remote host.
+    def _send_control_request(self, message: HsmsMessage) -> HsmsMessage | None:
+        """Send a control request and wait T6 for the response.
 
-        :returns: System of the sent request
-        :rtype: integer
-        """
-        system_id = self.get_next_system_counter()
+        Args:
+            message: control request to send
 
-        response_queue = self._get_queue_for_system(system_id)
+        Returns:
+            response, None if the response timed out or sending failed
+
+        """
+        future = self._transactions.open(message.header.system)
 
-        message = HsmsMessage(HsmsSelectReqHeader(system_id), b"")
         self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
 
         if not self.send_message(message):
-            self._remove_queue(system_id)
+            future.cancel()
             return None
 
-        try:
-            response = response_queue.get(True, self._settings.timeouts.t6)
-        except queue.Empty:
-            response = None
+        return self._transactions.wait(message.header.system, future, self._settings.timeouts.t6)
 
-        self._remove_queue(system_id)
+    def send_select_req(self):
+        """Send a Select Request to the remote host.
+
+        :returns: System of the sent request
+        :rtype: integer
+        """
+        system_id = self.get_next_system_counter()
 
-        return response
+        return self._send_control_request(HsmsMessage(HsmsSelectReqHeader(system_id, self._control_session_id), b""))
 
     def send_select_rsp(self, system_id):
         """Send a Select Response to the remote host.
@@ -385,7 +536,7 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         :param system_id: System of the request to reply for
         :type system_id: integer
         """
-        message = HsmsMessage(HsmsSelectRspHeader(system_id), b"")
+        message = HsmsMessage(HsmsSelectRspHeader(system_id, self._control_session_id), b"")
         self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
         return self.send_message(message)
 
@@ -397,23 +548,7 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         """
         system_id = self.get_next_system_counter()
 
-        response_queue = self._get_queue_for_system(system_id)
-
-        message = HsmsMessage(HsmsLinktestReqHeader(system_id), b"")
-        self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
-
-        if not self.send_message(message):
-            self._remove_queue(system_id)
-            return None
-
-        try:
-            response = response_queue.get(True, self._settings.timeouts.t6)
-        except queue.Empty:
-            response = None
-
-        self._remove_queue(system_id)
-
-        return response
+        return self._send_control_request(HsmsMessage(HsmsLinktestReqHeader(system_id), b""))
 
     def send_linktest_rsp(self, system_id):
         """Send a Linktest Response to the remote host.
@@ -433,23 +568,7 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         """
         system_id = self.get_next_system_counter()
 
-        response_queue = self._get_queue_for_system(system_id)
-
-        message = HsmsMessage(HsmsDeselectReqHeader(system_id), b"")
-        self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
-
-        if not self.send_message(message):
-            self._remove_queue(system_id)
-            return None
-
-        try:
-            response = response_queue.get(True, self._settings.timeouts.t6)
-        except queue.Empty:
-            response = None
-
-        self._remove_queue(system_id)
-
-        return response
+        return self._send_control_request(HsmsMessage(HsmsDeselectReqHeader(system_id, self._control_session_id), b""))
 
     def send_deselect_rsp(self, system_id):
         """Send a Deselect Response to the remote host.
@@ -457,7 +576,7 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         :param system_id: System of the request to reply for
         :type system_id: integer
         """
-        message = HsmsMessage(HsmsDeselectRspHeader(system_id), b"")
+        message = HsmsMessage(HsmsDeselectRspHeader(system_id, self._control_session_id), b"")
         self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
         return self.send_message(message)
 
@@ -471,7 +590,7 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         :param reason: reason for rejection
         :type reason: integer
         """
-        message = HsmsMessage(HsmsRejectReqHeader(system_id, s_type, reason), b"")
+        message = HsmsMessage(HsmsRejectReqHeader(system_id, s_type, reason, self._control_session_id), b"")
         self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
         return self.send_message(message)
 
@@ -479,7 +598,7 @@ class HsmsProtocol(secsgem.common.Protocol[HsmsMessage, HsmsBlock]):  # pylint:
         """Send a Separate Request to the remote host."""
         system_id = self.get_next_system_counter()
 
-        message = HsmsMessage(HsmsSeparateReqHeader(system_id), b"")
+        message = HsmsMessage(HsmsSeparateReqHeader(system_id, self._control_session_id), b"")
         self._communication_logger.info("> %s\n  %s", message, message.header.s_type.text, extra=self._get_log_extra())
 
         if not self.send_message(message):
@@ -24,7 +24,7 @@ class HsmsRejectReqHeader(HsmsHeader):
     Header for message with SType 7.
     """
 
-    def __init__(self, system: int, s_type: HsmsSType, reason: int):
+    def __init__(self, system: int, s_type: HsmsSType, reason: int, session_id: int = 0xFFFF):
         """Initialize a hsms reject request.
 
         :param system: message ID
@@ -33,6 +33,8 @@ class HsmsRejectReqHeader(HsmsHeader):
         :type s_type: integer
         :param reason: reason for rejection
         :type reason: integer
+        :param session_id: session of the rejected message, 0xFFFF unless sessions share the connection (HSMS-GS)
+        :type session_id: integer
 
         Example:
             >>> import secsgem.hsms
@@ -41,4 +43,4 @@ class HsmsRejectReqHeader(HsmsHeader):
             HsmsRejectReqHeader({session_id:0xffff, stream:03, function:04, p_type:0x00, s_type:0x07, \
 system:0x00000011, require_response:False})
         """
-        super().__init__(system, 0xFFFF, s_type.value, reason, False, 0x00, HsmsSType.REJECT_REQ)
+        super().__init__(system, session_id, s_type.value, reason, False, 0x00, HsmsSType.REJECT_REQ)
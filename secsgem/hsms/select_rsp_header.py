@@ -24,11 +24,13 @@ class HsmsSelectRspHeader(HsmsHeader):
     Header for message with SType 2.
     """
 
-    def __init__(self, system: int):
+    def __init__(self, system: int, session_id: int = 0xFFFF):
         """Initialize a hsms select response.
 
         :param system: message ID
         :type system: integer
+        :param session_id: session of the message, 0xFFFF unless multiple sessions share the connection (HSMS-GS)
+        :type session_id: integer
 
         Example:
             >>> import secsgem.hsms
@@ -37,4 +39,4 @@ class HsmsSelectRspHeader(HsmsHeader):
             HsmsSelectRspHeader({session_id:0xffff, stream:00, function:00, p_type:0x00, s_type:0x02, \
 system:0x00000018, require_response:False})
         """
-        super().__init__(system, 0xFFFF, 0, 0, False, 0x00, HsmsSType.SELECT_RSP)
+        super().__init__(system, session_id, 0, 0, False, 0x00, HsmsSType.SELECT_RSP)
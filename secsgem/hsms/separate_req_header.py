@@ -24,11 +24,13 @@ class HsmsSeparateReqHeader(HsmsHeader):
     Header for message with SType 9.
     """
 
-    def __init__(self, system: int):
+    def __init__(self, system: int, session_id: int = 0xFFFF):
         """Initialize a hsms separate request header.
 
         :param system: message ID
         :type system: integer
+        :param session_id: session of the message, 0xFFFF unless multiple sessions share the connection (HSMS-GS)
+        :type session_id: integer
 
         Example:
             >>> import secsgem.hsms
@@ -37,4 +39,4 @@ class HsmsSeparateReqHeader(HsmsHeader):
             HsmsSeparateReqHeader({session_id:0xffff, stream:00, function:00, p_type:0x00, s_type:0x09, \
 system:0x00000011, require_response:False})
         """
-        super().__init__(system, 0xFFFF, 0, 0, False, 0x00, HsmsSType.SEPARATE_REQ)
+        super().__init__(system, session_id, 0, 0, False, 0x00, HsmsSType.SEPARATE_REQ)
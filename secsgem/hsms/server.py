@@ -0,0 +1,294 @@
+#####################################################################
+# server.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Passive HSMS server for multiple peers."""
+
+from __future__ import annotations
+
+import logging
+import socket
+import threading
+import typing
+
+import secsgem.common
+
+from .settings import HsmsConnectMode, HsmsSettings
+
+HsmsPeerKey = typing.Tuple[str, int]  # runtime alias, python 3.8
+"""Key of a peer, consisting of remote address and remote port."""
+
+
+class HsmsPeerSettings(HsmsSettings):
+    """Settings for a peer connection accepted by :class:`HsmsMultiPassiveServer`.
+
+    Contains the settings of the server, and the accepted socket the connection is created for.
+
+    .. exec::
+        import secsgem.hsms.server
+
+        secsgem.hsms.server.HsmsPeerSettings._attributes_help()
+
+    """
+
+    @classmethod
+    def _attributes(cls) -> list[secsgem.common.Setting]:
+        """Get the available settings for the class."""
+        return [
+            *super()._attributes(),
+            secsgem.common.Setting("peer_socket", None, "Accepted socket of the peer"),
+            secsgem.common.Setting("peer_address", ("", 0), "Address and port of the peer"),
+        ]
+
+    def create_connection(self) -> secsgem.common.Connection:
+        """Connection class for this configuration."""
+        return secsgem.common.TcpAcceptedConnection(self, self.peer_socket)
+
+    @property
+    def name(self) -> str:
+        """Name of this configuration."""
+        address, port = self.peer_address
+        return f"HSMS-PEER_{address}:{port}"
+
+    def generate_thread_name(self, functionality: str) -> str:
+        """Generate a unique thread name for this configuration and a provided functionality.
+
+        Args:
+            functionality: name of the functionality to generate thread name for
+
+        Returns:
+            generated thread name
+
+        """
+        address, port = self.peer_address
+        return f"secsgem_HSMS_{functionality}_peer_{address}:{port}"
+
+
+class HsmsMultiPassiveServer:
+    """Passive HSMS endpoint accepting any number of peers on one port.
+
+    The listening socket stays open, every accepted connection gets its own protocol or handler.
+    It is created by the handler factory with :class:`HsmsPeerSettings`, a copy of the server settings for the peer.
+    The handler is enabled right after it was created and dropped when the peer disconnects.
+
+    All sockets are served by the reactor from the settings, a reactor owned by the server is used if not set.
+    The handler factory and the connected events are called from the reactor thread, so they must not block.
+
+    Example:
+        import secsgem.gem
+        import secsgem.hsms
+
+        settings = secsgem.hsms.HsmsSettings(
+            connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+            address="0.0.0.0",
+            port=5000,
+        )
+
+        server = secsgem.hsms.HsmsMultiPassiveServer(settings, secsgem.gem.GemHostHandler)
+        server.events.peer_connected += lambda data: print("connected", data["key"])
+
+        server.enable()
+
+    """
+
+    def __init__(
+        self,
+        settings: HsmsSettings,
+        handler_factory: typing.Callable[[HsmsPeerSettings], typing.Any] | None = None,
+        backlog: int = 16,
+    ):
+        """Initialize a multi passive server.
+
+        Args:
+            settings: settings for the listening socket, passed on to the peers
+            handler_factory: callable creating the handler (or protocol) for the peer settings,
+                a :class:`secsgem.hsms.HsmsProtocol` is created if not set
+            backlog: number of pending connections for the listening socket
+
+        """
+        if settings.connect_mode != HsmsConnectMode.PASSIVE:
+            raise ValueError(f"Multi passive server requires passive settings, got {settings.connect_mode}")
+
+        if settings.socket_path is not None:
+            raise ValueError("Multi passive server requires address and port, unix domain sockets are not supported")
+
+        self._settings = settings
+        self._handler_factory = handler_factory if handler_factory is not None else self._create_protocol
+        self._backlog = backlog
+
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._event_producer = secsgem.common.EventProducer()
+
+        self._reactor: secsgem.common.Reactor | None = settings.reactor
+        self._owns_reactor = False
+
+        self._server_sock: socket.socket | None = None
+        self._enabled = False
+
+        self._peers: dict[HsmsPeerKey, typing.Any] = {}
+        self._peers_lock = threading.Lock()
+
+    @staticmethod
+    def _create_protocol(settings: HsmsPeerSettings) -> secsgem.common.Protocol:
+        from ..secs.functions import StreamsFunctions  # pylint: disable=import-outside-toplevel
+
+        return settings.create_protocol(StreamsFunctions())
+
+    def __repr__(self) -> str:
+        """Generate textual representation for an object of this class."""
+        return f"{self.__class__.__name__} {self._settings.address}:{self._settings.port} ({len(self._peers)} peers)"
+
+    @property
+    def events(self) -> secsgem.common.EventProducer:
+        """Property for event handling.
+
+        The server fires `peer_connected` after the handler for a new peer was created and enabled, and
+        `peer_disconnected` after a peer disconnected and its handler was dropped.
+        """
+        return self._event_producer
+
+    @property
+    def settings(self) -> HsmsSettings:
+        """Get the server settings."""
+        return self._settings
+
+    @property
+    def peers(self) -> dict[HsmsPeerKey, typing.Any]:
+        """Get the handlers of the connected peers by remote address and remote port."""
+        with self._peers_lock:
+            return dict(self._peers)
+
+    @property
+    def address(self) -> tuple[str, int] | None:
+        """Get the address the server is listening on, None if not enabled."""
+        if self._server_sock is None:
+            return None
+
+        return self._server_sock.getsockname()[:2]
+
+    def enable(self):
+        """Start listening for peers."""
+        if self._enabled:
+            return
+
+        if self._reactor is None:
+            self._reactor = secsgem.common.Reactor(name=self._settings.generate_thread_name("reactor"))
+            self._owns_reactor = True
+
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+        if not secsgem.common.is_windows():
+            server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        # accepted sockets inherit the buffer sizes, they are used for the window negotiation
+        self._settings.tcp_options.apply(server_sock)
+
+        server_sock.bind((self._settings.address, self._settings.port))
+        server_sock.listen(self._backlog)
+        server_sock.setblocking(False)
+
+        self._server_sock = server_sock
+        self._enabled = True
+
+        self._reactor.register(server_sock, self._on_server_socket_readable)
+
+    def disable(self):
+        """Stop listening and disconnect all peers."""
+        if not self._enabled:
+            return
+
+        self._enabled = False
+
+        server_sock = self._server_sock
+        self._server_sock = None
+
+        if server_sock is not None and self._reactor is not None:
+            self._reactor.unregister(server_sock)
+            server_sock.close()
+
+        for handler in self.peers.values():
+            handler.disable()
+
+        if self._owns_reactor and self._reactor is not None:
+            self._reactor.stop()
+            self._reactor = None
+            self._owns_reactor = False
+
+    def _on_server_socket_readable(self):
+        """Reactor callback for incoming connections."""
+        while self._server_sock is not None:
+            try:
+                sock, _ = self._server_sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self._logger.exception("accepting connection failed")
+                return
+
+            try:
+                self._add_peer(sock)
+            except Exception:  # pylint: disable=broad-except
+                self._logger.exception("creating handler for peer failed")
+                sock.close()
+
+    def _add_peer(self, sock: socket.socket):
+        """Create and enable the handler for an accepted socket.
+
+        Args:
+            sock: accepted socket
+
+        """
+        address, port = sock.getpeername()[:2]
+
+        settings = HsmsPeerSettings(
+            **{
+                **self._settings.to_dict(),
+                "reactor": self._reactor,
+                "peer_socket": sock,
+                "peer_address": (address, port),
+            }
+        )
+
+        key: HsmsPeerKey = (address, port)
+
+        handler = self._handler_factory(settings)
+        handler.events.disconnected += lambda _: self._on_peer_disconnected(key, handler)
+
+        with self._peers_lock:
+            self._peers[key] = handler
+
+        self._logger.info("peer %s:%d connected", address, port)
+
+        handler.enable()
+
+        self.events.fire("peer_connected", {"server": self, "key": key, "handler": handler})
+
+    def _on_peer_disconnected(self, key: HsmsPeerKey, handler: typing.Any):
+        """Drop the handler of a disconnected peer.
+
+        Args:
+            key: key of the peer
+            handler: handler of the peer
+
+        """
+        with self._peers_lock:
+            if self._peers.get(key) is not handler:
+                return
+
+            del self._peers[key]
+
+        self._logger.info("peer %s:%d disconnected", key[0], key[1])
+
+        self.events.fire("peer_disconnected", {"server": self, "key": key, "handler": handler})
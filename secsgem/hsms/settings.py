@@ -25,6 +25,8 @@ import secsgem.common
 if typing.TYPE_CHECKING:
     from secsgem.secs.functions import StreamsFunctions
 
+    from .async_protocol import AsyncHsmsProtocol
+
 
 class HsmsConnectMode(enum.Enum):
     """Hsms connect mode (active or passive)."""
@@ -58,6 +60,9 @@ class HsmsSettings(secsgem.common.Settings):
 
     """
 
+    length_header_format = ">L"
+    """Format of the length header in front of each block, used by the connection to size the socket reads."""
+
     @classmethod
     def _attributes(cls) -> list[secsgem.common.Setting]:
         """Get the available settings for the class."""
@@ -66,6 +71,46 @@ class HsmsSettings(secsgem.common.Settings):
             secsgem.common.Setting("connect_mode", HsmsConnectMode.ACTIVE, "Hsms connect mode"),
             secsgem.common.Setting("address", "127.0.0.1", "Remote (active) or local (passive) IP address"),
             secsgem.common.Setting("port", 5000, "TCP port of remote host"),
+            secsgem.common.Setting(
+                "socket_path", None, "Path of a unix domain socket, used instead of address and port if set"
+            ),
+            secsgem.common.Setting(
+                "reactor", None, "Shared reactor serving the socket, a thread per connection is used if not set"
+            ),
+            secsgem.common.Setting("tcp_options", None, "TCP socket options", secsgem.common.TcpOptions),
+            secsgem.common.Setting(
+                "linktest_timeout", 30, "Seconds between linktest requests on a selected connection"
+            ),
+            secsgem.common.Setting(
+                "loopback", None, "In-memory link to a connection in the same process, used instead of TCP if set"
+            ),
+            secsgem.common.Setting(
+                "reconnect_scheduler", None, "Timer wheel for reconnect attempts, the shared timer wheel if not set"
+            ),
+            secsgem.common.Setting("reconnect_backoff", 2.0, "Factor the reconnect delay grows by per failed attempt"),
+            secsgem.common.Setting("reconnect_max_delay", 60.0, "Maximum reconnect delay in seconds, at least T5"),
+            secsgem.common.Setting("reconnect_jitter", 0.1, "Maximum random part of the reconnect delay as fraction"),
+            secsgem.common.Setting(
+                "receive_buffer_size",
+                65536,
+                "Bytes read from the socket at once, grows to the size of a pending block",
+            ),
+            secsgem.common.Setting(
+                "spool_threshold",
+                None,
+                "Payload bytes above which received messages are stored in a memory-mapped file, never if not set",
+            ),
+            secsgem.common.Setting(
+                "max_message_size", None, "Maximum payload bytes of a received message, unlimited if not set"
+            ),
+            secsgem.common.Setting(
+                "message_size_limits", None, "Maximum payload bytes of received messages by (stream, function)"
+            ),
+            secsgem.common.Setting(
+                "spool_directory",
+                None,
+                "Directory for the files of spooled messages, the temporary directory if not set",
+            ),
         ]
 
     def create_protocol(self, streams_functions: StreamsFunctions) -> secsgem.common.Protocol:
@@ -74,16 +119,38 @@ class HsmsSettings(secsgem.common.Settings):
 
         return HsmsProtocol(self, streams_functions)
 
+    def create_async_protocol(self, streams_functions: StreamsFunctions) -> AsyncHsmsProtocol:
+        """Asyncio protocol class for this configuration."""
+        from .async_protocol import AsyncHsmsProtocol  # pylint: disable=import-outside-toplevel
+
+        return AsyncHsmsProtocol(self, streams_functions)
+
     def create_connection(self) -> secsgem.common.Connection:
         """Connection class for this configuration."""
+        if self.loopback is not None:
+            return secsgem.common.LoopbackConnection(self, self.loopback)
+
+        if self.socket_path is not None:
+            if self.connect_mode == HsmsConnectMode.ACTIVE:
+                return secsgem.common.UnixClientConnection(self)
+            return secsgem.common.UnixServerConnection(self)
+
         if self.connect_mode == HsmsConnectMode.ACTIVE:
             return secsgem.common.TcpClientConnection(self)
         return secsgem.common.TcpServerConnection(self)
 
+    @property
+    def endpoint(self) -> str:
+        """Socket path or address and port of this configuration."""
+        if self.socket_path is not None:
+            return self.socket_path
+
+        return f"{self.address}:{self.port}"
+
     @property
     def name(self) -> str:
         """Name of this configuration."""
-        return f"HSMS-{self.connect_mode}_{self.address}:{self.port}"
+        return f"HSMS-{self.connect_mode}_{self.endpoint}"
 
     @property
     def is_active(self) -> bool:
@@ -100,4 +167,4 @@ class HsmsSettings(secsgem.common.Settings):
             generated thread name
 
         """
-        return f"secsgem_HSMS_{functionality}_{self.connect_mode}_{self.address}:{self.port}"
+        return f"secsgem_HSMS_{functionality}_{self.connect_mode}_{self.endpoint}"
@@ -16,7 +16,8 @@
 """module imports."""
 
 from . import data_items, functions, variables
+from .async_handler import AsyncSecsHandler
 from .functions.base import SecsStreamFunction
 from .handler import SecsHandler
 
-__all__ = ["variables", "data_items", "functions", "SecsStreamFunction", "SecsHandler"]
+__all__ = ["variables", "data_items", "functions", "SecsStreamFunction", "SecsHandler", "AsyncSecsHandler"]
@@ -0,0 +1,295 @@
+#####################################################################
+# async_handler.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Asyncio handler for SECS commands."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import typing
+
+import secsgem.common
+from secsgem.secs.functions import SecsS01F04, SecsS01F12, StreamsFunctions
+
+from .handler_mixin import SecsHandlerMixin
+
+if typing.TYPE_CHECKING:
+    from .data_items import SV
+    from .functions.base import SecsStreamFunction
+    from .handler_mixin import Exchange, ResultT
+
+
+class AsyncSecsHandler(SecsHandlerMixin):  # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    """Baseclass for creating Host/Equipment models on asyncio. This layer contains the SECS functionality.
+
+    Works like :class:`secsgem.secs.SecsHandler`, but all functions communicating with the remote are coroutines.
+    Stream/function callbacks can be plain functions or coroutine functions.
+
+    Inherit from this class and override required functions.
+    """
+
+    def __init__(self, settings: secsgem.common.Settings):
+        """Initialize a secs handler.
+
+        Args:
+            settings: settings defining protocol and connection
+
+        """
+        self._settings = settings
+        self.streams_functions = StreamsFunctions()
+
+        self._protocol = settings.create_async_protocol(self.streams_functions)
+        self._protocol.events.message_received += self._on_message_received
+
+        self.logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._callback_handler = secsgem.common.CallbackHandler()
+        self._callback_handler.target = self
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Future] = set()
+
+    @property
+    def protocol(self):
+        """Get the protocol for the handler."""
+        return self._protocol
+
+    async def enable(self):
+        """Enable the connection."""
+        self._loop = asyncio.get_running_loop()
+        await self.protocol.enable()
+
+    async def disable(self):
+        """Disable the connection."""
+        await self.protocol.disable()
+
+    async def send_response(self, *args, **kwargs):
+        """Wrapper for protocols send_response function."""
+        return await self.protocol.send_response(*args, **kwargs)
+
+    async def send_and_waitfor_response(self, *args, **kwargs):
+        """Wrapper for protocols send_and_waitfor_response function."""
+        return await self.protocol.send_and_waitfor_response(*args, **kwargs)
+
+    async def send_many_and_wait(
+        self,
+        functions: typing.Iterable[SecsStreamFunction],
+        window: int = 8,
+        timeout: float | None = None,
+    ) -> list[asyncio.Task[secsgem.common.Message | None]]:
+        """Send requests pipelined and wait for all responses.
+
+        Up to `window` requests are waiting for their response at the same time, the next request is sent as soon
+        as one of them is answered. A request timing out or failing doesn't abort the others.
+
+        Args:
+            functions: requests to send
+            window: maximum number of requests waiting for their response
+            timeout: seconds to wait for each response, T3 if None
+
+        Returns:
+            completed tasks in the order of the requests, the result is the response or None if it timed out or
+            sending failed, the exception is set if the request couldn't be sent
+
+        """
+        if window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+
+        in_flight = asyncio.Semaphore(window)
+        tasks: list[asyncio.Task[secsgem.common.Message | None]] = []
+
+        async def _send(function: SecsStreamFunction) -> secsgem.common.Message | None:
+            try:
+                return await self.protocol.send_and_waitfor_response(function, timeout)
+            finally:
+                in_flight.release()
+
+        for function in functions:
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(_send(function)))
+
+        if tasks:
+            await asyncio.wait(tasks)
+
+        return tasks
+
+    async def send_stream_function(self, *args, **kwargs):
+        """Wrapper for protocols send_stream_function function."""
+        return await self.protocol.send_stream_function(*args, **kwargs)
+
+    @property
+    def events(self):
+        """Wrapper for protocols events."""
+        return self.protocol.events
+
+    def _run_coroutine(self, coroutine: typing.Coroutine):
+        """Run a coroutine in the background on the handlers event loop.
+
+        Can be called from the event loop or from other threads, like the state machine timers.
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is None or running_loop is not self._loop:
+            if self._loop is None:
+                coroutine.close()
+                raise RuntimeError("Handler is not enabled")
+
+            asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+            return
+
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_exchange(self, exchange: Exchange[ResultT]) -> ResultT:
+        """Run a request helper, awaiting the response of each request."""
+        try:
+            request = next(exchange)
+            while True:
+                request = exchange.send(await self.send_and_waitfor_response(request))
+        except StopIteration as stop:
+            return stop.value
+
+    async def _handle_stream_function(self, message: secsgem.common.Message):
+        sf_callback_index = self._generate_sf_callback_name(message.header.stream, message.header.function)
+
+        # return S09F05 if no callback present
+        if sf_callback_index not in self._callback_handler:
+            self.logger.warning("unexpected function received %s\n%s", sf_callback_index, message.header)
+            if message.header.require_response:
+                await self.send_response(self.stream_function(9, 5)(message.header.encode()), message.header.system)
+
+            return
+
+        try:
+            callback = getattr(self._callback_handler, sf_callback_index)
+            result = callback(self, message)
+            if inspect.isawaitable(result):
+                result = await result
+
+            if result is not None:
+                await self.send_response(result, message.header.system)
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception("Callback aborted because of exception, abort sent")
+            await self.send_response(self.stream_function(message.header.stream, 0)(), message.header.system)
+
+    def _on_message_received(self, data: dict[str, typing.Any]):
+        """Message received from protocol layer.
+
+        Args:
+            data: received data
+
+        """
+        self._run_coroutine(self._handle_stream_function(data["message"]))
+
+    async def disable_ceids(self):
+        """Disable all Collection Events."""
+        return await self._run_exchange(self._disable_ceids())
+
+    async def disable_ceid_reports(self):
+        """Disable all Collection Event Reports."""
+        return await self._run_exchange(self._disable_ceid_reports())
+
+    async def list_svs(self, svs: typing.Sequence[int | str] | None = None) -> SecsS01F12:
+        """Get list of available Status Variables.
+
+        Args:
+            svs: Status Variables to list, all if None
+
+        """
+        return await self._run_exchange(self._list_svs(svs))
+
+    async def request_svs(self, svs: typing.Sequence[int | str]) -> SecsS01F04:
+        """Request contents of supplied Status Variables.
+
+        Args:
+            svs: Status Variables to request
+
+        """
+        return await self._run_exchange(self._request_svs(svs))
+
+    async def request_sv(self, sv_id: int | str) -> SV:
+        """Request contents of one Status Variable.
+
+        Args:
+            sv_id: id of Status Variable
+
+        """
+        return await self._run_exchange(self._request_sv(sv_id))
+
+    async def list_ecs(self, ecs=None):
+        """Get list of available Equipment Constants.
+
+        Args:
+            ecs: Equipment Constants to list, all if None
+
+        """
+        return await self._run_exchange(self._list_ecs(ecs))
+
+    async def request_ecs(self, ecs):
+        """Request contents of supplied Equipment Constants.
+
+        Args:
+            ecs: Equipment Constants to request
+
+        """
+        return await self._run_exchange(self._request_ecs(ecs))
+
+    async def request_ec(self, ec_id):
+        """Request contents of one Equipment Constant.
+
+        Args:
+            ec_id: id of Equipment Constant
+
+        """
+        return await self._run_exchange(self._request_ec(ec_id))
+
+    async def set_ecs(self, ecs):
+        """Set contents of supplied Equipment Constants.
+
+        Args:
+            ecs: list containing list of id / value pairs
+
+        """
+        return await self._run_exchange(self._set_ecs(ecs))
+
+    async def set_ec(self, ec_id, value):
+        """Set contents of one Equipment Constant.
+
+        Args:
+            ec_id: id of Equipment Constant
+            value: new content of Equipment Constant
+
+        """
+        return await self._run_exchange(self._set_ec(ec_id, value))
+
+    async def send_equipment_terminal(self, terminal_id, text):
+        """Set text to equipment terminal.
+
+        Args:
+            terminal_id: ID of terminal
+            text: text to send
+
+        """
+        return await self._run_exchange(self._send_equipment_terminal(terminal_id, text))
+
+    async def are_you_there(self):
+        """Check if remote is still replying."""
+        return await self._run_exchange(self._are_you_there())
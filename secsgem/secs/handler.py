@@ -17,17 +17,23 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import logging
+import threading
 import typing
 
 import secsgem.common
 from secsgem.secs.functions import SecsS01F04, SecsS01F12, StreamsFunctions
 
+from .handler_mixin import SecsHandlerMixin
+
 if typing.TYPE_CHECKING:
     from .data_items import SV
+    from .functions.base import SecsStreamFunction
+    from .handler_mixin import Exchange, ResultT
 
 
-class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
+class SecsHandler(SecsHandlerMixin):  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """Baseclass for creating Host/Equipment models. This layer contains the SECS functionality.
 
     Inherit from this class and override required functions.
@@ -51,15 +57,6 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         self._callback_handler = secsgem.common.CallbackHandler()
         self._callback_handler.target = self
 
-    @property
-    def settings(self) -> secsgem.common.Settings:
-        """Get the setting object."""
-        return self._settings
-
-    @staticmethod
-    def _generate_sf_callback_name(stream: int, function: int) -> str:
-        return f"s{stream:02d}f{function:02d}"
-
     @property
     def protocol(self) -> secsgem.common.Protocol:
         """Get the connection for the handler."""
@@ -77,10 +74,61 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         """Wrapper for connections send_response function."""
         return self.protocol.send_response(*args, **kwargs)
 
+    def send_response_async(self, *args, **kwargs):
+        """Wrapper for connections send_response_async function."""
+        return self.protocol.send_response_async(*args, **kwargs)
+
     def send_and_waitfor_response(self, *args, **kwargs):
         """Wrapper for connections send_and_waitfor_response function."""
         return self.protocol.send_and_waitfor_response(*args, **kwargs)
 
+    def send_many_and_wait(
+        self,
+        functions: typing.Iterable[SecsStreamFunction],
+        window: int = 8,
+        timeout: float | None = None,
+    ) -> list[concurrent.futures.Future[secsgem.common.Message | None]]:
+        """Send requests pipelined and wait for all responses.
+
+        Up to `window` requests are waiting for their response at the same time, the next request is sent as soon
+        as one of them is answered. A request timing out or failing doesn't abort the others.
+
+        Args:
+            functions: requests to send
+            window: maximum number of requests waiting for their response
+            timeout: seconds to wait for each response, T3 if None
+
+        Returns:
+            completed futures in the order of the requests, the result is the response or None if it timed out or
+            sending failed, the exception is set if the request couldn't be sent
+
+        """
+        if window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+
+        in_flight = threading.Semaphore(window)
+        futures: list[concurrent.futures.Future[secsgem.common.Message | None]] = []
+
+        for function in functions:
+            in_flight.acquire()  # pylint: disable=consider-using-with
+
+            try:
+                future = self.protocol.send_async(function, timeout)
+            except Exception as exc:  # pylint: disable=broad-except
+                future = concurrent.futures.Future()
+                future.set_exception(exc)
+
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+
+        concurrent.futures.wait(futures)
+
+        return futures
+
+    def send_async(self, *args, **kwargs):
+        """Wrapper for connections send_async function."""
+        return self.protocol.send_async(*args, **kwargs)
+
     def send_stream_function(self, *args, **kwargs):
         """Wrapper for connections send_stream_function function."""
         return self.protocol.send_stream_function(*args, **kwargs)
@@ -90,34 +138,14 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         """Wrapper for connections events."""
         return self.protocol.events
 
-    @property
-    def callbacks(self):
-        """Property for callback handling."""
-        return self._callback_handler
-
-    def register_stream_function(self, stream: int, function: int, callback):
-        """Register the function callback for stream and function.
-
-        :param stream: stream to register callback for
-        :type stream: integer
-        :param function: function to register callback for
-        :type function: integer
-        :param callback: method to call when stream and functions is received
-        :type callback: def callback(connection)
-        """
-        name = self._generate_sf_callback_name(stream, function)
-        setattr(self._callback_handler, name, callback)
-
-    def unregister_stream_function(self, stream, function):
-        """Unregister the function callback for stream and function.
-
-        :param stream: stream to unregister callback for
-        :type stream: integer
-        :param function: function to register callback for
-        :type function: integer
-        """
-        name = self._generate_sf_callback_name(stream, function)
-        setattr(self._callback_handler, name, None)
+    def _run_exchange(self, exchange: Exchange[ResultT]) -> ResultT:
+        """Run a request helper, waiting for the response of each request."""
+        try:
+            request = next(exchange)
+            while True:
+                request = exchange.send(self.send_and_waitfor_response(request))
+        except StopIteration as stop:
+            return stop.value
 
     def _handle_stream_function(self, message):
         sf_callback_index = self._generate_sf_callback_name(message.header.stream, message.header.function)
@@ -126,7 +154,7 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         if sf_callback_index not in self._callback_handler:
             self.logger.warning("unexpected function received %s\n%s", sf_callback_index, message.header)
             if message.header.require_response:
-                self.send_response(self.stream_function(9, 5)(message.header.encode()), message.header.system)
+                self.send_response_async(self.stream_function(9, 5)(message.header.encode()), message.header.system)
 
             return
 
@@ -134,10 +162,10 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
             callback = getattr(self._callback_handler, sf_callback_index)
             result = callback(self, message)
             if result is not None:
-                self.send_response(result, message.header.system)
+                self.send_response_async(result, message.header.system)
         except Exception:  # pylint: disable=broad-except
             self.logger.exception("Callback aborted because of exception, abort sent")
-            self.send_response(self.stream_function(message.header.stream, 0)(), message.header.system)
+            self.send_response_async(self.stream_function(message.header.stream, 0)(), message.header.system)
 
     def _on_message_received(self, data: dict[str, typing.Any]):
         """Message received from protocol layer.
@@ -153,15 +181,11 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
 
     def disable_ceids(self):
         """Disable all Collection Events."""
-        self.logger.info("Disable all collection events")
-
-        return self.send_and_waitfor_response(self.stream_function(2, 37)({"CEED": False, "CEID": []}))
+        return self._run_exchange(self._disable_ceids())
 
     def disable_ceid_reports(self):
         """Disable all Collection Event Reports."""
-        self.logger.info("Disable all collection event reports")
-
-        return self.send_and_waitfor_response(self.stream_function(2, 33)({"DATAID": 0, "DATA": []}))
+        return self._run_exchange(self._disable_ceid_reports())
 
     def list_svs(self, svs: typing.Sequence[int | str] | None = None) -> SecsS01F12:
         """Get list of available Status Variables.
@@ -169,14 +193,7 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         :returns: available Status Variables
         :rtype: list
         """
-        self.logger.info("Get list of status variables")
-
-        if svs is None:
-            svs = []
-
-        message = self.send_and_waitfor_response(self.stream_function(1, 11)(svs))
-
-        return typing.cast(SecsS01F12, self.streams_functions.decode(message))
+        return self._run_exchange(self._list_svs(svs))
 
     def request_svs(self, svs: typing.Sequence[int | str]) -> SecsS01F04:
         """Request contents of supplied Status Variables.
@@ -186,11 +203,7 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         :returns: values of requested Status Variables
         :rtype: list
         """
-        self.logger.info("Get value of status variables %s", svs)
-
-        message = self.send_and_waitfor_response(self.stream_function(1, 3)(svs))
-
-        return typing.cast(SecsS01F04, self.streams_functions.decode(message))
+        return self._run_exchange(self._request_svs(svs))
 
     def request_sv(self, sv_id: int | str) -> SV:
         """Request contents of one Status Variable.
@@ -200,9 +213,7 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         :returns: value of requested Status Variable
         :rtype: various
         """
-        self.logger.info("Get value of status variable %s", sv_id)
-
-        return self.request_svs([sv_id]).data[0]
+        return self._run_exchange(self._request_sv(sv_id))
 
     def list_ecs(self, ecs=None):
         """Get list of available Equipment Constants.
@@ -210,13 +221,7 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         :returns: available Equipment Constants
         :rtype: list
         """
-        self.logger.info("Get list of equipment constants")
-
-        if ecs is None:
-            ecs = []
-        message = self.send_and_waitfor_response(self.stream_function(2, 29)(ecs))
-
-        return self.streams_functions.decode(message)
+        return self._run_exchange(self._list_ecs(ecs))
 
     def request_ecs(self, ecs):
         """Request contents of supplied Equipment Constants.
@@ -226,11 +231,7 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         :returns: values of requested Equipment Constants
         :rtype: list
         """
-        self.logger.info("Get value of equipment constants %s", ecs)
-
-        message = self.send_and_waitfor_response(self.stream_function(2, 13)(ecs))
-
-        return self.streams_functions.decode(message)
+        return self._run_exchange(self._request_ecs(ecs))
 
     def request_ec(self, ec_id):
         """Request contents of one Equipment Constant.
@@ -240,9 +241,7 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         :returns: value of requested Equipment Constant
         :rtype: various
         """
-        self.logger.info("Get value of equipment constant %s", ec_id)
-
-        return self.request_ecs([ec_id])
+        return self._run_exchange(self._request_ec(ec_id))
 
     def set_ecs(self, ecs):
         """Set contents of supplied Equipment Constants.
@@ -250,11 +249,7 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         :param ecs: list containing list of id / value pairs
         :type ecs: list
         """
-        self.logger.info("Set value of equipment constants %s", ecs)
-
-        message = self.send_and_waitfor_response(self.stream_function(2, 15)(ecs))
-
-        return self.streams_functions.decode(message).get()
+        return self._run_exchange(self._set_ecs(ecs))
 
     def set_ec(self, ec_id, value):
         """Set contents of one Equipment Constant.
@@ -264,9 +259,7 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         :param value: new content of Equipment Constant
         :type value: various
         """
-        self.logger.info("Set value of equipment constant %s to %s", ec_id, value)
-
-        return self.set_ecs([[ec_id, value]])
+        return self._run_exchange(self._set_ec(ec_id, value))
 
     def send_equipment_terminal(self, terminal_id, text):
         """Set text to equipment terminal.
@@ -276,25 +269,8 @@ class SecsHandler:  # pylint: disable=too-many-instance-attributes,too-many-publ
         :param text: text to send
         :type text: string
         """
-        self.logger.info("Send text to terminal %s", terminal_id)
-
-        return self.send_and_waitfor_response(self.stream_function(10, 3)({"TID": terminal_id, "TEXT": text}))
+        return self._run_exchange(self._send_equipment_terminal(terminal_id, text))
 
     def are_you_there(self):
         """Check if remote is still replying."""
-        self.logger.info("Requesting 'are you there'")
-
-        return self.send_and_waitfor_response(self.stream_function(1, 1)())
-
-    def stream_function(self, stream: int, function: int) -> type[secsgem.secs.SecsStreamFunction]:
-        """Get class for stream and function.
-
-        Args:
-            stream: stream to get class for
-            function: function to get class for
-
-        Returns:
-            class for function
-
-        """
-        return self.streams_functions.function(stream, function)
+        return self._run_exchange(self._are_you_there())
@@ -0,0 +1,169 @@
+#####################################################################
+# handler_mixin.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Request helpers and callback registration shared by the threaded and the asyncio SECS handler."""
+
+from __future__ import annotations
+
+import typing
+
+from secsgem.secs.functions import SecsS01F04, SecsS01F12
+
+if typing.TYPE_CHECKING:
+    import logging
+
+    import secsgem.common
+
+    from .data_items import SV
+    from .functions import StreamsFunctions
+    from .functions.base import SecsStreamFunction
+
+    ResultT = typing.TypeVar("ResultT")
+
+    Exchange = typing.Generator["SecsStreamFunction", "secsgem.common.Message | None", ResultT]
+    """Request helper yielding the requests to send and receiving their responses."""
+
+
+class SecsHandlerMixin:
+    """SECS functionality not communicating, shared by :class:`SecsHandler` and :class:`AsyncSecsHandler`.
+
+    The request helpers are generators, yielding each request and receiving its response. The handlers run them
+    with their own way of sending a request and waiting for the response.
+    """
+
+    _settings: secsgem.common.Settings
+    _callback_handler: secsgem.common.CallbackHandler
+    streams_functions: StreamsFunctions
+    logger: logging.Logger
+
+    @property
+    def settings(self) -> secsgem.common.Settings:
+        """Get the setting object."""
+        return self._settings
+
+    @staticmethod
+    def _generate_sf_callback_name(stream: int, function: int) -> str:
+        return f"s{stream:02d}f{function:02d}"
+
+    @property
+    def callbacks(self):
+        """Property for callback handling."""
+        return self._callback_handler
+
+    def register_stream_function(self, stream: int, function: int, callback):
+        """Register the function callback for stream and function.
+
+        Args:
+            stream: stream to register callback for
+            function: function to register callback for
+            callback: function to call when stream and functions is received
+
+        """
+        name = self._generate_sf_callback_name(stream, function)
+        setattr(self._callback_handler, name, callback)
+
+    def unregister_stream_function(self, stream: int, function: int):
+        """Unregister the function callback for stream and function.
+
+        Args:
+            stream: stream to unregister callback for
+            function: function to register callback for
+
+        """
+        name = self._generate_sf_callback_name(stream, function)
+        setattr(self._callback_handler, name, None)
+
+    def stream_function(self, stream: int, function: int) -> type[SecsStreamFunction]:
+        """Get class for stream and function.
+
+        Args:
+            stream: stream to get class for
+            function: function to get class for
+
+        Returns:
+            class for function
+
+        """
+        return self.streams_functions.function(stream, function)
+
+    def _disable_ceids(self) -> Exchange[secsgem.common.Message | None]:
+        self.logger.info("Disable all collection events")
+
+        return (yield self.stream_function(2, 37)({"CEED": False, "CEID": []}))
+
+    def _disable_ceid_reports(self) -> Exchange[secsgem.common.Message | None]:
+        self.logger.info("Disable all collection event reports")
+
+        return (yield self.stream_function(2, 33)({"DATAID": 0, "DATA": []}))
+
+    def _list_svs(self, svs: typing.Sequence[int | str] | None) -> Exchange[SecsS01F12]:
+        self.logger.info("Get list of status variables")
+
+        message = yield self.stream_function(1, 11)(svs if svs is not None else [])
+
+        return typing.cast(SecsS01F12, self.streams_functions.decode(message))
+
+    def _request_svs(self, svs: typing.Sequence[int | str]) -> Exchange[SecsS01F04]:
+        self.logger.info("Get value of status variables %s", svs)
+
+        message = yield self.stream_function(1, 3)(svs)
+
+        return typing.cast(SecsS01F04, self.streams_functions.decode(message))
+
+    def _request_sv(self, sv_id: int | str) -> Exchange[SV]:
+        self.logger.info("Get value of status variable %s", sv_id)
+
+        return (yield from self._request_svs([sv_id])).data[0]
+
+    def _list_ecs(self, ecs) -> Exchange[typing.Any]:
+        self.logger.info("Get list of equipment constants")
+
+        message = yield self.stream_function(2, 29)(ecs if ecs is not None else [])
+
+        return self.streams_functions.decode(message)
+
+    def _request_ecs(self, ecs) -> Exchange[typing.Any]:
+        self.logger.info("Get value of equipment constants %s", ecs)
+
+        message = yield self.stream_function(2, 13)(ecs)
+
+        return self.streams_functions.decode(message)
+
+    def _request_ec(self, ec_id) -> Exchange[typing.Any]:
+        self.logger.info("Get value of equipment constant %s", ec_id)
+
+        return (yield from self._request_ecs([ec_id]))
+
+    def _set_ecs(self, ecs) -> Exchange[typing.Any]:
+        self.logger.info("Set value of equipment constants %s", ecs)
+
+        message = yield self.stream_function(2, 15)(ecs)
+
+        return typing.cast("SecsStreamFunction", self.streams_functions.decode(message)).get()
+
+    def _set_ec(self, ec_id, value) -> Exchange[typing.Any]:
+        self.logger.info("Set value of equipment constant %s to %s", ec_id, value)
+
+        return (yield from self._set_ecs([[ec_id, value]]))
+
+    def _send_equipment_terminal(self, terminal_id, text) -> Exchange[secsgem.common.Message | None]:
+        self.logger.info("Send text to terminal %s", terminal_id)
+
+        return (yield self.stream_function(10, 3)({"TID": terminal_id, "TEXT": text}))
+
+    def _are_you_there(self) -> Exchange[secsgem.common.Message | None]:
+        self.logger.info("Requesting 'are you there'")
+
+        return (yield self.stream_function(1, 1)())
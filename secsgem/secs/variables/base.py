@@ -82,7 +82,7 @@ class Base:
             raise ValueError(f"Decoding for {self.__class__.__name__} without any text")
 
         # parse format byte
-        format_byte = bytearray(data)[text_pos]
+        format_byte = data[text_pos]
 
         format_code = (format_byte & 0b11111100) >> 2
         length_bytes = format_byte & 0b00000011
@@ -93,7 +93,7 @@ class Base:
         length = 0
         for _ in range(length_bytes):
             length <<= 8
-            length += bytearray(data)[text_pos]
+            length += data[text_pos]
 
             text_pos += 1
 
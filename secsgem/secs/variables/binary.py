@@ -216,7 +216,7 @@ class Binary(Base):
         result = None
 
         if length > 0:
-            result = data[text_pos : text_pos + length]
+            result = bytes(data[text_pos : text_pos + length])
 
         self.set(result)
 
@@ -212,7 +212,7 @@ class Boolean(Base):
         result = []
 
         for _ in range(length):
-            if bytearray(data)[text_pos] == 0:
+            if data[text_pos] == 0:
                 result.append(False)
             else:
                 result.append(True)
@@ -16,11 +16,14 @@
 """module imports."""
 
 from .header import SecsIHeader
+from .link import SecsILink, SecsILinkState
 from .protocol import SecsIProtocol
 from .settings import SecsISettings
 
 __all__ = [
     "SecsIHeader",
+    "SecsILink",
+    "SecsILinkState",
     "SecsIProtocol",
     "SecsISettings",
 ]
@@ -22,6 +22,10 @@ import typing
 
 import secsgem.common
 
+_HEADER_STRUCT = struct.Struct(">HBBHI")
+_BLOCK_STRUCT = struct.Struct(">H")
+_BLOCK_OFFSET = 4
+
 
 class SecsIHeader(secsgem.common.Header):
     """Generic SECS I header.
@@ -41,6 +45,8 @@ class SecsIHeader(secsgem.common.Header):
         from_equipment: bool = False,
         require_response: bool = False,
         last_block: bool = True,
+        *,
+        encoded: bytes | None = None,
     ):
         """Initialize a SECS I header.
 
@@ -53,6 +59,7 @@ class SecsIHeader(secsgem.common.Header):
             from_equipment: message is send from equipment
             require_response: response requested
             last_block: last block of multi block message
+            encoded: encoded header matching the fields, encoded on demand if None
 
         Example:
             >>> import secsgem.secsi
@@ -68,6 +75,8 @@ require_response:False, last_block:True})
         self._from_equipment = from_equipment
         self._last_block = last_block
 
+        self._encoded = encoded
+
     @property
     def block(self) -> int:
         """Get block number."""
@@ -142,6 +151,10 @@ require_response:False, last_block:True})
             '00:64:00:00:80:00:00:00:00:02'
 
         """
+        # headers are immutable, the encoded header is reused for checksum and sending
+        if self._encoded is not None:
+            return self._encoded
+
         session_id = self.session_id
         if self.from_equipment:
             session_id |= 0b1000000000000000
@@ -154,8 +167,7 @@ require_response:False, last_block:True})
         if self.last_block:
             block |= 0b1000000000000000
 
-        return struct.pack(
-            ">HBBHI",
+        self._encoded = _HEADER_STRUCT.pack(
             session_id,
             stream,
             self.function,
@@ -163,6 +175,49 @@ require_response:False, last_block:True})
             self.system,
         )
 
+        return self._encoded
+
+    def updated_with(self, **kwargs) -> SecsIHeader:
+        """Get a new header with updated fields.
+
+        Updating only block number and last block flag copies the encoded header and replaces the block field,
+        which is used for the blocks of a multi block message.
+
+        Args:
+            kwargs: parameter name will update constructor field
+
+        Returns:
+            new header with modified data
+
+        Example:
+            >>> import secsgem.secsi
+            >>>
+            >>> header = secsgem.secsi.SecsIHeader(2, 100).updated_with(block=3, last_block=False)
+            >>> secsgem.common.format_hex(header.encode())
+            '00:64:00:00:00:03:00:00:00:02'
+
+        """
+        if not kwargs.keys() <= {"block", "last_block"}:
+            return super().updated_with(**kwargs)
+
+        block = kwargs.get("block", self.block)
+        last_block = kwargs.get("last_block", self.last_block)
+
+        encoded = bytearray(self.encode())
+        _BLOCK_STRUCT.pack_into(encoded, _BLOCK_OFFSET, block | (0b1000000000000000 if last_block else 0))
+
+        return SecsIHeader(
+            self.system,
+            self.session_id,
+            self.stream,
+            self.function,
+            block,
+            self.from_equipment,
+            self.require_response,
+            last_block,
+            encoded=bytes(encoded),
+        )
+
     @classmethod
     def decode(cls, data: bytes) -> SecsIHeader:
         """Decode data to SecsIHeader object.
@@ -174,8 +229,9 @@ require_response:False, last_block:True})
             new header object
 
         """
-        res = struct.unpack(">HBBHI", data)
+        res = _HEADER_STRUCT.unpack(data)
 
+        # all bits are represented in the fields, the received bytes are the encoded header
         return SecsIHeader(
             res[4],
             res[0] & 0b0111111111111111,
@@ -185,4 +241,5 @@ require_response:False, last_block:True})
             (((res[0] & 0b1000000000000000) >> 15) == 1),
             (((res[1] & 0b10000000) >> 7) == 1),
             (((res[3] & 0b1000000000000000) >> 15) == 1),
+            encoded=bytes(data),
         )
@@ -0,0 +1,317 @@
+#####################################################################
+# link.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""SECS-I line control and block transfer state machine."""
+
+from __future__ import annotations
+
+import enum
+import logging
+import time
+import typing
+
+from .message import SecsIBlock
+
+if typing.TYPE_CHECKING:
+    from secsgem.common import BlockSendInfo, Timeouts
+
+
+class SecsILinkState(enum.Enum):
+    """State of the SECS-I link."""
+
+    IDLE = 0
+    LINE_CONTROL = 1
+    SEND = 2
+    RECEIVE_LENGTH = 3
+    RECEIVE = 4
+    DISCARD = 5
+
+
+class SecsILink:  # pylint: disable=too-many-instance-attributes
+    """Event driven SECS-I line control and block transfer protocol (SEMI E4).
+
+    The state machine is driven by the received bytes and by :meth:`check_timeouts`, it never waits itself.
+    The owner passes received data to :meth:`receive`, blocks to send to :meth:`send`
+    and calls :meth:`check_timeouts` not later than :meth:`next_timeout` seconds after the last call.
+
+    Sending a block starts with an ENQ, the block is written when the peer answers with EOT.
+    A missing EOT or ACK within T2 or a NAK is retried up to `retry_limit` times.
+    If both ends send ENQ at the same time, the host yields and receives the block of the equipment first.
+
+    Receiving a block starts with an ENQ from the peer, answered with EOT.
+    The length character has to follow within T2, and the characters of the block within T1 of each other.
+    Blocks with invalid length or checksum are answered with NAK after the line was silent for T1.
+    A block with the same header as the block received before is a retransmission and is acknowledged,
+    but not passed on.
+
+    Example:
+        >>> import secsgem.common
+        >>> import secsgem.secsi
+        >>> written = []
+        >>> link = secsgem.secsi.SecsILink(secsgem.common.Timeouts(), 3, True, written.append, print)
+        >>> link.send(secsgem.common.BlockSendInfo(bytes([10, *range(12)])))
+        >>> link.state, [data.hex() for data in written]
+        (<SecsILinkState.LINE_CONTROL: 1>, ['05'])
+        >>> link.receive(bytes([secsgem.secsi.SecsILink.EOT]))
+        >>> link.state
+        <SecsILinkState.SEND: 2>
+        >>> link.receive(bytes([secsgem.secsi.SecsILink.ACK]))
+        >>> link.state, link.sending
+        (<SecsILinkState.IDLE: 0>, False)
+
+    """
+
+    ENQ = 0b00000101
+    EOT = 0b00000100
+    ACK = 0b00000110
+    NAK = 0b00010101
+
+    min_block_length = 10
+    max_block_length = 254
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        timeouts: Timeouts,
+        retry_limit: int,
+        is_host: bool,
+        write: typing.Callable[[bytes], typing.Any],
+        on_block: typing.Callable[[SecsIBlock], typing.Any],
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the link.
+
+        Args:
+            timeouts: timeouts, T1 and T2 are used
+            retry_limit: number of retries for a block before sending fails (RTY)
+            is_host: the link is the host end, which yields on contention
+            write: function writing bytes to the line
+            on_block: function called with each received block
+            clock: monotonic time source
+
+        """
+        self._timeouts = timeouts
+        self._retry_limit = retry_limit
+        self._is_host = is_host
+        self._write = write
+        self._on_block = on_block
+        self._clock = clock
+
+        self._logger = logging.getLogger(self.__module__ + "." + self.__class__.__name__)
+
+        self._state = SecsILinkState.IDLE
+        self._deadline: float | None = None
+
+        self._pending: BlockSendInfo | None = None
+        self._retries = 0
+
+        self._buffer = bytearray()
+        self._expected = 0
+        self._last_header: bytes | None = None
+
+    @property
+    def state(self) -> SecsILinkState:
+        """Get the current state."""
+        return self._state
+
+    @property
+    def sending(self) -> bool:
+        """Check if a block is being sent."""
+        return self._pending is not None
+
+    @property
+    def retries(self) -> int:
+        """Get the number of retries for the block being sent."""
+        return self._retries
+
+    def send(self, block_info: BlockSendInfo):
+        """Send a block.
+
+        The block is sent when the link is idle, the result is resolved in `block_info`.
+
+        Args:
+            block_info: block to send
+
+        """
+        if self._pending is not None:
+            raise RuntimeError("SECS-I link is already sending a block")
+
+        self._pending = block_info
+        self._retries = 0
+
+        if self._state == SecsILinkState.IDLE:
+            self._start_send()
+
+    def reset(self):
+        """Fail the block being sent and return to idle, used when the connection was closed."""
+        if self._pending is not None:
+            self._pending.resolve(False)
+            self._pending = None
+
+        self._state = SecsILinkState.IDLE
+        self._deadline = None
+        self._buffer.clear()
+        self._last_header = None
+
+    def next_timeout(self) -> float | None:
+        """Get the seconds until the running timer expires.
+
+        Returns:
+            seconds until :meth:`check_timeouts` has to be called, None if no timer is running
+
+        """
+        if self._deadline is None:
+            return None
+
+        return max(self._deadline - self._clock(), 0.0)
+
+    def check_timeouts(self):
+        """Handle an expired timer."""
+        if self._deadline is None or self._clock() < self._deadline:
+            return
+
+        self._deadline = None
+
+        if self._state in (SecsILinkState.LINE_CONTROL, SecsILinkState.SEND):
+            self._logger.warning("T2 timeout in state %s", self._state.name)
+            self._retry()
+        elif self._state == SecsILinkState.RECEIVE_LENGTH:
+            self._logger.warning("T2 timeout waiting for length character")
+            self._reject()
+        elif self._state == SecsILinkState.RECEIVE:
+            self._logger.warning("T1 timeout after %d of %d characters", len(self._buffer), self._expected)
+            self._reject()
+        elif self._state == SecsILinkState.DISCARD:
+            self._reject()
+
+    def receive(self, data: bytes):
+        """Handle data received from the line.
+
+        Args:
+            data: received bytes
+
+        """
+        position = 0
+
+        while position < len(data):
+            if self._state == SecsILinkState.RECEIVE:
+                chunk = data[position : position + self._expected - len(self._buffer)]
+                position += len(chunk)
+
+                self._buffer += chunk
+
+                if len(self._buffer) < self._expected:
+                    self._deadline = self._clock() + self._timeouts.t1
+                else:
+                    self._complete_block()
+
+                continue
+
+            if self._state == SecsILinkState.DISCARD:
+                # remaining data is dropped until the line is silent for T1
+                self._deadline = self._clock() + self._timeouts.t1
+                return
+
+            self._receive_control(data[position])
+            position += 1
+
+    def _receive_control(self, character: int):
+        if self._state == SecsILinkState.IDLE:
+            if character == self.ENQ:
+                self._start_receive()
+            else:
+                self._logger.debug("Ignoring character %#04x while idle", character)
+        elif self._state == SecsILinkState.LINE_CONTROL:
+            if character == self.EOT:
+                self._state = SecsILinkState.SEND
+                self._deadline = self._clock() + self._timeouts.t2
+                self._write(self._pending.data)  # type: ignore[union-attr]
+            elif character == self.ENQ and self._is_host:
+                # contention, host receives first and sends the block afterwards
+                self._start_receive()
+            else:
+                self._logger.debug("Ignoring character %#04x waiting for EOT", character)
+        elif self._state == SecsILinkState.SEND:
+            if character == self.ACK:
+                self._pending.resolve(True)  # type: ignore[union-attr]
+                self._pending = None
+                self._idle()
+            else:
+                self._logger.warning("Block not acknowledged, received %#04x", character)
+                self._retry()
+        elif self._state == SecsILinkState.RECEIVE_LENGTH:
+            if self.min_block_length <= character <= self.max_block_length:
+                self._state = SecsILinkState.RECEIVE
+                self._expected = character + 3
+                self._buffer.clear()
+                self._buffer.append(character)
+                self._deadline = self._clock() + self._timeouts.t1
+            else:
+                self._logger.warning("Invalid block length %d", character)
+                self._state = SecsILinkState.DISCARD
+                self._deadline = self._clock() + self._timeouts.t1
+
+    def _start_send(self):
+        self._state = SecsILinkState.LINE_CONTROL
+        self._deadline = self._clock() + self._timeouts.t2
+        self._write(bytes([self.ENQ]))
+
+    def _start_receive(self):
+        self._state = SecsILinkState.RECEIVE_LENGTH
+        self._deadline = self._clock() + self._timeouts.t2
+        self._write(bytes([self.EOT]))
+
+    def _idle(self):
+        self._state = SecsILinkState.IDLE
+        self._deadline = None
+
+        if self._pending is not None:
+            self._start_send()
+
+    def _retry(self):
+        self._retries += 1
+
+        if self._retries > self._retry_limit:
+            self._logger.error("Sending block failed after %d retries", self._retry_limit)
+            self._pending.resolve(False)  # type: ignore[union-attr]
+            self._pending = None
+
+        self._idle()
+
+    def _reject(self):
+        self._write(bytes([self.NAK]))
+        self._idle()
+
+    def _complete_block(self):
+        block = SecsIBlock.decode(bytes(self._buffer))
+
+        if block is None:
+            self._logger.warning("Invalid block checksum")
+            self._state = SecsILinkState.DISCARD
+            self._deadline = self._clock() + self._timeouts.t1
+            return
+
+        self._write(bytes([self.ACK]))
+
+        header = bytes(self._buffer[1:11])
+        duplicate = header == self._last_header
+        self._last_header = header
+
+        self._idle()
+
+        if duplicate:
+            self._logger.info("Ignoring duplicate block %s", block.header)
+            return
+
+        self._on_block(block)
@@ -39,6 +39,24 @@ class SecsIMessage(secsgem.common.Message[SecsIBlock]):
     block_size = 244
     block_type = SecsIBlock
 
+    def __init__(
+        self, header: SecsIHeader, data: bytes | memoryview, *, blocks: list[SecsIBlock] | None = None
+    ) -> None:
+        """Initialize a Message object.
+
+        The joined data of received blocks is kept, so it isn't joined again when the message is decoded.
+
+        Args:
+            header: header used for this message
+            data: data part used for streams and functions (SType 0)
+            blocks: received blocks of the message, kept instead of splitting the data into new blocks
+
+        """
+        super().__init__(header, data, blocks=blocks)
+
+        # joined data and the number of blocks it was joined from
+        self._data: tuple[int, bytes] = (len(self._blocks), bytes(data))
+
     @property
     def header(self) -> SecsIHeader:
         """Get the header."""
@@ -47,9 +65,13 @@ class SecsIMessage(secsgem.common.Message[SecsIBlock]):
     @property
     def data(self) -> bytes:
         """Get the data."""
-        return b"".join(block.data for block in self._blocks)
+        # blocks appended to the message invalidate the joined data
+        if self._data[0] != len(self._blocks):
+            self._data = (len(self._blocks), b"".join(block.data for block in self._blocks))
+
+        return self._data[1]
 
     @property
     def complete(self) -> bool:
         """Check if the message is complete."""
-        return self.blocks[-1].header.last_block
+        return self.is_last_block(self.blocks[-1])
@@ -17,11 +17,13 @@
 
 from __future__ import annotations
 
+import queue
 import typing
 
 import secsgem.common
 
 from .header import SecsIHeader
+from .link import SecsILink
 from .message import SecsIBlock, SecsIMessage
 
 if typing.TYPE_CHECKING:
@@ -31,12 +33,16 @@ if typing.TYPE_CHECKING:
 
 
 class SecsIProtocol(secsgem.common.Protocol[SecsIMessage, SecsIBlock]):
-    """Implementation for SECS-I protocol."""
+    """Implementation for SECS-I protocol.
 
-    ENQ = 0b00000101
-    EOT = 0b00000100
-    ACK = 0b00000110
-    NAK = 0b00010101
+    The line control is handled by a :class:`secsgem.secsi.SecsILink` state machine,
+    which is driven by the received data and its T1 and T2 timers in the protocol thread.
+    """
+
+    ENQ = SecsILink.ENQ
+    EOT = SecsILink.EOT
+    ACK = SecsILink.ACK
+    NAK = SecsILink.NAK
 
     block_size = 244
 
@@ -71,6 +77,18 @@ class SecsIProtocol(secsgem.common.Protocol[SecsIMessage, SecsIBlock]):
         """
         super().__init__(settings, streams_functions)
 
+        self._link = SecsILink(
+            self._settings.timeouts,
+            self._settings.retry_limit,
+            self._settings.device_type == secsgem.common.DeviceType.HOST,
+            self._connection_write,
+            self._on_link_block,
+        )
+
+    def _connection_write(self, data: bytes):
+        """Write data from the link to the connection."""
+        self._connection.send_data(data)
+
     def _create_message_for_function(
         self,
         function: SecsStreamFunction,
@@ -121,58 +139,59 @@ class SecsIProtocol(secsgem.common.Protocol[SecsIMessage, SecsIBlock]):
 
         self._receive_buffer.clear()
 
-    def _on_disconnecting(self, _: dict[str, typing.Any]):
-        pass
+        # fail the block being sent and the queued blocks
+        self._link.reset()
 
-    def _process_send_queue(self):
-        if self._send_queue.empty():
-            return
+        # the remaining blocks of partially received messages won't arrive
+        self._message_assembler.clear()
 
-        while not self._send_queue.empty():
-            self._connection.send_data(bytes([self.ENQ]))
+        self._send_queue.clear()
 
-            enq_resonse = self._receive_buffer.wait_for_byte(peek=True)
+        # responses to the open transactions won't arrive
+        self._transactions.resolve_all()
 
-            if enq_resonse == self.ENQ and self._settings.device_type == secsgem.common.DeviceType.HOST:
-                self._process_received_data()
-                continue
+    def _on_disconnecting(self, _: dict[str, typing.Any]):
+        pass
 
-            enq_resonse = self._receive_buffer.pop_byte()
+    def _process_data(self) -> float | None:
+        """Feed received data and timers to the link, pass the next block to send and expire partial messages.
 
-            block_info = self._send_queue.get()
+        Returns:
+            seconds until the next timer of the link, inter-block timeout or send rate limit expires
 
-            self._connection.send_data(block_info.data)
+        """
+        self._process_received_data()
+        self._link.check_timeouts()
+        send_timeout = self._process_send_queue()
+
+        timeouts = (self._link.next_timeout(), self._message_assembler.expire(), send_timeout)
+        return min((timeout for timeout in timeouts if timeout is not None), default=None)
+
+    def _process_send_queue(self) -> float | None:
+        while not self._link.sending:
+            try:
+                block_info = self._send_queue.get_nowait()
+            except queue.Empty:
+                return self._send_queue.delay
+
+            # the remaining blocks of a message after a failed block
+            if block_info.aborted:
+                block_info.resolve(False)
+                continue
 
-            data_response = self._receive_buffer.wait_for_byte()
+            self._link.send(block_info)
 
-            block_info.resolve(data_response == self.ACK)
+        return None
 
     def _process_received_data(self):
         if len(self._receive_buffer) < 1:
             return
 
-        while len(self._receive_buffer) > 0:
-            receive_byte = self._receive_buffer.pop_byte()
-
-            if receive_byte != self.ENQ:
-                self._logger.info("Expected ENQ, received '%s'. Ignoring", receive_byte)
-
-            self._connection.send_data(bytes([self.EOT]))
-
-            length = self._receive_buffer.wait_for_byte(peek=True)
-
-            data = self._receive_buffer.wait_for(length + 3)
-
-            response = SecsIBlock.decode(data)
-
-            if response is None:
-                self._connection.send_data(bytes([self.NAK]))
-                return
-
-            # redirect message to hsms handler
-            self._thread.queue_block(self, response)
+        self._link.receive(self._receive_buffer.pop(len(self._receive_buffer)))
 
-            self._connection.send_data(bytes([self.ACK]))
+    def _on_link_block(self, block: SecsIBlock):
+        """Redirect a block received by the link to the message handler."""
+        self._thread.queue_block(self, block)
 
     def _on_connection_message_received(self, source: object, message: SecsIMessage):
         """Message received from connection.
@@ -186,9 +205,7 @@ class SecsIProtocol(secsgem.common.Protocol[SecsIMessage, SecsIBlock]):
         self._communication_logger.info("< %s\n%s", message, decoded_message, extra=self._get_log_extra())
 
         # someone is waiting for this message
-        if message.header.system in self._response_queues:
-            self._response_queues[message.header.system].put_nowait(message)
-        else:
+        if not self._resolve_transaction(message):
             self.events.fire("message_received", {"connection": source, "message": message})
 
     def _get_log_extra(self) -> dict[str, typing.Any]:
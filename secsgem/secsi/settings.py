@@ -53,6 +53,7 @@ class SecsISettings(secsgem.common.Settings):
             *super()._attributes(),
             secsgem.common.Setting("port", None, "Serial port"),
             secsgem.common.Setting("speed", 9600, "Serial port baud rate"),
+            secsgem.common.Setting("retry_limit", 3, "Number of retries for sending a block (RTY)"),
         ]
 
     def create_protocol(self, streams_functions: StreamsFunctions) -> secsgem.common.Protocol:
@@ -67,6 +67,19 @@ class SecsITcpSettings(secsgem.secsi.SecsISettings):
             secsgem.common.Setting("connect_mode", SecsITcpConnectMode.CLIENT, "Secs I over TCP connect mode"),
             secsgem.common.Setting("address", "127.0.0.1", "Remote (client) or local (server) IP address"),
             secsgem.common.Setting("port", 5000, "TCP port of remote host"),
+            secsgem.common.Setting(
+                "reactor", None, "Shared reactor serving the socket, a thread per connection is used if not set"
+            ),
+            secsgem.common.Setting("tcp_options", None, "TCP socket options", secsgem.common.TcpOptions),
+            secsgem.common.Setting(
+                "loopback", None, "In-memory link to a connection in the same process, used instead of TCP if set"
+            ),
+            secsgem.common.Setting(
+                "reconnect_scheduler", None, "Timer wheel for reconnect attempts, the shared timer wheel if not set"
+            ),
+            secsgem.common.Setting("reconnect_backoff", 2.0, "Factor the reconnect delay grows by per failed attempt"),
+            secsgem.common.Setting("reconnect_max_delay", 60.0, "Maximum reconnect delay in seconds, at least T5"),
+            secsgem.common.Setting("reconnect_jitter", 0.1, "Maximum random part of the reconnect delay as fraction"),
         ]
 
     def create_protocol(self, streams_functions: StreamsFunctions) -> secsgem.common.Protocol:
@@ -77,6 +90,9 @@ class SecsITcpSettings(secsgem.secsi.SecsISettings):
 
     def create_connection(self) -> secsgem.common.Connection:
         """Connection class for this configuration."""
+        if self.loopback is not None:
+            return secsgem.common.LoopbackConnection(self, self.loopback)
+
         if self.connect_mode == SecsITcpConnectMode.CLIENT:
             return secsgem.common.TcpClientConnection(self)
         return secsgem.common.TcpServerConnection(self)
@@ -47,3 +47,11 @@ class TestBlockSendInfo:
 
         block_send_info.resolve(True)
         assert block_send_info.wait() is True
+
+    def test_parts(self) -> None:
+        """Test BlockSendInfo with the data passed as list of buffers."""
+        payload = b"efgh"
+
+        block_send_info = BlockSendInfo([b"abcd", memoryview(payload)])
+        assert block_send_info.data == b"abcdefgh"
+        assert block_send_info.parts[1].obj is payload
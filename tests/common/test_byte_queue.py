@@ -19,6 +19,8 @@ from __future__ import annotations
 
 import threading
 
+import pytest
+
 from secsgem.common import ByteQueue
 
 
@@ -98,3 +100,49 @@ class TestByteQueue:
 
         assert result == b"te"
         assert len(queue) == 2
+
+    def test_pop_across_chunks(self):
+        """Test popping data spread over multiple appended chunks."""
+        queue = ByteQueue()
+        queue.append(b"te")
+        queue.append(b"")
+        queue.append(bytearray(b"st"))
+        queue.append(b"data")
+
+        assert len(queue) == 8
+        assert queue.pop(3) == b"tes"
+        assert queue.pop(3) == b"tda"
+        assert queue.pop_byte() == ord("t")
+        assert queue.pop(10) == b"a"
+
+        assert len(queue) == 0
+        assert queue.pop() == b""
+
+    def test_peek_across_chunks(self):
+        """Test peeking at data spread over multiple appended chunks."""
+        queue = ByteQueue()
+        queue.append(b"\x00\x00")
+        queue.append(b"\x00\x0a\x01")
+
+        length_data = queue.peek(4)
+
+        assert isinstance(length_data, memoryview)
+        assert length_data == b"\x00\x00\x00\x0a"
+        assert queue.peek_byte(4) == 1
+
+        assert queue.pop(4) == b"\x00\x00\x00\x0a"
+        assert length_data == b"\x00\x00\x00\x0a"
+        assert len(queue) == 1
+
+    def test_peek_byte_out_of_range(self):
+        """Test peeking and popping bytes not in the queue."""
+        queue = ByteQueue()
+        queue.append(b"t")
+
+        with pytest.raises(IndexError):
+            queue.peek_byte(1)
+
+        assert queue.pop_byte() == ord("t")
+
+        with pytest.raises(IndexError):
+            queue.pop_byte()
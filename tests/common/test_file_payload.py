@@ -0,0 +1,69 @@
+#####################################################################
+# test_file_payload.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the file_payload module."""
+
+from __future__ import annotations
+
+import secsgem.hsms
+from secsgem.common import FilePayload
+
+
+class TestFilePayload:
+    """Tests for FilePayload class."""
+
+    def test_write(self, tmp_path):
+        """Test the data is written to a temporary file in the directory and the view only covers written data."""
+        payload = FilePayload(6, str(tmp_path))
+
+        assert payload.write(b"abc") == 3
+        assert bytes(payload.view) == b"abc"
+        assert payload.remaining == 3
+
+        assert payload.write(memoryview(b"defgh")) == 3
+        assert bytes(payload.view) == b"abcdef"
+        assert payload.remaining == 0
+        assert payload.size == 6
+
+    def test_empty(self):
+        """Test an empty payload."""
+        payload = FilePayload(0)
+
+        assert payload.remaining == 0
+        assert bytes(payload.view) == b""
+
+    def test_empty_file(self, tmp_path):
+        """Test mapping an empty file."""
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+
+        payload = FilePayload.from_file(str(path))
+
+        assert payload.size == 0
+        assert payload.remaining == 0
+        assert bytes(payload.view) == b""
+
+    def test_send_from_file(self, tmp_path):
+        """Test a message sends the content of a mapped file."""
+        path = tmp_path / "recipe.bin"
+        path.write_bytes(b"\x41\x03abc")
+
+        payload = FilePayload.from_file(str(path))
+        message = secsgem.hsms.HsmsMessage(secsgem.hsms.HsmsStreamFunctionHeader(1, 7, 3, True, 0), payload.view)
+
+        assert payload.size == 5
+        assert b"".join(message.blocks[0].encode_parts()) == (
+            b"\x00\x00\x00\x0f\x00\x00\x87\x03\x00\x00\x00\x00\x00\x01\x41\x03abc"
+        )
@@ -0,0 +1,159 @@
+#####################################################################
+# test_loopback_connection.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the loopback_connection module."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from conftest import wait_for
+
+import secsgem.common
+import secsgem.gem
+import secsgem.hsms
+import secsgem.secsitcp
+from secsgem.secs.functions import StreamsFunctions
+
+
+class TestLoopbackConnection:
+    """Tests for LoopbackConnection class."""
+
+    def test_connect_and_data(self):
+        """Test the link is established with both ends enabled, and data is passed in order."""
+        link = secsgem.common.LoopbackLink()
+        first = secsgem.hsms.HsmsSettings(loopback=link).create_connection()
+        second = secsgem.hsms.HsmsSettings(loopback=link).create_connection()
+
+        assert isinstance(first, secsgem.common.LoopbackConnection)
+
+        received = []
+        disconnected = []
+        second.on_data.register(lambda data: received.append(data["data"]))
+        second.on_disconnected.register(lambda _: disconnected.append(True))
+
+        first.enable()
+        assert not first.connected
+        assert not first.send_data(b"lost")
+
+        second.enable()
+        assert first.connected
+        assert second.connected
+
+        assert first.send_data(b"abc")
+        assert first.send_buffers([b"de", memoryview(b"f")])
+        assert received == [b"abc", b"def"]
+
+        first.disable()
+        assert not second.connected
+        assert disconnected == [True]
+        assert not first.send_data(b"lost")
+
+        second.disable()
+
+    def test_data_before_connected_handled(self):
+        """Test data sent from the connected handler of one end waits for the connected handler of the other."""
+        link = secsgem.common.LoopbackLink()
+        first = secsgem.hsms.HsmsSettings(loopback=link).create_connection()
+        second = secsgem.hsms.HsmsSettings(loopback=link).create_connection()
+
+        events = []
+        first.on_connected.register(lambda _: first.send_data(b"hello"))
+        second.on_connected.register(lambda _: events.append("connected"))
+        second.on_data.register(lambda data: events.append(data["data"]))
+
+        first.enable()
+        second.enable()
+
+        assert events == ["connected", b"hello"]
+
+        first.disable()
+        second.disable()
+
+    def test_third_connection(self):
+        """Test a link can't be used by more than two connections."""
+        link = secsgem.common.LoopbackLink()
+        connections = [secsgem.hsms.HsmsSettings(loopback=link).create_connection() for _ in range(3)]
+
+        connections[0].enable()
+        connections[1].enable()
+
+        try:
+            with pytest.raises(ValueError):
+                connections[2].enable()
+        finally:
+            connections[0].disable()
+            connections[1].disable()
+
+    def test_hsms_handlers(self):
+        """Test host and equipment handler communicating over a loopback link, also after reconnecting."""
+        link = secsgem.common.LoopbackLink()
+        host = secsgem.gem.GemHostHandler(secsgem.hsms.HsmsSettings(loopback=link))
+        equipment = secsgem.gem.GemEquipmentHandler(
+            secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+                device_type=secsgem.common.DeviceType.EQUIPMENT,
+                loopback=link,
+            )
+        )
+
+        equipment.enable()
+        host.enable()
+
+        try:
+            for _ in range(2):
+                assert host.waitfor_communicating(5)
+
+                response = host.send_and_waitfor_response(host.stream_function(1, 1)())
+                assert host.streams_functions.decode(response).get() == ["secsgem", "0.1.0"]
+
+                host.disable()
+                assert wait_for(lambda: equipment.protocol.connection_state.current.name == "NOT_CONNECTED")
+                host.enable()
+        finally:
+            host.disable()
+            equipment.disable()
+
+    def test_secsi_protocols(self):
+        """Test secs-i protocols exchanging a message over a loopback link."""
+        link = secsgem.common.LoopbackLink()
+        host = secsgem.secsitcp.SecsITcpSettings(loopback=link).create_protocol(StreamsFunctions())
+        equipment = secsgem.secsitcp.SecsITcpSettings(
+            connect_mode=secsgem.secsitcp.SecsITcpConnectMode.SERVER,
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            loopback=link,
+        ).create_protocol(StreamsFunctions())
+
+        received = threading.Event()
+
+        def on_message(data):
+            received.set()
+            equipment.send_response(secsgem.secs.functions.SecsS01F04([42]), data["message"].header.system)
+
+        equipment.events.message_received += on_message
+
+        equipment.enable()
+        host.enable()
+
+        try:
+            response = host.send_and_waitfor_response(secsgem.secs.functions.SecsS01F03([1]))
+
+            assert received.is_set()
+            assert response is not None
+            assert StreamsFunctions().decode(response).get() == [42]
+        finally:
+            host.disable()
+            equipment.disable()
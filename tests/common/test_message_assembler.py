@@ -0,0 +1,112 @@
+#####################################################################
+# test_message_assembler.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the message_assembler module."""
+
+from __future__ import annotations
+
+import secsgem.hsms
+import secsgem.secsi
+import secsgem.secsi.message
+from secsgem.common import MessageAssembler
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _blocks(system: int, size: int) -> list[secsgem.secsi.message.SecsIBlock]:
+    header = secsgem.secsi.SecsIHeader(system, 0, 6, 11)
+    return secsgem.secsi.message.SecsIMessage(header, bytes(range(256)) * (size // 256) + b"x" * (size % 256)).blocks
+
+
+class TestMessageAssembler:
+    """Tests for MessageAssembler class."""
+
+    def test_interleaved_messages(self):
+        """Test blocks of interleaved messages are assembled by system id."""
+        assembler = MessageAssembler(secsgem.secsi.message.SecsIMessage, 10.0, 1024 * 1024)
+        first = _blocks(1, 600)
+        second = _blocks(2, 300)
+
+        assert assembler.add(first[0]) is None
+        assert assembler.add(second[0]) is None
+        assert assembler.add(first[1]) is None
+        assert assembler.statistics.partial_messages == 2
+        assert assembler.statistics.buffered_bytes == 244 * 3
+
+        message = assembler.add(second[1])
+        assert message is not None
+        assert message.header.system == 2
+        assert message.data == b"".join(block.data for block in second)
+        assert message.data is message.data
+
+        message = assembler.add(first[2])
+        assert message is not None
+        assert message.data == b"".join(block.data for block in first)
+        assert [block.header.block for block in message.blocks] == [1, 2, 3]
+
+        assert assembler.statistics.to_dict() == {
+            "blocks": 5,
+            "messages": 2,
+            "expired": 0,
+            "dropped": 0,
+            "partial_messages": 0,
+            "buffered_bytes": 0,
+            "peak_buffered_bytes": 244 * 3,
+        }
+
+    def test_single_block_message(self):
+        """Test single block messages are returned without buffering."""
+        assembler = MessageAssembler(secsgem.hsms.HsmsMessage, 10.0, 1024)
+        message = secsgem.hsms.HsmsMessage(secsgem.hsms.HsmsLinktestReqHeader(7), b"")
+
+        assert assembler.add(message.blocks[0]).header.system == 7
+        assert assembler.statistics.partial_messages == 0
+
+    def test_inter_block_timeout(self):
+        """Test partial messages are dropped after the inter-block timeout."""
+        clock = _Clock()
+        assembler = MessageAssembler(secsgem.secsi.message.SecsIMessage, 10.0, 1024 * 1024, clock)
+        blocks = _blocks(1, 600)
+
+        assert assembler.add(blocks[0]) is None
+        clock.now = 6.0
+        assert assembler.add(blocks[1]) is None
+        assert assembler.expire() == 10.0
+
+        clock.now = 16.0
+        assert assembler.expire() is None
+        assert assembler.statistics.expired == 1
+        assert assembler.statistics.partial_messages == 0
+        assert assembler.statistics.buffered_bytes == 0
+
+    def test_memory_limit(self):
+        """Test the oldest partial messages are dropped when exceeding the memory limit."""
+        assembler = MessageAssembler(secsgem.secsi.message.SecsIMessage, 10.0, 600)
+        first = _blocks(1, 600)
+        second = _blocks(2, 600)
+
+        assembler.add(first[0])
+        assembler.add(second[0])
+        assembler.add(second[1])
+
+        assert assembler.statistics.dropped == 1
+        assert assembler.statistics.buffered_bytes == 488
+        assert assembler.add(second[2]).data == b"".join(block.data for block in second)
@@ -0,0 +1,271 @@
+#####################################################################
+# test_protocol_dispatcher.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the protocol_dispatcher module."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from conftest import wait_for
+
+import secsgem.common
+import secsgem.hsms
+from secsgem.common import DispatchWorkerStatistics, ProtocolDispatcher
+from secsgem.secs.functions import StreamsFunctions
+
+
+def _block(system: int, stream: int, session_id: int = 0) -> secsgem.hsms.HsmsBlock:
+    return secsgem.hsms.HsmsBlock(secsgem.hsms.HsmsStreamFunctionHeader(system, stream, 1, True, session_id), b"")
+
+
+class TestProtocolDispatcher:
+    """Tests for ProtocolDispatcher class."""
+
+    def test_single_worker(self):
+        """Test blocks are dispatched in the order they were received by default."""
+        dispatched = []
+        dispatcher = ProtocolDispatcher(
+            lambda: None, lambda _, block: dispatched.append(block.header.system), secsgem.hsms.HsmsSettings()
+        )
+        dispatcher.start()
+
+        try:
+            for system, stream in enumerate([2, 6, 2, 5]):
+                dispatcher.queue_block(None, _block(system, stream))
+
+            assert wait_for(lambda: len(dispatched) == 4)
+        finally:
+            dispatcher.stop()
+
+        assert dispatched == [0, 1, 2, 3]
+        assert [statistics.name for statistics in dispatcher.statistics] == ["protocol_dispatcher"]
+        assert dispatcher.statistics[0].dispatched == 4
+
+    def test_worker_pool(self):
+        """Test a slow stream doesn't block other streams, and the blocks of a stream stay in order."""
+        release = threading.Event()
+        dispatched = []
+
+        def _dispatch(_, block: secsgem.hsms.HsmsBlock):
+            if block.header.system == 0:
+                assert release.wait(5)
+
+            dispatched.append(block.header.system)
+
+        dispatcher = ProtocolDispatcher(lambda: None, _dispatch, secsgem.hsms.HsmsSettings(dispatch_workers=3))
+        dispatcher.start()
+
+        try:
+            for system, stream in enumerate([2, 2, 6, 5, 2, 6]):
+                dispatcher.queue_block(None, _block(system, stream))
+
+            # stream 6 and 5 are dispatched while the first block of stream 2 is still being dispatched
+            assert wait_for(lambda: len(dispatched) == 3)
+            assert sorted(dispatched) == [2, 3, 5]
+
+            release.set()
+            assert wait_for(lambda: len(dispatched) == 6)
+        finally:
+            dispatcher.stop()
+
+        assert [system for system in dispatched if system in (0, 1, 4)] == [0, 1, 4]
+        assert [statistics.name for statistics in dispatcher.statistics] == [
+            "protocol_dispatcher_0",
+            "protocol_dispatcher_1",
+            "protocol_dispatcher_2",
+        ]
+        assert sum(statistics.dispatched for statistics in dispatcher.statistics) == 6
+        assert max(statistics.max_dispatch_time for statistics in dispatcher.statistics) > 0
+
+    def test_dispatch_key(self):
+        """Test blocks are ordered by a custom dispatch key."""
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+
+        def _dispatch(_, _block: secsgem.hsms.HsmsBlock):
+            nonlocal active, max_active
+
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+
+            time.sleep(0.01)
+
+            with lock:
+                active -= 1
+
+        dispatcher = ProtocolDispatcher(
+            lambda: None,
+            _dispatch,
+            secsgem.hsms.HsmsSettings(dispatch_workers=4, dispatch_key=lambda block: block.header.session_id),
+        )
+        dispatcher.start()
+
+        try:
+            for system in range(20):
+                dispatcher.queue_block(None, _block(system, system))
+
+            assert wait_for(lambda: sum(statistics.dispatched for statistics in dispatcher.statistics) == 20)
+        finally:
+            dispatcher.stop()
+
+        # all blocks have the same session id
+        assert max_active == 1
+
+    def test_select_before_data(self):
+        """Test a data message right after a select is dispatched after the select with several workers."""
+        selected = threading.Event()
+        selected_on_data = []
+
+        def _dispatch(_, block: secsgem.hsms.HsmsBlock):
+            if block.header.s_type == secsgem.hsms.HsmsSType.SELECT_REQ:
+                time.sleep(0.05)
+                selected.set()
+            else:
+                selected_on_data.append(selected.is_set())
+
+        dispatcher = ProtocolDispatcher(lambda: None, _dispatch, secsgem.hsms.HsmsSettings(dispatch_workers=4))
+        dispatcher.start()
+
+        try:
+            dispatcher.queue_block(None, secsgem.hsms.HsmsBlock(secsgem.hsms.HsmsSelectReqHeader(1), b""))
+            dispatcher.queue_block(None, _block(2, 1))
+
+            assert wait_for(lambda: len(selected_on_data) == 1)
+        finally:
+            dispatcher.stop()
+
+        assert selected_on_data == [True]
+
+    def test_control_barrier(self):
+        """Test a control block is dispatched alone, after the blocks before and before the blocks after it."""
+        release = threading.Event()
+        dispatched = []
+
+        def _dispatch(_, block: secsgem.hsms.HsmsBlock):
+            if block.header.system == 0:
+                assert release.wait(5)
+
+            dispatched.append(block.header.system)
+
+        dispatcher = ProtocolDispatcher(lambda: None, _dispatch, secsgem.hsms.HsmsSettings(dispatch_workers=3))
+        dispatcher.start()
+
+        try:
+            dispatcher.queue_block(None, _block(0, 2))
+            dispatcher.queue_block(None, _block(1, 5))
+            dispatcher.queue_block(None, secsgem.hsms.HsmsBlock(secsgem.hsms.HsmsSeparateReqHeader(2), b""))
+            dispatcher.queue_block(None, _block(3, 6))
+            dispatcher.queue_block(None, _block(4, 2))
+
+            # the separate waits for the slow first block, the blocks after it wait for the separate
+            assert wait_for(lambda: len(dispatched) == 1)
+            time.sleep(0.05)
+            assert dispatched == [1]
+
+            release.set()
+            assert wait_for(lambda: len(dispatched) == 5)
+        finally:
+            dispatcher.stop()
+
+        assert dispatched[:3] == [1, 0, 2]
+        assert sorted(dispatched[3:]) == [3, 4]
+
+    def test_stop_dispatches_received_blocks(self):
+        """Test blocks received before stopping are still dispatched by the workers."""
+        release = threading.Event()
+        dispatched = []
+
+        def _dispatch(_, block: secsgem.hsms.HsmsBlock):
+            assert release.wait(5)
+            dispatched.append(block.header.system)
+
+        dispatcher = ProtocolDispatcher(lambda: None, _dispatch, secsgem.hsms.HsmsSettings(dispatch_workers=2))
+        dispatcher.start()
+
+        for system in range(4):
+            dispatcher.queue_block(None, _block(system, 1))
+
+        dispatcher.stop()
+        release.set()
+
+        assert wait_for(lambda: len(dispatched) == 4)
+        assert dispatched == [0, 1, 2, 3]
+
+    def test_protocol_select_before_data(self):
+        """Test a protocol with several workers accepts a data message sent right after the select request."""
+        link = secsgem.common.LoopbackLink()
+        equipment = secsgem.hsms.HsmsSettings(
+            connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            loopback=link,
+            dispatch_workers=4,
+        ).create_protocol(StreamsFunctions())
+        peer = secsgem.hsms.HsmsSettings(loopback=link).create_connection()
+
+        received = []
+        equipment.events.message_received += lambda data: received.append(data["message"])
+        sent_back = []
+        peer.on_data.register(lambda data: sent_back.append(bytes(data["data"])))
+
+        equipment.enable()
+        peer.enable()
+
+        try:
+            select = secsgem.hsms.HsmsMessage(secsgem.hsms.HsmsSelectReqHeader(1), b"")
+            data = secsgem.hsms.HsmsMessage(secsgem.hsms.HsmsStreamFunctionHeader(2, 1, 1, True, 0), b"")
+            assert peer.send_data(select.blocks[0].encode() + data.blocks[0].encode())
+
+            assert wait_for(lambda: len(received) == 1)
+        finally:
+            peer.disable()
+            equipment.disable()
+
+        assert received[0].header.system == 2
+        # only the select response was sent, no reject
+        assert [secsgem.hsms.HsmsHeader.decode(frame[4:14]).s_type for frame in sent_back] == [
+            secsgem.hsms.HsmsSType.SELECT_RSP
+        ]
+
+    def test_protocol_statistics(self):
+        """Test the protocols expose the statistics of their dispatch workers."""
+        protocol = secsgem.hsms.HsmsSettings(dispatch_workers=2).create_protocol(StreamsFunctions())
+
+        assert [statistics.dispatched for statistics in protocol.dispatch_statistics] == [0, 0]
+
+
+class TestDispatchWorkerStatistics:
+    """Tests for DispatchWorkerStatistics class."""
+
+    def test_utilization(self):
+        """Test the utilization is the fraction of the time spent dispatching."""
+        now = 10.0
+        statistics = DispatchWorkerStatistics("worker", clock=lambda: now)
+
+        statistics.add(1.0)
+        statistics.add(0.5)
+        now = 14.0
+
+        assert statistics.utilization == 0.375
+        assert statistics.to_dict() == {
+            "name": "worker",
+            "dispatched": 2,
+            "busy_time": 1.5,
+            "max_dispatch_time": 1.0,
+            "utilization": 0.375,
+        }
@@ -0,0 +1,97 @@
+#####################################################################
+# test_rate_limiter.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the rate_limiter module."""
+
+from __future__ import annotations
+
+import pytest
+
+from secsgem.common import RateLimiter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter class."""
+
+    def test_unlimited(self):
+        """Test tokens are always available without a rate."""
+        limiter = RateLimiter()
+
+        assert all(limiter.acquire(1, 1024 * 1024) == 0.0 for _ in range(1000))
+
+    @pytest.mark.parametrize("kwargs", [{"messages_per_second": 0}, {"bytes_per_second": -1}])
+    def test_invalid_rate(self, kwargs):
+        """Test a rate, which is not positive, is rejected."""
+        with pytest.raises(ValueError):
+            RateLimiter(**kwargs)
+
+    def test_messages(self):
+        """Test the message rate after a burst."""
+        clock = _Clock()
+        limiter = RateLimiter(messages_per_second=10, clock=clock)
+
+        assert all(limiter.acquire(1, 0) == 0.0 for _ in range(10))
+        assert limiter.acquire(1, 0) == pytest.approx(0.1)
+
+        # following blocks of a message don't take message tokens
+        assert limiter.acquire(0, 100) == 0.0
+
+        clock.now = 0.1
+        assert limiter.acquire(1, 0) == 0.0
+        assert limiter.acquire(1, 0) == pytest.approx(0.1)
+
+    def test_bytes(self):
+        """Test the byte rate, with a block larger than the bucket leaving a debt."""
+        clock = _Clock()
+        limiter = RateLimiter(bytes_per_second=1000, clock=clock)
+
+        assert limiter.acquire(1, 5000) == 0.0
+        assert limiter.acquire(1, 10) == pytest.approx(4.01)
+
+        clock.now = 4.01
+        assert limiter.acquire(1, 10) == 0.0
+
+    def test_both_limits(self):
+        """Test tokens are only taken if both rates allow the block."""
+        clock = _Clock()
+        limiter = RateLimiter(messages_per_second=1, bytes_per_second=100, clock=clock)
+
+        assert limiter.acquire(1, 50) == 0.0
+        assert limiter.acquire(0, 50) == 0.0
+        assert limiter.acquire(0, 50) == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert limiter.acquire(1, 50) == pytest.approx(0.5)
+        assert limiter.acquire(0, 50) == 0.0
+
+    def test_burst(self):
+        """Test the bucket size follows the burst time."""
+        clock = _Clock()
+        limiter = RateLimiter(messages_per_second=10, burst=0.5, clock=clock)
+
+        assert all(limiter.acquire(1, 0) == 0.0 for _ in range(5))
+        assert limiter.acquire(1, 0) > 0
+
+        clock.now = 100.0
+        assert all(limiter.acquire(1, 0) == 0.0 for _ in range(5))
+        assert limiter.acquire(1, 0) > 0
@@ -0,0 +1,187 @@
+#####################################################################
+# test_reactor.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the reactor module."""
+
+from __future__ import annotations
+
+import socket
+import threading
+
+import pytest
+from conftest import free_port
+
+import secsgem.common
+import secsgem.hsms
+from secsgem.common import Reactor
+
+
+class TestReactor:
+    """Tests for Reactor class."""
+
+    def test_invalid_thread_count(self):
+        """Test creating a reactor without threads."""
+        with pytest.raises(ValueError):
+            Reactor(threads=0)
+
+    def test_readable_callback(self):
+        """Test the callback is called when data is available."""
+        reactor = Reactor()
+        first, second = socket.socketpair()
+        received = []
+        event = threading.Event()
+
+        def _on_readable():
+            received.append(first.recv(1024))
+            event.set()
+
+        reactor.register(first, _on_readable)
+        assert reactor.socket_count == 1
+
+        second.send(b"test")
+
+        assert event.wait(5)
+        assert received == [b"test"]
+
+        reactor.unregister(first)
+        assert reactor.socket_count == 0
+
+        reactor.stop()
+        first.close()
+        second.close()
+
+    def test_double_register(self):
+        """Test registering a socket twice."""
+        reactor = Reactor()
+        first, second = socket.socketpair()
+
+        reactor.register(first, lambda: None)
+
+        with pytest.raises(ValueError):
+            reactor.register(first, lambda: None)
+
+        reactor.unregister(first)
+        reactor.stop()
+        first.close()
+        second.close()
+
+    def test_no_callback_after_unregister(self):
+        """Test the callback is not called after unregister returned."""
+        reactor = Reactor()
+        first, second = socket.socketpair()
+        calls = []
+
+        reactor.register(first, lambda: calls.append(first.recv(1024)))
+        reactor.unregister(first)
+
+        second.send(b"test")
+
+        # registering another socket makes sure the loop went through a select cycle
+        third, fourth = socket.socketpair()
+        event = threading.Event()
+        reactor.register(third, event.set)
+        fourth.send(b"x")
+        assert event.wait(5)
+
+        assert calls == []
+
+        reactor.unregister(third)
+        reactor.stop()
+        for sock in (first, second, third, fourth):
+            sock.close()
+
+    def test_sockets_distributed_over_threads(self):
+        """Test sockets are served by multiple threads."""
+        reactor = Reactor(threads=2)
+        pairs = [socket.socketpair() for _ in range(4)]
+        thread_names = set()
+        events = [threading.Event() for _ in pairs]
+
+        def _callback(index):
+            def _on_readable():
+                pairs[index][0].recv(1024)
+                thread_names.add(threading.current_thread().name)
+                events[index].set()
+
+            return _on_readable
+
+        for index, (first, _) in enumerate(pairs):
+            reactor.register(first, _callback(index))
+
+        for _, second in pairs:
+            second.send(b"x")
+
+        assert all(event.wait(5) for event in events)
+        assert thread_names == {"secsgem_reactor_0", "secsgem_reactor_1"}
+
+        for first, second in pairs:
+            reactor.unregister(first)
+            first.close()
+            second.close()
+
+        reactor.stop()
+
+
+class TestReactorConnections:
+    """Tests for TCP connections served by a reactor."""
+
+    def test_client_server_exchange(self):
+        """Test a client and a server connection sharing one reactor."""
+        reactor = Reactor()
+        port = free_port()
+
+        server = secsgem.common.TcpServerConnection(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=port, reactor=reactor)
+        )
+        client = secsgem.common.TcpClientConnection(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE, port=port, reactor=reactor)
+        )
+
+        server_connected = threading.Event()
+        client_connected = threading.Event()
+        server_data = threading.Event()
+        server_disconnected = threading.Event()
+        received = bytearray()
+
+        def _on_server_data(data):
+            received.extend(data["data"])
+            if len(received) >= 4:
+                server_data.set()
+
+        server.on_connected.register(lambda _: server_connected.set())
+        server.on_data.register(_on_server_data)
+        server.on_disconnected.register(lambda _: server_disconnected.set())
+        client.on_connected.register(lambda _: client_connected.set())
+
+        server.enable()
+        client.enable()
+
+        assert server_connected.wait(5)
+        assert client_connected.wait(5)
+
+        assert client.send_data(b"test")
+        assert server_data.wait(5)
+        assert bytes(received) == b"test"
+
+        # no receiver threads besides the reactor
+        assert not any(thread.name.startswith("secsgem_tcpConnection_receiver") for thread in threading.enumerate())
+
+        client.disable()
+        assert server_disconnected.wait(5)
+
+        server.disable()
+        reactor.stop()
+
+        assert reactor.socket_count == 0
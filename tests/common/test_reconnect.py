@@ -0,0 +1,82 @@
+#####################################################################
+# test_reconnect.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the reconnect module."""
+
+from __future__ import annotations
+
+import socket
+
+from conftest import free_port, wait_for
+
+import secsgem.common
+import secsgem.hsms
+from secsgem.common import TimerWheel, reconnect_delay
+
+
+class TestReconnectDelay:
+    """Tests for reconnect_delay function."""
+
+    def test_delay(self):
+        """Test the reconnect delay grows with the failed attempts, within T5 and the maximum delay plus jitter."""
+        assert reconnect_delay(0.25, 0, 2.0, 60.0, 0.0) == 0.25
+        assert reconnect_delay(0.25, 2, 2.0, 60.0, 0.0) == 1.0
+        assert reconnect_delay(0.25, 1000, 2.0, 60.0, 0.0) == 60.0
+        assert reconnect_delay(10.0, 3, 2.0, 5.0, 0.0) == 10.0
+
+        delays = [reconnect_delay(1.0, 0, 2.0, 60.0, 0.5) for _ in range(100)]
+        assert all(1.0 <= delay <= 1.5 for delay in delays)
+        assert len(set(delays)) > 1
+
+
+class TestTcpClientConnectionReconnect:
+    """Tests for the reconnect of TcpClientConnection class."""
+
+    def test_backoff_and_statistics(self):
+        """Test failed attempts back off up to the maximum delay, and the statistics reset on connect."""
+        port = free_port()
+        client = secsgem.common.TcpClientConnection(
+            secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE,
+                port=port,
+                timeouts=secsgem.common.Timeouts(t5=0.02),
+                reconnect_scheduler=TimerWheel(resolution=0.005),
+                reconnect_backoff=2.0,
+                reconnect_max_delay=0.08,
+                reconnect_jitter=0.0,
+            )
+        )
+
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.enable()
+
+        try:
+            assert wait_for(lambda: client.reconnect_statistics.failures >= 4)
+
+            statistics = client.reconnect_statistics
+            assert statistics.attempts >= statistics.failures
+            assert statistics.connects == 0
+            assert statistics.last_delay == 0.08
+            assert statistics.last_error is not None
+
+            server.bind(("127.0.0.1", port))
+            server.listen(1)
+
+            assert wait_for(lambda: client.connected)
+            assert statistics.connects == 1
+            assert statistics.consecutive_failures == 0
+        finally:
+            client.disable()
+            server.close()
@@ -0,0 +1,212 @@
+#####################################################################
+# test_send_queue.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the send_queue module."""
+
+from __future__ import annotations
+
+import queue
+import time
+
+import pytest
+
+import secsgem.hsms
+import secsgem.secs
+import secsgem.secsi
+import secsgem.secsitcp
+from secsgem.common import BlockSendInfo, RateLimiter, SendPriority, SendQueue
+from secsgem.secs.functions import StreamsFunctions
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSendQueue:
+    """Tests for SendQueue class."""
+
+    def test_priorities(self):
+        """Test blocks are taken by priority, and in order within a priority."""
+        send_queue = SendQueue()
+
+        for data, priority in [
+            (b"request1", SendPriority.REQUEST),
+            (b"reply1", SendPriority.REPLY),
+            (b"request2", SendPriority.REQUEST),
+            (b"control", SendPriority.CONTROL),
+            (b"reply2", SendPriority.REPLY),
+        ]:
+            send_queue.put(BlockSendInfo(data, priority=priority))
+
+        assert len(send_queue) == 5
+        assert [send_queue.get_nowait().data for _ in range(5)] == [
+            b"control",
+            b"reply1",
+            b"reply2",
+            b"request1",
+            b"request2",
+        ]
+        assert send_queue.empty()
+
+        with pytest.raises(queue.Empty):
+            send_queue.get_nowait()
+
+    def test_rate_limit(self):
+        """Test only primary messages are throttled, and the delay until the next one may be sent."""
+        clock = _Clock()
+        send_queue = SendQueue(RateLimiter(messages_per_second=1, clock=clock), clock=clock)
+
+        send_queue.put(BlockSendInfo(b"request1"))
+        send_queue.put(BlockSendInfo(b"request2"))
+        send_queue.put(BlockSendInfo(b"block2", starts_message=False))
+
+        assert send_queue.get_nowait().data == b"request1"
+
+        for _ in range(2):
+            with pytest.raises(queue.Empty):
+                send_queue.get_nowait()
+
+        assert send_queue.delay == pytest.approx(1.0)
+        assert send_queue.statistics.throttled == 1
+
+        send_queue.put(BlockSendInfo(b"reply", priority=SendPriority.REPLY))
+        assert send_queue.get_nowait().data == b"reply"
+
+        clock.now = 1.0
+        assert send_queue.get_nowait().data == b"request2"
+        assert send_queue.get_nowait().data == b"block2"
+        assert send_queue.delay is None
+
+        assert send_queue.statistics.sent == 4
+        assert send_queue.statistics.wait_time_max == pytest.approx(1.0)
+
+    def test_limit(self):
+        """Test primary message blocks exceeding the limit are dropped, replies are not."""
+        send_queue = SendQueue(limit=1)
+
+        first = BlockSendInfo(b"request1")
+        second = BlockSendInfo(b"request2")
+        reply = BlockSendInfo(b"reply", priority=SendPriority.REPLY)
+
+        for block_send_info in (first, second, reply):
+            send_queue.put(block_send_info)
+
+        assert not second.wait()
+        assert len(send_queue) == 2
+        assert send_queue.statistics.dropped == 1
+        assert send_queue.statistics.max_depth == 2
+
+    def test_clear(self):
+        """Test clearing resolves the queued blocks with False, also a throttled one."""
+        send_queue = SendQueue(RateLimiter(messages_per_second=1, clock=lambda: 0.0))
+
+        block_send_infos = [BlockSendInfo(b"request1"), BlockSendInfo(b"request2")]
+        for block_send_info in block_send_infos:
+            send_queue.put(block_send_info)
+
+        send_queue.get_nowait()
+        with pytest.raises(queue.Empty):
+            send_queue.get_nowait()
+
+        send_queue.clear()
+
+        assert send_queue.empty()
+        assert send_queue.delay is None
+        assert not block_send_infos[1].wait()
+        assert send_queue.statistics.to_dict() == {
+            "queued": 2,
+            "sent": 1,
+            "dropped": 1,
+            "throttled": 1,
+            "depth": 0,
+            "max_depth": 2,
+            "wait_time_total": pytest.approx(0.0, abs=1.0),
+            "wait_time_max": pytest.approx(0.0, abs=1.0),
+        }
+
+
+class TestSendPriority:
+    """Tests for the send priority of the protocols."""
+
+    def test_secsi(self):
+        """Test replies and S9 messages are sent before primary messages."""
+        protocol = secsgem.secsi.SecsISettings(port="").create_protocol(StreamsFunctions())
+
+        def _priority(function: secsgem.secs.SecsStreamFunction) -> SendPriority:
+            return protocol._send_priority(protocol._create_message_for_function(function, 1))
+
+        assert _priority(secsgem.secs.functions.SecsS01F03([1])) == SendPriority.REQUEST
+        assert _priority(secsgem.secs.functions.SecsS06F12(0)) == SendPriority.REPLY
+        assert _priority(secsgem.secs.functions.SecsS09F05(b"header")) == SendPriority.REPLY
+        assert _priority(secsgem.secs.functions.SecsS06F00()) == SendPriority.REPLY
+
+    def test_hsms(self):
+        """Test control messages are sent before data messages."""
+        protocol = secsgem.hsms.HsmsSettings().create_protocol(StreamsFunctions())
+
+        linktest = secsgem.hsms.HsmsMessage(secsgem.hsms.HsmsLinktestRspHeader(1), b"")
+        request = protocol._create_message_for_function(secsgem.secs.functions.SecsS01F01(), 1)
+
+        assert protocol._send_priority(linktest) == SendPriority.CONTROL
+        assert protocol._send_priority(request) == SendPriority.REQUEST
+
+
+class TestSendLimits:
+    """Tests for the send limits of the protocols."""
+
+    def test_secsi_rate_limit(self):
+        """Test primary messages are throttled while replies are sent right away."""
+        link = secsgem.common.LoopbackLink()
+        host = secsgem.secsitcp.SecsITcpSettings(loopback=link, send_messages_per_second=2).create_protocol(
+            StreamsFunctions()
+        )
+        equipment = secsgem.secsitcp.SecsITcpSettings(
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            loopback=link,
+        ).create_protocol(StreamsFunctions())
+
+        equipment.enable()
+        host.enable()
+
+        try:
+            start = time.monotonic()
+            messages = [
+                host._create_message_for_function(secsgem.secs.functions.SecsS01F01(), host.get_next_system_counter())
+                for _ in range(3)
+            ]
+            primaries = [host.send_message_async(message) for message in messages]
+            reply = host.send_response_async(secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]), 1)
+
+            assert reply.result(10)
+            assert not primaries[2].done()
+            assert all(primary.result(10) for primary in primaries)
+            assert time.monotonic() - start >= 0.4
+
+            assert host.send_statistics.throttled == 1
+            assert host.send_statistics.sent == 4
+        finally:
+            host.disable()
+            equipment.disable()
+
+    def test_hsms_queue_limit(self):
+        """Test sending fails while the queue limit is exceeded."""
+        protocol = secsgem.hsms.HsmsSettings(send_queue_limit=0).create_protocol(StreamsFunctions())
+
+        assert not protocol.send_stream_function(secsgem.secs.functions.SecsS01F01())
+        assert protocol.send_statistics.dropped == 1
@@ -0,0 +1,300 @@
+#####################################################################
+# test_tcp_connection.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the tcp_connection module."""
+
+from __future__ import annotations
+
+import socket
+import struct
+import threading
+import time
+
+import pytest
+from conftest import free_port
+
+import secsgem.common
+import secsgem.hsms
+import secsgem.secsitcp
+
+
+def _create_connection(settings: secsgem.common.Settings):
+    connection = secsgem.common.TcpClientConnection(settings)
+    local, remote = socket.socketpair()
+    connection._sock = local
+
+    received = []
+    connection.on_data.register(lambda data: received.append(data["data"]))
+
+    return connection, remote, received
+
+
+class TestTcpConnectionSend:
+    """Tests for the send path of TcpConnection."""
+
+    def test_send_buffers(self):
+        """Test sending multiple buffers."""
+        connection, remote, _ = _create_connection(secsgem.hsms.HsmsSettings())
+
+        assert connection.send_buffers([b"\x00\x00", memoryview(b"\x00\x04test"), b""])
+        assert remote.recv(1024) == b"\x00\x00\x00\x04test"
+
+        remote.close()
+        connection._sock.close()
+
+    def test_send_partial_writes(self):
+        """Test sending more data than the socket takes at once."""
+        connection, remote, _ = _create_connection(secsgem.hsms.HsmsSettings())
+        connection._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        connection._sock.setblocking(False)
+
+        payload = bytes(range(256)) * 16384
+        received = bytearray()
+
+        def _receive():
+            while len(received) < len(payload) + 14:
+                received.extend(remote.recv(65536))
+
+        receiver = threading.Thread(target=_receive)
+        receiver.start()
+
+        block = secsgem.hsms.HsmsBlock(secsgem.hsms.HsmsStreamFunctionHeader(1, 6, 11, True, 0), payload)
+        assert connection.send_buffers(block.encode_parts())
+
+        receiver.join()
+
+        assert bytes(received) == block.encode()
+
+        remote.close()
+        connection._sock.close()
+
+    def test_send_remote_closed(self):
+        """Test sending to a socket closed by the remote."""
+        connection, remote, _ = _create_connection(secsgem.hsms.HsmsSettings())
+
+        remote.close()
+
+        assert not connection.send_data(b"test")
+
+        connection._sock.close()
+
+
+class TestTcpConnectionReceive:
+    """Tests for the receive path of TcpConnection."""
+
+    def test_receive_buffer_size_setting(self):
+        """Test the read size is taken from the settings."""
+        connection, remote, received = _create_connection(secsgem.hsms.HsmsSettings(receive_buffer_size=16))
+
+        remote.sendall(b"\x00" * 40)
+
+        assert connection._receive()
+        assert received == [b"\x00" * 16]
+
+        remote.close()
+        connection._sock.close()
+
+    def test_read_size_follows_pending_block(self):
+        """Test the read size grows to the size of the pending hsms block and shrinks afterwards."""
+        connection, remote, received = _create_connection(secsgem.hsms.HsmsSettings(receive_buffer_size=1024))
+        block = struct.pack(">L", 200000) + bytes(range(256)) * 781 + b"\x01" * 64
+        sender = threading.Thread(target=remote.sendall, args=(block + struct.pack(">L", 10) + b"\x02" * 10,))
+        sender.start()
+
+        assert connection._receive()
+        assert len(received[0]) == 1024
+        assert connection._next_receive_size() == 200000 + 4 - 1024
+
+        while sum(len(data) for data in received) < len(block) + 14:
+            assert connection._receive()
+
+        sender.join()
+
+        assert b"".join(received) == block + struct.pack(">L", 10) + b"\x02" * 10
+        assert connection._next_receive_size() == 1024
+
+        remote.close()
+        connection._sock.close()
+
+    def test_block_header_split_between_reads(self):
+        """Test a length header spread over multiple reads."""
+        connection, remote, _ = _create_connection(secsgem.hsms.HsmsSettings(receive_buffer_size=2))
+
+        remote.sendall(struct.pack(">L", 5000) + b"\x00" * 10)
+
+        assert connection._receive()
+        assert connection._next_receive_size() == 2
+        assert connection._receive()
+        assert connection._next_receive_size() == 5000
+
+        remote.close()
+        connection._sock.close()
+
+    def test_no_length_header(self):
+        """Test connections without length header keep the default read size."""
+        connection, remote, received = _create_connection(secsgem.secsitcp.SecsITcpSettings())
+
+        remote.sendall(struct.pack(">L", 200000))
+
+        assert connection._receive()
+        assert received == [struct.pack(">L", 200000)]
+        assert connection._next_receive_size() == secsgem.common.TcpClientConnection.receive_buffer_size
+
+        remote.close()
+        connection._sock.close()
+
+    def test_remote_closed(self):
+        """Test receiving from a socket closed by the remote."""
+        connection, remote, _ = _create_connection(secsgem.hsms.HsmsSettings())
+
+        remote.close()
+
+        assert not connection._receive()
+
+        connection._sock.close()
+
+
+class TestTcpConnectionLifecycle:
+    """Tests for enabling and disabling tcp connections."""
+
+    def test_enable_disable_cycle(self):
+        """Test the connections stop all threads on disable, also after the server started listening again."""
+        port = free_port()
+        server = secsgem.common.TcpServerConnection(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=port)
+        )
+        # short connect separation time, in case the client tries before the server is listening
+        client = secsgem.common.TcpClientConnection(
+            secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE, port=port, timeouts=secsgem.common.Timeouts(t5=0.1)
+            )
+        )
+
+        server_connected = threading.Event()
+        client_connected = threading.Event()
+        server_disconnected = threading.Event()
+
+        server.on_connected.register(lambda _: server_connected.set())
+        client.on_connected.register(lambda _: client_connected.set())
+        server.on_disconnected.register(lambda _: server_disconnected.set())
+
+        for _ in range(3):
+            server_connected.clear()
+            client_connected.clear()
+            server_disconnected.clear()
+
+            server.enable()
+            client.enable()
+
+            assert server_connected.wait(5)
+            assert client_connected.wait(5)
+
+            client.disable()
+            assert server_disconnected.wait(5)
+
+            # server is listening for the next connection again
+            server.disable()
+
+            assert not server.connected
+            assert not client.connected
+
+        assert not any(thread.name.startswith("secsgem_tcp") for thread in threading.enumerate())
+
+    def test_disable_while_waiting_for_reconnect(self):
+        """Test disabling a client connection waiting for the T5 timeout returns immediately."""
+        client = secsgem.common.TcpClientConnection(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE, port=free_port())
+        )
+
+        client.enable()
+
+        # first attempt failed, waiting for the next one
+        end_time = time.monotonic() + 5
+        while client.reconnect_statistics.failures == 0 and time.monotonic() < end_time:
+            time.sleep(0.01)
+
+        start = time.monotonic()
+        client.disable()
+
+        assert time.monotonic() - start < 1
+        assert client.connection_thread is not None
+        assert not client.connection_thread.is_alive()
+
+
+class TestTcpConnectionOptions:
+    """Tests for the socket options of tcp connections."""
+
+    def test_settings(self):
+        """Test the tcp options are created from the settings arguments."""
+        settings = secsgem.hsms.HsmsSettings(tcp_nodelay=False, so_rcvbuf=262144)
+
+        assert settings.tcp_options.tcp_nodelay is False
+        assert settings.tcp_options.so_rcvbuf == 262144
+        assert settings.tcp_options.so_keepalive is True
+        assert settings.tcp_options.tcp_keepidle is None
+
+        assert secsgem.secsitcp.SecsITcpSettings(tcp_keepcnt=3).tcp_options.tcp_keepcnt == 3
+
+        with pytest.raises(AttributeError):
+            _ = settings.tcp_options.unknown
+
+    def test_quickack(self):
+        """Test quick acknowledgement is only renewed where supported."""
+        assert not secsgem.common.TcpOptions().quickack
+        assert secsgem.common.TcpOptions(tcp_quickack=True).quickack == hasattr(socket, "TCP_QUICKACK")
+
+    def test_applied_on_both_sides(self):
+        """Test the options are set on the sockets of client and server connections."""
+        port = free_port()
+        options = {"tcp_nodelay": True, "so_sndbuf": 131072, "so_rcvbuf": 131072}
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            options["tcp_keepidle"] = 17
+
+        server = secsgem.common.TcpServerConnection(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=port, **options)
+        )
+        # short connect separation time, in case the client tries before the server is listening
+        client = secsgem.common.TcpClientConnection(
+            secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE,
+                port=port,
+                timeouts=secsgem.common.Timeouts(t5=0.1),
+                **options,
+            )
+        )
+
+        server_connected = threading.Event()
+        client_connected = threading.Event()
+
+        server.on_connected.register(lambda _: server_connected.set())
+        client.on_connected.register(lambda _: client_connected.set())
+
+        server.enable()
+        client.enable()
+
+        try:
+            assert server_connected.wait(5)
+            assert client_connected.wait(5)
+
+            for sock in (server._sock, client._sock):
+                assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+                assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE) != 0
+                assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 131072
+
+                if "tcp_keepidle" in options:
+                    assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE) == 17
+        finally:
+            client.disable()
+            server.disable()
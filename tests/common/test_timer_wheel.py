@@ -0,0 +1,154 @@
+#####################################################################
+# test_timer_wheel.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the timer_wheel module."""
+
+from __future__ import annotations
+
+import threading
+
+from secsgem.common import TimerWheel
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTimerWheel:
+    """Tests for TimerWheel class."""
+
+    def _run_until(self, wheel: TimerWheel, clock: _Clock, end: float, step: float):
+        while clock.now < end:
+            clock.now = min(clock.now + step, end)
+            wheel.advance()
+
+    def test_delays_on_all_wheels(self):
+        """Test timers from one tick to beyond the highest wheel fire in order, never early and at most a tick late."""
+        clock = _Clock()
+        wheel = TimerWheel(resolution=0.01, clock=clock)
+        fired: list[tuple[float, float]] = []
+
+        # scheduled out of order
+        delays = [5.0, 0.65, 200000.0, 0.0, 41.0, 0.3, 3600.0, 0.01, 40.96, 0.64]
+
+        for delay in delays:
+            wheel.schedule(delay, lambda delay=delay: fired.append((delay, clock.now)))
+
+        assert wheel.pending == len(delays)
+
+        # varying step sizes, like a thread woken up late
+        self._run_until(wheel, clock, 50.0, 0.007)
+        self._run_until(wheel, clock, 210000.0, 3.3)
+
+        assert [delay for delay, _ in fired] == sorted(delays)
+        for delay, fired_at in fired:
+            assert delay <= fired_at <= delay + 3.3 if delay > 50.0 else delay <= fired_at <= delay + 0.02
+
+        assert wheel.pending == 0
+
+    def test_cancel(self):
+        """Test cancelled timers are removed right away and not called."""
+        clock = _Clock()
+        wheel = TimerWheel(clock=clock)
+        fired = []
+
+        timers = [wheel.schedule(delay, lambda delay=delay: fired.append(delay)) for delay in (0.5, 30.0, 100.0)]
+        timers[1].cancel()
+        timers[1].cancel()
+
+        assert timers[1].cancelled
+        assert wheel.pending == 2
+
+        self._run_until(wheel, clock, 200.0, 0.25)
+
+        assert fired == [0.5, 100.0]
+
+    def test_advance_delay(self):
+        """Test the delay until the next advance, the start of the next slot holding timers is waited for."""
+        clock = _Clock()
+        wheel = TimerWheel(resolution=0.01, clock=clock)
+
+        assert wheel.advance() is None
+
+        # tick 1000 is in the slot of the second wheel starting with tick 960
+        wheel.schedule(10.0, lambda: None)
+        assert wheel.advance() == 9.6
+
+        wheel.schedule(0.1, lambda: None)
+        assert wheel.advance() == 0.1
+
+    def test_schedule_on_last_tick_of_turn(self):
+        """Test a timer due on the first tick of the next turn of the lowest wheel is not skipped."""
+        clock = _Clock()
+        wheel = TimerWheel(resolution=1.0, clock=clock)
+        fired = []
+
+        wheel.schedule(1000.0, lambda: None)
+        clock.now = 63.5
+        wheel.advance()
+
+        wheel.schedule(0.0, lambda: fired.append(clock.now))
+        assert wheel.advance() == 0.5
+
+        clock.now = 64.0
+        wheel.advance()
+        assert fired == [64.0]
+
+    def test_reschedule_from_callback(self):
+        """Test a callback can schedule the next timer, like the linktest."""
+        clock = _Clock()
+        wheel = TimerWheel(clock=clock)
+        fired = []
+
+        def _on_timer():
+            fired.append(clock.now)
+            wheel.schedule(1.0, _on_timer)
+
+        wheel.schedule(1.0, _on_timer)
+        self._run_until(wheel, clock, 5.5, 0.01)
+
+        assert len(fired) == 5
+
+    def test_exception_in_callback(self):
+        """Test an exception in a callback doesn't keep other timers from being called."""
+        clock = _Clock()
+        wheel = TimerWheel(clock=clock)
+        fired = []
+
+        wheel.schedule(0.1, lambda: 1 / 0)
+        wheel.schedule(0.1, lambda: fired.append(True))
+        self._run_until(wheel, clock, 1.0, 0.1)
+
+        assert fired == [True]
+
+    def test_thread(self):
+        """Test the wheel thread calls the timers, also after being idle."""
+        wheel = TimerWheel(resolution=0.005)
+        fired = threading.Event()
+        cancelled = wheel.schedule(0.02, lambda: fired.clear())
+
+        wheel.schedule(0.05, fired.set)
+        cancelled.cancel()
+
+        assert fired.wait(5)
+
+        fired.clear()
+        wheel.schedule(0.0, fired.set)
+
+        assert fired.wait(5)
@@ -0,0 +1,187 @@
+#####################################################################
+# test_transactions.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the transactions module."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import time
+
+from conftest import wait_for
+
+import secsgem.common
+import secsgem.hsms
+import secsgem.secs
+from secsgem.common import TransactionTable
+from secsgem.secs.functions import StreamsFunctions
+
+
+class TestTransactionTable:
+    """Tests for TransactionTable class."""
+
+    def test_resolve(self):
+        """Test a response resolves the transaction of its system id only once."""
+        table = TransactionTable()
+        future = table.open(1)
+
+        assert not table.resolve(2, None)
+        assert table.resolve(1, "response")
+        assert future.result(0) == "response"
+        assert not table.resolve(1, "duplicate")
+        assert len(table) == 0
+
+    def test_deadline(self):
+        """Test a transaction is resolved with None after its deadline."""
+        table = TransactionTable()
+        future = table.open(1, 0.05)
+
+        assert future.result(5) is None
+        assert 1 not in table
+
+    def test_cancel(self):
+        """Test a cancelled transaction is closed, and the response is passed on as unsolicited."""
+        table = TransactionTable()
+        future = table.open(1, 10.0)
+
+        assert future.cancel()
+        assert 1 not in table
+        assert not table.resolve(1, "late")
+
+    def test_reused_system(self):
+        """Test the deadline of a closed transaction doesn't resolve a newer one with the same system id."""
+        table = TransactionTable()
+        first = table.open(1, 0.05)
+        first.cancel()
+
+        second = table.open(1)
+        time.sleep(0.2)
+
+        assert not second.done()
+        assert table.resolve(1, "response")
+
+    def test_wait(self):
+        """Test waiting returns the response resolved before the deadline."""
+        table = TransactionTable()
+        future = table.open(1)
+        table.resolve(1, "response")
+
+        assert table.wait(1, future, 10.0) == "response"
+
+    def test_wait_stalled_timers(self):
+        """Test a waiting thread closes the transaction itself if the deadline isn't enforced."""
+        table = TransactionTable(secsgem.common.TimerWheel(clock=lambda: 0.0))
+        table.wait_margin = 0.05
+        future = table.open(1)
+
+        start = time.monotonic()
+        assert table.wait(1, future, 0.05) is None
+        assert time.monotonic() - start < 5
+
+        assert future.cancelled()
+        assert 1 not in table
+
+    def test_resolve_all(self):
+        """Test all open transactions are resolved with None."""
+        table = TransactionTable()
+        futures = [table.open(system) for system in range(100)]
+
+        table.resolve_all()
+
+        assert all(future.result(0) is None for future in futures)
+        assert len(table) == 0
+
+
+class TestProtocolTransactions:
+    """Tests for the transactions of a protocol."""
+
+    def setup_method(self):
+        link = secsgem.common.LoopbackLink()
+        self.host = secsgem.hsms.HsmsSettings(loopback=link).create_protocol(StreamsFunctions())
+        self.equipment = secsgem.hsms.HsmsSettings(
+            connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            loopback=link,
+        ).create_protocol(StreamsFunctions())
+
+        self.response_delay = 0.0
+        self.equipment.events.message_received += self._on_message
+
+        self.equipment.enable()
+        self.host.enable()
+
+        assert wait_for(lambda: self.host.connection_state.current.name == "CONNECTED_SELECTED")
+
+    def teardown_method(self):
+        self.host.disable()
+        self.equipment.disable()
+
+    def _on_message(self, data):
+        message = data["message"]
+
+        # S1F3 is left unanswered
+        if message.header.function == 1:
+            time.sleep(self.response_delay)
+            self.equipment.send_response(
+                secsgem.secs.functions.SecsS01F02(["MDLN", str(message.header.system)]), message.header.system
+            )
+
+    def test_concurrent_system_ids(self):
+        """Test system ids allocated from many threads are unique."""
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            systems = list(executor.map(lambda _: self.host.get_next_system_counter(), range(10000)))
+
+        assert len(set(systems)) == len(systems)
+
+    def test_send_async(self):
+        """Test many concurrent requests are each resolved with their own response."""
+        futures = [self.host.send_async(secsgem.secs.functions.SecsS01F01()) for _ in range(500)]
+
+        for future in futures:
+            response = future.result(10)
+            assert response is not None
+            assert StreamsFunctions().decode(response).get()[1] == str(response.header.system)
+
+        assert len({future.result().header.system for future in futures}) == 500
+        assert len(self.host._transactions) == 0
+
+    def test_timeout_override(self):
+        """Test the per call timeout replaces T3."""
+        start = time.monotonic()
+        assert self.host.send_and_waitfor_response(secsgem.secs.functions.SecsS01F03([1]), timeout=0.1) is None
+        assert self.host.send_async(secsgem.secs.functions.SecsS01F03([1]), timeout=0.1).result(5) is None
+        assert time.monotonic() - start < 5
+
+        assert len(self.host._transactions) == 0
+
+    def test_cancel(self):
+        """Test a cancelled request is closed and its response is handled as unsolicited message."""
+        unsolicited = []
+        self.host.events.message_received += lambda data: unsolicited.append(data["message"])
+        self.response_delay = 0.1
+
+        future = self.host.send_async(secsgem.secs.functions.SecsS01F01())
+        assert future.cancel()
+
+        assert wait_for(lambda: len(unsolicited) == 1)
+        assert len(self.host._transactions) == 0
+
+    def test_disconnect(self):
+        """Test open requests are resolved with None when the connection is lost."""
+        future = self.host.send_async(secsgem.secs.functions.SecsS01F03([1]))
+
+        self.equipment.disable()
+
+        assert future.result(5) is None
@@ -0,0 +1,133 @@
+#####################################################################
+# test_unix_connection.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the unix_client_connection and unix_server_connection modules."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+
+import pytest
+
+import secsgem.common
+import secsgem.hsms
+import secsgem.secs
+from secsgem.secs.functions import StreamsFunctions
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="unix domain sockets not supported")
+
+
+def _create_settings(path: str, **kwargs) -> tuple[secsgem.hsms.HsmsSettings, secsgem.hsms.HsmsSettings]:
+    passive = secsgem.hsms.HsmsSettings(
+        connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+        device_type=secsgem.common.DeviceType.EQUIPMENT,
+        socket_path=path,
+        **kwargs,
+    )
+    active = secsgem.hsms.HsmsSettings(
+        connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE,
+        socket_path=path,
+        timeouts=secsgem.common.Timeouts(t5=0.1),
+        **kwargs,
+    )
+
+    return passive, active
+
+
+class TestUnixConnection:
+    """Tests for UnixClientConnection and UnixServerConnection classes."""
+
+    def test_settings(self, tmp_path):
+        """Test the settings create unix connections for a socket path."""
+        passive, active = _create_settings(str(tmp_path / "hsms.sock"))
+
+        assert isinstance(passive.create_connection(), secsgem.common.UnixServerConnection)
+        assert isinstance(active.create_connection(), secsgem.common.UnixClientConnection)
+        assert active.name == f"HSMS-{active.connect_mode}_{tmp_path / 'hsms.sock'}"
+
+        with pytest.raises(ValueError):
+            secsgem.hsms.HsmsMultiPassiveServer(passive)
+
+    def test_protocols(self, tmp_path):
+        """Test hsms protocols communicating over a unix domain socket, the socket file is removed on disable."""
+        path = tmp_path / "hsms.sock"
+
+        # stale socket file from a previous run
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+
+        passive_settings, active_settings = _create_settings(str(path), tcp_nodelay=True, so_rcvbuf=65536)
+        passive = passive_settings.create_protocol(StreamsFunctions())
+        active = active_settings.create_protocol(StreamsFunctions())
+
+        passive.events.message_received += lambda data: passive.send_response(
+            secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]), data["message"].header.system
+        )
+
+        communicating = threading.Event()
+        active.events.communicating += lambda _: communicating.set()
+
+        passive.enable()
+        active.enable()
+
+        try:
+            assert communicating.wait(5)
+
+            response = active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01())
+            assert response is not None
+            assert StreamsFunctions().decode(response).get() == ["MDLN", "SOFTREV"]
+        finally:
+            active.disable()
+            passive.disable()
+
+        assert not path.exists()
+
+    def test_async_protocols(self, tmp_path):
+        """Test asyncio hsms protocols communicating over a unix domain socket."""
+
+        async def _run():
+            passive_settings, active_settings = _create_settings(str(tmp_path / "hsms.sock"))
+            passive = passive_settings.create_async_protocol(StreamsFunctions())
+            active = active_settings.create_async_protocol(StreamsFunctions())
+
+            tasks = []
+            passive.events.message_received += lambda data: tasks.append(
+                asyncio.ensure_future(
+                    passive.send_response(
+                        secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]), data["message"].header.system
+                    )
+                )
+            )
+
+            await passive.enable()
+            await active.enable()
+
+            try:
+                for _ in range(500):
+                    if active.connection_state.current.name == "CONNECTED_SELECTED":
+                        break
+                    await asyncio.sleep(0.01)
+
+                response = await active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01())
+                assert response is not None
+                assert StreamsFunctions().decode(response).get() == ["MDLN", "SOFTREV"]
+            finally:
+                await active.disable()
+                await passive.disable()
+
+        asyncio.run(_run())
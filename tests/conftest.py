@@ -1,7 +1,38 @@
 """Test fixtures."""
 
 import os
+import socket
 import sys
+import time
 
 # add helpers to path for tests
 sys.path.append(os.path.join(os.path.dirname(__file__), "helpers"))
+
+
+def free_port() -> int:
+    """Get a local TCP port, which is currently not in use."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Wait for a condition to become true.
+
+    Args:
+        condition: callable checking the condition
+        timeout: seconds to wait before giving up
+
+    Returns:
+        True if the condition was met before the timeout
+
+    """
+    end_time = time.monotonic() + timeout
+
+    while not condition():
+        if time.monotonic() > end_time:
+            return False
+
+        time.sleep(0.01)
+
+    return True
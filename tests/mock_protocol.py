@@ -17,6 +17,7 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import datetime
 import typing
 
@@ -195,6 +196,21 @@ class MockProtocol(secsgem.common.Protocol[secsgem.common.Message, secsgem.commo
 
         return True
 
+    def send_message_async(self, message: secsgem.common.Message) -> concurrent.futures.Future[bool]:
+        """Queue a message for the remote host.
+
+        Args:
+            message: message to be transmitted
+
+        Returns:
+            future resolved with True
+
+        """
+        future: concurrent.futures.Future[bool] = concurrent.futures.Future()
+        future.set_result(self.send_message(message))
+
+        return future
+
     def expect_message(self, system_id=None, s_type=None, stream=None, function=None, timeout=5):
         end_time = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
 
@@ -221,7 +237,5 @@ class MockProtocol(secsgem.common.Protocol[secsgem.common.Message, secsgem.commo
                     return None
 
     def simulate_message(self, message: MockMessage):
-        if message.header.system in self._response_queues:
-            self._response_queues[message.header.system].put_nowait(message)
-        else:
+        if not self._resolve_transaction(message):
             self.events.fire("message_received", {"connection": None, "message": message})
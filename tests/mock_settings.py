@@ -80,6 +80,11 @@ class MockHsmsSettings(MockSettings):
             secsgem.common.Setting("connect_mode", secsgem.hsms.HsmsConnectMode.ACTIVE, "Hsms connect mode"),
             secsgem.common.Setting("address", "127.0.0.1", "Remote (active) or local (passive) IP address"),
             secsgem.common.Setting("port", 5000, "TCP port of remote host"),
+            secsgem.common.Setting("linktest_timeout", 30, "Seconds between linktest requests"),
+            secsgem.common.Setting("spool_threshold", None, "Payload bytes above which messages are spooled"),
+            secsgem.common.Setting("spool_directory", None, "Directory for the files of spooled messages"),
+            secsgem.common.Setting("max_message_size", None, "Maximum payload bytes of a received message"),
+            secsgem.common.Setting("message_size_limits", None, "Maximum payload bytes by (stream, function)"),
         ]
 
     @property
@@ -0,0 +1,145 @@
+#####################################################################
+# test_gem_async_host_handler.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the asyncio gem host handler against the threaded equipment handler."""
+
+from __future__ import annotations
+
+import asyncio
+
+from conftest import free_port
+
+import secsgem.common
+import secsgem.gem
+import secsgem.hsms
+
+
+class TestAsyncGemHostHandler:
+    def test_communication_with_equipment(self):
+        port = free_port()
+
+        equipment = secsgem.gem.GemEquipmentHandler(
+            secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE,
+                device_type=secsgem.common.DeviceType.EQUIPMENT,
+                port=port,
+            )
+        )
+        equipment.status_variables.update(
+            {
+                10: secsgem.gem.StatusVariable(10, "sample1", "meters", secsgem.secs.variables.U4, False),
+            }
+        )
+        equipment.status_variables[10].value = 42
+
+        host = secsgem.gem.AsyncGemHostHandler(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=port)
+        )
+
+        async def _run():
+            await host.enable()
+            equipment.enable()
+
+            try:
+                assert await host.waitfor_communicating(10)
+
+                assert (await host.request_sv(10)).get() == 42
+
+                svs = await host.list_svs([10])
+                assert svs[0].SVNAME.get() == "sample1"
+
+                assert await host.are_you_there() is not None
+            finally:
+                await asyncio.get_running_loop().run_in_executor(None, equipment.disable)
+                await host.disable()
+
+        asyncio.run(_run())
+
+    def test_callbacks(self):
+        port = free_port()
+
+        host = secsgem.gem.AsyncGemHostHandler(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=port)
+        )
+        remote = secsgem.gem.AsyncGemHostHandler(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE, port=port)
+        )
+
+        async def _on_s10f03(handler, message):
+            del message  # unused parameters
+            await asyncio.sleep(0)
+            return handler.stream_function(10, 4)(0)
+
+        host.register_stream_function(10, 3, _on_s10f03)
+
+        async def _run():
+            await host.enable()
+            await remote.enable()
+
+            try:
+                assert await remote.waitfor_communicating(10)
+                assert await host.waitfor_communicating(10)
+
+                response = await remote.send_equipment_terminal(1, "hello")
+                assert response is not None
+                assert response.header.function == 4
+            finally:
+                await remote.disable()
+                await host.disable()
+
+        asyncio.run(_run())
+
+    def test_send_many_and_wait(self):
+        port = free_port()
+
+        equipment = secsgem.gem.GemEquipmentHandler(
+            secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE,
+                device_type=secsgem.common.DeviceType.EQUIPMENT,
+                port=port,
+            )
+        )
+        equipment.status_variables.update(
+            {
+                10: secsgem.gem.StatusVariable(10, "sample1", "meters", secsgem.secs.variables.U4, False),
+            }
+        )
+        equipment.status_variables[10].value = 42
+
+        host = secsgem.gem.AsyncGemHostHandler(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=port)
+        )
+
+        async def _run():
+            await host.enable()
+            equipment.enable()
+
+            try:
+                assert await host.waitfor_communicating(10)
+
+                functions = [host.stream_function(1, 3)([10]) for _ in range(20)]
+                functions[3] = None
+
+                tasks = await host.send_many_and_wait(functions, window=4)
+
+                assert isinstance(tasks[3].exception(), AttributeError)
+                for index, task in enumerate(tasks):
+                    if index != 3:
+                        assert host.streams_functions.decode(task.result()).get() == [42]
+            finally:
+                await asyncio.get_running_loop().run_in_executor(None, equipment.disable)
+                await host.disable()
+
+        asyncio.run(_run())
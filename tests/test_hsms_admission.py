@@ -0,0 +1,164 @@
+#####################################################################
+# test_hsms_admission.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import asyncio
+import socket
+
+import pytest
+from conftest import free_port
+
+import secsgem.common
+import secsgem.hsms
+from secsgem.secs.functions import StreamsFunctions
+
+
+def _frame(header: secsgem.hsms.HsmsHeader, data: bytes) -> bytes:
+    return b"".join(secsgem.hsms.HsmsMessage(header, data).blocks[0].encode_parts())
+
+
+class TestHsmsAdmission:
+    def test_limits(self):
+        admission = secsgem.hsms.HsmsAdmission(1000, {(7, 3): 100, (6, 11): 5000})
+
+        assert admission.admit(secsgem.hsms.HsmsStreamFunctionHeader(1, 7, 3, True, 0), 100)
+        assert not admission.admit(secsgem.hsms.HsmsStreamFunctionHeader(1, 7, 3, True, 0), 101)
+        assert admission.admit(secsgem.hsms.HsmsStreamFunctionHeader(1, 1, 1, True, 0), 1000)
+        assert not admission.admit(secsgem.hsms.HsmsStreamFunctionHeader(1, 6, 11, True, 0), 1001)
+
+        assert admission.statistics.to_dict() == {"rejected": 2, "malformed": 0, "discarded_bytes": 1102}
+
+    def test_check_length(self):
+        admission = secsgem.hsms.HsmsAdmission(1000, {(7, 3): 100})
+
+        assert not admission.check_length(110)
+        assert admission.check_length(111)
+        assert not secsgem.hsms.HsmsAdmission().check_length(0xFFFFFFFF)
+
+        with pytest.raises(secsgem.hsms.HsmsFrameRejectedError):
+            admission.check_length(9)
+
+        assert admission.statistics.malformed == 1
+
+    def test_control_message_with_payload(self):
+        admission = secsgem.hsms.HsmsAdmission(1000)
+
+        with pytest.raises(secsgem.hsms.HsmsFrameRejectedError) as exc_info:
+            admission.admit(secsgem.hsms.HsmsLinktestReqHeader(1), 2000)
+
+        assert exc_info.value.header is None
+        assert admission.statistics.malformed == 1
+
+    def test_read_discards_rejected_payload(self):
+        admission = secsgem.hsms.HsmsAdmission(100)
+        queue = secsgem.common.ByteQueue()
+        queue.append(_frame(secsgem.hsms.HsmsStreamFunctionHeader(7, 7, 3, True, 0), b"x" * 500))
+        queue.append(_frame(secsgem.hsms.HsmsStreamFunctionHeader(8, 1, 1, True, 0), b"y" * 50))
+
+        reader = secsgem.hsms.HsmsFrameReader(queue, admission=admission)
+
+        with pytest.raises(secsgem.hsms.HsmsFrameRejectedError) as exc_info:
+            reader.read()
+
+        assert exc_info.value.header.system == 7
+        assert admission.statistics.discarded_bytes == 500
+
+        block = reader.read()
+        assert block.header.system == 8
+        assert block.data == b"y" * 50
+        assert len(queue) == 0
+
+    def test_read_malformed_header(self):
+        queue = secsgem.common.ByteQueue()
+        queue.append(b"\xff\xff\xff\xff" + b"\x00" * 5 + b"\x63" + b"\x00" * 4)
+
+        with pytest.raises(secsgem.hsms.HsmsFrameRejectedError) as exc_info:
+            secsgem.hsms.HsmsFrameReader(queue, admission=secsgem.hsms.HsmsAdmission(1024)).read()
+
+        assert exc_info.value.header is None
+
+
+class TestAsyncHsmsProtocolAdmission:
+    def test_reject_and_separate(self):
+        async def _run():
+            port = free_port()
+            protocol = secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+                device_type=secsgem.common.DeviceType.EQUIPMENT,
+                port=port,
+                max_message_size=1024,
+            ).create_async_protocol(StreamsFunctions())
+
+            await protocol.enable()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+            writer.write(_frame(secsgem.hsms.HsmsStreamFunctionHeader(5, 7, 3, True, 0), b"x" * 4096))
+            reject = secsgem.hsms.HsmsBlock.decode(await reader.readexactly(14))
+
+            assert reject.header.s_type == secsgem.hsms.HsmsSType.REJECT_REQ
+            assert reject.header.system == 5
+            assert reject.header.function == secsgem.hsms.HsmsAdmission.reject_reason
+
+            writer.write(b"\x00\x00\x00\x02\x00\x00")
+            separate = secsgem.hsms.HsmsBlock.decode(await reader.readexactly(14))
+
+            assert separate.header.s_type == secsgem.hsms.HsmsSType.SEPARATE_REQ
+            assert await reader.read() == b""
+
+            assert protocol.admission_statistics.to_dict() == {
+                "rejected": 1,
+                "malformed": 1,
+                "discarded_bytes": 4096,
+            }
+
+            writer.close()
+            await protocol.disable()
+
+        asyncio.run(_run())
+
+
+class TestHsmsProtocolAdmission:
+    def test_reject_and_separate(self):
+        port = free_port()
+        protocol = secsgem.hsms.HsmsProtocol(
+            secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+                device_type=secsgem.common.DeviceType.EQUIPMENT,
+                port=port,
+                message_size_limits={(7, 3): 1024},
+            ),
+            StreamsFunctions(),
+        )
+        protocol.enable()
+
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+                reader = sock.makefile("rb")
+
+                sock.sendall(_frame(secsgem.hsms.HsmsStreamFunctionHeader(5, 7, 3, True, 0), b"x" * 4096))
+                reject = secsgem.hsms.HsmsBlock.decode(reader.read(14))
+
+                assert reject.header.s_type == secsgem.hsms.HsmsSType.REJECT_REQ
+                assert reject.header.system == 5
+
+                sock.sendall(b"\x00\x00\x00\x02\x00\x00")
+                separate = secsgem.hsms.HsmsBlock.decode(reader.read(14))
+
+                assert separate.header.s_type == secsgem.hsms.HsmsSType.SEPARATE_REQ
+                assert protocol.admission_statistics.rejected == 1
+                assert protocol.admission_statistics.malformed == 1
+        finally:
+            protocol.disable()
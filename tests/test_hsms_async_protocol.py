@@ -0,0 +1,228 @@
+#####################################################################
+# test_hsms_async_protocol.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the asyncio hsms protocol."""
+
+from __future__ import annotations
+
+import asyncio
+
+from conftest import free_port
+
+import secsgem.common
+import secsgem.hsms
+import secsgem.secs
+from secsgem.secs.functions import StreamsFunctions
+
+
+def _create_pair(port: int, **kwargs) -> tuple[secsgem.hsms.AsyncHsmsProtocol, secsgem.hsms.AsyncHsmsProtocol]:
+    passive = secsgem.hsms.HsmsSettings(
+        connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+        device_type=secsgem.common.DeviceType.EQUIPMENT,
+        port=port,
+        **kwargs,
+    ).create_async_protocol(StreamsFunctions())
+    active = secsgem.hsms.HsmsSettings(
+        connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE,
+        port=port,
+        **kwargs,
+    ).create_async_protocol(StreamsFunctions())
+
+    return passive, active
+
+
+async def _wait_for(condition, timeout=5.0):
+    end_time = asyncio.get_running_loop().time() + timeout
+
+    while not condition():
+        if asyncio.get_running_loop().time() > end_time:
+            return False
+
+        await asyncio.sleep(0.01)
+
+    return True
+
+
+class TestAsyncHsmsProtocol:
+    def test_select_and_request(self):
+        async def _run():
+            passive, active = _create_pair(free_port())
+            tasks = []
+
+            def _reply(data):
+                message = data["message"]
+                tasks.append(
+                    asyncio.ensure_future(
+                        passive.send_response(
+                            secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]), message.header.system
+                        )
+                    )
+                )
+
+            passive.events.message_received += _reply
+
+            await passive.enable()
+            await active.enable()
+
+            assert await _wait_for(
+                lambda: (
+                    active.connection_state.current
+                    == secsgem.hsms.connection_state_machine.ConnectionState.CONNECTED_SELECTED
+                )
+            )
+
+            response = await active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01())
+
+            assert response is not None
+            assert response.header.stream == 1
+            assert response.header.function == 2
+
+            await active.disable()
+            assert await _wait_for(lambda: not passive.connected)
+
+            await passive.disable()
+
+        asyncio.run(_run())
+
+    def test_concurrent_requests(self):
+        async def _run():
+            passive, active = _create_pair(free_port())
+            tasks = []
+
+            def _reply(data):
+                message = data["message"]
+                tasks.append(
+                    asyncio.ensure_future(
+                        passive.send_response(secsgem.secs.functions.SecsS01F02([]), message.header.system)
+                    )
+                )
+
+            passive.events.message_received += _reply
+
+            await passive.enable()
+            await active.enable()
+
+            assert await _wait_for(lambda: passive.connection_state.current.name == "CONNECTED_SELECTED")
+
+            responses = await asyncio.gather(
+                *[active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01()) for _ in range(100)]
+            )
+
+            assert all(response is not None for response in responses)
+            assert len({response.header.system for response in responses}) == 100
+
+            await active.disable()
+            await passive.disable()
+
+        asyncio.run(_run())
+
+    def test_spooled_message(self):
+        async def _run():
+            passive, active = _create_pair(free_port(), spool_threshold=1024)
+            received = []
+
+            passive.events.message_received += lambda data: received.append(data["message"])
+
+            await passive.enable()
+            await active.enable()
+
+            assert await _wait_for(lambda: passive.connection_state.current.name == "CONNECTED_SELECTED")
+
+            recipe = "recipe body " * 10000
+            await active.send_stream_function(secsgem.secs.functions.SecsS07F03(["recipe", recipe]))
+
+            assert await _wait_for(lambda: len(received) == 1)
+            assert isinstance(received[0].data, memoryview)
+
+            function = passive._streams_functions.decode(received[0])
+            assert function.PPBODY.get() == recipe
+
+            await active.disable()
+            await passive.disable()
+
+        asyncio.run(_run())
+
+    def test_response_timeout(self):
+        async def _run():
+            passive, active = _create_pair(free_port())
+
+            await passive.enable()
+            await active.enable()
+
+            assert await _wait_for(lambda: active.connection_state.current.name == "CONNECTED_SELECTED")
+
+            response = await active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01(), timeout=0.1)
+            assert response is None
+
+            await active.disable()
+            await passive.disable()
+
+        asyncio.run(_run())
+
+    def test_linktest(self):
+        async def _run():
+            passive, active = _create_pair(free_port())
+
+            await passive.enable()
+            await active.enable()
+
+            assert await _wait_for(lambda: active.connected)
+
+            response = await active.send_linktest_req()
+            assert response is not None
+            assert response.header.s_type == secsgem.hsms.HsmsSType.LINKTEST_RSP
+
+            await active.disable()
+            await passive.disable()
+
+        asyncio.run(_run())
+
+    def test_linktest_timeout_setting(self):
+        passive, _ = _create_pair(free_port(), linktest_timeout=5)
+
+        assert passive._linktest_timeout == 5
+
+    def test_single_connection(self):
+        async def _closed(reader: asyncio.StreamReader) -> bool:
+            try:
+                return await asyncio.wait_for(reader.read(1), 0.5) == b""
+            except asyncio.TimeoutError:
+                return False
+
+        async def _run():
+            port = free_port()
+            passive, _ = _create_pair(port)
+
+            await passive.enable()
+
+            connections = await asyncio.gather(*(asyncio.open_connection("127.0.0.1", port) for _ in range(2)))
+            closed = await asyncio.gather(*(_closed(reader) for reader, _ in connections))
+
+            assert sorted(closed) == [False, True]
+
+            for _, writer in connections:
+                writer.close()
+
+            await passive.disable()
+
+        asyncio.run(_run())
+
+    def test_send_not_connected(self):
+        async def _run():
+            _, active = _create_pair(free_port())
+
+            assert await active.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01()) is None
+
+        asyncio.run(_run())
@@ -0,0 +1,153 @@
+#####################################################################
+# test_hsms_frame_reader.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+
+import socket
+import struct
+import time
+
+import pytest
+
+import secsgem.common
+import secsgem.hsms
+from secsgem.secs.functions import StreamsFunctions
+
+
+def _frame(header: secsgem.hsms.HsmsHeader, data: bytes) -> bytes:
+    return b"".join(secsgem.hsms.HsmsMessage(header, data).blocks[0].encode_parts())
+
+
+def _feed(reader: secsgem.hsms.HsmsFrameReader, queue: secsgem.common.ByteQueue, data: bytes, size: int):
+    """Append the data in chunks, each read but the last returns None."""
+    results = []
+    for offset in range(0, len(data), size):
+        queue.append(data[offset : offset + size])
+        results.append(reader.read())
+
+    assert all(result is None for result in results[:-1])
+    return results[-1]
+
+
+class TestHsmsFrameReader:
+    def test_byte_by_byte(self):
+        queue = secsgem.common.ByteQueue()
+        reader = secsgem.hsms.HsmsFrameReader(queue)
+
+        block = _feed(reader, queue, _frame(secsgem.hsms.HsmsStreamFunctionHeader(5, 1, 1, True, 0), b"data"), 1)
+
+        assert block.header.system == 5
+        assert block.data == b"data"
+        assert not reader.partial
+
+    def test_spooled_payload_consumed_as_it_arrives(self):
+        queue = secsgem.common.ByteQueue()
+        reader = secsgem.hsms.HsmsFrameReader(queue, spool_threshold=10)
+        frame = _frame(secsgem.hsms.HsmsStreamFunctionHeader(5, 6, 11, True, 0), bytes(range(100)))
+
+        assert _feed(reader, queue, frame[:50], 7) is None
+        assert len(queue) == 0
+        assert reader.partial
+        assert reader.needed == 1
+
+        block = _feed(reader, queue, frame[50:], 7)
+
+        assert isinstance(block.data, memoryview)
+        assert bytes(block.data) == bytes(range(100))
+        assert len(queue) == 0
+
+    def test_rejected_payload_discarded_as_it_arrives(self):
+        queue = secsgem.common.ByteQueue()
+        admission = secsgem.hsms.HsmsAdmission(100)
+        reader = secsgem.hsms.HsmsFrameReader(queue, admission=admission)
+        frame = _frame(secsgem.hsms.HsmsStreamFunctionHeader(7, 7, 3, True, 0), b"x" * 500)
+
+        assert _feed(reader, queue, frame[:-1], 64) is None
+        assert len(queue) == 0
+
+        queue.append(frame[-1:] + _frame(secsgem.hsms.HsmsStreamFunctionHeader(8, 1, 1, True, 0), b"y"))
+        with pytest.raises(secsgem.hsms.HsmsFrameRejectedError) as exc_info:
+            reader.read()
+
+        assert exc_info.value.header.system == 7
+        assert reader.read().header.system == 8
+
+    def test_last_progress(self):
+        queue = secsgem.common.ByteQueue()
+        reader = secsgem.hsms.HsmsFrameReader(queue)
+
+        queue.append(b"\x00\x00\x00\x0e")
+        reader.read()
+        first = reader.last_progress
+
+        time.sleep(0.01)
+        reader.read()
+        assert reader.last_progress == first
+
+        queue.append(b"\x00")
+        reader.read()
+        assert reader.last_progress > first
+
+
+class TestHsmsProtocolReceiving:
+    def test_send_while_receiving_large_frame(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        protocol = secsgem.hsms.HsmsSettings(
+            connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            port=port,
+        ).create_protocol(StreamsFunctions())
+        protocol._linktest_timeout = 0.5
+        protocol.enable()
+
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+                # start of a 50 MB frame, the rest never arrives
+                header = secsgem.hsms.HsmsStreamFunctionHeader(1, 6, 11, True, 0)
+                sock.sendall(struct.pack(">L", 10 + 50 * 1024 * 1024) + header.encode() + b"\x00" * 65536)
+
+                # the linktest is sent while the frame is partly received
+                linktest = secsgem.hsms.HsmsBlock.decode(sock.makefile("rb").read(14))
+                assert linktest.header.s_type == secsgem.hsms.HsmsSType.LINKTEST_REQ
+        finally:
+            protocol.disable()
+
+    def test_t8_timeout(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        protocol = secsgem.hsms.HsmsSettings(
+            connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            port=port,
+            timeouts=secsgem.common.Timeouts(t8=0.2),
+        ).create_protocol(StreamsFunctions())
+        protocol.enable()
+
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+                start = time.monotonic()
+                sock.sendall(b"\x00\x00\x00\x0a\xff\xff")
+
+                reader = sock.makefile("rb")
+                separate = secsgem.hsms.HsmsBlock.decode(reader.read(14))
+                assert separate.header.s_type == secsgem.hsms.HsmsSType.SEPARATE_REQ
+                assert reader.read() == b""
+                assert 0.2 <= time.monotonic() - start < 5
+        finally:
+            protocol.disable()
@@ -0,0 +1,171 @@
+#####################################################################
+# test_hsms_multiplexer.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for multiple hsms sessions sharing one connection."""
+
+from __future__ import annotations
+
+import pytest
+from conftest import free_port, wait_for
+
+import secsgem.common
+import secsgem.gem
+import secsgem.hsms
+from secsgem.secs.functions import StreamsFunctions
+
+
+def _create_multiplexers(port: int) -> tuple[secsgem.hsms.HsmsMultiplexer, secsgem.hsms.HsmsMultiplexer]:
+    passive = secsgem.hsms.HsmsMultiplexer(
+        secsgem.hsms.HsmsSettings(
+            connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            port=port,
+        )
+    )
+    active = secsgem.hsms.HsmsMultiplexer(
+        secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE, port=port)
+    )
+
+    return passive, active
+
+
+class TestHsmsMultiplexer:
+    """Tests for HsmsMultiplexer class."""
+
+    def test_session_settings(self):
+        """Test settings created for a session."""
+        multiplexer = secsgem.hsms.HsmsMultiplexer(secsgem.hsms.HsmsSettings(port=5001))
+
+        settings = multiplexer.session_settings(7)
+
+        assert isinstance(settings, secsgem.hsms.HsmsSessionSettings)
+        assert settings.session_id == 7
+        assert settings.port == 5001
+        assert settings.multiplexer is multiplexer
+        assert isinstance(settings.create_protocol(StreamsFunctions()), secsgem.hsms.HsmsSessionProtocol)
+
+    def test_control_headers_with_session(self):
+        """Test control messages carrying the session id."""
+        assert secsgem.hsms.HsmsSelectReqHeader(1).session_id == 0xFFFF
+        assert secsgem.hsms.HsmsSelectReqHeader(1, 3).session_id == 3
+        assert secsgem.hsms.HsmsSelectRspHeader(1, 3).session_id == 3
+        assert secsgem.hsms.HsmsDeselectReqHeader(1, 3).session_id == 3
+        assert secsgem.hsms.HsmsDeselectRspHeader(1, 3).session_id == 3
+        assert secsgem.hsms.HsmsSeparateReqHeader(1, 3).session_id == 3
+        assert secsgem.hsms.HsmsRejectReqHeader(1, secsgem.hsms.HsmsSType.SELECT_REQ, 4, 3).session_id == 3
+
+    def test_attach_twice(self):
+        """Test enabling two sessions with the same session id."""
+        multiplexer = secsgem.hsms.HsmsMultiplexer(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=free_port())
+        )
+
+        first = multiplexer.session_settings(1).create_protocol(StreamsFunctions())
+        second = multiplexer.session_settings(1).create_protocol(StreamsFunctions())
+
+        first.enable()
+
+        try:
+            with pytest.raises(ValueError):
+                second.enable()
+        finally:
+            first.disable()
+
+        assert multiplexer.sessions == {}
+
+    def test_routing(self):
+        """Test messages routed to the handlers of the sessions."""
+        passive, active = _create_multiplexers(free_port())
+
+        equipments = {}
+        for session_id in (1, 2, 3):
+            equipments[session_id] = secsgem.gem.GemEquipmentHandler(passive.session_settings(session_id))
+            equipments[session_id]._mdln = f"module{session_id}"
+
+        hosts = {
+            session_id: secsgem.gem.GemHostHandler(active.session_settings(session_id)) for session_id in (1, 2, 3)
+        }
+
+        for handler in [*equipments.values(), *hosts.values()]:
+            handler.enable()
+
+        disabled = set()
+
+        try:
+            for session_id, host in hosts.items():
+                assert host.waitfor_communicating(10)
+
+                response = host.streams_functions.decode(host.send_and_waitfor_response(host.stream_function(1, 1)()))
+                assert response.get() == [f"module{session_id}", "0.1.0"]
+                assert host.protocol.connection_state.current.name == "CONNECTED_SELECTED"
+
+            assert passive.connected
+            assert active.connected
+            assert sorted(active.sessions) == [1, 2, 3]
+
+            linktest = active.send_linktest_req()
+            assert linktest is not None
+            assert linktest.header.s_type == secsgem.hsms.HsmsSType.LINKTEST_RSP
+
+            # separating one session keeps the others communicating
+            hosts[2].disable()
+            disabled.add(2)
+
+            assert wait_for(lambda: equipments[2].protocol.connection_state.current.name == "CONNECTED_NOT_SELECTED")
+            assert active.connected
+            assert hosts[1].are_you_there() is not None
+            assert hosts[3].are_you_there() is not None
+        finally:
+            for session_id, host in hosts.items():
+                if session_id not in disabled:
+                    host.disable()
+
+            for equipment in equipments.values():
+                equipment.disable()
+
+        assert not active.connected
+        assert not passive.connected
+
+    def test_unknown_session(self):
+        """Test selecting a session the remote doesn't know."""
+        passive, active = _create_multiplexers(free_port())
+
+        equipment = passive.session_settings(1).create_protocol(StreamsFunctions())
+        known = active.session_settings(1).create_protocol(StreamsFunctions())
+        unknown = active.session_settings(2).create_protocol(StreamsFunctions())
+
+        equipment.enable()
+        known.enable()
+        unknown.enable()
+
+        try:
+            assert wait_for(lambda: known.connection_state.current.name == "CONNECTED_SELECTED")
+
+            response = unknown.send_select_req()
+
+            assert response is not None
+            assert response.header.s_type == secsgem.hsms.HsmsSType.REJECT_REQ
+            assert unknown.connection_state.current.name == "CONNECTED_NOT_SELECTED"
+        finally:
+            unknown.disable()
+            known.disable()
+            equipment.disable()
+
+    def test_send_not_connected(self):
+        """Test sending without the shared connection."""
+        multiplexer = secsgem.hsms.HsmsMultiplexer(secsgem.hsms.HsmsSettings(port=free_port()))
+
+        assert not multiplexer.send_buffers([b"\x00\x00\x00\x0a"])
+        assert multiplexer.send_linktest_req() is None
@@ -16,6 +16,7 @@
 
 import unittest
 
+import secsgem.common
 import secsgem.hsms
 
 
@@ -282,3 +283,24 @@ class TestHsmsPacket(unittest.TestCase):
             str(packet)
             == "'header': {session_id:0x0064, stream:01, function:01, p_type:0x00, s_type:0x00, system:0x0000007b, require_response:True} "
         )
+
+    def testReadSpooled(self):
+        queue = secsgem.common.ByteQueue()
+        queue.append(b"\x00\x00\x00\x0e\x00d\x81\x01\x00\x00\x00\x00\x00{da")
+        queue.append(b"ta\x00\x00\x00\x0a")
+
+        block = secsgem.hsms.HsmsFrameReader(queue, spool_threshold=3).read()
+
+        assert isinstance(block.data, memoryview)
+        assert bytes(block.data) == b"data"
+        assert block.header.system == 123
+        assert len(queue) == 4
+
+    def testReadBelowThreshold(self):
+        queue = secsgem.common.ByteQueue()
+        queue.append(b"\x00\x00\x00\x0e\x00d\x81\x01\x00\x00\x00\x00\x00{data")
+
+        block = secsgem.hsms.HsmsFrameReader(queue, spool_threshold=4).read()
+
+        assert block.data == b"data"
+        assert len(queue) == 0
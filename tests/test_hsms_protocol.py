@@ -14,13 +14,17 @@
 # GNU Lesser General Public License for more details.
 #####################################################################
 
+import socket
 import threading
+import time
 import unittest
 
 from mock_connection import MockHsmsConnection
 from mock_settings import MockHsmsSettings
 
+import secsgem.common
 import secsgem.hsms
+from secsgem.secs.functions import StreamsFunctions
 
 
 class TestHsmsProtocolHandlerPassive(unittest.TestCase):
@@ -392,3 +396,67 @@ class TestHsmsProtocolActive(unittest.TestCase):
         self.client._settings.timeouts.t6 = 0.1
 
         assert self.client.send_deselect_req() is None
+
+
+class TestHsmsProtocolTimers:
+    def test_linktest_timer(self):
+        link = secsgem.common.LoopbackLink()
+        host = secsgem.hsms.HsmsSettings(loopback=link).create_protocol(StreamsFunctions())
+        equipment = secsgem.hsms.HsmsSettings(
+            connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            loopback=link,
+        ).create_protocol(StreamsFunctions())
+
+        linktests = []
+        send_linktest_rsp = equipment.send_linktest_rsp
+
+        def _send_linktest_rsp(system_id):
+            linktests.append(system_id)
+            return send_linktest_rsp(system_id)
+
+        equipment.send_linktest_rsp = _send_linktest_rsp
+        host._linktest_timeout = 0.05
+
+        equipment.enable()
+        host.enable()
+
+        try:
+            end_time = time.monotonic() + 5
+            while len(linktests) < 3:
+                assert time.monotonic() < end_time
+                time.sleep(0.01)
+
+            assert len(host._transactions) <= 1
+        finally:
+            host.disable()
+            equipment.disable()
+
+        count = len(linktests)
+        time.sleep(0.2)
+        assert len(linktests) == count
+
+    def test_t7_timeout(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        protocol = secsgem.hsms.HsmsSettings(
+            connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            port=port,
+            timeouts=secsgem.common.Timeouts(t7=0.2),
+        ).create_protocol(StreamsFunctions())
+        protocol.enable()
+
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+                start = time.monotonic()
+                reader = sock.makefile("rb")
+
+                separate = secsgem.hsms.HsmsBlock.decode(reader.read(14))
+                assert separate.header.s_type == secsgem.hsms.HsmsSType.SEPARATE_REQ
+                assert reader.read() == b""
+                assert 0.2 <= time.monotonic() - start < 5
+        finally:
+            protocol.disable()
@@ -0,0 +1,124 @@
+#####################################################################
+# test_hsms_server.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the multi passive hsms server."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from conftest import free_port, wait_for
+
+import secsgem.common
+import secsgem.gem
+import secsgem.hsms
+from secsgem.secs.functions import StreamsFunctions
+
+
+def _create_client(port: int) -> secsgem.hsms.HsmsProtocol:
+    return secsgem.hsms.HsmsProtocol(
+        secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE, port=port), StreamsFunctions()
+    )
+
+
+class TestHsmsMultiPassiveServer:
+    """Tests for HsmsMultiPassiveServer class."""
+
+    def test_active_settings(self):
+        """Test creating a server with active settings."""
+        with pytest.raises(ValueError):
+            secsgem.hsms.HsmsMultiPassiveServer(
+                secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE)
+            )
+
+    def test_multiple_peers(self):
+        """Test multiple active peers connecting to one server port."""
+        port = free_port()
+        server = secsgem.hsms.HsmsMultiPassiveServer(
+            secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE, port=port)
+        )
+        disconnected = threading.Event()
+        server.events.peer_disconnected += lambda _: disconnected.set()
+
+        server.enable()
+
+        clients = [_create_client(port) for _ in range(3)]
+        for client in clients:
+            client.enable()
+
+        try:
+            assert wait_for(lambda: len(server.peers) == 3)
+            assert wait_for(
+                lambda: all(client.connection_state.current.name == "CONNECTED_SELECTED" for client in clients)
+            )
+
+            local_ports = {key[1] for key in server.peers}
+            assert len(local_ports) == 3
+            assert all(key[0] == "127.0.0.1" for key in server.peers)
+
+            # only the clients use receiver threads, the peers are served by the reactor
+            receivers = [thread for thread in threading.enumerate() if "tcpConnection_receiver" in thread.name]
+            assert len(receivers) == 3
+
+            clients[0].disable()
+
+            assert disconnected.wait(5)
+            assert wait_for(lambda: len(server.peers) == 2)
+        finally:
+            for client in clients:
+                client.disable()
+
+            server.disable()
+
+        assert server.address is None
+
+    def test_handler_factory(self):
+        """Test peers served by gem handlers."""
+        port = free_port()
+        server = secsgem.hsms.HsmsMultiPassiveServer(
+            secsgem.hsms.HsmsSettings(
+                connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+                device_type=secsgem.common.DeviceType.EQUIPMENT,
+                port=port,
+            ),
+            secsgem.gem.GemEquipmentHandler,
+        )
+
+        hosts = [
+            secsgem.gem.GemHostHandler(
+                secsgem.hsms.HsmsSettings(connect_mode=secsgem.hsms.HsmsConnectMode.ACTIVE, port=port)
+            )
+            for _ in range(2)
+        ]
+
+        server.enable()
+
+        try:
+            for host in hosts:
+                host.enable()
+
+            for host in hosts:
+                assert host.waitfor_communicating(10)
+                assert host.are_you_there() is not None
+
+            assert all(isinstance(handler, secsgem.gem.GemEquipmentHandler) for handler in server.peers.values())
+        finally:
+            for host in hosts:
+                host.disable()
+
+            server.disable()
+
+        assert server.peers == {}
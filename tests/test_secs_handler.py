@@ -15,12 +15,14 @@
 #####################################################################
 
 import threading
+import time
 import unittest.mock
 
 import pytest
 from mock_protocol import MockProtocol
 from mock_settings import MockSettings
 
+import secsgem.common
 import secsgem.hsms
 import secsgem.secs
 
@@ -672,3 +674,59 @@ class TestSecsHandlerActive(unittest.TestCase):
 
     def tearDown(self):
         self.client.disable()
+
+
+class TestSecsHandlerBatch:
+    def setup_method(self):
+        link = secsgem.common.LoopbackLink()
+        self.client = secsgem.secs.SecsHandler(secsgem.hsms.HsmsSettings(loopback=link))
+        self.equipment = secsgem.hsms.HsmsSettings(
+            connect_mode=secsgem.hsms.HsmsConnectMode.PASSIVE,
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            loopback=link,
+        ).create_protocol(secsgem.secs.functions.StreamsFunctions())
+
+        self.max_in_flight = 0
+        self.equipment.events.message_received += self._on_message
+
+        self.equipment.enable()
+        self.client.enable()
+
+        end_time = time.monotonic() + 5
+        while self.client.protocol.connection_state.current.name != "CONNECTED_SELECTED":
+            assert time.monotonic() < end_time
+            time.sleep(0.01)
+
+    def teardown_method(self):
+        self.client.disable()
+        self.equipment.disable()
+
+    def _on_message(self, data):
+        message = data["message"]
+        self.max_in_flight = max(self.max_in_flight, len(self.client.protocol._transactions))
+
+        # S1F11 is left unanswered
+        if message.header.function == 3:
+            svids = secsgem.secs.functions.StreamsFunctions().decode(message).get()
+            self.equipment.send_response(secsgem.secs.functions.SecsS01F04(svids), message.header.system)
+
+    def test_send_many_and_wait(self):
+        functions = [secsgem.secs.functions.SecsS01F03([index]) for index in range(40)]
+        functions[5] = secsgem.secs.functions.SecsS01F11([5])
+        functions[7] = None
+
+        futures = self.client.send_many_and_wait(functions, window=4, timeout=0.2)
+
+        assert all(future.done() for future in futures)
+        assert futures[5].result() is None
+        assert isinstance(futures[7].exception(), AttributeError)
+
+        for index, future in enumerate(futures):
+            if index not in (5, 7):
+                assert self.client.streams_functions.decode(future.result()).get() == [index]
+
+        assert 0 < self.max_in_flight <= 4
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            self.client.send_many_and_wait([], window=0)
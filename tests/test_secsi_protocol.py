@@ -0,0 +1,391 @@
+#####################################################################
+# test_secsi_protocol.py
+#
+# (c) Copyright 2024, Benjamin Parzella. All rights reserved.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#####################################################################
+"""Tests for the secsi link and protocol modules."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import secsgem.common
+import secsgem.secs
+import secsgem.secsi
+import secsgem.secsitcp
+from secsgem.secs.functions import StreamsFunctions
+from secsgem.secsi.link import SecsILinkState
+
+ENQ = bytes([secsgem.secsi.SecsILink.ENQ])
+EOT = bytes([secsgem.secsi.SecsILink.EOT])
+ACK = bytes([secsgem.secsi.SecsILink.ACK])
+NAK = bytes([secsgem.secsi.SecsILink.NAK])
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _encoded_block(system: int = 1, data: bytes = b"\x01\x02") -> bytes:
+    header = secsgem.secsi.SecsIHeader(system, 0, 1, 3, require_response=True)
+    return secsgem.secsi.message.SecsIMessage(header, data).blocks[0].encode()
+
+
+def _create_link(is_host: bool = True, retry_limit: int = 3):
+    clock = _Clock()
+    written: list[bytes] = []
+    blocks: list = []
+    link = secsgem.secsi.SecsILink(
+        secsgem.common.Timeouts(t1=0.5, t2=10.0), retry_limit, is_host, written.append, blocks.append, clock
+    )
+
+    return link, clock, written, blocks
+
+
+class TestSecsILink:
+    """Tests for SecsILink class."""
+
+    def test_send(self):
+        """Test a block is sent after EOT and succeeds on ACK."""
+        link, _, written, _ = _create_link()
+        block_info = secsgem.common.BlockSendInfo(_encoded_block())
+
+        link.send(block_info)
+        assert written == [ENQ]
+        assert link.next_timeout() == 10.0
+
+        link.receive(EOT)
+        assert written == [ENQ, _encoded_block()]
+        assert link.state == SecsILinkState.SEND
+
+        link.receive(ACK)
+        assert block_info.wait()
+        assert link.state == SecsILinkState.IDLE
+        assert link.next_timeout() is None
+
+    def test_send_retry(self):
+        """Test a NAK and a T2 timeout are retried, sending fails after the retry limit."""
+        link, clock, written, _ = _create_link(retry_limit=2)
+        block_info = secsgem.common.BlockSendInfo(_encoded_block())
+
+        link.send(block_info)
+        link.receive(EOT + NAK)
+        assert link.retries == 1
+        assert written == [ENQ, _encoded_block(), ENQ]
+
+        # no EOT within T2
+        clock.now = 9.9
+        link.check_timeouts()
+        assert link.retries == 1
+
+        clock.now = 10.0
+        link.check_timeouts()
+        assert link.retries == 2
+        assert written[-1] == ENQ
+
+        clock.now = 20.0
+        link.check_timeouts()
+        assert not block_info.wait()
+        assert not link.sending
+        assert link.state == SecsILinkState.IDLE
+        assert written.count(ENQ) == 3
+
+    def test_receive(self):
+        """Test a block received in pieces is acknowledged and passed on, a duplicate only acknowledged."""
+        link, clock, written, blocks = _create_link()
+        data = _encoded_block()
+
+        link.receive(ENQ)
+        assert written == [EOT]
+
+        link.receive(data[:1])
+        clock.now = 0.4
+        link.receive(data[1:5])
+        clock.now = 0.8
+        link.receive(data[5:])
+
+        assert written == [EOT, ACK]
+        assert len(blocks) == 1
+        assert blocks[0].header.system == 1
+        assert blocks[0].data == b"\x01\x02"
+
+        link.receive(ENQ + data)
+        assert written == [EOT, ACK, EOT, ACK]
+        assert len(blocks) == 1
+
+    def test_receive_errors(self):
+        """Test invalid checksum, T1 and T2 timeouts and invalid length are answered with NAK."""
+        link, clock, written, blocks = _create_link()
+        data = bytearray(_encoded_block())
+        data[-1] ^= 0xFF
+
+        # invalid checksum, NAK after the line is silent for T1
+        link.receive(ENQ + bytes(data))
+        assert written == [EOT]
+        assert link.state == SecsILinkState.DISCARD
+        clock.now = 0.5
+        link.check_timeouts()
+        assert written == [EOT, NAK]
+
+        # T1 between characters
+        link.receive(ENQ + bytes(data[:5]))
+        clock.now = 1.0
+        link.check_timeouts()
+        assert written[-1] == NAK
+        assert link.state == SecsILinkState.IDLE
+
+        # T2 for the length character
+        link.receive(ENQ)
+        clock.now = 11.0
+        link.check_timeouts()
+        assert written[-1] == NAK
+
+        # invalid length, NAK after the line is silent for T1
+        link.receive(ENQ + bytes([5, 1, 2]))
+        clock.now = 11.4
+        link.receive(bytes([3]))
+        clock.now = 11.8
+        link.check_timeouts()
+        assert written[-1] == EOT
+        clock.now = 11.9
+        link.check_timeouts()
+        assert written[-1] == NAK
+
+        assert blocks == []
+
+    def test_contention(self):
+        """Test the host yields on contention and sends afterwards, the equipment doesn't."""
+        host, _, host_written, host_blocks = _create_link(is_host=True)
+        host.send(secsgem.common.BlockSendInfo(_encoded_block(2)))
+        host.receive(ENQ)
+        assert host.state == SecsILinkState.RECEIVE_LENGTH
+
+        host.receive(_encoded_block(3))
+        assert host_written == [ENQ, EOT, ACK, ENQ]
+        assert host.state == SecsILinkState.LINE_CONTROL
+        assert len(host_blocks) == 1
+
+        equipment, _, equipment_written, _ = _create_link(is_host=False)
+        equipment.send(secsgem.common.BlockSendInfo(_encoded_block(3)))
+        equipment.receive(ENQ)
+        assert equipment.state == SecsILinkState.LINE_CONTROL
+
+        equipment.receive(EOT)
+        assert equipment_written == [ENQ, _encoded_block(3)]
+
+
+class TestSecsIBlock:
+    """Tests for SecsIBlock and SecsIMessage classes."""
+
+    def test_round_trip(self):
+        """Test the blocks of a message encode and decode to the original header and data."""
+        data = bytes(range(256)) * 4
+        header = secsgem.secsi.SecsIHeader(7, 3, 1, 3, from_equipment=True, require_response=True)
+        message = secsgem.secsi.message.SecsIMessage(header, data)
+
+        assert [len(block.data) for block in message.blocks] == [244, 244, 244, 244, 48]
+
+        decoded = []
+        for index, block in enumerate(message.blocks):
+            expected = header.__class__(7, 3, 1, 3, index + 1, True, True, index == 4)
+            assert block.header.encode() == expected.encode()
+            assert block.checksum == sum(expected.encode()) + sum(block.data)
+
+            decoded.append(secsgem.secsi.message.SecsIBlock.decode(block.encode()))
+
+        assert [block.header.block for block in decoded] == [1, 2, 3, 4, 5]
+        assert [block.header.last_block for block in decoded] == [False, False, False, False, True]
+        assert b"".join(block.data for block in decoded) == data
+
+        corrupted = bytearray(message.blocks[0].encode())
+        corrupted[20] ^= 0x01
+        assert secsgem.secsi.message.SecsIBlock.decode(bytes(corrupted)) is None
+
+
+class TestSecsIProtocol:
+    """Tests for SecsIProtocol class."""
+
+    def test_silent_peer(self):
+        """Test sending fails after the retries when the peer doesn't answer."""
+        link = secsgem.common.LoopbackLink()
+        settings = secsgem.secsitcp.SecsITcpSettings(
+            loopback=link, retry_limit=2, timeouts=secsgem.common.Timeouts(t2=0.05)
+        )
+        protocol = settings.create_protocol(StreamsFunctions())
+        peer = secsgem.secsitcp.SecsITcpSettings(loopback=link).create_connection()
+
+        received = bytearray()
+        peer.on_data.register(lambda data: received.extend(data["data"]))
+
+        peer.enable()
+        protocol.enable()
+
+        try:
+            start = time.monotonic()
+            assert not protocol.send_stream_function(secsgem.secs.functions.SecsS01F01())
+            assert time.monotonic() - start < 5
+            assert bytes(received) == ENQ * 3
+        finally:
+            protocol.disable()
+            peer.disable()
+
+    def test_failed_block_aborts_message(self):
+        """Test the remaining blocks of a message are not sent after a block failed."""
+        link = secsgem.common.LoopbackLink()
+        settings = secsgem.secsitcp.SecsITcpSettings(
+            loopback=link, retry_limit=2, timeouts=secsgem.common.Timeouts(t2=0.05)
+        )
+        protocol = settings.create_protocol(StreamsFunctions())
+        peer = secsgem.secsitcp.SecsITcpSettings(loopback=link).create_connection()
+
+        received = bytearray()
+        peer.on_data.register(lambda data: received.extend(data["data"]))
+
+        peer.enable()
+        protocol.enable()
+
+        try:
+            message = protocol._create_message_for_function(
+                secsgem.secs.functions.SecsS01F03(list(range(500))), protocol.get_next_system_counter()
+            )
+            assert len(message.blocks) > 1
+
+            assert not protocol.send_message_async(message).result(5)
+            assert bytes(received) == ENQ * 3
+            assert protocol._send_queue.empty()
+        finally:
+            protocol.disable()
+            peer.disable()
+
+    def test_send_message_async(self):
+        """Test the blocks of a message are queued at once and the future is resolved after the last one."""
+        link = secsgem.common.LoopbackLink()
+        host = secsgem.secsitcp.SecsITcpSettings(loopback=link).create_protocol(StreamsFunctions())
+        equipment = secsgem.secsitcp.SecsITcpSettings(
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            loopback=link,
+        ).create_protocol(StreamsFunctions())
+
+        messages = []
+        received = threading.Event()
+
+        def on_message(data):
+            messages.append(data["message"])
+            received.set()
+
+        equipment.events.message_received += on_message
+
+        equipment.enable()
+        host.enable()
+
+        try:
+            values = list(range(500))
+            message = host._create_message_for_function(
+                secsgem.secs.functions.SecsS01F03(values), host.get_next_system_counter()
+            )
+
+            future = host.send_message_async(message)
+            assert not future.cancel()
+            assert future.result(5)
+
+            assert received.wait(5)
+            assert StreamsFunctions().decode(messages[0]).get() == values
+        finally:
+            host.disable()
+            equipment.disable()
+
+    def test_reply_between_blocks(self):
+        """Test a reply is sent between the blocks of a queued multi-block primary message."""
+        link = secsgem.common.LoopbackLink()
+        host = secsgem.secsitcp.SecsITcpSettings(loopback=link).create_protocol(StreamsFunctions())
+        equipment = secsgem.secsitcp.SecsITcpSettings(
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            loopback=link,
+        ).create_protocol(StreamsFunctions())
+
+        functions = []
+        equipment.events.message_received += lambda data: functions.append(data["message"].header.function)
+
+        equipment.enable()
+        host.enable()
+
+        try:
+            message = host._create_message_for_function(
+                secsgem.secs.functions.SecsS01F03(list(range(2000))), host.get_next_system_counter()
+            )
+            assert len(message.blocks) > 10
+
+            primary = host.send_message_async(message)
+            reply = host.send_response_async(secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"]), 1)
+
+            assert reply.result(10)
+            assert not primary.done()
+            assert primary.result(10)
+
+            end_time = time.monotonic() + 5
+            while len(functions) < 2:
+                assert time.monotonic() < end_time
+                time.sleep(0.01)
+
+            assert functions == [2, 3]
+        finally:
+            host.disable()
+            equipment.disable()
+
+    def test_messages(self):
+        """Test messages without data and with multiple blocks are exchanged."""
+        link = secsgem.common.LoopbackLink()
+        host = secsgem.secsitcp.SecsITcpSettings(loopback=link).create_protocol(StreamsFunctions())
+        equipment = secsgem.secsitcp.SecsITcpSettings(
+            device_type=secsgem.common.DeviceType.EQUIPMENT,
+            loopback=link,
+        ).create_protocol(StreamsFunctions())
+
+        values = list(range(500))
+        received = threading.Event()
+
+        def on_message(data):
+            received.set()
+
+            if data["message"].header.function == 1:
+                response = secsgem.secs.functions.SecsS01F02(["MDLN", "SOFTREV"])
+            else:
+                response = secsgem.secs.functions.SecsS01F04(values)
+
+            equipment.send_response(response, data["message"].header.system)
+
+        equipment.events.message_received += on_message
+
+        equipment.enable()
+        host.enable()
+
+        try:
+            response = host.send_and_waitfor_response(secsgem.secs.functions.SecsS01F01())
+
+            assert received.is_set()
+            assert response is not None
+            assert StreamsFunctions().decode(response).get() == ["MDLN", "SOFTREV"]
+
+            response = host.send_and_waitfor_response(secsgem.secs.functions.SecsS01F03(values))
+
+            assert response is not None
+            assert len(response.blocks) > 1
+            assert StreamsFunctions().decode(response).get() == values
+        finally:
+            host.disable()
+            equipment.disable()